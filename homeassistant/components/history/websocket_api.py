@@ -93,6 +93,25 @@ def _ws_get_significant_states(
     )
 
 
+def _ws_get_numeric_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+) -> bytes:
+    """Fetch numeric history and convert it to json in the executor."""
+    return json_bytes(
+        messages.result_message(
+            msg_id,
+            history.get_numeric_states(
+                hass, start_time, end_time, entity_ids, include_start_time_state
+            ),
+        )
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -103,6 +122,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("numeric", default=False): bool,
     }
 )
 @websocket_api.async_response
@@ -155,11 +175,25 @@ async def ws_get_history_during_period(
         connection.send_result(msg["id"], {})
         return
 
+    if msg["numeric"]:
+        connection.send_message(
+            await get_instance(hass).async_add_read_job(
+                _ws_get_numeric_states,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+            )
+        )
+        return
+
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -213,8 +247,9 @@ def _generate_websocket_response(
     )
 
 
-def _generate_historical_response(
+def _send_historical_response(
     hass: HomeAssistant,
+    connection: ActiveConnection,
     msg_id: int,
     start_time: dt,
     end_time: dt,
@@ -224,47 +259,57 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
-) -> tuple[float, dt | None, bytes | None]:
-    """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            None,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
-    )
+) -> float:
+    """Stream history significant_states to the client as they are read.
+
+    Each chunk is encoded in the executor and handed to the event loop
+    before the next one is read, so the whole period is never held in
+    memory. The last chunk is
+    held back to send it with the time window of the response. Stops
+    early when the subscription is gone, for instance because the
+    websocket was closed.
+    """
     last_time_ts = 0.0
-    for state_list in states.values():
-        if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
-        ):
-            last_time_ts = cast(float, state_last_time)
+    pending: dict[str, list[dict[str, Any]]] | None = None
+    for states in history.stream_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    ):
+        if msg_id not in connection.subscriptions:
+            return last_time_ts
+        for state_list in states.values():
+            if (
+                state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED]
+            ) > last_time_ts:
+                last_time_ts = cast(float, state_last_time)
+        if pending:
+            hass.loop.call_soon_threadsafe(
+                connection.send_message,
+                json_bytes(messages.event_message(msg_id, {"states": pending})),
+            )
+        pending = states
 
     if last_time_ts == 0:
         # If we did not send any states ever, we need to send an empty response
         # so the websocket client knows it should render/process/consume the
         # data.
         if not send_empty:
-            return last_time_ts, None, None
+            return last_time_ts
         last_time_dt = end_time
     else:
         last_time_dt = dt_util.utc_from_timestamp(last_time_ts)
 
-    return (
-        last_time_ts,
-        last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
+    hass.loop.call_soon_threadsafe(
+        connection.send_message,
+        _generate_websocket_response(msg_id, start_time, last_time_dt, pending or {}),
     )
+    return last_time_ts
 
 
 async def _async_send_historical_states(
@@ -282,9 +327,10 @@ async def _async_send_historical_states(
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
+    last_time_ts = await instance.async_add_read_job(
+        _send_historical_response,
         hass,
+        connection,
         msg_id,
         start_time,
         end_time,
@@ -295,16 +341,14 @@ async def _async_send_historical_states(
         no_attributes,
         send_empty,
     )
-    if payload:
-        connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    return dt_util.utc_from_timestamp(last_time_ts) if last_time_ts != 0 else None
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
     """Convert a state to a compressed state."""
     comp_state: dict[str, Any] = {COMPRESSED_STATE_STATE: state.state}
     if not no_attributes or state.domain in history.NEED_ATTRIBUTE_DOMAINS:
-        comp_state[COMPRESSED_STATE_ATTRIBUTES] = state.attributes
+        comp_state[COMPRESSED_STATE_ATTRIBUTES] = state.attributes_json_fragment
     comp_state[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated_timestamp
     if state.last_changed != state.last_updated:
         comp_state[COMPRESSED_STATE_LAST_CHANGED] = state.last_changed_timestamp
@@ -163,7 +163,7 @@ async def _async_get_ws_stream_events(
     partial: bool,
 ) -> tuple[bytes, dt | None]:
     """Async wrapper around _ws_formatted_get_events."""
-    return await get_instance(hass).async_add_executor_job(
+    return await get_instance(hass).async_add_read_job(
         _ws_stream_get_events,
         msg_id,
         start_time,
@@ -501,7 +501,7 @@ async def ws_get_events(
     )
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_job(
             _ws_formatted_get_events,
             msg["id"],
             start_time,
@@ -19,14 +19,24 @@ import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.const import (
+    CONF_SCAN_INTERVAL,
+    CONF_TYPE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.typing import ConfigType
+
+from . import websocket_api
+from .const import DOMAIN, LOOP_MONITOR
+from .loop_monitor import LoopMonitor
 
-from .const import DOMAIN
+PLATFORMS = [Platform.SENSOR]
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -78,6 +88,14 @@ LOG_INTERVAL_SUB = "log_interval_subscription"
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Profiler websocket commands."""
+    websocket_api.async_setup(hass)
+    return True
+
 
 async def async_setup_entry(  # noqa: C901
     hass: HomeAssistant, entry: ConfigEntry
@@ -86,6 +104,16 @@ async def async_setup_entry(  # noqa: C901
     lock = asyncio.Lock()
     domain_data = hass.data[DOMAIN] = {}
 
+    monitor = domain_data[LOOP_MONITOR] = LoopMonitor(hass)
+    monitor.async_start()
+
+    async def _async_stop_monitor(event: Event) -> None:
+        await monitor.async_stop()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_monitor)
+    )
+
     async def _async_run_profile(call: ServiceCall) -> None:
         async with lock:
             await _async_generate_profile(hass, call)
@@ -382,16 +410,20 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
-    hass.data.pop(DOMAIN)
+    await hass.data.pop(DOMAIN)[LOOP_MONITOR].async_stop()
     return True
 
 
@@ -0,0 +1,311 @@
+"""Sample event loop lag and attribute loop stalls to integrations."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+import logging
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.frame import MissingIntegrationFrame, get_integration_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 0.5
+SLOW_CALLBACK_THRESHOLD = 0.1
+LAG_HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RECENT_LAG_SAMPLES = 120
+MAX_SLOW_CALLBACKS = 50
+
+UNKNOWN_INTEGRATION = "unknown"
+
+# The event loop runs every callback from this method of its handle
+_HANDLE_RUN_CODE: CodeType = asyncio.Handle._run.__code__  # noqa: SLF001
+
+
+@dataclass(slots=True)
+class LagHistogram:
+    """Histogram of event loop lag samples."""
+
+    buckets: tuple[float, ...] = LAG_HISTOGRAM_BUCKETS
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LAG_HISTOGRAM_BUCKETS) + 1)
+    )
+    samples: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, lag: float) -> None:
+        """Add a lag sample."""
+        self.counts[bisect_left(self.buckets, lag)] += 1
+        self.samples += 1
+        self.total += lag
+        self.max = max(lag, self.max)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dict with cumulative bucket counts."""
+        cumulative = 0
+        buckets: list[dict[str, Any]] = []
+        for upper_bound, count in zip((*self.buckets, None), self.counts, strict=True):
+            cumulative += count
+            buckets.append({"le": upper_bound, "count": cumulative})
+        return {
+            "buckets": buckets,
+            "samples": self.samples,
+            "total": self.total,
+            "max": self.max,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class StallSource:
+    """The code that was running on the event loop while it stalled."""
+
+    integration: str
+    job: str | None
+    location: str | None
+
+
+@dataclass(slots=True)
+class SlowCallbackStats:
+    """Slow callback statistics for a single integration."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last_job: str | None = None
+
+    def add(self, duration: float, job: str | None) -> None:
+        """Add a slow callback."""
+        self.count += 1
+        self.total += duration
+        self.max = max(duration, self.max)
+        self.last_job = job
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats as a dict."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "last_job": self.last_job,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class SlowCallback:
+    """A single slow callback."""
+
+    timestamp: float
+    duration: float
+    source: StallSource
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slow callback as a dict."""
+        return {
+            "timestamp": self.timestamp,
+            "duration": self.duration,
+            "integration": self.source.integration,
+            "job": self.source.job,
+            "location": self.source.location,
+        }
+
+
+def sample_stall_source(frame: FrameType, job: str | None = None) -> StallSource:
+    """Attribute the stack starting at frame to an integration and job.
+
+    The stack belongs to the event loop thread, so only the code and
+    line of its frames are read. The job is the name of the HassJob or
+    task the event loop was running when it is known, falling back to
+    the qualified name of the callback or coroutine the loop was running.
+    """
+    callee: CodeType | None = None
+    walk: FrameType | None = frame
+    while job is None and walk is not None:
+        if (code := walk.f_code) is _HANDLE_RUN_CODE:
+            if callee is not None:
+                job = callee.co_qualname
+            break
+        callee = code
+        walk = walk.f_back
+
+    try:
+        integration_frame = get_integration_frame(start_frame=frame)
+    except MissingIntegrationFrame:
+        return StallSource(UNKNOWN_INTEGRATION, job, None)
+
+    return StallSource(
+        integration_frame.integration,
+        job,
+        f"{integration_frame.relative_filename}:{integration_frame.line_number}",
+    )
+
+
+class LoopMonitor:
+    """Measure event loop lag and attribute slow callbacks.
+
+    A heartbeat is scheduled on the event loop and the lateness of each
+    beat is recorded as the loop lag. A watchdog thread samples the stack
+    of the event loop thread once per stall when a beat is overdue by more
+    than the slow callback threshold, so the stall can be attributed to
+    the integration that caused it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        slow_callback_threshold: float = SLOW_CALLBACK_THRESHOLD,
+    ) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.heartbeat_interval = heartbeat_interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.histogram = LagHistogram()
+        self.recent_lags: deque[float] = deque(maxlen=RECENT_LAG_SAMPLES)
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=MAX_SLOW_CALLBACKS)
+        self.integrations: dict[str, SlowCallbackStats] = {}
+        self._next_beat = 0.0
+        # Written by the watchdog thread, keyed by the beat it sampled
+        self._stall_sample: tuple[float, StallSource] | None = None
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the heartbeat and the watchdog thread."""
+        self.hass.track_running_job = True
+        self._async_schedule_heartbeat(time.monotonic())
+        self._thread = threading.Thread(
+            target=self._watchdog, name="profiler loop monitor", daemon=True
+        )
+        self._thread.start()
+
+    async def async_stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        self.hass.track_running_job = False
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._stop_event.set()
+        if (thread := self._thread) is not None:
+            self._thread = None
+            await self.hass.async_add_executor_job(thread.join)
+
+    @callback
+    def _async_schedule_heartbeat(self, now: float) -> None:
+        """Schedule the next heartbeat."""
+        self._next_beat = now + self.heartbeat_interval
+        self._heartbeat = self.hass.loop.call_later(
+            self.heartbeat_interval, self._async_heartbeat
+        )
+
+    @callback
+    def _async_heartbeat(self) -> None:
+        """Record how late the heartbeat ran."""
+        now = time.monotonic()
+        source: StallSource | None = None
+        if (sample := self._stall_sample) is not None:
+            self._stall_sample = None
+            if sample[0] == self._next_beat:
+                source = sample[1]
+        self.async_record_lag(max(now - self._next_beat, 0.0), source)
+        self._async_schedule_heartbeat(now)
+
+    @callback
+    def async_record_lag(self, lag: float, source: StallSource | None = None) -> None:
+        """Record a lag sample and the source of the stall if it was slow."""
+        self.histogram.add(lag)
+        self.recent_lags.append(lag)
+        if lag < self.slow_callback_threshold:
+            return
+        if source is None:
+            source = StallSource(UNKNOWN_INTEGRATION, None, None)
+        if (stats := self.integrations.get(source.integration)) is None:
+            stats = self.integrations[source.integration] = SlowCallbackStats()
+        stats.add(lag, source.job)
+        self.slow_callbacks.append(SlowCallback(time.time(), lag, source))
+        _LOGGER.debug(
+            "Event loop stalled for %.3f seconds by %s (job: %s, at %s)",
+            lag,
+            source.integration,
+            source.job,
+            source.location,
+        )
+
+    @property
+    def recent_max_lag(self) -> float:
+        """Return the largest lag over the recent samples."""
+        return max(self.recent_lags, default=0.0)
+
+    @property
+    def slowest_integration(self) -> str | None:
+        """Return the integration that stalled the loop the longest in total."""
+        if not self.integrations:
+            return None
+        return max(self.integrations.items(), key=lambda item: item[1].total)[0]
+
+    @callback
+    def async_as_dict(self) -> dict[str, Any]:
+        """Return the collected statistics."""
+        return {
+            "heartbeat_interval": self.heartbeat_interval,
+            "slow_callback_threshold": self.slow_callback_threshold,
+            "lag": self.histogram.as_dict(),
+            "recent_max_lag": self.recent_max_lag,
+            "integrations": {
+                integration: stats.as_dict()
+                for integration, stats in self.integrations.items()
+            },
+            "slow_callbacks": [
+                slow_callback.as_dict() for slow_callback in self.slow_callbacks
+            ],
+            "job_priorities": {
+                priority.name.lower(): asdict(stats)
+                for priority, stats in self.hass.async_get_job_priority_stats().items()
+            },
+        }
+
+    def _running_job_name(self) -> str | None:
+        """Return the name of the HassJob or task the event loop is running.
+
+        This runs in the watchdog thread.
+        """
+        if (hassjob := self.hass.running_job) is not None and hassjob.name:
+            return hassjob.name
+        if (task := asyncio.current_task(self.hass.loop)) is not None:
+            return task.get_name()
+        return None
+
+    def _watchdog(self) -> None:
+        """Sample the event loop thread stack when the heartbeat is overdue.
+
+        This runs in its own thread.
+        """
+        loop_thread_id = self.hass.loop_thread_id
+        interval = self.slow_callback_threshold / 2
+        while not self._stop_event.wait(interval):
+            next_beat = self._next_beat
+            if time.monotonic() - next_beat < self.slow_callback_threshold or (
+                (sample := self._stall_sample) is not None and sample[0] == next_beat
+            ):
+                continue
+            if (frame := sys._current_frames().get(loop_thread_id)) is None:  # noqa: SLF001
+                continue
+            try:
+                self._stall_sample = (
+                    next_beat,
+                    sample_stall_source(frame, self._running_job_name()),
+                )
+            except Exception:
+                _LOGGER.exception("Error sampling the event loop stack")
+            finally:
+                del frame
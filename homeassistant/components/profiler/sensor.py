@@ -0,0 +1,99 @@
+"""Sensors for the event loop monitor of the profiler integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DEFAULT_NAME, DOMAIN, LOOP_MONITOR
+from .loop_monitor import LoopMonitor
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ProfilerSensorEntityDescription(SensorEntityDescription):
+    """Describes a profiler loop monitor sensor entity."""
+
+    value_fn: Callable[[LoopMonitor], StateType]
+
+
+SENSORS: tuple[ProfilerSensorEntityDescription, ...] = (
+    ProfilerSensorEntityDescription(
+        key="loop_lag",
+        translation_key="loop_lag",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda monitor: monitor.recent_max_lag * 1000,
+    ),
+    ProfilerSensorEntityDescription(
+        key="slow_callbacks",
+        translation_key="slow_callbacks",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda monitor: sum(
+            stats.count for stats in monitor.integrations.values()
+        ),
+    ),
+    ProfilerSensorEntityDescription(
+        key="slowest_integration",
+        translation_key="slowest_integration",
+        value_fn=lambda monitor: monitor.slowest_integration,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the profiler sensors."""
+    monitor: LoopMonitor = hass.data[DOMAIN][LOOP_MONITOR]
+    async_add_entities(
+        ProfilerSensor(monitor, entry, description) for description in SENSORS
+    )
+
+
+class ProfilerSensor(SensorEntity):
+    """Sensor reporting event loop monitor statistics."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: ProfilerSensorEntityDescription
+
+    def __init__(
+        self,
+        monitor: LoopMonitor,
+        entry: ConfigEntry,
+        description: ProfilerSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._monitor = monitor
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=DEFAULT_NAME,
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._monitor)
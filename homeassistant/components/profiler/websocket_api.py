@@ -0,0 +1,33 @@
+"""The profiler websocket API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOOP_MONITOR
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the profiler websocket API."""
+    websocket_api.async_register_command(hass, ws_loop_stats)
+
+
+@websocket_api.require_admin
+@callback
+@websocket_api.websocket_command({vol.Required("type"): "profiler/loop_stats"})
+def ws_loop_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return event loop lag and slow callback statistics."""
+    if (monitor := hass.data.get(DOMAIN, {}).get(LOOP_MONITOR)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Profiler is not loaded"
+        )
+        return
+    connection.send_result(msg["id"], monitor.async_as_dict())
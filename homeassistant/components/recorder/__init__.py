@@ -8,6 +8,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.const import (
+    CONF_ENTITIES,
     CONF_EXCLUDE,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,  # noqa: F401
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,  # noqa: F401
@@ -39,12 +40,14 @@ from . import (
 from .const import (  # noqa: F401
     CONF_DB_INTEGRITY_CHECK,
     DOMAIN,
+    INTEGRATION_PLATFORM_ASYNC_SETUP,
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
 from .core import Recorder
+from .retention import RecorderRetention, RetentionPolicy
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -68,6 +71,16 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_MIGRATION_ROWS_PER_SECOND = "migration_rows_per_second"
+CONF_COMPRESS_ATTRIBUTES = "compress_attributes"
+CONF_CONTINUOUS_PURGE = "continuous_purge"
+CONF_QUERY_CACHE_SIZE = "query_cache_size"
+CONF_ARCHIVE_HISTORY = "archive_history"
+CONF_RETENTION = "retention"
+CONF_SAMPLE_EVERY = "sample_every"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_KEEP_LAST = "keep_last"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -78,6 +91,28 @@ FILTER_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {vol.Optional(CONF_EXCLUDE, default=EXCLUDE_SCHEMA({})): EXCLUDE_SCHEMA}
 )
 
+RETENTION_POLICY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_SAMPLE_EVERY): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_MIN_INTERVAL): cv.positive_time_period,
+            vol.Optional(CONF_KEEP_LAST): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        }
+    ),
+    cv.has_at_least_one_key(CONF_SAMPLE_EVERY, CONF_MIN_INTERVAL, CONF_KEEP_LAST),
+)
+
+RETENTION_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ENTITIES, default=dict): {
+            cv.entity_id: RETENTION_POLICY_SCHEMA
+        },
+        vol.Optional(CONF_EVENT_TYPES, default=dict): {
+            cv.string: RETENTION_POLICY_SCHEMA
+        },
+    }
+)
+
 
 ALLOW_IN_MEMORY_DB = False
 
@@ -120,6 +155,15 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_MIGRATION_ROWS_PER_SECOND): cv.positive_int,
+                    vol.Optional(CONF_COMPRESS_ATTRIBUTES, default=False): cv.boolean,
+                    vol.Optional(CONF_CONTINUOUS_PURGE, default=False): cv.boolean,
+                    vol.Optional(CONF_QUERY_CACHE_SIZE, default=0): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                    vol.Optional(CONF_ARCHIVE_HISTORY, default=False): cv.boolean,
+                    vol.Optional(CONF_RETENTION): RETENTION_SCHEMA,
                 }
             ),
         )
@@ -159,6 +203,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     if EVENT_STATE_CHANGED in exclude_event_types:
         _LOGGER.error("State change events cannot be excluded, use a filter instead")
         exclude_event_types.remove(EVENT_STATE_CHANGED)
+    retention = None
+    if retention_conf := conf.get(CONF_RETENTION):
+        retention = _retention_from_config(retention_conf)
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass,
         auto_purge=auto_purge,
@@ -170,6 +217,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        bulk_insert=conf[CONF_BULK_INSERT],
+        migration_rows_per_second=conf.get(CONF_MIGRATION_ROWS_PER_SECOND),
+        compress_attributes=conf[CONF_COMPRESS_ATTRIBUTES],
+        continuous_purge=conf[CONF_CONTINUOUS_PURGE],
+        query_cache_max_bytes=conf[CONF_QUERY_CACHE_SIZE] * 1024**2,
+        archive_history=conf[CONF_ARCHIVE_HISTORY],
+        retention=retention,
     )
     get_instance.cache_clear()
     instance.async_initialize()
@@ -184,6 +238,31 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return await instance.async_db_ready
 
 
+def _retention_from_config(conf: ConfigType) -> RecorderRetention:
+    """Create the retention policies from the configuration."""
+    policies = {
+        key: {
+            name: RetentionPolicy(
+                sample_every=policy_conf.get(CONF_SAMPLE_EVERY, 1),
+                min_interval=(
+                    policy_conf[CONF_MIN_INTERVAL].total_seconds()
+                    if CONF_MIN_INTERVAL in policy_conf
+                    else 0
+                ),
+                keep_last=policy_conf.get(CONF_KEEP_LAST),
+            )
+            for name, policy_conf in conf[key].items()
+        }
+        for key in (CONF_ENTITIES, CONF_EVENT_TYPES)
+    }
+    if policies[CONF_EVENT_TYPES].pop(EVENT_STATE_CHANGED, None):
+        _LOGGER.error(
+            "State change events cannot have a retention policy, "
+            "use a policy for the entities instead"
+        )
+    return RecorderRetention(policies[CONF_ENTITIES], policies[CONF_EVENT_TYPES])
+
+
 async def _async_setup_integration_platform(
     hass: HomeAssistant, instance: Recorder
 ) -> None:
@@ -194,6 +273,10 @@ async def _async_setup_integration_platform(
         hass: HomeAssistant, domain: str, platform: Any
     ) -> None:
         """Process a recorder platform."""
+        # Platforms which need to act on the event loop, e.g. to listen for
+        # events, are set up when they are processed.
+        if hasattr(platform, INTEGRATION_PLATFORM_ASYNC_SETUP):
+            platform.async_setup(hass)
         # If the platform has a compile_statistics method, we need to
         # add it to the recorder queue to be processed.
         if any(hasattr(platform, _attr) for _attr in INTEGRATION_PLATFORM_METHODS):
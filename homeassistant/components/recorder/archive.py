@@ -0,0 +1,553 @@
+"""Columnar archive of purged states and short term statistics."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+import gzip
+import logging
+import os
+import threading
+from typing import Any, Final, NamedTuple, cast
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .query_cache import HistoryRow
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_STATES: Final = "states"
+ARCHIVE_STATISTICS_SHORT_TERM: Final = "statistics_short_term"
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+# The columns are very repetitive, the default zlib level already
+# shrinks them a lot while keeping the purge fast
+SEGMENT_COMPRESS_LEVEL = 6
+
+type ArchivedState = tuple[str, str | None, float, float | None, str | None]
+
+
+class ArchivedStatisticsRow(NamedTuple):
+    """An archived statistics row in the layout of the statistics queries."""
+
+    metadata_id: int
+    start_ts: float
+    mean: float | None = None
+    min: float | None = None
+    max: float | None = None
+    last_reset_ts: float | None = None
+    state: float | None = None
+    sum: float | None = None
+
+
+type ArchivedStatistics = tuple[
+    str,
+    float,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+    float | None,
+]
+
+_STATISTICS_COLUMNS = (
+    "start_ts",
+    "mean",
+    "min",
+    "max",
+    "last_reset_ts",
+    "state",
+    "sum",
+)
+
+
+def _month(timestamp: float) -> str:
+    """Return the month of a timestamp as used in segment file names."""
+    date = datetime.fromtimestamp(timestamp, UTC)
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def _month_start_ts(month: str) -> float:
+    """Return the timestamp the month of a segment starts at."""
+    year, month_number = month.split("-")
+    return datetime(int(year), int(month_number), 1, tzinfo=UTC).timestamp()
+
+
+def _dictionary_encode(values: Iterable[Any]) -> tuple[list[Any], list[int]]:
+    """Return the distinct values and the index of each value in them."""
+    index: dict[Any, int] = {}
+    indices = [index.setdefault(value, len(index)) for value in values]
+    return list(index), indices
+
+
+class HistoryArchive:
+    """Compressed columnar segment files of rows removed by the purge.
+
+    Each table has a directory with a segment file per month. A segment
+    is a gzip file of JSON lines, every line holds the columns of one batch
+    of purged rows. The entity ids, statistic ids and attributes of a batch
+    are dictionary encoded. Batches are appended as new gzip members, a
+    segment is only rewritten when rows of an entity or statistic are
+    removed or changed in the database.
+
+    A batch may be written again if the purge is retried after a failed
+    commit, the readers skip the duplicate rows.
+
+    Writing is done by the recorder thread, reading is thread-safe.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the archive."""
+        self.path = path
+        self._lock = threading.Lock()
+        # Timestamp of the newest archived row of each table, loaded
+        # from the newest segment the first time it is needed
+        self._newest_ts: dict[str, float | None] = {}
+
+    def write_states(self, states: Iterable[ArchivedState]) -> None:
+        """Append purged states to the archive.
+
+        States are tuples of the entity_id, state, last_updated_ts,
+        last_changed_ts and shared attributes.
+        """
+        by_month: dict[str, list[ArchivedState]] = {}
+        for state in states:
+            by_month.setdefault(_month(state[2]), []).append(state)
+        for month, month_states in by_month.items():
+            self._append(
+                ARCHIVE_STATES,
+                month,
+                _encode_states(month_states),
+                max(state[2] for state in month_states),
+            )
+
+    def write_statistics(self, statistics: Iterable[ArchivedStatistics]) -> None:
+        """Append purged short term statistics to the archive.
+
+        Statistics are tuples of the statistic_id, start_ts, mean, min,
+        max, last_reset_ts, state and sum.
+        """
+        by_month: dict[str, list[ArchivedStatistics]] = {}
+        for row in statistics:
+            by_month.setdefault(_month(row[1]), []).append(row)
+        for month, month_rows in by_month.items():
+            self._append(
+                ARCHIVE_STATISTICS_SHORT_TERM,
+                month,
+                _encode_statistics(month_rows),
+                max(row[1] for row in month_rows),
+            )
+
+    def purge_states(
+        self, entity_filter: Callable[[str], bool], purge_before_ts: float
+    ) -> None:
+        """Remove the archived states of entities older than purge_before_ts."""
+
+        def _purge(states: list[ArchivedState]) -> list[ArchivedState] | None:
+            kept = [
+                state
+                for state in states
+                if state[2] >= purge_before_ts or not entity_filter(state[0])
+            ]
+            return kept if len(kept) != len(states) else None
+
+        self._rewrite(ARCHIVE_STATES, _purge)
+
+    def rename_states(self, entity_id: str, new_entity_id: str) -> None:
+        """Move the archived states of an entity to its new entity_id."""
+        self._rewrite(ARCHIVE_STATES, _rename_rows(entity_id, new_entity_id))
+
+    def clear_statistics(self, statistic_ids: Iterable[str]) -> None:
+        """Remove the archived short term statistics of statistic_ids."""
+        cleared = set(statistic_ids)
+
+        def _clear(rows: list[ArchivedStatistics]) -> list[ArchivedStatistics] | None:
+            kept = [row for row in rows if row[0] not in cleared]
+            return kept if len(kept) != len(rows) else None
+
+        self._rewrite(ARCHIVE_STATISTICS_SHORT_TERM, _clear)
+
+    def rename_statistics(self, statistic_id: str, new_statistic_id: str) -> None:
+        """Move the archived short term statistics to a new statistic_id."""
+        self._rewrite(
+            ARCHIVE_STATISTICS_SHORT_TERM, _rename_rows(statistic_id, new_statistic_id)
+        )
+
+    def convert_statistics(
+        self, statistic_id: str, convert: Callable[[float | None], float | None]
+    ) -> None:
+        """Convert the archived short term statistics of a statistic to a new unit."""
+
+        def _convert(
+            rows: list[ArchivedStatistics],
+        ) -> list[ArchivedStatistics] | None:
+            if not any(row[0] == statistic_id for row in rows):
+                return None
+            return [
+                (
+                    row[0],
+                    row[1],
+                    convert(row[2]),
+                    convert(row[3]),
+                    convert(row[4]),
+                    row[5],
+                    convert(row[6]),
+                    convert(row[7]),
+                )
+                if row[0] == statistic_id
+                else row
+                for row in rows
+            ]
+
+        self._rewrite(ARCHIVE_STATISTICS_SHORT_TERM, _convert)
+
+    def adjust_statistics_sum(
+        self, statistic_id: str, start_ts: float, adjustment: float
+    ) -> None:
+        """Adjust the sum of archived short term statistics from start_ts on."""
+
+        def _adjust(rows: list[ArchivedStatistics]) -> list[ArchivedStatistics] | None:
+            if not any(
+                row[0] == statistic_id and row[1] >= start_ts and row[7] is not None
+                for row in rows
+            ):
+                return None
+            return [
+                (*row[:7], row[7] + adjustment)
+                if row[0] == statistic_id and row[1] >= start_ts and row[7] is not None
+                else row
+                for row in rows
+            ]
+
+        self._rewrite(ARCHIVE_STATISTICS_SHORT_TERM, _adjust)
+
+    def reaches(self, table: str, start_ts: float) -> bool:
+        """Return if rows of a table after start_ts may be archived."""
+        if table not in self._newest_ts:
+            self._load_newest_ts(table)
+        return (newest_ts := self._newest_ts[table]) is not None and (
+            start_ts <= newest_ts
+        )
+
+    def read_states(
+        self,
+        entity_ids: Iterable[str],
+        start_ts: float,
+        end_ts: float | None,
+        include_start_state: bool,
+    ) -> dict[str, tuple[ArchivedState | None, list[ArchivedState]]]:
+        """Return the archived states of entities between start_ts and end_ts.
+
+        The last archived state of each entity before start_ts is returned
+        with them if include_start_state is set. States are sorted by
+        last_updated_ts.
+        """
+        result: dict[str, tuple[ArchivedState | None, list[ArchivedState]]] = {}
+        for entity_id in entity_ids:
+            start_state, states = self.iter_states(
+                entity_id, start_ts, end_ts, include_start_state
+            )
+            result[entity_id] = (start_state, list(states))
+        return result
+
+    def iter_states(
+        self,
+        entity_id: str,
+        start_ts: float,
+        end_ts: float | None,
+        include_start_state: bool,
+    ) -> tuple[ArchivedState | None, Iterator[ArchivedState]]:
+        """Return the archived states of an entity between start_ts and end_ts.
+
+        The states are sorted by last_updated_ts and decoded one month at a
+        time while they are iterated, so only the states of the entity in
+        one month are held in memory. The last archived state before
+        start_ts is returned with them if include_start_state is set.
+        """
+        wanted = {entity_id}
+        months = self._months(ARCHIVE_STATES)
+        start_month = _month(start_ts)
+        start_month_states: list[ArchivedState] | None = None
+        start_state: ArchivedState | None = None
+        if include_start_state:
+            # Look back for the start state from the month of start_ts
+            for month in reversed(months):
+                if month > start_month:
+                    continue
+                month_states = self._read_month_states(month, wanted)
+                if month == start_month:
+                    start_month_states = month_states
+                if before := [state for state in month_states if state[2] <= start_ts]:
+                    start_state = before[-1]
+                    break
+        return start_state, self._iter_states(
+            months, wanted, start_ts, end_ts, start_month_states
+        )
+
+    def read_statistics(
+        self, statistic_ids: Iterable[str], start_ts: float, end_ts: float | None
+    ) -> dict[str, list[ArchivedStatistics]]:
+        """Return the archived statistics starting between start_ts and end_ts.
+
+        Statistics are sorted by start_ts.
+        """
+        wanted = set(statistic_ids)
+        found: dict[str, dict[float, ArchivedStatistics]] = {
+            statistic_id: {} for statistic_id in wanted
+        }
+        start_month = _month(start_ts)
+        end_month = _month(end_ts) if end_ts is not None else None
+        for month in self._months(ARCHIVE_STATISTICS_SHORT_TERM):
+            if month < start_month or (end_month is not None and month > end_month):
+                continue
+            for batch in self._read_batches(ARCHIVE_STATISTICS_SHORT_TERM, month):
+                for row in _decode_statistics(batch, wanted):
+                    row_start_ts = row[1]
+                    if row_start_ts < start_ts or (
+                        end_ts is not None and row_start_ts >= end_ts
+                    ):
+                        continue
+                    found[row[0]][row_start_ts] = row
+        return {
+            statistic_id: [rows[row_start_ts] for row_start_ts in sorted(rows)]
+            for statistic_id, rows in found.items()
+        }
+
+    def _iter_states(
+        self,
+        months: list[str],
+        wanted: set[str],
+        start_ts: float,
+        end_ts: float | None,
+        start_month_states: list[ArchivedState] | None,
+    ) -> Iterator[ArchivedState]:
+        """Yield the archived states of the wanted entities after start_ts."""
+        start_month = _month(start_ts)
+        end_month = _month(end_ts) if end_ts is not None else None
+        for month in months:
+            if month < start_month:
+                continue
+            if end_month is not None and month > end_month:
+                return
+            if month != start_month or start_month_states is None:
+                month_states = self._read_month_states(month, wanted)
+            else:
+                month_states = start_month_states
+            for state in month_states:
+                if state[2] <= start_ts:
+                    continue
+                if end_ts is not None and state[2] >= end_ts:
+                    return
+                yield state
+
+    def _read_month_states(self, month: str, wanted: set[str]) -> list[ArchivedState]:
+        """Return the archived states of the wanted entities in a month.
+
+        A state written again after a failed commit is only returned once.
+        """
+        states: dict[tuple[str, float], ArchivedState] = {}
+        for batch in self._read_batches(ARCHIVE_STATES, month):
+            for state in _decode_states(batch, wanted):
+                states[state[0], state[2]] = state
+        return sorted(states.values(), key=_archived_state_ts)
+
+    def _segment_path(self, table: str, month: str) -> str:
+        """Return the path of the segment of a table for a month."""
+        return os.path.join(self.path, table, f"{month}{SEGMENT_SUFFIX}")
+
+    def _months(self, table: str) -> list[str]:
+        """Return the sorted months which have a segment for a table."""
+        try:
+            names = os.listdir(os.path.join(self.path, table))
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name.removesuffix(SEGMENT_SUFFIX)
+            for name in names
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def _append(
+        self, table: str, month: str, batch: dict[str, list[Any]], newest_ts: float
+    ) -> None:
+        """Append a batch of columns to the segment of a table for a month."""
+        payload = json_bytes(batch) + b"\n"
+        with self._lock:
+            os.makedirs(os.path.join(self.path, table), exist_ok=True)
+            with gzip.open(
+                self._segment_path(table, month),
+                "ab",
+                compresslevel=SEGMENT_COMPRESS_LEVEL,
+            ) as segment:
+                segment.write(payload)
+            if table in self._newest_ts:
+                current = self._newest_ts[table]
+                self._newest_ts[table] = (
+                    newest_ts if current is None else max(current, newest_ts)
+                )
+
+    def _rewrite(
+        self, table: str, rewrite_rows: Callable[[list[Any]], list[Any] | None]
+    ) -> None:
+        """Rewrite the segments of a table which have rows changed by rewrite_rows.
+
+        rewrite_rows is called with the rows of each batch and returns the
+        changed rows, or None if the batch is unchanged. Segments are
+        replaced atomically so they can be read at the same time.
+        """
+        # The rows of both tables are rewritten as lists of tuples
+        decode: Callable[[dict[str, Any]], Iterator[Any]]
+        encode: Callable[[list[Any]], dict[str, list[Any]]]
+        if table == ARCHIVE_STATES:
+            decode, encode = _decode_states, _encode_states
+        else:
+            decode, encode = _decode_statistics, _encode_statistics
+        with self._lock:
+            for month in self._months(table):
+                changed = False
+                batches: list[dict[str, list[Any]]] = []
+                for batch in self._read_batches(table, month):
+                    if (rows := rewrite_rows(list(decode(batch)))) is None:
+                        batches.append(batch)
+                        continue
+                    changed = True
+                    if rows:
+                        batches.append(encode(rows))
+                if not changed:
+                    continue
+                path = self._segment_path(table, month)
+                if not batches:
+                    os.unlink(path)
+                    continue
+                with gzip.open(
+                    f"{path}.tmp", "wb", compresslevel=SEGMENT_COMPRESS_LEVEL
+                ) as segment:
+                    for batch in batches:
+                        segment.write(json_bytes(batch) + b"\n")
+                os.replace(f"{path}.tmp", path)
+            # The newest row may have been removed
+            self._newest_ts.pop(table, None)
+
+    def _read_batches(self, table: str, month: str) -> Iterator[dict[str, Any]]:
+        """Yield the batches of the segment of a table for a month.
+
+        A segment cut short by a crash while it was written is read up
+        to the last complete batch.
+        """
+        path = self._segment_path(table, month)
+        try:
+            with gzip.open(path, "rb") as segment:
+                for line in segment:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield cast(dict[str, Any], json_loads(line))
+        except FileNotFoundError:
+            return
+        except (EOFError, OSError, ValueError) as err:
+            _LOGGER.warning("Archive segment %s is damaged: %s", path, err)
+
+    def _load_newest_ts(self, table: str) -> None:
+        """Load the timestamp of the newest archived row of a table."""
+        newest_ts: float | None = None
+        if months := self._months(table):
+            column = "last_updated_ts" if table == ARCHIVE_STATES else "start_ts"
+            for batch in self._read_batches(table, months[-1]):
+                if batch[column]:
+                    batch_newest_ts = max(batch[column])
+                    if newest_ts is None or batch_newest_ts > newest_ts:
+                        newest_ts = batch_newest_ts
+            if newest_ts is None:
+                # The newest segment has no complete batch
+                newest_ts = _month_start_ts(months[-1])
+        with self._lock:
+            if table not in self._newest_ts:
+                self._newest_ts[table] = newest_ts
+
+
+def _encode_states(states: list[ArchivedState]) -> dict[str, list[Any]]:
+    """Return the columns of a batch of states."""
+    entity_ids, entity_idx = _dictionary_encode(state[0] for state in states)
+    attributes, attributes_idx = _dictionary_encode(state[4] for state in states)
+    return {
+        "entity_ids": entity_ids,
+        "entity_idx": entity_idx,
+        "state": [state[1] for state in states],
+        "last_updated_ts": [state[2] for state in states],
+        "last_changed_ts": [state[3] for state in states],
+        "attributes": attributes,
+        "attributes_idx": attributes_idx,
+    }
+
+
+def _decode_states(
+    batch: dict[str, Any], wanted: set[str] | None = None
+) -> Iterator[ArchivedState]:
+    """Yield the states of a batch, only those of the wanted entities if set."""
+    entity_ids: list[str] = batch["entity_ids"]
+    attributes: list[str | None] = batch["attributes"]
+    states = batch["state"]
+    last_updated = batch["last_updated_ts"]
+    last_changed = batch["last_changed_ts"]
+    attributes_idx = batch["attributes_idx"]
+    for row_idx, idx in enumerate(batch["entity_idx"]):
+        if wanted is None or entity_ids[idx] in wanted:
+            yield (
+                entity_ids[idx],
+                states[row_idx],
+                last_updated[row_idx],
+                last_changed[row_idx],
+                attributes[attributes_idx[row_idx]],
+            )
+
+
+def _encode_statistics(rows: list[ArchivedStatistics]) -> dict[str, list[Any]]:
+    """Return the columns of a batch of short term statistics."""
+    statistic_ids, statistic_idx = _dictionary_encode(row[0] for row in rows)
+    batch: dict[str, list[Any]] = {
+        "statistic_ids": statistic_ids,
+        "statistic_idx": statistic_idx,
+    }
+    for column_idx, column in enumerate(_STATISTICS_COLUMNS, 1):
+        batch[column] = [row[column_idx] for row in rows]
+    return batch
+
+
+def _decode_statistics(
+    batch: dict[str, Any], wanted: set[str] | None = None
+) -> Iterator[ArchivedStatistics]:
+    """Yield the short term statistics of a batch, only the wanted ones if set."""
+    statistic_ids: list[str] = batch["statistic_ids"]
+    columns = [batch[column] for column in _STATISTICS_COLUMNS]
+    for row_idx, idx in enumerate(batch["statistic_idx"]):
+        if wanted is None or statistic_ids[idx] in wanted:
+            yield cast(
+                ArchivedStatistics,
+                (statistic_ids[idx], *(column[row_idx] for column in columns)),
+            )
+
+
+def _rename_rows(old_id: str, new_id: str) -> Callable[[list[Any]], list[Any] | None]:
+    """Return a rewrite moving archived rows from old_id to new_id."""
+
+    def _rename(rows: list[Any]) -> list[Any] | None:
+        if not any(row[0] == old_id for row in rows):
+            return None
+        return [(new_id, *row[1:]) if row[0] == old_id else row for row in rows]
+
+    return _rename
+
+
+def _archived_state_ts(state: ArchivedState) -> float:
+    """Return the last_updated_ts of an archived state."""
+    return state[2]
+
+
+def archived_state_to_row(
+    metadata_id: int, state: ArchivedState, no_attributes: bool
+) -> HistoryRow:
+    """Return an archived state in the layout of the history queries."""
+    return HistoryRow(
+        metadata_id, state[1], state[2], state[3], None if no_attributes else state[4]
+    )
@@ -32,6 +32,9 @@ def ws_info(
         backlog = instance.backlog
         migration_in_progress = instance.migration_in_progress
         migration_is_live = instance.migration_is_live
+        migration_progress = None
+        if progress := instance.migration_progress:
+            migration_progress = progress.as_dict()
         recording = instance.recording
         # We avoid calling is_alive() as it can block waiting
         # for the thread state lock which will block the event loop.
@@ -41,6 +44,7 @@ def ws_info(
         backlog = None
         migration_in_progress = False
         migration_is_live = False
+        migration_progress = None
         recording = False
         is_running = False
         max_backlog = None
@@ -50,6 +54,7 @@ def ws_info(
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
+        "migration_progress": migration_progress,
         "recording": recording,
         "thread_running": is_running,
     }
@@ -0,0 +1,185 @@
+"""Insert states in bulk without going through the ORM unit of work."""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, EventStateChangedData
+
+from .db_schema import StateAttributes, States, StatesMeta
+
+_STATES_TABLE = cast(Table, States.__table__)
+
+INSERT_STATES_STMT = insert(_STATES_TABLE).returning(
+    _STATES_TABLE.c.state_id, sort_by_parameter_order=True
+)
+
+
+class PendingState:
+    """A row for the states table that has not been inserted yet.
+
+    It stands in for a States object in the StatesManager. The attribute
+    names match the States columns and relationships so that the ids can
+    be resolved the same way.
+    """
+
+    __slots__ = (
+        "attributes_id",
+        "context_id_bin",
+        "context_parent_id_bin",
+        "context_user_id_bin",
+        "entity_id",
+        "last_changed_ts",
+        "last_reported_ts",
+        "last_updated_ts",
+        "metadata_id",
+        "old_state",
+        "old_state_id",
+        "origin_idx",
+        "state",
+        "state_attributes",
+        "state_id",
+        "states_meta_rel",
+    )
+
+    def __init__(
+        self,
+        entity_id: str | None,
+        state: str | None,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+        last_reported_ts: float | None,
+        context_id_bin: bytes | None,
+        context_user_id_bin: bytes | None,
+        context_parent_id_bin: bytes | None,
+        origin_idx: int,
+    ) -> None:
+        """Initialize the pending state."""
+        self.entity_id = entity_id
+        self.state = state
+        self.last_updated_ts = last_updated_ts
+        self.last_changed_ts = last_changed_ts
+        self.last_reported_ts = last_reported_ts
+        self.context_id_bin = context_id_bin
+        self.context_user_id_bin = context_user_id_bin
+        self.context_parent_id_bin = context_parent_id_bin
+        self.origin_idx = origin_idx
+        self.state_id: int | None = None
+        self.old_state: PendingState | None = None
+        self.old_state_id: int | None = None
+        self.state_attributes: StateAttributes | None = None
+        self.attributes_id: int | None = None
+        self.states_meta_rel: StatesMeta | None = None
+        self.metadata_id: int | None = None
+
+    @staticmethod
+    def from_event(event: Event[EventStateChangedData]) -> PendingState:
+        """Create a pending state from a state_changed event."""
+        return PendingState(*States.columns_from_event(event))
+
+    def as_params(self) -> dict[str, Any]:
+        """Return the insert parameters for the row.
+
+        The ids of related rows must already be known.
+        """
+        old_state_id = self.old_state_id
+        if (old_state := self.old_state) is not None:
+            old_state_id = old_state.state_id
+        attributes_id = self.attributes_id
+        if (state_attributes := self.state_attributes) is not None:
+            attributes_id = state_attributes.attributes_id
+        metadata_id = self.metadata_id
+        if (states_meta := self.states_meta_rel) is not None:
+            metadata_id = states_meta.metadata_id
+        return {
+            "entity_id": self.entity_id,
+            "state": self.state,
+            "last_updated_ts": self.last_updated_ts,
+            "last_changed_ts": self.last_changed_ts,
+            "last_reported_ts": self.last_reported_ts,
+            "old_state_id": old_state_id,
+            "attributes_id": attributes_id,
+            "metadata_id": metadata_id,
+            "context_id_bin": self.context_id_bin,
+            "context_user_id_bin": self.context_user_id_bin,
+            "context_parent_id_bin": self.context_parent_id_bin,
+            "origin_idx": self.origin_idx,
+        }
+
+
+class BulkStatesWriter:
+    """Write pending states with executemany instead of the ORM unit of work.
+
+    New StatesMeta and StateAttributes rows are rare since they are shared
+    between states, so they are still added to the session and flushed
+    before the states are inserted to resolve their ids.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk states writer."""
+        self._pending: list[PendingState] = []
+
+    def add(self, pending_state: PendingState) -> None:
+        """Add a pending state to be written.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append(pending_state)
+
+    def write(self, session: Session) -> None:
+        """Insert the pending states and set their state_id.
+
+        States that replace a state inserted in the same batch need its
+        state_id for old_state_id, so the states are inserted in rounds
+        with each round holding at most one state per entity.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (pending_states := self._pending):
+            return
+        session.flush()
+        written = {id(pending_state) for pending_state in pending_states}
+        for pending_state in pending_states:
+            pending_state.state_id = None
+            # A state that was never added, for example because its
+            # attributes could not be serialized, can not be linked to
+            old_state = pending_state.old_state
+            if old_state is not None and id(old_state) not in written:
+                pending_state.old_state = None
+        while pending_states:
+            ready: list[PendingState] = []
+            waiting: list[PendingState] = []
+            for pending_state in pending_states:
+                old_state = pending_state.old_state
+                if old_state is not None and old_state.state_id is None:
+                    waiting.append(pending_state)
+                else:
+                    ready.append(pending_state)
+            result = session.execute(
+                INSERT_STATES_STMT,
+                [pending_state.as_params() for pending_state in ready],
+            )
+            for pending_state, state_id in zip(ready, result.scalars(), strict=True):
+                pending_state.state_id = state_id
+            pending_states = waiting
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the written states.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
@@ -22,6 +22,7 @@ from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -48,9 +49,13 @@ from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
+from homeassistant.util.executor import InterruptibleThreadPoolExecutor
 
 from . import migration, statistics
+from .archive import HistoryArchive
+from .bulk_insert import BulkStatesWriter, PendingState
 from .const import (
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     DEFAULT_MAX_BIND_VARS,
     DOMAIN,
@@ -62,6 +67,7 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    NUMERIC_STATES_SCHEMA_VERSION,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
@@ -80,12 +86,18 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgePacer
+from .query_cache import QueryCache
+from .read_pool import READ_JOB_TIMEOUT, READ_POOL_SIZE, ReadJob, ReadPool
+from .retention import RecorderRetention
+from .spool import EventSpool
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
 from .table_managers.states_meta import StatesMetaManager
+from .table_managers.states_numeric import StatesNumericManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
     AdjustLRUSizeTask,
@@ -94,12 +106,17 @@ from .tasks import (
     ClearStatisticsTask,
     CommitTask,
     CompileMissingStatisticsTask,
+    ContinuousPurgeTask,
     DatabaseLockTask,
     ImportStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
+    PurgeRingBuffersTask,
     PurgeTask,
+    RebuildStatisticsRollupsTask,
     RecorderTask,
+    RecordTrailingChangesTask,
+    ReplaySpoolTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -128,18 +145,34 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Weight of the last commit in the average commit duration
+COMMIT_DURATION_SMOOTHING = 0.2
+
 SHUTDOWN_TASK = object()
 
 COMMIT_TASK = CommitTask()
 KEEP_ALIVE_TASK = KeepAliveTask()
 WAIT_TASK = WaitTask()
 ADJUST_LRU_SIZE_TASK = AdjustLRUSizeTask()
+REPLAY_SPOOL_TASK = ReplaySpoolTask()
+CONTINUOUS_PURGE_TASK = ContinuousPurgeTask()
+PURGE_RING_BUFFERS_TASK = PurgeRingBuffersTask()
+RECORD_TRAILING_CHANGES_TASK = RecordTrailingChangesTask()
 
 DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
 QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
 
+# Once the backlog is too large, new events are written to the
+# spool in batches of SPOOL_FLUSH_SIZE and recorded from it in
+# batches of SPOOL_REPLAY_SIZE when the recorder catches up
+SPOOL_FLUSH_SIZE = 1000
+SPOOL_REPLAY_SIZE = 1000
+SPOOL_FILE_SUFFIX = ".spool"
+DEFAULT_SPOOL_FILE = "recorder.spool"
+DEFAULT_ARCHIVE_DIR = "recorder_archive"
+
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
@@ -164,6 +197,13 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        bulk_insert: bool,
+        migration_rows_per_second: int | None,
+        compress_attributes: bool,
+        continuous_purge: bool,
+        query_cache_max_bytes: int,
+        archive_history: bool,
+        retention: RecorderRetention | None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -181,6 +221,24 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.bulk_insert = bulk_insert
+        # Limits how fast data migrations write to the database, None is unlimited
+        self.migration_rows_per_second = migration_rows_per_second
+        self.compress_attributes = compress_attributes
+        self.continuous_purge = continuous_purge
+        self.purge_pacer = PurgePacer()
+        # Average seconds a commit of the event session takes
+        self.commit_duration = 0.0
+        self.query_cache = QueryCache(query_cache_max_bytes)
+        # States of the event session to add to the query cache once committed
+        self._query_cache_states: list[
+            tuple[str, str | None, float, float | None, str | None]
+        ] = []
+        # Purged states and short term statistics are moved to the
+        # archive instead of being deleted when it is set
+        self.archive: HistoryArchive | None = None
+        if archive_history:
+            self.archive = HistoryArchive(hass.config.path(DEFAULT_ARCHIVE_DIR))
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -194,11 +252,23 @@ class Recorder(threading.Thread):
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
         self._psutil: ha_psutil.PsutilWrapper | None = None
 
+        # An in memory database has nowhere to spool events to
+        self._spool: EventSpool | None = None
+        if self._using_file_sqlite:
+            self._spool = EventSpool(f"{dburl_to_path(uri)}{SPOOL_FILE_SUFFIX}")
+        elif not uri.startswith(SQLITE_URL_PREFIX):
+            self._spool = EventSpool(hass.config.path(DEFAULT_SPOOL_FILE))
+        # Events waiting to be written to the spool, None when not spooling
+        self._spool_buffer: list[Event] | None = None
+        self._spool_flush: asyncio.Future[None] | None = None
+
         # The entity_filter is exposed on the recorder instance so that
         # it can be used to see if an entity is being recorded and is called
         # by is_entity_recorder and the sensor recorder.
         self.entity_filter = entity_filter
         self.exclude_event_types = exclude_event_types
+        # Sampling and ring buffer policies of entities and event types
+        self.retention = retention
 
         self.schema_version = 0
         self._commits_without_expire = 0
@@ -206,20 +276,31 @@ class Recorder(threading.Thread):
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
+        self.states_numeric_manager = StatesNumericManager()
         self.event_data_manager = EventDataManager(self)
         self.event_type_manager = EventTypeManager(self)
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        # Set when the states are inserted in bulk instead of through the ORM
+        self._bulk_states_writer: BulkStatesWriter | None = None
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.migration_in_progress = False
         self.migration_is_live = False
+        # Set while a data migration is running
+        self.migration_progress: migration.MigrationProgress | None = None
         self.use_legacy_events_index = False
+        # Set when the daily and monthly statistics rollups are complete
+        self.statistics_rollups_active = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        # Set when the database can be read without going through the
+        # connections of the recorder thread and db executor
+        self._read_pool: ReadPool | None = None
+        self._read_executor: InterruptibleThreadPoolExecutor | None = None
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -262,10 +343,32 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for reading.
+
+        Jobs added with async_add_read_job get a session on the read pool,
+        everything else gets the same session as get_session.
+        """
+        if (read_pool := self._read_pool) and (session := read_pool.get_session()):
+            return session
+        return self.get_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_task_later(self, task: RecorderTask, delay: float) -> None:
+        """Add a task to the recorder queue after delay seconds."""
+        self.hass.loop.call_soon_threadsafe(
+            self.hass.loop.call_later, delay, self.queue_task, task
+        )
+
+    def queue_statistics_rollups_rebuild(self) -> None:
+        """Rebuild the statistics rollups, they are not used until rebuilt."""
+        if self.statistics_rollups_active:
+            self.statistics_rollups_active = False
+            self.queue_task(RebuildStatisticsRollupsTask())
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -279,6 +382,9 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        self._read_executor = InterruptibleThreadPoolExecutor(
+            thread_name_prefix=DB_READER_PREFIX, max_workers=READ_POOL_SIZE
+        )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
@@ -288,9 +394,21 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
+        self._async_listen_events(self._queue.put_nowait)
+        self._queue_watcher = async_track_time_interval(
+            self.hass,
+            self._async_check_queue,
+            QUEUE_CHECK_INTERVAL,
+            name="Recorder queue watcher",
+        )
+
+    @callback
+    def _async_listen_events(self, queue_put: Callable[[Event], None]) -> None:
+        """Listen for new events and pass the ones to record to queue_put."""
+        if self._event_listener:
+            self._event_listener()
         entity_filter = self.entity_filter
         exclude_event_types = self.exclude_event_types
-        queue_put = self._queue.put_nowait
 
         @callback
         def _event_listener(event: Event) -> None:
@@ -323,12 +441,6 @@ class Recorder(threading.Thread):
             MATCH_ALL,
             _event_listener,
         )
-        self._queue_watcher = async_track_time_interval(
-            self.hass,
-            self._async_check_queue,
-            QUEUE_CHECK_INTERVAL,
-            name="Recorder queue watcher",
-        )
 
     @callback
     def _async_keep_alive(self, now: datetime) -> None:
@@ -353,6 +465,25 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    async def async_add_read_job[_T](self, target: Callable[..., _T], *args: Any) -> _T:
+        """Add a job that only reads from the database from within the event loop.
+
+        When there is a read pool the job runs on its own connection so
+        it does not contend with the recorder thread. The job is cancelled
+        if it takes longer than READ_JOB_TIMEOUT or the caller is cancelled.
+        """
+        if (read_pool := self._read_pool) is None:
+            return await self.async_add_executor_job(target, *args)
+        job = ReadJob()
+        try:
+            async with asyncio.timeout(READ_JOB_TIMEOUT):
+                return await self.hass.loop.run_in_executor(
+                    self._read_executor, read_pool.run, job, target, *args
+                )
+        except (TimeoutError, asyncio.CancelledError):
+            job.cancelled = True
+            raise
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -360,8 +491,22 @@ class Recorder(threading.Thread):
         The queue grows during migration or if something really goes wrong.
         """
         _LOGGER.debug("Recorder queue size is: %s", self.backlog)
+        if self._spool_buffer is not None:
+            self._async_flush_spool()
+            return
         if not self._reached_max_backlog():
             return
+        if self._spool is not None:
+            _LOGGER.warning(
+                (
+                    "The recorder backlog queue reached the maximum size of %s events; "
+                    "new events will be spooled to %s until the recorder catches up"
+                ),
+                self.backlog,
+                self._spool.path,
+            )
+            self._async_start_spooling()
+            return
         _LOGGER.error(
             (
                 "The recorder backlog queue reached the maximum size of %s events; "
@@ -373,6 +518,95 @@ class Recorder(threading.Thread):
         )
         self._async_stop_queue_watcher_and_event_listener()
 
+    @callback
+    def _async_start_spooling(self) -> None:
+        """Spool new events to disk until the recorder catches up."""
+        self._spool_buffer = []
+        self._async_listen_events(self._async_spool_event)
+        # The spool is replayed once the events in the queue are recorded
+        self.queue_task(REPLAY_SPOOL_TASK)
+
+    @callback
+    def _async_spool_event(self, event: Event) -> None:
+        """Buffer an event to be written to the spool."""
+        assert self._spool_buffer is not None
+        self._spool_buffer.append(event)
+        if len(self._spool_buffer) >= SPOOL_FLUSH_SIZE:
+            self._async_flush_spool()
+
+    @callback
+    def _async_flush_spool(self) -> None:
+        """Write the buffered events to the spool in the executor."""
+        if self._spool_flush is not None or not self._spool_buffer:
+            return
+        events = self._spool_buffer
+        self._spool_buffer = []
+        self._spool_flush = self.hass.async_add_executor_job(self._write_spool, events)
+        self._spool_flush.add_done_callback(self._async_spool_flushed)
+
+    @callback
+    def _async_spool_flushed(self, _: asyncio.Future[None]) -> None:
+        """Write the events buffered while the spool was being written."""
+        self._spool_flush = None
+        if self._spool_buffer and len(self._spool_buffer) >= SPOOL_FLUSH_SIZE:
+            self._async_flush_spool()
+
+    def _write_spool(self, events: list[Event]) -> None:
+        """Write events to the spool."""
+        assert self._spool is not None
+        try:
+            self._spool.write(events)
+        except OSError:
+            _LOGGER.exception(
+                "Error writing %s events to %s, they will not be recorded",
+                len(events),
+                self._spool.path,
+            )
+
+    @callback
+    def _async_spool_replayed(self) -> None:
+        """Stop spooling once every spooled event has been recorded."""
+        if self._spool_buffer is None:
+            return
+        assert self._spool is not None
+        if self._spool_flush is not None or self._spool.pending:
+            # More events were spooled while the spool was replayed
+            self.queue_task(REPLAY_SPOOL_TASK)
+            return
+        # The buffered events are newer than every spooled event
+        # so they can go straight to the queue
+        events = self._spool_buffer
+        self._spool_buffer = None
+        queue_put = self._queue.put_nowait
+        for event in events:
+            queue_put(event)
+        if self._event_listener:
+            self._async_listen_events(queue_put)
+        _LOGGER.info("The recorder caught up with the spooled events")
+
+    async def _async_close_spool(self) -> None:
+        """Write the buffered events to the spool to record them after a restart."""
+        if self._spool_flush is not None:
+            await self._spool_flush
+        if events := self._spool_buffer:
+            self._spool_buffer = []
+            await self.hass.async_add_executor_job(self._write_spool, events)
+
+    def _replay_spool(self) -> None:
+        """Record a batch of spooled events."""
+        assert self._spool is not None
+        self._replay_spool_batch()
+        if self._spool.pending:
+            self.queue_task(REPLAY_SPOOL_TASK)
+        else:
+            self.hass.add_job(self._async_spool_replayed)
+
+    def _replay_spool_batch(self) -> None:
+        """Record the next batch of events from the spool."""
+        assert self._spool is not None
+        for event in self._spool.read(SPOOL_REPLAY_SIZE):
+            self._guarded_process_one_task_or_event_or_recover(event)
+
     def _available_memory(self) -> int:
         """Return the available memory in bytes."""
         if not self._psutil:
@@ -440,6 +674,7 @@ class Recorder(threading.Thread):
             self._hass_started.set_result(SHUTDOWN_TASK)
         self.queue_task(StopTask())
         self._async_stop_listeners()
+        await self._async_close_spool()
         await self.hass.async_add_executor_job(self.join)
 
     @callback
@@ -507,10 +742,15 @@ class Recorder(threading.Thread):
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
         if self.auto_purge:
+            repack = self.auto_repack and is_second_sunday(now)
+            if self.continuous_purge and not repack:
+                # The continuous purge deletes old rows and
+                # frees their space throughout the day
+                self.queue_task(PerodicCleanupTask())
+                return
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
             # until after the database is vacuumed
-            repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
             self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
         else:
@@ -521,6 +761,13 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if self.auto_purge and self.continuous_purge:
+            self.queue_task(CONTINUOUS_PURGE_TASK)
+        if self.retention is not None:
+            if self.retention.samples_entities:
+                self.queue_task(RECORD_TRAILING_CHANGES_TASK)
+            if self.retention.ring_buffers:
+                self.queue_task(PURGE_RING_BUFFERS_TASK)
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -705,6 +952,8 @@ class Recorder(threading.Thread):
         thread_id = threading.get_ident()
         self.thread_id = thread_id
         self.recorder_and_worker_thread_ids.add(thread_id)
+        if self._spool is not None:
+            self._spool.load()
 
         setup_result = self._setup_recorder()
 
@@ -821,6 +1070,11 @@ class Recorder(threading.Thread):
         # with a commit every time the event time
         # has changed. This reduces the disk io.
         queue_ = self._queue
+        if self._spool is not None and self._spool_buffer is None:
+            # Events spooled before the last shutdown are older
+            # than the events in the queue so they go first
+            while self._spool.pending:
+                self._replay_spool_batch()
         startup_task_or_events: list[RecorderTask | Event] = []
         while not queue_.empty() and (task_or_event := queue_.get_nowait()):
             startup_task_or_events.append(task_or_event)
@@ -1026,14 +1280,38 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
             return
-        if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
-        else:
-            self._process_non_state_changed_event_into_session(event)
+        if self.retention is not None:
+            if not self.retention.should_record(event):
+                return
+            for trailing in self.retention.pop_removed_trailing_changes():
+                self._process_event_into_session(trailing)
+        self._process_event_into_session(event)
         # Commit if the commit interval is zero
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _process_event_into_session(self, event: Event[Any]) -> None:
+        """Process an event into the session or the bulk writer."""
+        if event.event_type == EVENT_STATE_CHANGED:
+            if self._bulk_states_writer is None:
+                self._process_state_changed_event_into_session(event)
+            else:
+                self._process_state_changed_event_into_bulk_writer(
+                    event, self._bulk_states_writer
+                )
+        else:
+            self._process_non_state_changed_event_into_session(event)
+
+    def _record_trailing_changes(self) -> None:
+        """Record the trailing changes of the retention policies which are due."""
+        assert self.retention is not None
+        if not self.enabled:
+            return
+        for trailing in self.retention.pop_trailing_changes(
+            dt_util.utcnow().timestamp()
+        ):
+            self._process_event_into_session(trailing)
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         session = self.event_session
@@ -1084,63 +1362,99 @@ class Recorder(threading.Thread):
         self, event: Event[EventStateChangedData]
     ) -> None:
         """Process a state_changed event into the session."""
+        dbstate = States.from_event(event)
+        if self._link_state_changed_row(event, dbstate):
+            assert self.event_session is not None
+            self._add_to_session(self.event_session, dbstate)
+
+    def _process_state_changed_event_into_bulk_writer(
+        self,
+        event: Event[EventStateChangedData],
+        bulk_states_writer: BulkStatesWriter,
+    ) -> None:
+        """Process a state_changed event into the bulk states writer.
+
+        The state row is kept as a PendingState and inserted by the writer
+        when the session is committed.
+        """
+        pending = PendingState.from_event(event)
+        if self._link_state_changed_row(event, pending):
+            self._event_session_has_pending_writes = True
+            bulk_states_writer.add(pending)
+
+    def _link_state_changed_row[_StateRowT: (States, PendingState)](
+        self, event: Event[EventStateChangedData], row: _StateRowT
+    ) -> bool:
+        """Link the state row of a state_changed event to its related rows.
+
+        The old state, states meta and state attributes of the row are
+        resolved and new ones are added to the session. Returns True if
+        the row should be written.
+        """
         state_attributes_manager = self.state_attributes_manager
         states_meta_manager = self.states_meta_manager
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
-
-        dbstate = States.from_event(event)
         old_state = event.data["old_state"]
 
         assert self.event_session is not None
         session = self.event_session
 
         states_manager = self.states_manager
+        # The last reported timestamp of the old state is only written
+        # to the previous row if the old state was recorded, changes of
+        # sampled entities can be skipped
         if pending_state := states_manager.pop_pending(entity_id):
-            dbstate.old_state = pending_state
-            if old_state:
+            # Rows are never mixed, the bulk writer is used for all of them
+            pending_state = cast(_StateRowT, pending_state)
+            row.old_state = pending_state
+            if (
+                old_state
+                and old_state.last_updated_timestamp == pending_state.last_updated_ts
+            ):
                 pending_state.last_reported_ts = old_state.last_reported_timestamp
-        elif old_state_id := states_manager.pop_committed(entity_id):
-            dbstate.old_state_id = old_state_id
-            if old_state:
+        elif committed := states_manager.pop_committed_with_last_updated_ts(entity_id):
+            old_state_id, old_last_updated_ts = committed
+            row.old_state_id = old_state_id
+            if old_state and old_state.last_updated_timestamp == old_last_updated_ts:
                 states_manager.update_pending_last_reported(
                     old_state_id, old_state.last_reported_timestamp
                 )
         if entity_removed:
-            dbstate.state = None
+            row.state = None
         else:
-            states_manager.add_pending(entity_id, dbstate)
+            states_manager.add_pending(entity_id, row)
 
         if states_meta_manager.active:
-            dbstate.entity_id = None
+            row.entity_id = None
 
         if entity_id is None or not (
             shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
         ):
-            return
+            return False
 
         # Map the entity_id to the StatesMeta table
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
+            row.states_meta_rel = pending_states_meta
         elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
+            row.metadata_id = metadata_id
         elif states_meta_manager.active and entity_removed:
             # If the entity was removed, we don't need to add it to the
             # StatesMeta table or record it in the pending commit
             # if it does not have a metadata_id allocated to it as
             # it either never existed or was just renamed.
-            return
+            return False
         else:
             states_meta = StatesMeta(entity_id=entity_id)
             states_meta_manager.add_pending(states_meta)
             self._add_to_session(session, states_meta)
-            dbstate.states_meta_rel = states_meta
+            row.states_meta_rel = states_meta
 
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
+            row.state_attributes = pending_event_data
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1152,15 +1466,30 @@ class Recorder(threading.Thread):
                 )
             )
         ):
-            dbstate.attributes_id = attributes_id
+            row.attributes_id = attributes_id
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
             state_attributes_manager.add_pending(dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
+            row.state_attributes = dbstate_attributes
+
+        if self.schema_version >= NUMERIC_STATES_SCHEMA_VERSION:
+            self.states_numeric_manager.add_pending(row, old_state)
 
-        self._add_to_session(session, dbstate)
+        if self.query_cache.enabled:
+            if TYPE_CHECKING:
+                assert row.last_updated_ts is not None
+            self._query_cache_states.append(
+                (
+                    entity_id,
+                    row.state,
+                    row.last_updated_ts,
+                    row.last_changed_ts,
+                    shared_attrs,
+                )
+            )
+        return True
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1223,7 +1552,14 @@ class Recorder(threading.Thread):
                         for state_id, last_reported_timestamp in pending_last_reported.items()
                     ],
                 )
+        start = time.monotonic()
+        if self._bulk_states_writer is not None:
+            self._bulk_states_writer.write(session)
+        self.states_numeric_manager.write(session)
         session.commit()
+        self.commit_duration += COMMIT_DURATION_SMOOTHING * (
+            time.monotonic() - start - self.commit_duration
+        )
 
         self._event_session_has_pending_writes = False
         # We just committed the state attributes to the database
@@ -1231,10 +1567,16 @@ class Recorder(threading.Thread):
         # many selects for matching attributes by loading them
         # into the LRU or committed now.
         self.states_manager.post_commit_pending()
+        self.states_numeric_manager.post_commit_pending()
         self.state_attributes_manager.post_commit_pending()
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if self._bulk_states_writer is not None:
+            self._bulk_states_writer.post_commit_pending()
+        if self._query_cache_states:
+            self.query_cache.add_states(self._query_cache_states)
+            self._query_cache_states = []
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1258,11 +1600,18 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self.states_manager.reset()
+        self.states_numeric_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        if self._bulk_states_writer is not None:
+            self._bulk_states_writer.reset()
+        if self._query_cache_states:
+            # The states were not committed
+            self._query_cache_states = []
+            self.query_cache.clear()
 
         if not self.event_session:
             return
@@ -1427,9 +1776,48 @@ class Recorder(threading.Thread):
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
+        self._setup_read_pool(kwargs.get("connect_args", {}))
+        self._bulk_states_writer = None
+        if not self.bulk_insert:
+            return
+        if not self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+            _LOGGER.warning(
+                "The %s database does not support returning ids from bulk inserts,"
+                " states will be inserted through the ORM instead",
+                self.engine.dialect.name,
+            )
+            return
+        self._bulk_states_writer = BulkStatesWriter()
+
+    def _setup_read_pool(self, connect_args: dict[str, Any]) -> None:
+        """Set up the read pool if the database can be read concurrently."""
+        if self._read_pool:
+            self._read_pool.close()
+            self._read_pool = None
+        # An in memory database can only be read through the
+        # connection that created it
+        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+            return
+        if self.dialect_name == SupportedDialect.SQLITE:
+            connect_args = {**connect_args, "check_same_thread": False}
+        self._read_pool = ReadPool(
+            self,
+            create_engine(
+                self.db_url,
+                connect_args=connect_args,
+                poolclass=QueuePool,
+                pool_size=READ_POOL_SIZE,
+                max_overflow=0,
+                echo=False,
+                future=True,
+            ),
+        )
 
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self._read_pool:
+            self._read_pool.close()
+            self._read_pool = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
@@ -1441,6 +1829,7 @@ class Recorder(threading.Thread):
             end_incomplete_runs(session, self.recorder_runs_manager.recording_start)
             self.recorder_runs_manager.start(session)
             self.states_manager.load_from_db(session)
+            self.states_numeric_manager.load_from_db(session)
 
         self._open_event_session()
 
@@ -1485,8 +1874,12 @@ class Recorder(threading.Thread):
                 # joining the threads until after we have tried
                 # to cleanly close the connection.
                 self._db_executor.shutdown(join_threads_or_timeout=False)
+            if self._read_executor:
+                self._read_executor.shutdown(join_threads_or_timeout=False)
             self._close_connection()
             if self._db_executor:
                 # After the connection is closed, we can join the threads
                 # or forcefully shutdown the threads if they take too long.
                 self._db_executor.join_threads_or_timeout()
+            if self._read_executor:
+                self._read_executor.join_threads_or_timeout()
@@ -62,6 +62,7 @@ from .models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
     datetime_to_timestamp_or_none,
+    decompress_shared_attrs,
     process_timestamp,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
@@ -77,7 +78,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 48
+SCHEMA_VERSION = 51
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,12 +88,15 @@ TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_STATES_META = "states_meta"
+TABLE_STATES_NUMERIC = "states_numeric"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_MIGRATION_CHANGES = "migration_changes"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
@@ -112,10 +116,13 @@ ALL_TABLES = [
     TABLE_SCHEMA_CHANGES,
     TABLE_MIGRATION_CHANGES,
     TABLE_STATES_META,
+    TABLE_STATES_NUMERIC,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
 ]
 
 TABLES_TO_CHECK = [
@@ -127,6 +134,9 @@ TABLES_TO_CHECK = [
 
 LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
 METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
+NUMERIC_METADATA_ID_LAST_UPDATED_INDEX_TS = (
+    "ix_states_numeric_metadata_id_last_updated_ts"
+)
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
 STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
@@ -192,6 +202,22 @@ class NativeLargeBinary(LargeBinary):
         return None
 
 
+class SharedAttrsText(Text):
+    """Text that decompresses compressed shared attributes when loaded."""
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Callable | None:
+        """Decompress the shared attributes."""
+        return decompress_shared_attrs
+
+
+class SharedAttrsLongText(mysql.LONGTEXT):
+    """LONGTEXT that decompresses compressed shared attributes when loaded."""
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Callable | None:
+        """Decompress the shared attributes."""
+        return decompress_shared_attrs
+
+
 # Although all integers are same in SQLite, it does not allow an identity column to be BIGINT
 # https://sqlite.org/forum/info/2dfa968a702e1506e885cb06d92157d492108b22bf39459506ab9f7125bca7fd
 ID_TYPE = BigInteger().with_variant(sqlite.INTEGER, "sqlite")
@@ -202,6 +228,9 @@ UINT_32_TYPE = BigInteger().with_variant(
     "mysql",
     "mariadb",
 )
+SHARED_ATTRS_TYPE = SharedAttrsText().with_variant(
+    SharedAttrsLongText, "mysql", "mariadb"
+)
 JSON_VARIANT_CAST = Text().with_variant(
     postgresql.JSON(none_as_null=True),  # type: ignore[no-untyped-call]
     "postgresql",
@@ -515,6 +544,55 @@ class States(Base):
     @staticmethod
     def from_event(event: Event[EventStateChangedData]) -> States:
         """Create object from a state_changed event."""
+        (
+            entity_id,
+            state,
+            last_updated_ts,
+            last_changed_ts,
+            last_reported_ts,
+            context_id_bin,
+            context_user_id_bin,
+            context_parent_id_bin,
+            origin_idx,
+        ) = States.columns_from_event(event)
+        return States(
+            state=state,
+            entity_id=entity_id,
+            attributes=None,
+            context_id=None,
+            context_id_bin=context_id_bin,
+            context_user_id=None,
+            context_user_id_bin=context_user_id_bin,
+            context_parent_id=None,
+            context_parent_id_bin=context_parent_id_bin,
+            origin_idx=origin_idx,
+            last_updated=None,
+            last_changed=None,
+            last_updated_ts=last_updated_ts,
+            last_changed_ts=last_changed_ts,
+            last_reported_ts=last_reported_ts,
+        )
+
+    @staticmethod
+    def columns_from_event(
+        event: Event[EventStateChangedData],
+    ) -> tuple[
+        str,
+        str,
+        float,
+        float | None,
+        float | None,
+        bytes | None,
+        bytes | None,
+        bytes | None,
+        int,
+    ]:
+        """Return the column values of a state_changed event.
+
+        The values are entity_id, state, last_updated_ts, last_changed_ts,
+        last_reported_ts, context_id_bin, context_user_id_bin,
+        context_parent_id_bin and origin_idx.
+        """
         state = event.data["new_state"]
         # None state means the state was removed from the state machine
         if state is None:
@@ -534,22 +612,16 @@ class States(Base):
             else:
                 last_reported_ts = state.last_reported_timestamp
         context = event.context
-        return States(
-            state=state_value,
-            entity_id=event.data["entity_id"],
-            attributes=None,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(context.parent_id),
-            origin_idx=event.origin.idx,
-            last_updated=None,
-            last_changed=None,
-            last_updated_ts=last_updated_ts,
-            last_changed_ts=last_changed_ts,
-            last_reported_ts=last_reported_ts,
+        return (
+            event.data["entity_id"],
+            state_value,
+            last_updated_ts,
+            last_changed_ts,
+            last_reported_ts,
+            ulid_to_bytes_or_none(context.id),
+            uuid_hex_to_bytes_or_none(context.user_id),
+            ulid_to_bytes_or_none(context.parent_id),
+            event.origin.idx,
         )
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
@@ -621,9 +693,7 @@ class StateAttributes(Base):
     attributes_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
     hash: Mapped[int | None] = mapped_column(UINT_32_TYPE, index=True)
     # Note that this is not named attributes to avoid confusion with the states table
-    shared_attrs: Mapped[str | None] = mapped_column(
-        Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
-    )
+    shared_attrs: Mapped[str | None] = mapped_column(SHARED_ATTRS_TYPE)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -654,10 +724,16 @@ class StateAttributes(Base):
                 exclude_attrs -= _MATCH_ALL_KEEP
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
-        encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
-        bytes_result = encoder(
-            {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
-        )
+        attributes = state.attributes
+        if dialect != PSQL_DIALECT and exclude_attrs.isdisjoint(attributes):
+            # Nothing is excluded so the JSON of the attributes
+            # can be shared with the other consumers of the state
+            bytes_result = state.attributes_json
+        else:
+            encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
+            bytes_result = encoder(
+                {k: v for k, v in attributes.items() if k not in exclude_attrs}
+            )
         if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
             _LOGGER.warning(
                 "State attributes for %s exceed maximum size of %s bytes. "
@@ -676,7 +752,7 @@ class StateAttributes(Base):
 
     def to_native(self) -> dict[str, Any]:
         """Convert to a state attributes dictionary."""
-        shared_attrs = self.shared_attrs
+        shared_attrs = decompress_shared_attrs(self.shared_attrs)
         if shared_attrs is None:
             return {}
         try:
@@ -706,6 +782,42 @@ class StatesMeta(Base):
         )
 
 
+class StatesNumeric(Base):
+    """Values of numeric state changes.
+
+    Holds a row per state change of an entity that is or was numeric so
+    numeric history can be read without parsing the state strings.
+    States which are not numeric have a value of None.
+    """
+
+    __table_args__ = (
+        # Used for fetching the numeric history of entities
+        Index(
+            NUMERIC_METADATA_ID_LAST_UPDATED_INDEX_TS,
+            "metadata_id",
+            "last_updated_ts",
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATES_NUMERIC
+    state_id: Mapped[int] = mapped_column(
+        ID_TYPE,
+        ForeignKey(f"{TABLE_STATES}.state_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metadata_id: Mapped[int | None] = mapped_column(ID_TYPE)
+    last_updated_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+    value: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StatesNumeric(id={self.state_id},"
+            f" metadata_id={self.metadata_id},"
+            f" last_updated_ts={self.last_updated_ts}, value={self.value})>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -790,6 +902,54 @@ class Statistics(Base, StatisticsBase):
     __tablename__ = TABLE_STATISTICS
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Statistics rollup base class."""
+
+    # The number of hourly means the mean was rolled up from
+    mean_count: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDaily(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per local day.
+
+    Maintained from the hourly statistics, days are 23 or 25 hours
+    long when daylight saving time starts or ends.
+    """
+
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per local month.
+
+    Maintained from the hourly statistics, the duration is nominal.
+    """
+
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class _StatisticsShortTerm(StatisticsBase):
     """Short term statistics."""
 
@@ -909,6 +1069,8 @@ class MigrationChanges(Base):
 
     migration_id: Mapped[str] = mapped_column(String(255), primary_key=True)
     version: Mapped[int] = mapped_column(SmallInteger)
+    # Where an unfinished run time migration continues
+    checkpoint: Mapped[int | None] = mapped_column(BigInteger)
 
 
 class SchemaChanges(Base):
@@ -967,9 +1129,12 @@ OLD_ENTITY_ID_IN_EVENT: ColumnElement = OLD_FORMAT_EVENT_DATA_JSON["entity_id"]
 DEVICE_ID_IN_EVENT: ColumnElement = EVENT_DATA_JSON["device_id"]
 OLD_STATE = aliased(States, name="old_state")
 
-SHARED_ATTR_OR_LEGACY_ATTRIBUTES = case(
-    (StateAttributes.shared_attrs.is_(None), States.attributes),
-    else_=StateAttributes.shared_attrs,
+SHARED_ATTR_OR_LEGACY_ATTRIBUTES = type_coerce(
+    case(
+        (StateAttributes.shared_attrs.is_(None), States.attributes),
+        else_=StateAttributes.shared_attrs,
+    ),
+    SHARED_ATTRS_TYPE,
 ).label("attributes")
 SHARED_DATA_OR_LEGACY_EVENT_DATA = case(
     (EventData.shared_data.is_(None), Events.event_data), else_=EventData.shared_data
@@ -79,3 +79,6 @@ def update_states_metadata(
                 entity_id,
                 new_entity_id,
             )
+            return
+    if instance.archive is not None:
+        instance.archive.rename_states(entity_id, new_entity_id)
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Generator
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
 from sqlalchemy.orm.session import Session
 
@@ -11,13 +12,16 @@ from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.recorder import get_instance
 
 from ..filters import Filters
-from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
+from ..models import numeric_state_value
+from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS, STREAM_CHUNK_SIZE
 from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
+    get_numeric_states as _modern_get_numeric_states,
     get_significant_states as _modern_get_significant_states,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
+    stream_significant_states as _modern_stream_significant_states,
 )
 
 # These are the APIs of this package
@@ -26,9 +30,11 @@ __all__ = [
     "SIGNIFICANT_DOMAINS",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
+    "get_numeric_states",
     "get_significant_states",
     "get_significant_states_with_session",
     "state_changes_during_period",
+    "stream_significant_states",
 ]
 
 
@@ -80,6 +86,44 @@ def get_last_state_changes(
     return _target(hass, number_of_states, entity_id)
 
 
+def get_numeric_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+) -> dict[str, list[tuple[float, float | None]]]:
+    """Return (timestamp, value) pairs of numeric states during a time period.
+
+    The values are parsed from the recorded state strings.
+    """
+    if get_instance(hass).states_meta_manager.active:
+        return _modern_get_numeric_states(
+            hass, start_time, end_time, entity_ids, include_start_time_state
+        )
+    from .legacy import (  # pylint: disable=import-outside-toplevel
+        get_significant_states as _legacy_get_significant_states,
+    )
+
+    result: dict[str, list[tuple[float, float | None]]] = {}
+    for entity_id, states in _legacy_get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        no_attributes=True,
+    ).items():
+        ent_results = result[entity_id] = []
+        for state in cast(list[State], states):
+            value = numeric_state_value(state.state)
+            if ent_results and value == ent_results[-1][1]:
+                continue
+            ent_results.append((state.last_updated.timestamp(), value))
+    return result
+
+
 def get_significant_states(
     hass: HomeAssistant,
     start_time: datetime,
@@ -152,6 +196,50 @@ def get_significant_states_with_session(
     )
 
 
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Generator[dict[str, list[dict[str, Any]]]]:
+    """Yield significant states in the compressed state format in chunks."""
+    if get_instance(hass).states_meta_manager.active:
+        yield from _modern_stream_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            chunk_size,
+        )
+        return
+    from .legacy import (  # pylint: disable=import-outside-toplevel
+        get_significant_states as _legacy_get_significant_states,
+    )
+
+    if states := _legacy_get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+    ):
+        yield cast(dict[str, list[dict[str, Any]]], states)
+
+
 def state_changes_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -19,3 +19,10 @@ NEED_ATTRIBUTE_DOMAINS = {
     "thermostat",
     "water_heater",
 }
+
+# Maximum number of states in each chunk of a history stream
+STREAM_CHUNK_SIZE = 5000
+
+# Periods ending at most this many seconds ago are fetched into the query
+# cache, older periods are only served by it when they are already cached
+CACHED_HISTORY_MAX_END_AGE = 300
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable, Iterator
+from bisect import bisect_left
+from collections.abc import Callable, Generator, Iterable, Iterator
 from datetime import datetime
+import heapq
 from itertools import groupby
 from operator import itemgetter
 from typing import Any, cast
@@ -21,32 +23,45 @@ from sqlalchemy import (
 )
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
 from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.helpers.json import json_fragment
 from homeassistant.helpers.recorder import get_instance
 import homeassistant.util.dt as dt_util
 
+from ..archive import ARCHIVE_STATES, HistoryArchive, archived_state_to_row
 from ..const import LAST_REPORTED_SCHEMA_VERSION
 from ..db_schema import (
     SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
     StateAttributes,
     States,
     StatesMeta,
+    StatesNumeric,
 )
 from ..filters import Filters
 from ..models import (
     LazyState,
     datetime_to_timestamp_or_none,
     extract_metadata_ids,
+    numeric_state_value,
     row_to_compressed_state,
 )
+from ..query_cache import HistoryEntry, HistoryKey, HistoryRow, QueryCache
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
+    CACHED_HISTORY_MAX_END_AGE,
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
     STATE_KEY,
+    STREAM_CHUNK_SIZE,
 )
 
 _FIELD_MAP = {
@@ -232,7 +247,322 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
-    entity_id_to_metadata_id: dict[str, int | None] | None = None
+    instance = get_instance(hass)
+    if (archive := instance.archive) is not None and archive.reaches(
+        ARCHIVE_STATES, start_time.timestamp()
+    ):
+        states, entity_id_to_metadata_id = _archived_significant_rows(
+            hass,
+            session,
+            archive,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+        return _sorted_states_to_dict(
+            cast(Iterable[Row], states),
+            start_time.timestamp() if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        )
+    if (query_cache := instance.query_cache).enabled and (
+        cached := _cached_history_rows(
+            hass,
+            session,
+            query_cache,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        rows, entity_id_to_metadata_id = cached
+        return _sorted_states_to_dict(
+            cast(Iterable[Row], rows),
+            start_time.timestamp() if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        )
+    if not (
+        prepared := _significant_states_lambda_stmt(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ):
+        return {}
+    stmt, entity_id_to_metadata_id, include_start_time_state = prepared
+    return _sorted_states_to_dict(
+        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+        start_time.timestamp() if include_start_time_state else None,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def _cached_history_rows(
+    hass: HomeAssistant,
+    session: Session,
+    query_cache: QueryCache,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[Iterator[HistoryRow], dict[str, int | None]] | None:
+    """Return the significant states of a period using the query cache.
+
+    All states since start_time are fetched and cached when they are not
+    cached yet and the period ends less than CACHED_HISTORY_MAX_END_AGE
+    seconds ago, the significant states are picked from the cached states.
+    Returns None if the period has to be queried from the database.
+    """
+    key: HistoryKey = (tuple(entity_ids), no_attributes)
+    start_time_ts = start_time.timestamp()
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    if (cached := query_cache.get_history(key, start_time_ts)) is None:
+        if (
+            end_time_ts is not None
+            and end_time_ts < dt_util.utcnow().timestamp() - CACHED_HISTORY_MAX_END_AGE
+        ):
+            return None
+        sequence = query_cache.history_sequence()
+        if not (
+            prepared := _significant_states_lambda_stmt(
+                hass,
+                session,
+                start_time,
+                None,
+                entity_ids,
+                True,
+                False,
+                no_attributes,
+            )
+        ):
+            return iter(()), {}
+        stmt, entity_id_to_metadata_id, _ = prepared
+        metadata_id_to_entity_id = {
+            v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+        }
+        rows: dict[str, list[HistoryRow]] = {entity_id: [] for entity_id in entity_ids}
+        for row in execute_stmt_lambda_element(
+            session, stmt, None, None, orm_rows=False
+        ):
+            rows[metadata_id_to_entity_id[row[0]]].append(
+                HistoryRow(
+                    row[0], row[1], row[2], row[3], None if no_attributes else row[4]
+                )
+            )
+        cached = (
+            entity_id_to_metadata_id,
+            {
+                entity_id: _split_start_row(entity_rows)
+                for entity_id, entity_rows in rows.items()
+            },
+        )
+        query_cache.store_history(
+            key, HistoryEntry(start_time_ts, entity_id_to_metadata_id, rows), sequence
+        )
+    entity_id_to_metadata_id, rows_by_entity_id = cached
+
+    def _rows() -> Iterator[HistoryRow]:
+        """Yield the significant states of the period from the cached states."""
+        for entity_id in entity_ids:
+            start_row, rows_after = rows_by_entity_id[entity_id]
+            if end_time_ts is not None:
+                rows_after = rows_after[
+                    : bisect_left(rows_after, end_time_ts, key=_last_updated_ts)
+                ]
+            yield from _significant_history_rows(
+                entity_id,
+                start_row if include_start_time_state else None,
+                rows_after,
+                significant_changes_only,
+            )
+
+    return _rows(), entity_id_to_metadata_id
+
+
+def _significant_history_rows(
+    entity_id: str,
+    start_row: HistoryRow | None,
+    rows: Iterable[HistoryRow],
+    significant_changes_only: bool,
+) -> Iterator[HistoryRow]:
+    """Return the rows of an entity as the significant states query returns them."""
+    if start_row is not None:
+        # The database returns the state at the start time with
+        # the timestamps replaced by the start time
+        yield start_row._replace(
+            last_updated_ts=0,
+            last_changed_ts=None if significant_changes_only else 0,
+        )
+    if not significant_changes_only:
+        yield from rows
+        return
+    significant_domain = split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
+    yield from (
+        row._replace(last_changed_ts=None)
+        for row in rows
+        if significant_domain
+        or row.last_changed_ts is None
+        or row.last_changed_ts == row.last_updated_ts
+    )
+
+
+def _archived_significant_rows(
+    hass: HomeAssistant,
+    session: Session,
+    archive: HistoryArchive,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[Iterator[HistoryRow], dict[str, int | None]]:
+    """Return the significant states from the archive and the database.
+
+    The archived states come before the states in the database, a state
+    in both is only returned once. Entities which are no longer in the
+    database get a negative metadata id which is returned with the rows.
+    The rows are merged one entity at a time while they are iterated, the
+    session must stay open until then.
+    """
+    live_rows: Iterable[Row] = ()
+    entity_id_to_metadata_id: dict[str, int | None] = {}
+    if prepared := _significant_states_lambda_stmt(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        False,
+        False,
+        no_attributes,
+    ):
+        stmt, entity_id_to_metadata_id, _ = prepared
+        live_rows = execute_stmt_lambda_element(
+            session, stmt, start_time, end_time, orm_rows=False
+        )
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    entity_id_to_metadata_id = {
+        entity_id: entity_id_to_metadata_id.get(entity_id) or -idx
+        for idx, entity_id in enumerate(entity_ids, 1)
+    }
+
+    def _entity_rows(entity_id: str, live: Iterable[Row]) -> Iterator[HistoryRow]:
+        """Merge the archived and live rows of an entity."""
+        metadata_id = cast(int, entity_id_to_metadata_id[entity_id])
+        archived_start, archived_states = archive.iter_states(
+            entity_id,
+            start_time.timestamp(),
+            datetime_to_timestamp_or_none(end_time),
+            include_start_time_state,
+        )
+        return _significant_history_rows(
+            entity_id,
+            None
+            if archived_start is None
+            else archived_state_to_row(metadata_id, archived_start, no_attributes),
+            _merge_archived_rows(
+                (
+                    archived_state_to_row(metadata_id, state, no_attributes)
+                    for state in archived_states
+                ),
+                (
+                    HistoryRow(
+                        row[0],
+                        row[1],
+                        row[2],
+                        row[3],
+                        None if no_attributes else row[4],
+                    )
+                    for row in live
+                ),
+            ),
+            significant_changes_only,
+        )
+
+    def _rows() -> Iterator[HistoryRow]:
+        """Yield the rows of the entities with live rows first."""
+        merged: set[str] = set()
+        for metadata_id, live in groupby(live_rows, itemgetter(0)):
+            entity_id = metadata_id_to_entity_id[metadata_id]
+            merged.add(entity_id)
+            yield from _entity_rows(entity_id, live)
+        for entity_id in entity_ids:
+            if entity_id not in merged:
+                yield from _entity_rows(entity_id, ())
+
+    return _rows(), entity_id_to_metadata_id
+
+
+def _merge_archived_rows(
+    archived: Iterable[HistoryRow], live: Iterable[HistoryRow]
+) -> Iterator[HistoryRow]:
+    """Merge sorted archived and live rows, a row in both is only returned once."""
+    previous_ts: float | None = None
+    for row in heapq.merge(archived, live, key=_last_updated_ts):
+        # Ties keep the archived row first
+        if row.last_updated_ts == previous_ts:
+            continue
+        yield row
+        previous_ts = row.last_updated_ts
+
+
+def _last_updated_ts(row: HistoryRow) -> float:
+    """Return the last_updated_ts of a history row."""
+    return row.last_updated_ts
+
+
+def _split_start_row(
+    rows: list[HistoryRow],
+) -> tuple[HistoryRow | None, list[HistoryRow]]:
+    """Split fetched history rows into the state at the start time and the rest."""
+    if rows and rows[0].last_updated_ts == 0:
+        return rows[0], rows[1:]
+    return None, rows
+
+
+def _significant_states_lambda_stmt(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[StatementLambdaElement, dict[str, int | None], bool] | None:
+    """Return the statement to fetch the significant states of the entities.
+
+    The metadata ids of the entities and if the states at the start time
+    are included are returned with it. Returns None if none of the
+    entities have been recorded.
+    """
     metadata_ids_in_significant_domains: list[int] = []
     instance = get_instance(hass)
     if not (
@@ -240,7 +570,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -278,14 +608,252 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
+    return stmt, entity_id_to_metadata_id, include_start_time_state
+
+
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Generator[dict[str, list[dict[str, Any]]]]:
+    """Yield significant states in the compressed state format in chunks.
+
+    The rows are converted as they are read from the cursor so only
+    chunk_size states are held in memory at a time, regardless of the
+    length of the period. Closing the generator stops the query. Periods
+    in the query cache are converted from the cached states instead.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    instance = get_instance(hass)
+    archive = instance.archive
+    query_cache = instance.query_cache
+    with session_scope(hass=hass, read_only=True) as session:
+        rows: Iterable[Row]
+        if archive is not None and archive.reaches(
+            ARCHIVE_STATES, start_time.timestamp()
+        ):
+            states, entity_id_to_metadata_id = _archived_significant_rows(
+                hass,
+                session,
+                archive,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+            )
+            rows = cast(Iterable[Row], states)
+        elif query_cache.enabled and (
+            cached := _cached_history_rows(
+                hass,
+                session,
+                query_cache,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+            )
+        ):
+            states, entity_id_to_metadata_id = cached
+            rows = cast(Iterable[Row], states)
+        elif not (
+            prepared := _significant_states_lambda_stmt(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                no_attributes,
+            )
+        ):
+            return
+        else:
+            stmt, entity_id_to_metadata_id, _ = prepared
+            rows = execute_stmt_lambda_element(
+                session, stmt, start_time, end_time, orm_rows=False
+            )
+        yield from _sorted_states_to_compressed_chunks(
+            rows,
+            start_time.timestamp(),
+            entity_id_to_metadata_id,
+            minimal_response,
+            no_attributes,
+            chunk_size,
+        )
+
+
+def get_numeric_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+) -> dict[str, list[tuple[float, float | None]]]:
+    """Wrap get_numeric_states_with_session with an sql session."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return get_numeric_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+        )
+
+
+def get_numeric_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+) -> dict[str, list[tuple[float, float | None]]]:
+    """Return numeric state changes during UTC period start_time - end_time.
+
+    Each entity gets a list of (timestamp, value) pairs that are built
+    straight from the rows without creating State objects. States that
+    are not numeric, for instance unavailable, have a value of None so
+    graphs can show a gap.
+
+    Periods which start after the states_numeric table was added are
+    read from it. Older periods are selected by the same query as
+    get_significant_states without attributes and the values are parsed
+    from the stored state strings.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    instance = get_instance(hass)
+    if (archive := instance.archive) is not None and archive.reaches(
+        ARCHIVE_STATES, start_time.timestamp()
+    ):
+        states, entity_id_to_metadata_id = _archived_significant_rows(
+            hass,
+            session,
+            archive,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            True,
+            True,
+        )
+        return _sorted_numeric_rows_to_dict(
+            _numeric_rows_from_states(cast(Iterable[Row], states)),
+            start_time.timestamp() if include_start_time_state else None,
+            entity_ids,
+            entity_id_to_metadata_id,
+        )
+    if (
+        active_since_ts := instance.states_numeric_manager.active_since_ts
+    ) is not None and start_time.timestamp() >= active_since_ts:
+        return _get_numeric_states_from_table(
+            hass, session, start_time, end_time, entity_ids, include_start_time_state
+        )
+    if not (
+        prepared := _significant_states_lambda_stmt(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            True,
+            True,
+        )
+    ):
+        return {}
+    stmt, entity_id_to_metadata_id, include_start_time_state = prepared
+    return _sorted_numeric_rows_to_dict(
+        _numeric_rows_from_states(
+            execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False)
+        ),
+        start_time.timestamp() if include_start_time_state else None,
+        entity_ids,
+        entity_id_to_metadata_id,
+    )
+
+
+def _numeric_states_stmt(
+    start_time_ts: float, end_time_ts: float | None, metadata_ids: list[int]
+) -> Select:
+    """Query the database for numeric states."""
+    stmt = select(
+        StatesNumeric.metadata_id, StatesNumeric.last_updated_ts, StatesNumeric.value
+    ).filter(
+        StatesNumeric.metadata_id.in_(metadata_ids),
+        StatesNumeric.last_updated_ts > start_time_ts,
+    )
+    if end_time_ts:
+        stmt = stmt.filter(StatesNumeric.last_updated_ts < end_time_ts)
+    return stmt.order_by(StatesNumeric.metadata_id, StatesNumeric.last_updated_ts)
+
+
+def _get_numeric_states_from_table(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+) -> dict[str, list[tuple[float, float | None]]]:
+    """Return numeric state changes from the states_numeric table.
+
+    The states at the start time are read from the states table since
+    the last change of an entity can be older than the table.
+    """
+    if not (
+        entity_id_to_metadata_id := get_instance(hass).states_meta_manager.get_many(
+            entity_ids, session, False
+        )
+    ) or not (metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+        return {}
+    start_time_ts = start_time.timestamp()
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    start_rows: list[tuple[int, float, float | None]] = []
+    if include_start_time_state and _get_oldest_possible_ts(hass, start_time):
+        single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
+        start_stmt = lambda_stmt(
+            lambda: _get_start_time_state_stmt(
+                start_time_ts, single_metadata_id, metadata_ids, True, False
+            ),
+            track_on=[bool(single_metadata_id)],
+        )
+        start_rows = sorted(
+            _numeric_rows_from_states(
+                execute_stmt_lambda_element(session, start_stmt, orm_rows=False)
+            ),
+            key=itemgetter(0),
+        )
+    else:
+        include_start_time_state = False
+    stmt = lambda_stmt(
+        lambda: _numeric_states_stmt(start_time_ts, end_time_ts, metadata_ids),
+        track_on=[bool(end_time_ts)],
+    )
+    rows = cast(
+        Iterable[tuple[int, float, float | None]],
+        execute_stmt_lambda_element(
+            session, stmt, start_time, end_time, orm_rows=False
+        ),
+    )
+    return _sorted_numeric_rows_to_dict(
+        heapq.merge(start_rows, rows, key=itemgetter(0, 1)) if start_rows else rows,
         start_time_ts if include_start_time_state else None,
         entity_ids,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
     )
 
 
@@ -744,7 +1312,7 @@ def _sorted_states_to_dict(
                         entity_id,
                         db_state[state_idx],
                         db_state[last_updated_ts_idx],
-                        False,
+                        no_attributes,
                     )
                     for db_state in group
                 ]
@@ -814,3 +1382,124 @@ def _sorted_states_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+def _sorted_states_to_compressed_chunks(
+    states: Iterable[Row],
+    start_time_ts: float,
+    entity_id_to_metadata_id: dict[str, int | None],
+    minimal_response: bool,
+    no_attributes: bool,
+    chunk_size: int,
+) -> Generator[dict[str, list[dict[str, Any]]]]:
+    """Convert SQL results into chunks of compressed states.
+
+    States must be sorted by entity_id and last_updated. The states of an
+    entity can be split over consecutive chunks. The attributes are passed
+    through as JSON fragments since they are already JSON in the database.
+    """
+    field_map = _FIELD_MAP
+    metadata_id_idx = field_map["metadata_id"]
+    state_idx = field_map["state"]
+    last_updated_ts_idx = field_map["last_updated_ts"]
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    chunk: dict[str, list[dict[str, Any]]] = {}
+    remaining = chunk_size
+    for metadata_id, group in groupby(states, itemgetter(metadata_id_idx)):
+        entity_id = metadata_id_to_entity_id[metadata_id]
+        ent_results = chunk[entity_id] = []
+        full_states = (
+            not minimal_response
+            or split_entity_id(entity_id)[0] in NEED_ATTRIBUTE_DOMAINS
+        )
+        prev_state: str | None = None
+        for row in group:
+            state: str = row[state_idx]
+            if full_states or (prev_state is None and not ent_results):
+                # The state at the start time is returned with a
+                # last_updated_ts of 0 by the start time query
+                last_updated_ts = row[last_updated_ts_idx] or start_time_ts
+                comp_state: dict[str, Any] = {COMPRESSED_STATE_STATE: state}
+                if not no_attributes:
+                    comp_state[COMPRESSED_STATE_ATTRIBUTES] = json_fragment(
+                        getattr(row, "attributes", None) or "{}"
+                    )
+                comp_state[COMPRESSED_STATE_LAST_UPDATED] = last_updated_ts
+                if (
+                    last_changed_ts := getattr(row, "last_changed_ts", None)
+                ) and last_changed_ts != last_updated_ts:
+                    comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+            elif state != prev_state:
+                # With minimal response only the first state is complete,
+                # the states after it are only sent when the state changed
+                comp_state = {
+                    COMPRESSED_STATE_STATE: state,
+                    COMPRESSED_STATE_LAST_UPDATED: row[last_updated_ts_idx],
+                }
+            else:
+                continue
+            prev_state = state
+            ent_results.append(comp_state)
+            remaining -= 1
+            if not remaining:
+                yield {
+                    entity_id: states for entity_id, states in chunk.items() if states
+                }
+                chunk = {}
+                ent_results = chunk[entity_id] = []
+                remaining = chunk_size
+    if chunk := {entity_id: states for entity_id, states in chunk.items() if states}:
+        yield chunk
+
+
+def _numeric_rows_from_states(
+    states: Iterable[Row],
+) -> Iterator[tuple[int, float, float | None]]:
+    """Parse the values of states into (metadata_id, timestamp, value) rows."""
+    field_map = _FIELD_MAP
+    metadata_id_idx = field_map["metadata_id"]
+    state_idx = field_map["state"]
+    last_updated_ts_idx = field_map["last_updated_ts"]
+    for row in states:
+        yield (
+            row[metadata_id_idx],
+            row[last_updated_ts_idx],
+            numeric_state_value(row[state_idx]),
+        )
+
+
+def _sorted_numeric_rows_to_dict(
+    rows: Iterable[tuple[int, float, float | None]],
+    start_time_ts: float | None,
+    entity_ids: list[str],
+    entity_id_to_metadata_id: dict[str, int | None],
+) -> dict[str, list[tuple[float, float | None]]]:
+    """Convert (metadata_id, timestamp, value) rows into pairs per entity.
+
+    Rows must be sorted by metadata_id and timestamp. Repeated values
+    are dropped since they do not change the graph.
+    """
+    # Set all entity IDs to empty lists in result set to maintain the order
+    result: dict[str, list[tuple[float, float | None]]] = {
+        entity_id: [] for entity_id in entity_ids
+    }
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    for metadata_id, group in groupby(rows, itemgetter(0)):
+        ent_results = result[metadata_id_to_entity_id[metadata_id]]
+        prev_value: float | None = None
+        for _, last_updated_ts, value in group:
+            if ent_results and value == prev_value:
+                continue
+            # The state at the start time is returned with a
+            # last_updated_ts of 0 by the start time query
+            if start_time_ts is not None and last_updated_ts < start_time_ts:
+                last_updated_ts = start_time_ts
+            ent_results.append((last_updated_ts, value))
+            prev_value = value
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
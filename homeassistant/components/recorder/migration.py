@@ -5,15 +5,24 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable
 import contextlib
-from dataclasses import dataclass, replace as dataclass_replace
+from dataclasses import dataclass, field, replace as dataclass_replace
 from datetime import timedelta
 import logging
-from time import time
+from time import monotonic, sleep, time
 from typing import TYPE_CHECKING, Any, cast, final
 from uuid import UUID
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text, update
+from sqlalchemy import (
+    ForeignKeyConstraint,
+    MetaData,
+    Table,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.engine import CursorResult, Engine
 from sqlalchemy.exc import (
     DatabaseError,
@@ -53,7 +62,9 @@ from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
+    MIGRATION_CHECKPOINT_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUPS_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
@@ -75,8 +86,11 @@ from .db_schema import (
     SchemaChanges,
     States,
     StatesMeta,
+    StatesNumeric,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -84,6 +98,10 @@ from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
 from .queries import (
     batch_cleanup_entity_ids,
+    count_entity_ids_to_migrate,
+    count_event_type_to_migrate,
+    count_events_context_ids_to_migrate,
+    count_states_context_ids_to_migrate,
     delete_duplicate_short_term_statistics_row,
     delete_duplicate_statistics_row,
     find_entity_ids_to_migrate,
@@ -93,6 +111,7 @@ from .queries import (
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     get_migration_changes,
+    get_migration_checkpoint,
     has_entity_ids_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
@@ -102,9 +121,15 @@ from .queries import (
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import cleanup_statistics_timestamp_migration, get_start_time
+from .statistics import (
+    cleanup_statistics_timestamp_migration,
+    get_start_time,
+    rebuild_statistics_rollups,
+)
 from .tasks import RecorderTask
 from .util import (
+    async_create_migration_progress_issue,
+    async_delete_migration_progress_issue,
     database_job_retry_wrapper,
     database_job_retry_wrapper_method,
     execute_stmt_lambda_element,
@@ -132,6 +157,9 @@ MIGRATION_NOTE_MINUTES = (
 )
 MIGRATION_NOTE_WHILE = "This will take a while; please be patient!"
 
+# Minimum number of seconds between updates of the migration progress issue
+MIGRATION_PROGRESS_ISSUE_INTERVAL = 30
+
 _EMPTY_ENTITY_ID = "missing.entity_id"
 _EMPTY_EVENT_TYPE = "missing_event_type"
 
@@ -1987,6 +2015,32 @@ class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
         _migrate_columns_to_timestamp(self.instance, self.session_maker, self.engine)
 
 
+class _SchemaVersion49Migrator(_SchemaVersionMigrator, target_version=49):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The rollup tables are filled by StatisticsRollupsMigration
+        for table in (StatisticsDaily, StatisticsMonthly):
+            cast(Table, table.__table__).create(self.engine, checkfirst=True)
+
+
+class _SchemaVersion50Migrator(_SchemaVersionMigrator, target_version=50):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        _add_columns(
+            self.session_maker,
+            "migration_changes",
+            [f"checkpoint {self.column_types.big_int_type}"],
+        )
+
+
+class _SchemaVersion51Migrator(_SchemaVersionMigrator, target_version=51):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # Numeric states are only written from this version on, older
+        # history is read from the states table
+        cast(Table, StatesNumeric.__table__).create(self.engine, checkfirst=True)
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2406,7 +2460,11 @@ class MigrationTask(RecorderTask):
         """Run migration task."""
         if not self.migrator.migrate_data(instance):
             # Schedule a new migration task if this one didn't finish
-            instance.queue_task(MigrationTask(self.migrator))
+            task = MigrationTask(self.migrator)
+            if delay := self.migrator.throttle_delay(instance):
+                instance.queue_task_later(task, delay)
+            else:
+                instance.queue_task(task)
 
 
 @dataclass(slots=True)
@@ -2422,6 +2480,41 @@ class DataMigrationStatus:
 
     needs_migrate: bool
     migration_done: bool
+    rows_migrated: int = 0
+
+
+@dataclass(slots=True)
+class MigrationProgress:
+    """Progress of the data migration which is running."""
+
+    migration_id: str
+    rows_total: int | None
+    rows_done: int = 0
+    started: float = field(default_factory=monotonic)
+    issue_updated: float | None = None
+
+    def eta(self) -> float | None:
+        """Return the estimated number of seconds until the migration is done."""
+        if self.rows_total is None or not self.rows_done:
+            return None
+        rows_left = max(self.rows_total - self.rows_done, 0)
+        return rows_left * (monotonic() - self.started) / self.rows_done
+
+    def throttle_delay(self, rows_per_second: int | None) -> float:
+        """Return how many seconds to wait to stay within the rows per second."""
+        if not rows_per_second:
+            return 0
+        return max(self.rows_done / rows_per_second - (monotonic() - self.started), 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress as a dict."""
+        eta = self.eta()
+        return {
+            "migration_id": self.migration_id,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "eta": None if eta is None else round(eta),
+        }
 
 
 class BaseMigration(ABC):
@@ -2448,6 +2541,7 @@ class BaseMigration(ABC):
         self.initial_schema_version = initial_schema_version
         self.start_schema_version = start_schema_version
         self.migration_changes = migration_changes
+        self._progress: MigrationProgress | None = None
 
     @abstractmethod
     def migrate_data(self, instance: Recorder, /) -> bool:
@@ -2455,7 +2549,12 @@ class BaseMigration(ABC):
 
     def _migrate_data(self, instance: Recorder) -> bool:
         """Migrate some data, returns True if migration is completed."""
+        if (progress := self._progress) is None:
+            with session_scope(session=instance.get_session()) as session:
+                progress = self._progress = self._start_progress(instance, session)
+            instance.migration_progress = progress
         status = self.migrate_data_impl(instance)
+        progress.rows_done += status.rows_migrated
         if status.migration_done:
             with session_scope(session=instance.get_session()) as session:
                 self.migration_done(instance, session)
@@ -2463,8 +2562,64 @@ class BaseMigration(ABC):
             if self.index_to_drop is not None:
                 table, index, _ = self.index_to_drop
                 _drop_index(instance.get_session, table, index)
+        if status.needs_migrate:
+            self._report_progress(instance, progress)
+        else:
+            self._finish_progress(instance, progress)
         return not status.needs_migrate
 
+    def _start_progress(
+        self, instance: Recorder, session: Session
+    ) -> MigrationProgress:
+        """Start tracking the progress of the migration."""
+        return MigrationProgress(
+            self.migration_id, self.rows_to_migrate(instance, session)
+        )
+
+    def _report_progress(self, instance: Recorder, progress: MigrationProgress) -> None:
+        """Report the progress of the migration in a repair issue."""
+        if (eta := progress.eta()) is None or progress.rows_total is None:
+            return
+        now = monotonic()
+        if (
+            progress.issue_updated is not None
+            and now - progress.issue_updated < MIGRATION_PROGRESS_ISSUE_INTERVAL
+        ):
+            return
+        progress.issue_updated = now
+        _LOGGER.info(
+            "Data migration '%s' migrated %s of %s rows",
+            self.migration_id,
+            progress.rows_done,
+            progress.rows_total,
+        )
+        instance.hass.add_job(
+            async_create_migration_progress_issue,
+            instance.hass,
+            self.migration_id,
+            progress.rows_done,
+            progress.rows_total,
+            eta,
+        )
+
+    def _finish_progress(self, instance: Recorder, progress: MigrationProgress) -> None:
+        """Stop tracking the progress of the migration."""
+        self._progress = None
+        if instance.migration_progress is progress:
+            instance.migration_progress = None
+        if progress.issue_updated is not None:
+            instance.hass.add_job(async_delete_migration_progress_issue, instance.hass)
+
+    def rows_to_migrate(self, instance: Recorder, session: Session) -> int | None:
+        """Return the number of rows to migrate or None if it is not known."""
+        return None
+
+    def throttle_delay(self, instance: Recorder) -> float:
+        """Return how many seconds to wait before migrating more data."""
+        if self._progress is None:
+            return 0
+        return self._progress.throttle_delay(instance.migration_rows_per_second)
+
     @abstractmethod
     def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
         """Migrate some data, return if the migration needs to run and if it is done."""
@@ -2563,7 +2718,8 @@ class BaseOffLineMigration(BaseMigration):
             MIGRATION_NOTE_OFFLINE,
         )
         while not self.migrate_data(instance):
-            pass
+            if delay := self.throttle_delay(instance):
+                sleep(delay)
         _LOGGER.warning("Data migration step '%s' completed", self.migration_id)
 
     @database_job_retry_wrapper_method("migrate data", 10)
@@ -2596,6 +2752,51 @@ class BaseRunTimeMigration(BaseMigration):
 
     task = MigrationTask
 
+    def __init__(
+        self,
+        *,
+        initial_schema_version: int,
+        start_schema_version: int,
+        migration_changes: dict[str, int],
+    ) -> None:
+        """Initialize a new BaseRunTimeMigration."""
+        super().__init__(
+            initial_schema_version=initial_schema_version,
+            start_schema_version=start_schema_version,
+            migration_changes=migration_changes,
+        )
+        # Where the migration continues, saved in the migration changes
+        # table so an interrupted migration does not start over
+        self.checkpoint: int | None = None
+
+    def _start_progress(
+        self, instance: Recorder, session: Session
+    ) -> MigrationProgress:
+        """Load the checkpoint and start tracking the progress of the migration."""
+        if instance.schema_version >= MIGRATION_CHECKPOINT_SCHEMA_VERSION:
+            self.checkpoint = session.execute(
+                get_migration_checkpoint(self.migration_id)
+            ).scalar()
+            if self.checkpoint is not None:
+                _LOGGER.info(
+                    "Data migration '%s' continues from checkpoint %s",
+                    self.migration_id,
+                    self.checkpoint,
+                )
+        return super()._start_progress(instance, session)
+
+    def _save_checkpoint(self, instance: Recorder) -> None:
+        """Save the checkpoint of the migration."""
+        if instance.schema_version < MIGRATION_CHECKPOINT_SCHEMA_VERSION:
+            return
+        with session_scope(session=instance.get_session()) as session:
+            _set_migration_changes(
+                session,
+                self.migration_id,
+                version=self.migration_changes.get(self.migration_id, 0),
+                checkpoint=self.checkpoint,
+            )
+
     def queue_migration(self, instance: Recorder, session: Session) -> None:
         """Start migration if needed."""
         if self.needs_migrate(instance, session):
@@ -2625,6 +2826,16 @@ class BaseMigrationWithQuery(BaseMigration):
             needs_migrate=bool(needs_migrate), migration_done=not needs_migrate
         )
 
+    def count_query(self) -> StatementLambdaElement | None:
+        """Return the query to count the rows to migrate."""
+        return None
+
+    def rows_to_migrate(self, instance: Recorder, session: Session) -> int | None:
+        """Return the number of rows to migrate or None if it is not known."""
+        if (count_query := self.count_query()) is None:
+            return None
+        return cast(int, session.execute(count_query).scalar())
+
 
 class StatesContextIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
     """Migration to migrate states context_ids to binary format."""
@@ -2663,12 +2874,18 @@ class StatesContextIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
             is_done = not states
 
         _LOGGER.debug("Migrating states context_ids to binary format: done=%s", is_done)
-        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+        return DataMigrationStatus(
+            needs_migrate=not is_done, migration_done=is_done, rows_migrated=len(states)
+        )
 
     def needs_migrate_query(self) -> StatementLambdaElement:
         """Return the query to check if the migration needs to run."""
         return has_states_context_ids_to_migrate()
 
+    def count_query(self) -> StatementLambdaElement:
+        """Return the query to count the rows to migrate."""
+        return count_states_context_ids_to_migrate()
+
 
 class EventsContextIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
     """Migration to migrate events context_ids to binary format."""
@@ -2707,12 +2924,18 @@ class EventsContextIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
             is_done = not events
 
         _LOGGER.debug("Migrating events context_ids to binary format: done=%s", is_done)
-        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+        return DataMigrationStatus(
+            needs_migrate=not is_done, migration_done=is_done, rows_migrated=len(events)
+        )
 
     def needs_migrate_query(self) -> StatementLambdaElement:
         """Return the query to check if the migration needs to run."""
         return has_events_context_ids_to_migrate()
 
+    def count_query(self) -> StatementLambdaElement:
+        """Return the query to count the rows to migrate."""
+        return count_events_context_ids_to_migrate()
+
 
 class EventTypeIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
     """Migration to migrate event_type to event_type_ids."""
@@ -2777,12 +3000,18 @@ class EventTypeIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
             is_done = not events
 
         _LOGGER.debug("Migrating event_types done=%s", is_done)
-        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+        return DataMigrationStatus(
+            needs_migrate=not is_done, migration_done=is_done, rows_migrated=len(events)
+        )
 
     def needs_migrate_query(self) -> StatementLambdaElement:
         """Check if the data is migrated."""
         return has_event_type_to_migrate()
 
+    def count_query(self) -> StatementLambdaElement:
+        """Return the query to count the rows to migrate."""
+        return count_event_type_to_migrate()
+
 
 class EntityIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
     """Migration to migrate entity_ids to states_meta."""
@@ -2857,12 +3086,18 @@ class EntityIDMigration(BaseMigrationWithQuery, BaseOffLineMigration):
             is_done = not states
 
         _LOGGER.debug("Migrating entity_ids done=%s", is_done)
-        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+        return DataMigrationStatus(
+            needs_migrate=not is_done, migration_done=is_done, rows_migrated=len(states)
+        )
 
     def needs_migrate_query(self) -> StatementLambdaElement:
         """Check if the data is migrated."""
         return has_entity_ids_to_migrate()
 
+    def count_query(self) -> StatementLambdaElement:
+        """Return the query to count the rows to migrate."""
+        return count_entity_ids_to_migrate()
+
 
 class EventIDPostMigration(BaseRunTimeMigration):
     """Migration to remove old event_id index from states."""
@@ -2979,18 +3214,92 @@ NON_LIVE_DATA_MIGRATORS: tuple[type[BaseOffLineMigration], ...] = (
     EntityIDPostMigration,  # Introduced in HA Core 2023.4 by PR #89557
 )
 
+
+class StatisticsRollupsMigration(BaseRunTimeMigration):
+    """Migration to roll up the existing hourly statistics per day and month."""
+
+    migration_id = "statistics_rollups"
+    max_initial_schema_version = STATISTICS_ROLLUPS_SCHEMA_VERSION - 1
+    task = MigrationTask
+    migration_version = 1
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Roll up a month of hourly statistics, return True if completed."""
+        _LOGGER.debug("Rolling up hourly statistics")
+        start_time_ts = self.checkpoint
+        next_start_time_ts = rebuild_statistics_rollups(instance, start_time_ts)
+        with session_scope(session=instance.get_session()) as session:
+            rows_migrated = self._count_statistics(
+                session, start_time_ts, next_start_time_ts
+            )
+        self.checkpoint = (
+            None if next_start_time_ts is None else int(next_start_time_ts)
+        )
+        self._save_checkpoint(instance)
+        is_done = next_start_time_ts is None
+        return DataMigrationStatus(
+            needs_migrate=not is_done,
+            migration_done=is_done,
+            rows_migrated=rows_migrated,
+        )
+
+    def rows_to_migrate(self, instance: Recorder, session: Session) -> int | None:
+        """Return the number of hourly statistics rows to roll up."""
+        return self._count_statistics(session, self.checkpoint, None)
+
+    @staticmethod
+    def _count_statistics(
+        session: Session, start_time_ts: float | None, end_time_ts: float | None
+    ) -> int:
+        """Count the hourly statistics rows between start and end."""
+        stmt = select(func.count(Statistics.id))
+        if start_time_ts is not None:
+            stmt = stmt.filter(Statistics.start_ts >= start_time_ts)
+        if end_time_ts is not None:
+            stmt = stmt.filter(Statistics.start_ts < end_time_ts)
+        return cast(int, session.execute(stmt).scalar())
+
+    def migration_done(self, instance: Recorder, session: Session) -> None:
+        """Will be called after migrate returns True or if migration is not needed."""
+        instance.statistics_rollups_active = True
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        return DataMigrationStatus(needs_migrate=True, migration_done=False)
+
+
 LIVE_DATA_MIGRATORS: tuple[type[BaseRunTimeMigration], ...] = (
     EventIDPostMigration,  # Introduced in HA Core 2023.4 by PR #89901
+    StatisticsRollupsMigration,
 )
 
 
 def _mark_migration_done(session: Session, migration: type[BaseMigration]) -> None:
     """Mark a migration as done in the database."""
-    session.merge(
-        MigrationChanges(
-            migration_id=migration.migration_id, version=migration.migration_version
-        )
+    _set_migration_changes(
+        session, migration.migration_id, version=migration.migration_version
+    )
+
+
+def _set_migration_changes(
+    session: Session, migration_id: str, **values: int | None
+) -> None:
+    """Update the row of a migration in the migration changes table.
+
+    Only the given columns are written since the migration changes table
+    may not have the columns of the current schema yet.
+    """
+    result = session.execute(
+        update(MigrationChanges)
+        .where(MigrationChanges.migration_id == migration_id)
+        .values(**values)
     )
+    if not result.rowcount:
+        session.execute(
+            insert(MigrationChanges).values(migration_id=migration_id, **values)
+        )
 
 
 def rebuild_sqlite_table(
@@ -10,7 +10,13 @@ from .context import (
 )
 from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
 from .event import extract_event_type_ids
-from .state import LazyState, extract_metadata_ids, row_to_compressed_state
+from .state import (
+    LazyState,
+    extract_metadata_ids,
+    numeric_state_value,
+    row_to_compressed_state,
+)
+from .state_attributes import compress_shared_attrs, decompress_shared_attrs
 from .statistics import (
     CalendarStatisticPeriod,
     FixedStatisticPeriod,
@@ -43,9 +49,12 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "compress_shared_attrs",
     "datetime_to_timestamp_or_none",
+    "decompress_shared_attrs",
     "extract_event_type_ids",
     "extract_metadata_ids",
+    "numeric_state_value",
     "process_timestamp",
     "process_timestamp_to_utc_isoformat",
     "row_to_compressed_state",
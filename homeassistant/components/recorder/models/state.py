@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
+from math import isfinite
 from typing import TYPE_CHECKING, Any
 
 from propcache import cached_property
@@ -36,6 +37,17 @@ def extract_metadata_ids(
     ]
 
 
+def numeric_state_value(state: str | None) -> float | None:
+    """Return the value of a numeric state or None if it is not numeric."""
+    if state is None:
+        return None
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    return value if isfinite(value) else None
+
+
 class LazyState(State):
     """A lazy version of core State after schema 31."""
 
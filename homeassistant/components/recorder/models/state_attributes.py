@@ -2,14 +2,90 @@
 
 from __future__ import annotations
 
+from base64 import b64decode, b64encode
 import logging
-from typing import Any
+from typing import Any, cast
+import zlib
 
+from homeassistant.const import ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util.json import json_loads_object
 
 EMPTY_JSON_OBJECT = "{}"
 _LOGGER = logging.getLogger(__name__)
 
+# Compressed shared_attrs are a JSON object holding the compressed JSON of
+# the attributes under this key. It is followed by the attributes which are
+# looked at by database queries, so the queries keep working.
+COMPRESSED_ATTRS_KEY = "__compressed_v1__"
+_COMPRESSED_ATTRS_PREFIX = f'{{"{COMPRESSED_ATTRS_KEY}":"'
+_COMPRESSED_ATTRS_PREFIX_LENGTH = len(_COMPRESSED_ATTRS_PREFIX)
+_UNCOMPRESSED_ATTRS = (ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT)
+
+# Shorter shared_attrs do not get smaller by compressing them
+COMPRESS_MIN_LENGTH = 256
+
+# Preset dictionary with the keys and values frequently found in attributes,
+# zlib finds matches at the end of the dictionary with the shortest codes.
+# Changing it requires a new COMPRESSED_ATTRS_KEY.
+_COMPRESSION_DICTIONARY = (
+    b'"attribution":"Data provided by ","entity_picture":"/api/","media_'
+    b'content_id":"media_content_type":"music","media_duration":"media_position'
+    b'":"media_position_updated_at":"media_title":"media_artist":"media_album_'
+    b'name":"app_name":"source_list":["sound_mode_list":["volume_level":"is_'
+    b'volume_muted":false,"shuffle":false,"repeat":"off","hvac_modes":["off",'
+    b'"heat","cool","auto"],"hvac_action":"idle","min_temp":7,"max_temp":35,'
+    b'"target_temp_step":0.5,"current_temperature":"target_temp_high":null,'
+    b'"target_temp_low":null,"fan_modes":["preset_modes":["preset_mode":"none",'
+    b'"supported_color_modes":["color_temp","xy"],"color_mode":"brightness":'
+    b'"color_temp_kelvin":"min_color_temp_kelvin":"max_color_temp_kelvin":'
+    b'"hs_color":["rgb_color":["xy_color":["effect_list":["effect":null,'
+    b'"forecast":[{"datetime":"T00:00:00+00:00","condition":"partlycloudy",'
+    b'"cloudy","sunny","rainy","clear-night","temperature":"templow":'
+    b'"precipitation":0.0,"precipitation_probability":"wind_bearing":'
+    b'"wind_speed":"wind_gust_speed":"humidity":"pressure":"cloud_coverage":'
+    b'"uv_index":"dew_point":"apparent_temperature":"temperature_unit":"\\u00b0C",'
+    b'"pressure_unit":"hPa","wind_speed_unit":"km/h","visibility_unit":"km",'
+    b'"precipitation_unit":"mm","latitude":"longitude":"gps_accuracy":'
+    b'"source":"restored":true,"last_triggered":"current":0,"id":"editable":'
+    b'true,"options":["state_class":"measurement","total_increasing","device_'
+    b'class":"temperature","power","energy","timestamp","enum","supported_'
+    b'features":0,"icon":"mdi:","unit_of_measurement":"friendly_name":"'
+)
+
+
+def compress_shared_attrs(shared_attrs: str) -> str:
+    """Return shared_attrs compressed or unchanged if compressing is not worth it."""
+    if len(shared_attrs) < COMPRESS_MIN_LENGTH:
+        return shared_attrs
+    compressor = zlib.compressobj(zdict=_COMPRESSION_DICTIONARY)
+    compressed = compressor.compress(shared_attrs.encode()) + compressor.flush()
+    stored: dict[str, Any] = {COMPRESSED_ATTRS_KEY: b64encode(compressed).decode()}
+    attributes = json_loads_object(shared_attrs)
+    for key in _UNCOMPRESSED_ATTRS:
+        if key in attributes:
+            stored[key] = attributes[key]
+    if len(stored_attrs := json_bytes(stored).decode()) >= len(shared_attrs):
+        return shared_attrs
+    return stored_attrs
+
+
+def decompress_shared_attrs(shared_attrs: str | None) -> str | None:
+    """Return the JSON of the attributes of compressed or plain shared_attrs."""
+    if (
+        not shared_attrs
+        or shared_attrs[:_COMPRESSED_ATTRS_PREFIX_LENGTH] != _COMPRESSED_ATTRS_PREFIX
+    ):
+        return shared_attrs
+    try:
+        attributes = json_loads_object(shared_attrs)
+        compressed = b64decode(cast(str, attributes[COMPRESSED_ATTRS_KEY]))
+        decompressor = zlib.decompressobj(zdict=_COMPRESSION_DICTIONARY)
+        return (decompressor.decompress(compressed) + decompressor.flush()).decode()
+    except (ValueError, zlib.error):
+        _LOGGER.exception("Error decompressing state attributes: %s", shared_attrs)
+        return EMPTY_JSON_OBJECT
+
 
 def decode_attributes_from_source(
     source: Any, attr_cache: dict[str, dict[str, Any]]
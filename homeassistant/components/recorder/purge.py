@@ -6,13 +6,16 @@ from collections.abc import Callable
 from datetime import datetime
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
+from homeassistant.util.event_type import EventType
 
-from .db_schema import Events, States, StatesMeta
+from .archive import ArchivedState, ArchivedStatistics
+from .const import NUMERIC_STATES_SCHEMA_VERSION
+from .db_schema import Events, States, StatesMeta, StatisticsShortTerm
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -25,18 +28,24 @@ from .queries import (
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
     delete_states_meta_rows,
+    delete_states_numeric_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
-    delete_statistics_short_term_rows,
+    delete_statistics_short_term_rows_before,
     disconnect_states_rows,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
+    find_events_beyond_ring_buffer,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
-    find_short_term_statistics_to_purge,
+    find_oldest_short_term_statistics_start_ts,
+    find_short_term_statistics_purge_period_end,
+    find_short_term_statistics_to_archive,
+    find_states_beyond_ring_buffer,
+    find_states_to_archive,
     find_states_to_purge,
     find_statistics_runs_to_purge,
 )
@@ -52,6 +61,45 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# The continuous purge deletes one batch of up to max_bind_vars
+# states and events at a time
+CONTINUOUS_PURGE_BATCHES = 1
+# Seconds between continuous purge steps, the delay doubles while the
+# recorder is busy and halves again once it has caught up
+CONTINUOUS_PURGE_MIN_DELAY = 1.0
+CONTINUOUS_PURGE_MAX_DELAY = 60.0
+# The recorder is busy if the backlog or the commit duration
+# in seconds is above these limits
+CONTINUOUS_PURGE_MAX_BACKLOG = 100
+CONTINUOUS_PURGE_MAX_COMMIT_DURATION = 0.5
+# Wait at least this many times as long as a purge step took before
+# the next one, which limits the purge to a fifth of the recorder thread
+CONTINUOUS_PURGE_IDLE_RATIO = 4
+# Number of free SQLite pages returned to the file system after each step
+CONTINUOUS_PURGE_VACUUM_PAGES = 1024
+
+
+class PurgePacer:
+    """Pace the continuous purge by the recorder backlog and commit duration."""
+
+    __slots__ = ("delay", "running")
+
+    def __init__(self) -> None:
+        """Initialize the pacer."""
+        self.delay = CONTINUOUS_PURGE_MIN_DELAY
+        self.running = False
+
+    def next_delay(self, instance: Recorder, step_duration: float) -> float:
+        """Return the seconds to wait before the next purge step."""
+        if (
+            instance.backlog > CONTINUOUS_PURGE_MAX_BACKLOG
+            or instance.commit_duration > CONTINUOUS_PURGE_MAX_COMMIT_DURATION
+        ):
+            self.delay = min(self.delay * 2, CONTINUOUS_PURGE_MAX_DELAY)
+        else:
+            self.delay = max(self.delay / 2, CONTINUOUS_PURGE_MIN_DELAY)
+        return max(self.delay, step_duration * CONTINUOUS_PURGE_IDLE_RATIO)
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -61,10 +109,12 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    cleanup: bool = True,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+    The cleanups of a finished purge cycle are skipped if cleanup is False.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
@@ -95,16 +145,14 @@ def purge_old_data(
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
         )
-        short_term_statistics = _select_short_term_statistics_to_purge(
-            session, purge_before, instance.max_bind_vars
-        )
         if statistics_runs:
             _purge_statistics_runs(session, statistics_runs)
 
-        if short_term_statistics:
-            _purge_short_term_statistics(session, short_term_statistics)
+        has_more_to_purge |= _purge_short_term_statistics(
+            instance, session, purge_before
+        )
 
-        if has_more_to_purge or statistics_runs or short_term_statistics:
+        if has_more_to_purge or statistics_runs:
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
             return False
@@ -113,6 +161,9 @@ def purge_old_data(
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
             return False
 
+        if not cleanup:
+            return True
+
         # This purge cycle is finished, clean up old event types and
         # recorder runs
         _purge_old_event_types(instance, session)
@@ -146,6 +197,7 @@ def _purge_legacy_format(
     ) = _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
         session, purge_before, instance.max_bind_vars
     )
+    _archive_state_ids(instance, session, state_ids)
     _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids)
     _purge_event_ids(session, event_ids)
@@ -162,6 +214,7 @@ def _purge_legacy_format(
     ) = _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
         session, purge_before, instance.max_bind_vars
     )
+    _archive_state_ids(instance, session, detached_state_ids)
     _purge_state_ids(instance, session, detached_state_ids)
     _purge_unused_attributes_ids(instance, session, detached_attributes_ids)
     return bool(
@@ -200,6 +253,7 @@ def _purge_states_and_attributes_ids(
         if not state_ids:
             has_remaining_state_ids_to_purge = False
             break
+        _archive_state_ids(instance, session, state_ids)
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
 
@@ -388,17 +442,6 @@ def _select_statistics_runs_to_purge(
     return statistic_runs_list
 
 
-def _select_short_term_statistics_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
-) -> list[int]:
-    """Return a list of short term statistics to purge."""
-    statistics = session.execute(
-        find_short_term_statistics_to_purge(purge_before, max_bind_vars)
-    ).all()
-    _LOGGER.debug("Selected %s short term statistics to remove", len(statistics))
-    return [statistic_id for (statistic_id,) in statistics]
-
-
 def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
@@ -454,6 +497,16 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     return event_ids, state_ids, attributes_ids, data_ids
 
 
+def _archive_state_ids(
+    instance: Recorder, session: Session, state_ids: set[int]
+) -> None:
+    """Write states to the archive before they are purged."""
+    if instance.archive is None or not state_ids:
+        return
+    states = session.execute(find_states_to_archive(state_ids)).all()
+    instance.archive.write_states(cast(list[ArchivedState], states))
+
+
 def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int]) -> None:
     """Disconnect states and delete by state id."""
     if not state_ids:
@@ -466,6 +519,11 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     disconnected_rows = session.execute(disconnect_states_rows(state_ids))
     _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
 
+    if instance.schema_version >= NUMERIC_STATES_SCHEMA_VERSION:
+        # Delete the numeric values first for the same reason
+        deleted_rows = session.execute(delete_states_numeric_rows(state_ids))
+        _LOGGER.debug("Deleted %s numeric states", deleted_rows)
+
     deleted_rows = session.execute(delete_states_rows(state_ids))
     _LOGGER.debug("Deleted %s states", deleted_rows)
 
@@ -506,13 +564,41 @@ def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None
 
 
 def _purge_short_term_statistics(
-    session: Session, short_term_statistics: list[int]
-) -> None:
-    """Delete by id."""
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Delete the oldest short term statistics by a range of start times.
+
+    The range ends at the period of the max_bind_vars-th oldest row, so each
+    call deletes a bounded number of rows without selecting their ids first.
+    Returns true if there are more short term statistics to purge.
+    """
+    purge_before_ts = purge_before.timestamp()
+    period_end_ts: float | None = session.execute(
+        find_short_term_statistics_purge_period_end(
+            purge_before, instance.max_bind_vars
+        )
+    ).scalar()
+    if period_end_ts is None:
+        period_end_ts = purge_before_ts
+    elif (
+        period_end_ts
+        == session.execute(find_oldest_short_term_statistics_start_ts()).scalar()
+    ):
+        # The oldest period alone has more than max_bind_vars rows
+        period_end_ts = min(
+            period_end_ts + StatisticsShortTerm.duration.total_seconds(),
+            purge_before_ts,
+        )
+    if instance.archive is not None:
+        rows = session.execute(
+            find_short_term_statistics_to_archive(period_end_ts)
+        ).all()
+        instance.archive.write_statistics(cast(list[ArchivedStatistics], rows))
     deleted_rows = session.execute(
-        delete_statistics_short_term_rows(short_term_statistics)
+        delete_statistics_short_term_rows_before(period_end_ts)
     )
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+    return period_end_ts < purge_before_ts
 
 
 def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
@@ -729,21 +815,81 @@ def purge_entity_data(
             if entity_filter and entity_filter(entity_id)
         ]
         _LOGGER.debug("Purging entity data for %s", selected_metadata_ids)
-        if not selected_metadata_ids:
-            return True
-
         # Purge a max of max_bind_vars, based on the oldest states
         # or events record.
-        if not _purge_filtered_states(
-            instance,
-            session,
-            selected_metadata_ids,
-            database_engine,
-            purge_before_timestamp,
-        ):
-            _LOGGER.debug("Purging entity data hasn't fully completed yet")
-            return False
+        if selected_metadata_ids:
+            if not _purge_filtered_states(
+                instance,
+                session,
+                selected_metadata_ids,
+                database_engine,
+                purge_before_timestamp,
+            ):
+                _LOGGER.debug("Purging entity data hasn't fully completed yet")
+                return False
 
-        _purge_old_entity_ids(instance, session)
+            _purge_old_entity_ids(instance, session)
 
+    if instance.archive is not None and entity_filter:
+        # The archived states of the entities are purged once
+        # all their states are purged from the database
+        instance.archive.purge_states(entity_filter, purge_before_timestamp)
     return True
+
+
+@retryable_database_job("purge ring buffers")
+def purge_ring_buffers(
+    instance: Recorder,
+    entities: dict[str, int],
+    event_types: dict[EventType[Any] | str, int],
+) -> bool:
+    """Purge the rows beyond the newest rows kept of entities and event types.
+
+    entities and event_types map each entity_id and event type to the
+    number of rows to keep. Deletes up to max_bind_vars rows of each per
+    call. Returns true if everything beyond the ring buffers is purged.
+    """
+    has_more_to_purge = False
+    purged_entity_ids: list[str] = []
+    max_bind_vars = instance.max_bind_vars
+    with session_scope(session=instance.get_session()) as session:
+        for entity_id, metadata_id in instance.states_meta_manager.get_many(
+            entities, session, True
+        ).items():
+            if metadata_id is None:
+                continue
+            rows = session.execute(
+                find_states_beyond_ring_buffer(
+                    metadata_id, entities[entity_id], max_bind_vars
+                )
+            ).all()
+            if not rows:
+                continue
+            purged_entity_ids.append(entity_id)
+            _purge_state_ids(instance, session, {state_id for state_id, _ in rows})
+            _purge_unused_attributes_ids(
+                instance,
+                session,
+                {attributes_id for _, attributes_id in rows if attributes_id},
+            )
+            has_more_to_purge |= len(rows) == max_bind_vars
+        for event_type, event_type_id in instance.event_type_manager.get_many(
+            event_types, session, True
+        ).items():
+            if event_type_id is None:
+                continue
+            rows = session.execute(
+                find_events_beyond_ring_buffer(
+                    event_type_id, event_types[event_type], max_bind_vars
+                )
+            ).all()
+            if not rows:
+                continue
+            _purge_event_ids(session, {event_id for event_id, _ in rows})
+            _purge_unused_data_ids(
+                instance, session, {data_id for _, data_id in rows if data_id}
+            )
+            has_more_to_purge |= len(rows) == max_bind_vars
+    if purged_entity_ids:
+        instance.query_cache.purged_entities(purged_entity_ids)
+    return not has_more_to_purge
@@ -10,15 +10,19 @@ from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
 from .db_schema import (
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
     EventData,
     Events,
     EventTypes,
     MigrationChanges,
     RecorderRuns,
+    SchemaChanges,
     StateAttributes,
     States,
     StatesMeta,
+    StatesNumeric,
     Statistics,
+    StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -181,6 +185,15 @@ def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def delete_states_numeric_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_numeric rows."""
+    return lambda_stmt(
+        lambda: delete(StatesNumeric)
+        .where(StatesNumeric.state_id.in_(state_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_event_data_rows(data_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete event_data rows."""
     return lambda_stmt(
@@ -212,13 +225,13 @@ def delete_statistics_runs_rows(
     )
 
 
-def delete_statistics_short_term_rows(
-    short_term_statistics: Iterable[int],
+def delete_statistics_short_term_rows_before(
+    period_end_ts: float,
 ) -> StatementLambdaElement:
-    """Delete statistics_short_term rows."""
+    """Delete statistics_short_term rows which start before period_end_ts."""
     return lambda_stmt(
         lambda: delete(StatisticsShortTerm)
-        .where(StatisticsShortTerm.id.in_(short_term_statistics))
+        .where(StatisticsShortTerm.start_ts < period_end_ts)
         .execution_options(synchronize_session=False)
     )
 
@@ -269,6 +282,54 @@ def find_states_to_purge(
     )
 
 
+def find_states_to_archive(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Find the states to write to the archive before they are purged.
+
+    States recorded before the states meta migration finished only have
+    the entity_id of the legacy column.
+    """
+    return lambda_stmt(
+        lambda: select(
+            func.coalesce(StatesMeta.entity_id, States.entity_id),
+            States.state,
+            States.last_updated_ts,
+            States.last_changed_ts,
+            SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+        )
+        .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .where(States.state_id.in_(state_ids))
+    )
+
+
+def find_states_beyond_ring_buffer(
+    metadata_id: int, keep_last: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the states of an entity older than the newest keep_last states."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.attributes_id)
+        .filter(States.metadata_id == metadata_id)
+        .order_by(States.last_updated_ts.desc())
+        .offset(keep_last)
+        .limit(max_bind_vars)
+    )
+
+
+def find_events_beyond_ring_buffer(
+    event_type_id: int, keep_last: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the events of an event type older than the newest keep_last events."""
+    return lambda_stmt(
+        lambda: select(Events.event_id, Events.data_id)
+        .filter(Events.event_type_id == event_type_id)
+        .order_by(Events.time_fired_ts.desc())
+        .offset(keep_last)
+        .limit(max_bind_vars)
+    )
+
+
 def find_oldest_state() -> StatementLambdaElement:
     """Find the last_updated_ts of the oldest state."""
     return lambda_stmt(
@@ -278,15 +339,60 @@ def find_oldest_state() -> StatementLambdaElement:
     )
 
 
-def find_short_term_statistics_to_purge(
+def find_schema_version_reached(schema_version: int) -> StatementLambdaElement:
+    """Find when the schema was first changed to a version or a later one."""
+    return lambda_stmt(
+        lambda: select(SchemaChanges.changed)
+        .filter(SchemaChanges.schema_version >= schema_version)
+        .order_by(SchemaChanges.change_id.asc())
+        .limit(1)
+    )
+
+
+def find_short_term_statistics_purge_period_end(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
-    """Find short term statistics to purge."""
+    """Find the start of the first period beyond a short term statistics purge batch.
+
+    Returns no row if fewer than max_bind_vars short term statistics start
+    before purge_before.
+    """
     purge_before_ts = purge_before.timestamp()
     return lambda_stmt(
-        lambda: select(StatisticsShortTerm.id)
+        lambda: select(StatisticsShortTerm.start_ts)
         .filter(StatisticsShortTerm.start_ts < purge_before_ts)
-        .limit(max_bind_vars)
+        .order_by(StatisticsShortTerm.start_ts.asc())
+        .offset(max_bind_vars)
+        .limit(1)
+    )
+
+
+def find_oldest_short_term_statistics_start_ts() -> StatementLambdaElement:
+    """Find the start_ts of the oldest short term statistics."""
+    return lambda_stmt(
+        lambda: select(StatisticsShortTerm.start_ts)
+        .order_by(StatisticsShortTerm.start_ts.asc())
+        .limit(1)
+    )
+
+
+def find_short_term_statistics_to_archive(
+    period_end_ts: float,
+) -> StatementLambdaElement:
+    """Find the short term statistics to archive before they are purged."""
+    return lambda_stmt(
+        lambda: select(
+            StatisticsMeta.statistic_id,
+            StatisticsShortTerm.start_ts,
+            StatisticsShortTerm.mean,
+            StatisticsShortTerm.min,
+            StatisticsShortTerm.max,
+            StatisticsShortTerm.last_reset_ts,
+            StatisticsShortTerm.state,
+            StatisticsShortTerm.sum,
+        )
+        .join(StatisticsMeta, StatisticsShortTerm.metadata_id == StatisticsMeta.id)
+        .where(StatisticsShortTerm.start_ts < period_end_ts)
     )
 
 
@@ -447,6 +553,40 @@ def has_entity_ids_to_migrate() -> StatementLambdaElement:
     )
 
 
+def count_events_context_ids_to_migrate() -> StatementLambdaElement:
+    """Count the events context ids to migrate."""
+    return lambda_stmt(
+        lambda: select(func.count(Events.event_id)).filter(
+            Events.context_id_bin.is_(None)
+        )
+    )
+
+
+def count_states_context_ids_to_migrate() -> StatementLambdaElement:
+    """Count the states context ids to migrate."""
+    return lambda_stmt(
+        lambda: select(func.count(States.state_id)).filter(
+            States.context_id_bin.is_(None)
+        )
+    )
+
+
+def count_event_type_to_migrate() -> StatementLambdaElement:
+    """Count the event_types to migrate."""
+    return lambda_stmt(
+        lambda: select(func.count(Events.event_id)).filter(
+            Events.event_type_id.is_(None)
+        )
+    )
+
+
+def count_entity_ids_to_migrate() -> StatementLambdaElement:
+    """Count the entity_ids to migrate."""
+    return lambda_stmt(
+        lambda: select(func.count(States.state_id)).filter(States.metadata_id.is_(None))
+    )
+
+
 def find_states_context_ids_to_migrate(max_bind_vars: int) -> StatementLambdaElement:
     """Find events context_ids to migrate."""
     return lambda_stmt(
@@ -469,6 +609,15 @@ def get_migration_changes() -> StatementLambdaElement:
     )
 
 
+def get_migration_checkpoint(migration_id: str) -> StatementLambdaElement:
+    """Query the database for the checkpoint of an unfinished migration."""
+    return lambda_stmt(
+        lambda: select(MigrationChanges.checkpoint).filter(
+            MigrationChanges.migration_id == migration_id
+        )
+    )
+
+
 def find_event_types_to_purge() -> StatementLambdaElement:
     """Find event_type_ids to purge.
 
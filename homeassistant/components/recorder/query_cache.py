@@ -0,0 +1,388 @@
+"""Cache of recent history and statistics query results."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import threading
+from typing import Any, NamedTuple
+
+# Rough number of bytes used by a cached row besides its strings
+HISTORY_ROW_SIZE = 150
+STATISTICS_ROW_SIZE = 100
+STATISTICS_VALUE_SIZE = 60
+
+
+class HistoryRow(NamedTuple):
+    """A cached states row in the layout of the history queries."""
+
+    metadata_id: int
+    state: str | None
+    last_updated_ts: float
+    last_changed_ts: float | None
+    attributes: str | None
+
+
+type HistoryKey = tuple[tuple[str, ...], bool]
+type StatisticsKey = tuple[
+    tuple[str, ...], str, tuple[tuple[str, str], ...], tuple[str, ...]
+]
+
+
+def _history_row_size(row: HistoryRow) -> int:
+    """Return the estimated size of a history row."""
+    return HISTORY_ROW_SIZE + len(row.state or "") + len(row.attributes or "")
+
+
+def _statistics_rows_size(result: dict[str, list[dict[str, Any]]]) -> int:
+    """Return the estimated size of statistics rows."""
+    return sum(
+        STATISTICS_ROW_SIZE + STATISTICS_VALUE_SIZE * len(row)
+        for rows in result.values()
+        for row in rows
+    )
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """The states of entities since start_ts.
+
+    The rows of each entity are sorted by last_updated_ts, the first row
+    may be the state at start_ts with a last_updated_ts of 0.
+    """
+
+    start_ts: float
+    entity_id_to_metadata_id: dict[str, int | None]
+    rows: dict[str, list[HistoryRow]]
+    size: int = 0
+    last_used: int = 0
+
+
+@dataclass(slots=True)
+class StatisticsEntry:
+    """The statistics rows since start_ts."""
+
+    start_ts: float
+    result: dict[str, list[dict[str, Any]]]
+    generation: int
+    size: int = 0
+    last_used: int = 0
+
+
+@dataclass(slots=True)
+class QueryCache:
+    """A memory bounded cache of history and statistics query results.
+
+    Cached history is extended with the states the recorder commits, and
+    cached statistics with the statistics compiled after they were
+    fetched, so results for windows up to now stay valid. The least
+    recently used results are evicted once the cache uses more than
+    max_bytes.
+
+    This class is thread-safe.
+    """
+
+    max_bytes: int
+    size: int = 0
+    _history: OrderedDict[HistoryKey, HistoryEntry] = field(default_factory=OrderedDict)
+    _statistics: OrderedDict[StatisticsKey, StatisticsEntry] = field(
+        default_factory=OrderedDict
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _uses: int = 0
+    # Sequence of the last commit, of the last commit with states of each
+    # entity and of the last clear to detect results which missed states
+    _sequence: int = 0
+    _entity_sequence: dict[str, int] = field(default_factory=dict)
+    _clear_sequence: int = 0
+    _statistics_generation: int = 0
+    _purge_before_ts: float = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return if query results are cached."""
+        return self.max_bytes > 0
+
+    def history_sequence(self) -> int:
+        """Return the sequence to pass to store_history for a new result."""
+        return self._sequence
+
+    def get_history(
+        self, key: HistoryKey, start_ts: float
+    ) -> (
+        tuple[
+            dict[str, int | None], dict[str, tuple[HistoryRow | None, list[HistoryRow]]]
+        ]
+        | None
+    ):
+        """Return the state at start_ts and the states after it for each entity.
+
+        The metadata ids of the entities are returned with them. Returns
+        None if the states since start_ts are not cached.
+        """
+        with self._lock:
+            if (entry := self._history.get(key)) is None or start_ts < entry.start_ts:
+                return None
+            self._history.move_to_end(key)
+            entry.last_used = self._use()
+            result: dict[str, tuple[HistoryRow | None, list[HistoryRow]]] = {}
+            for entity_id, rows in entry.rows.items():
+                start_idx = bisect_left(rows, start_ts, key=_last_updated_ts)
+                after_idx = bisect_right(rows, start_ts, key=_last_updated_ts)
+                result[entity_id] = (
+                    rows[start_idx - 1] if start_idx else None,
+                    rows[after_idx:],
+                )
+            return entry.entity_id_to_metadata_id, result
+
+    def store_history(
+        self, key: HistoryKey, entry: HistoryEntry, sequence: int
+    ) -> None:
+        """Store a history result fetched after sequence was returned."""
+        entry.size = sum(
+            _history_row_size(row) for rows in entry.rows.values() for row in rows
+        )
+        with self._lock:
+            entity_sequence = self._entity_sequence
+            if (
+                sequence < self._clear_sequence
+                or entry.start_ts < self._purge_before_ts
+                or any(
+                    entity_sequence.get(entity_id, 0) > sequence
+                    for entity_id in entry.rows
+                )
+            ):
+                # States were committed or purged while the result was
+                # fetched, they may be missing from the result
+                return
+            self._pop_history(key)
+            entry.last_used = self._use()
+            self._history[key] = entry
+            self.size += entry.size
+            self._evict()
+
+    def add_states(
+        self,
+        states: Iterable[tuple[str, str | None, float, float | None, str | None]],
+    ) -> None:
+        """Add committed states to the cached history.
+
+        States are tuples of the entity_id, state, last_updated_ts,
+        last_changed_ts and shared attributes.
+        """
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            entity_sequence = self._entity_sequence
+            entries_by_entity: dict[str, list[tuple[HistoryKey, HistoryEntry]]] = {}
+            for key, entry in self._history.items():
+                for entity_id in entry.rows:
+                    entries_by_entity.setdefault(entity_id, []).append((key, entry))
+            invalid: set[HistoryKey] = set()
+            for entity_id, state, last_updated_ts, last_changed_ts, attrs in states:
+                entity_sequence[entity_id] = sequence
+                for key, entry in entries_by_entity.get(entity_id, ()):
+                    if (
+                        metadata_id := entry.entity_id_to_metadata_id[entity_id]
+                    ) is None:
+                        # The entity was not recorded when the result was
+                        # fetched so it can not be added to the result
+                        invalid.add(key)
+                        continue
+                    row = HistoryRow(
+                        metadata_id,
+                        state,
+                        last_updated_ts,
+                        last_changed_ts,
+                        None if key[1] else attrs,
+                    )
+                    rows = entry.rows[entity_id]
+                    if rows and rows[-1].last_updated_ts > last_updated_ts:
+                        insort(rows, row, key=_last_updated_ts)
+                    else:
+                        rows.append(row)
+                    row_size = _history_row_size(row)
+                    entry.size += row_size
+                    self.size += row_size
+            for key in invalid:
+                self._pop_history(key)
+            self._evict()
+
+    def get_statistics(
+        self, key: StatisticsKey, start_ts: float
+    ) -> tuple[dict[str, list[dict[str, Any]]], float | None] | None:
+        """Return the cached statistics since start_ts.
+
+        Returns None if the statistics since start_ts are not cached. Also
+        returns the start of the statistics to fetch to bring the result up
+        to date, or None if the result is up to date.
+        """
+        with self._lock:
+            if (
+                entry := self._statistics.get(key)
+            ) is None or start_ts < entry.start_ts:
+                return None
+            self._statistics.move_to_end(key)
+            entry.last_used = self._use()
+            refresh_start_ts: float | None = None
+            if entry.generation != self._statistics_generation:
+                # Statistics were compiled since the result was fetched,
+                # fetch them from the start of the last row of each
+                # statistic which may have been compiled again
+                refresh_start_ts = min(
+                    (
+                        rows[-1]["start"]
+                        if (rows := entry.result.get(statistic_id))
+                        else entry.start_ts
+                    )
+                    for statistic_id in key[0]
+                )
+            return {
+                statistic_id: [
+                    row.copy()
+                    for row in rows[bisect_left(rows, start_ts, key=_start) :]
+                ]
+                for statistic_id, rows in entry.result.items()
+            }, refresh_start_ts
+
+    def statistics_generation(self) -> int:
+        """Return the generation to pass to store_statistics for a new result."""
+        return self._statistics_generation
+
+    def store_statistics(
+        self,
+        key: StatisticsKey,
+        start_ts: float,
+        result: dict[str, list[dict[str, Any]]],
+        generation: int,
+    ) -> None:
+        """Store a statistics result fetched after generation was returned.
+
+        A result fetched for a start_ts after the start_ts of the cached
+        result replaces its rows since start_ts.
+        """
+        with self._lock:
+            if (
+                generation != self._statistics_generation
+                or start_ts < self._purge_before_ts
+            ):
+                # Statistics were compiled or purged while the result
+                # was fetched
+                return
+            if (entry := self._statistics.get(key)) is not None and (
+                start_ts >= entry.start_ts
+            ):
+                result = {
+                    statistic_id: [
+                        *(
+                            row
+                            for row in entry.result.get(statistic_id, ())
+                            if row["start"] < start_ts
+                        ),
+                        *(row.copy() for row in result.get(statistic_id, ())),
+                    ]
+                    for statistic_id in entry.result.keys() | result.keys()
+                }
+                start_ts = entry.start_ts
+            else:
+                result = {
+                    statistic_id: [row.copy() for row in rows]
+                    for statistic_id, rows in result.items()
+                }
+            self._pop_statistics(key)
+            new_entry = StatisticsEntry(
+                start_ts,
+                result,
+                generation,
+                _statistics_rows_size(result),
+                self._use(),
+            )
+            self._statistics[key] = new_entry
+            self.size += new_entry.size
+            self._evict()
+
+    def statistics_compiled(self) -> None:
+        """Mark cached statistics as missing newly compiled statistics."""
+        with self._lock:
+            self._statistics_generation += 1
+
+    def clear_statistics(self) -> None:
+        """Remove the cached statistics after they were changed."""
+        with self._lock:
+            self._statistics_generation += 1
+            for key in list(self._statistics):
+                self._pop_statistics(key)
+
+    def purged(self, purge_before_ts: float) -> None:
+        """Remove the cached results which may hold purged rows."""
+        with self._lock:
+            self._purge_before_ts = max(self._purge_before_ts, purge_before_ts)
+            for history_key, history_entry in list(self._history.items()):
+                if history_entry.start_ts < purge_before_ts:
+                    self._pop_history(history_key)
+            for statistics_key, statistics_entry in list(self._statistics.items()):
+                if statistics_entry.start_ts < purge_before_ts:
+                    self._pop_statistics(statistics_key)
+
+    def purged_entities(self, entity_ids: Iterable[str]) -> None:
+        """Remove the cached history of entities after some states were purged."""
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+            entity_sequence = self._entity_sequence
+            purged = set(entity_ids)
+            for entity_id in purged:
+                # Results which were fetched before may hold purged states
+                entity_sequence[entity_id] = sequence
+            for key, entry in list(self._history.items()):
+                if not purged.isdisjoint(entry.rows):
+                    self._pop_history(key)
+
+    def clear(self) -> None:
+        """Remove all cached results after rows were deleted or changed."""
+        with self._lock:
+            self._sequence += 1
+            self._clear_sequence = self._sequence
+            self._statistics_generation += 1
+            self._history.clear()
+            self._statistics.clear()
+            self.size = 0
+
+    def _use(self) -> int:
+        """Return the next use counter, the lock must be held."""
+        self._uses += 1
+        return self._uses
+
+    def _pop_history(self, key: HistoryKey) -> None:
+        """Remove a history result, the lock must be held."""
+        if (entry := self._history.pop(key, None)) is not None:
+            self.size -= entry.size
+
+    def _pop_statistics(self, key: StatisticsKey) -> None:
+        """Remove a statistics result, the lock must be held."""
+        if (entry := self._statistics.pop(key, None)) is not None:
+            self.size -= entry.size
+
+    def _evict(self) -> None:
+        """Evict the least recently used results, the lock must be held."""
+        while self.size > self.max_bytes and (self._history or self._statistics):
+            if not self._statistics or (
+                self._history
+                and next(iter(self._history.values())).last_used
+                < next(iter(self._statistics.values())).last_used
+            ):
+                self._pop_history(next(iter(self._history)))
+            else:
+                self._pop_statistics(next(iter(self._statistics)))
+
+
+def _last_updated_ts(row: HistoryRow) -> float:
+    """Return the last_updated_ts of a history row."""
+    return row.last_updated_ts
+
+
+def _start(row: dict[str, Any]) -> float:
+    """Return the start of a statistics row."""
+    return row["start"]  # type: ignore[no-any-return]
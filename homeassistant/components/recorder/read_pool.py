@@ -0,0 +1,133 @@
+"""A pool of read-only connections for history and statistics queries."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import threading
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.session import Session
+
+from .const import SupportedDialect
+from .util import execute_on_connection, setup_connection_for_dialect
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+# Maximum number of read jobs that run at the same time
+READ_POOL_SIZE = 4
+
+# Read jobs that take longer than this many seconds are cancelled
+READ_JOB_TIMEOUT = 120
+
+# Number of SQLite virtual machine instructions between checks
+# if the running read job was cancelled
+SQLITE_PROGRESS_HANDLER_INSTRUCTIONS = 10000
+
+
+class ReadJobCancelled(Exception):
+    """Error to indicate a read job was cancelled or timed out."""
+
+
+class ReadJob:
+    """Track if a read job should stop."""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self) -> None:
+        """Initialize the read job."""
+        self.cancelled = False
+
+
+class ReadPool:
+    """Read-only connections that do not contend with the recorder thread.
+
+    On SQLite the connections are WAL readers of the database file, on
+    MySQL and PostgreSQL they are pooled connections of their own. A
+    cancelled job is stopped before its next statement, SQLite also
+    interrupts the running statement. MySQL and PostgreSQL enforce the
+    timeout on the server instead.
+    """
+
+    def __init__(self, instance: Recorder, engine: Engine) -> None:
+        """Initialize the read pool."""
+        self.instance = instance
+        self.engine = engine
+        self._local = threading.local()
+        self._get_session = scoped_session(sessionmaker(bind=engine, future=True))
+        sqlalchemy_event.listen(engine, "connect", self._setup_connection)
+        sqlalchemy_event.listen(
+            engine, "before_cursor_execute", self._before_cursor_execute
+        )
+
+    def get_session(self) -> Session | None:
+        """Return a session on the read pool if called from a read job."""
+        if getattr(self._local, "job", None) is None:
+            return None
+        return self._get_session()
+
+    def run[_T](self, job: ReadJob, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a read job.
+
+        This call is not thread-safe and must be called from a read
+        executor thread.
+        """
+        if job.cancelled:
+            raise ReadJobCancelled
+        self._local.job = job
+        try:
+            return target(*args)
+        finally:
+            self._local.job = None
+
+    def close(self) -> None:
+        """Close the connections of the read pool."""
+        self.engine.dispose()
+
+    def _job_cancelled(self) -> bool:
+        """Return if the read job running in this thread was cancelled."""
+        job: ReadJob | None = getattr(self._local, "job", None)
+        return job is not None and job.cancelled
+
+    def _setup_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Set up a new read-only connection."""
+        dialect_name = self.engine.dialect.name
+        setup_connection_for_dialect(
+            self.instance, dialect_name, dbapi_connection, False
+        )
+        if dialect_name == SupportedDialect.SQLITE:
+            execute_on_connection(dbapi_connection, "PRAGMA query_only = ON")
+            dbapi_connection.set_progress_handler(  # type: ignore[attr-defined]
+                self._job_cancelled, SQLITE_PROGRESS_HANDLER_INSTRUCTIONS
+            )
+        elif dialect_name == SupportedDialect.MYSQL:
+            execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+            assert self.instance.engine is not None
+            if getattr(self.instance.engine.dialect, "is_mariadb", False):
+                statement = f"SET SESSION max_statement_time = {READ_JOB_TIMEOUT}"
+            else:
+                statement = (
+                    f"SET SESSION max_execution_time = {READ_JOB_TIMEOUT * 1000}"
+                )
+            execute_on_connection(dbapi_connection, statement)
+        elif dialect_name == SupportedDialect.POSTGRESQL:
+            execute_on_connection(
+                dbapi_connection,
+                "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+            )
+            execute_on_connection(
+                dbapi_connection, f"SET statement_timeout = {READ_JOB_TIMEOUT * 1000}"
+            )
+            # Settings are rolled back with the transaction they were made in
+            dbapi_connection.commit()
+
+    def _before_cursor_execute(self, *args: Any) -> None:
+        """Stop a cancelled read job before it runs another statement."""
+        if self._job_cancelled():
+            raise ReadJobCancelled
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
 
 def repack_database(instance: Recorder) -> None:
     """Repack based on engine type."""
@@ -25,6 +27,10 @@ def repack_database(instance: Recorder) -> None:
     if dialect_name == SupportedDialect.SQLITE:
         _LOGGER.debug("Vacuuming SQL DB to free space")
         with instance.engine.connect() as conn:
+            if instance.continuous_purge:
+                # Switching to incremental auto vacuum only
+                # takes effect when the database is vacuumed
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
             conn.execute(text("VACUUM"))
             conn.commit()
         return
@@ -46,3 +52,36 @@ def repack_database(instance: Recorder) -> None:
             conn.execute(text(f"OPTIMIZE TABLE {','.join(ALL_TABLES)}"))
             conn.commit()
         return
+
+
+def incremental_vacuum(instance: Recorder, pages: int) -> bool:
+    """Return up to pages free SQLite pages to the file system.
+
+    Databases created without incremental auto vacuum are skipped until
+    the scheduled repack converts them, since converting vacuums the whole
+    database.
+
+    Returns True if there are free pages remaining.
+    """
+    assert instance.engine is not None
+    if instance.engine.dialect.name != SupportedDialect.SQLITE:
+        return False
+    with instance.engine.connect() as conn:
+        # PRAGMA auto_vacuum reports the mode the connection last read
+        # from the database header, so read a page of the database first
+        conn.execute(text("PRAGMA freelist_count"))
+        if (
+            conn.execute(text("PRAGMA auto_vacuum")).scalar()
+            != SQLITE_AUTO_VACUUM_INCREMENTAL
+        ):
+            _LOGGER.debug(
+                "Skipping the incremental vacuum until the database is repacked"
+                " with incremental auto vacuum"
+            )
+            return False
+        # The sqlite3 module only runs a single step of statements
+        # without results, executescript runs it to completion
+        conn.connection.driver_connection.executescript(  # type: ignore[union-attr]
+            f"PRAGMA incremental_vacuum({pages})"
+        )
+        return bool(conn.execute(text("PRAGMA freelist_count")).scalar())
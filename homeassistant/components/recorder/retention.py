@@ -0,0 +1,193 @@
+"""Sampling and ring buffer retention of entities and event types."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event
+from homeassistant.util.event_type import EventType
+
+
+@dataclass(slots=True, frozen=True)
+class RetentionPolicy:
+    """How often the changes of an entity or event type are recorded.
+
+    A change is recorded once sample_every changes were seen and at least
+    min_interval seconds passed since the last recorded change. When
+    keep_last is set only the newest keep_last rows are kept.
+    """
+
+    sample_every: int = 1
+    min_interval: float = 0
+    keep_last: int | None = None
+
+    @property
+    def samples(self) -> bool:
+        """Return if the policy skips some of the changes."""
+        return self.sample_every > 1 or self.min_interval > 0
+
+
+@dataclass(slots=True)
+class _Sampler:
+    """The changes seen since the last recorded change of an entity or event."""
+
+    seen: int = 0
+    last_recorded_ts: float | None = None
+    # The last skipped state change of an entity
+    trailing: Event[Any] | None = None
+
+
+class RecorderRetention:
+    """Decide which events are recorded by the retention policies.
+
+    Policies of entities apply to their state_changed events, policies
+    of event types to all other events. Events without a policy are
+    always recorded.
+
+    The last skipped state change of an entity is recorded later as a
+    trailing change, so the history of an entity which stopped changing
+    ends with its latest state.
+
+    This class is only used from the recorder thread.
+    """
+
+    __slots__ = (
+        "_entity_samplers",
+        "_event_type_samplers",
+        "_removed_trailing",
+        "entities",
+        "event_types",
+        "purging_ring_buffers",
+    )
+
+    def __init__(
+        self,
+        entities: dict[str, RetentionPolicy],
+        event_types: dict[EventType[Any] | str, RetentionPolicy],
+    ) -> None:
+        """Initialize the retention."""
+        self.entities = entities
+        self.event_types = event_types
+        self._entity_samplers: dict[str, _Sampler] = {}
+        self._event_type_samplers: dict[EventType[Any] | str, _Sampler] = {}
+        # Trailing changes of removed entities
+        self._removed_trailing: list[Event[Any]] = []
+        self.purging_ring_buffers = False
+
+    @property
+    def samples_entities(self) -> bool:
+        """Return if the changes of any entity are sampled."""
+        return any(policy.samples for policy in self.entities.values())
+
+    @property
+    def ring_buffers(self) -> bool:
+        """Return if any entity or event type keeps only its newest rows."""
+        return any(
+            policy.keep_last is not None
+            for policies in (self.entities, self.event_types)
+            for policy in policies.values()
+        )
+
+    def ring_buffer_entities(self) -> dict[str, int]:
+        """Return the number of rows kept of each entity with a ring buffer."""
+        return _ring_buffers(self.entities)
+
+    def ring_buffer_event_types(self) -> dict[EventType[Any] | str, int]:
+        """Return the number of rows kept of each event type with a ring buffer."""
+        return _ring_buffers(self.event_types)
+
+    def should_record(self, event: Event[Any]) -> bool:
+        """Return if an event should be recorded."""
+        if event.event_type != EVENT_STATE_CHANGED:
+            if (policy := self.event_types.get(event.event_type)) is None:
+                return True
+            return _sample(
+                self._event_type_samplers,
+                event.event_type,
+                policy,
+                event.time_fired_timestamp,
+            )
+        entity_id: str = event.data["entity_id"]
+        if (policy := self.entities.get(entity_id)) is None:
+            return True
+        if (new_state := event.data["new_state"]) is None:
+            # Removals are always recorded, the entity starts
+            # over when it is added again
+            if (
+                sampler := self._entity_samplers.pop(entity_id, None)
+            ) is not None and sampler.trailing is not None:
+                self._removed_trailing.append(sampler.trailing)
+            return True
+        if _sample(
+            self._entity_samplers, entity_id, policy, new_state.last_updated_timestamp
+        ):
+            return True
+        self._entity_samplers[entity_id].trailing = event
+        return False
+
+    def pop_removed_trailing_changes(self) -> list[Event[Any]]:
+        """Return the trailing changes of entities removed by the last event.
+
+        They have to be recorded before the removal.
+        """
+        if not (removed_trailing := self._removed_trailing):
+            return removed_trailing
+        self._removed_trailing = []
+        return removed_trailing
+
+    def pop_trailing_changes(self, timestamp: float) -> list[Event[Any]]:
+        """Return the trailing changes which are due at timestamp.
+
+        A trailing change is due once the min_interval of the policy
+        passed since the last recorded change of the entity.
+        """
+        due: list[Event[Any]] = []
+        for entity_id, sampler in self._entity_samplers.items():
+            if (trailing := sampler.trailing) is None or (
+                sampler.last_recorded_ts is not None
+                and timestamp - sampler.last_recorded_ts
+                < self.entities[entity_id].min_interval
+            ):
+                continue
+            due.append(trailing)
+            sampler.trailing = None
+            sampler.seen = 0
+            sampler.last_recorded_ts = trailing.data["new_state"].last_updated_timestamp
+        return due
+
+
+def _sample[_KeyT: str | EventType[Any]](
+    samplers: dict[_KeyT, _Sampler],
+    key: _KeyT,
+    policy: RetentionPolicy,
+    timestamp: float,
+) -> bool:
+    """Return if a change should be recorded by a policy."""
+    if not policy.samples:
+        return True
+    if (sampler := samplers.get(key)) is None:
+        sampler = samplers[key] = _Sampler()
+    seen = sampler.seen + 1
+    if sampler.last_recorded_ts is not None and (
+        seen < policy.sample_every
+        or timestamp - sampler.last_recorded_ts < policy.min_interval
+    ):
+        sampler.seen = seen
+        return False
+    sampler.seen = 0
+    sampler.last_recorded_ts = timestamp
+    sampler.trailing = None
+    return True
+
+
+def _ring_buffers[_KeyT: str | EventType[Any]](
+    policies: dict[_KeyT, RetentionPolicy],
+) -> dict[_KeyT, int]:
+    """Return the number of rows kept of each key with a ring buffer."""
+    return {
+        key: policy.keep_last
+        for key, policy in policies.items()
+        if policy.keep_last is not None
+    }
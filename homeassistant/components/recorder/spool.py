@@ -0,0 +1,204 @@
+"""Spool events to disk while the recorder backlog is too large."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+import logging
+import os
+import struct
+import threading
+from typing import Any, cast
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes, json_fragment
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS, json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Each frame is the length of the payload followed by the payload
+FRAME_HEADER = struct.Struct("<I")
+
+_ORIGINS = tuple(EventOrigin)
+
+
+def _state_to_frame(state: State | None) -> list[Any] | None:
+    """Return the part of a frame holding a state."""
+    if state is None:
+        return None
+    return [
+        state.state,
+        json_fragment(state.attributes_json),
+        state.last_changed_timestamp,
+        state.last_updated_timestamp,
+        state.last_reported_timestamp,
+        # The unrecorded attributes are needed to leave
+        # them out when the state is recorded
+        None
+        if (state_info := state.state_info) is None
+        else sorted(state_info["unrecorded_attributes"]),
+    ]
+
+
+def _state_from_frame(entity_id: str, frame: list[Any] | None) -> State | None:
+    """Recreate a state from its part of a frame."""
+    if frame is None:
+        return None
+    (
+        state,
+        attributes,
+        last_changed_ts,
+        last_updated_ts,
+        last_reported_ts,
+        unrecorded_attributes,
+    ) = frame
+    return State(
+        entity_id,
+        state,
+        attributes,
+        last_changed=dt_util.utc_from_timestamp(last_changed_ts),
+        last_reported=dt_util.utc_from_timestamp(last_reported_ts),
+        last_updated=dt_util.utc_from_timestamp(last_updated_ts),
+        validate_entity_id=False,
+        state_info=None
+        if unrecorded_attributes is None
+        else {"unrecorded_attributes": frozenset(unrecorded_attributes)},
+        last_updated_timestamp=last_updated_ts,
+    )
+
+
+def encode_event(event: Event[Any]) -> bytes:
+    """Encode an event as the payload of a frame."""
+    data: Any = event.data
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = [
+            data["entity_id"],
+            _state_to_frame(data["old_state"]),
+            _state_to_frame(data["new_state"]),
+        ]
+    context = event.context
+    return json_bytes(
+        [
+            event.event_type,
+            data,
+            event.origin.idx,
+            event.time_fired_timestamp,
+            context.id,
+            context.user_id,
+            context.parent_id,
+        ]
+    )
+
+
+def decode_event(payload: bytes) -> Event[Any]:
+    """Decode an event from the payload of a frame."""
+    (
+        event_type,
+        data,
+        origin_idx,
+        time_fired_timestamp,
+        context_id,
+        context_user_id,
+        context_parent_id,
+    ) = cast(list[Any], json_loads(payload))
+    if event_type == EVENT_STATE_CHANGED:
+        entity_id, old_state, new_state = data
+        data = {
+            "entity_id": entity_id,
+            "old_state": _state_from_frame(entity_id, old_state),
+            "new_state": _state_from_frame(entity_id, new_state),
+        }
+    return Event(
+        event_type,
+        data,
+        _ORIGINS[origin_idx],
+        time_fired_timestamp,
+        Context(context_user_id, context_parent_id, context_id),
+    )
+
+
+class EventSpool:
+    """Append-only file of events waiting to be recorded.
+
+    Events are appended as frames and read back in the order they were
+    written. The file is removed once every frame has been read.
+
+    Writing and reading are thread-safe so events can be written from
+    an executor while the recorder thread reads them.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the spool."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._read_offset = 0
+        self._write_offset = 0
+
+    @property
+    def pending(self) -> bool:
+        """Return if there are events in the spool that have not been read."""
+        return self._read_offset < self._write_offset
+
+    def load(self) -> bool:
+        """Pick up events left in the spool by a previous run.
+
+        Returns True if there are events to read.
+        """
+        with self._lock:
+            try:
+                self._write_offset = os.path.getsize(self.path)
+            except FileNotFoundError:
+                self._write_offset = 0
+            self._read_offset = 0
+        return self.pending
+
+    def write(self, events: list[Event[Any]]) -> None:
+        """Append events to the spool.
+
+        Events that can not be serialized are not recorded anyway and
+        are skipped.
+        """
+        frames = bytearray()
+        for event in events:
+            try:
+                payload = encode_event(event)
+            except JSON_ENCODE_EXCEPTIONS as ex:
+                _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+                continue
+            frames += FRAME_HEADER.pack(len(payload))
+            frames += payload
+        with self._lock, open(self.path, "ab") as file:
+            file.write(frames)
+            self._write_offset += len(frames)
+
+    def read(self, max_events: int) -> list[Event[Any]]:
+        """Read up to max_events from the spool in the order they were written."""
+        events: list[Event[Any]] = []
+        with self._lock:
+            if not self.pending:
+                return events
+            with open(self.path, "rb") as file:
+                file.seek(self._read_offset)
+                while len(events) < max_events and self.pending:
+                    header = file.read(FRAME_HEADER.size)
+                    if len(header) < FRAME_HEADER.size:
+                        _LOGGER.warning("Truncated frame in %s", self.path)
+                        self._read_offset = self._write_offset
+                        break
+                    (length,) = FRAME_HEADER.unpack(header)
+                    payload = file.read(length)
+                    self._read_offset += FRAME_HEADER.size + length
+                    try:
+                        events.append(decode_event(payload))
+                    except (TypeError, ValueError):
+                        _LOGGER.warning("Skipping invalid frame in %s", self.path)
+            if self._read_offset >= self._write_offset:
+                self._remove()
+        return events
+
+    def _remove(self) -> None:
+        """Remove the spool file once it has been read."""
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._read_offset = self._write_offset = 0
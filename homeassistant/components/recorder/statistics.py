@@ -14,7 +14,7 @@ import re
 from time import time as time_time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import Select, and_, bindparam, delete, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -49,6 +49,11 @@ from homeassistant.util.unit_conversion import (
     VolumeFlowRateConverter,
 )
 
+from .archive import (
+    ARCHIVE_STATISTICS_SHORT_TERM,
+    ArchivedStatisticsRow,
+    HistoryArchive,
+)
 from .const import (
     DOMAIN,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
@@ -63,7 +68,10 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -75,6 +83,7 @@ from .models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
+from .query_cache import QueryCache, StatisticsKey
 from .util import (
     execute,
     execute_stmt_lambda_element,
@@ -130,6 +139,28 @@ QUERY_STATISTICS_SUMMARY_SUM = (
     .label("rownum"),
 )
 
+QUERY_STATISTICS_ROLLUP_MEAN = (
+    Statistics.metadata_id,
+    func.avg(Statistics.mean),
+    func.min(Statistics.min),
+    func.max(Statistics.max),
+    func.count(Statistics.mean),
+)
+
+QUERY_STATISTICS_ROLLUP_SUM = (
+    Statistics.metadata_id,
+    Statistics.start_ts,
+    Statistics.last_reset_ts,
+    Statistics.state,
+    Statistics.sum,
+    func.row_number()
+    .over(
+        partition_by=Statistics.metadata_id,
+        order_by=Statistics.start_ts.desc(),
+    )
+    .label("rownum"),
+)
+
 
 STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
     **{unit: AreaConverter for unit in AreaConverter.VALID_UNITS},
@@ -454,6 +485,224 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         for metadata_id, summary_item in summary.items()
     )
 
+    # Roll the hour into the day and month it belongs to
+    if summary:
+        _update_statistics_rollups_with_hour(session, summary, start_time_ts)
+
+
+def _statistics_rollup_mean_stmt(
+    metadata_ids: list[int], start_time_ts: float, end_time_ts: float
+) -> StatementLambdaElement:
+    """Generate the mean, min and max statement for a statistics rollup."""
+    return lambda_stmt(
+        lambda: select(*QUERY_STATISTICS_ROLLUP_MEAN)
+        .filter(Statistics.metadata_id.in_(metadata_ids))
+        .filter(Statistics.start_ts >= start_time_ts)
+        .filter(Statistics.start_ts < end_time_ts)
+        .group_by(Statistics.metadata_id)
+    )
+
+
+def _statistics_rollup_last_sum_stmt(
+    metadata_ids: list[int], start_time_ts: float, end_time_ts: float
+) -> StatementLambdaElement:
+    """Generate the last sum statement for a statistics rollup."""
+    return lambda_stmt(
+        lambda: select(
+            subquery := (
+                select(*QUERY_STATISTICS_ROLLUP_SUM)
+                .filter(Statistics.metadata_id.in_(metadata_ids))
+                .filter(Statistics.start_ts >= start_time_ts)
+                .filter(Statistics.start_ts < end_time_ts)
+                .subquery()
+            )
+        ).filter(subquery.c.rownum == 1)
+    )
+
+
+def _delete_statistics_rollup_stmt(
+    table: type[StatisticsRollupBase],
+    metadata_ids: list[int],
+    start_time_ts: float,
+    end_time_ts: float,
+) -> StatementLambdaElement:
+    """Generate the statement to delete statistics rollups in a period."""
+    return lambda_stmt(
+        lambda: delete(table)
+        .filter(table.metadata_id.in_(metadata_ids))
+        .filter(table.start_ts >= start_time_ts)
+        .filter(table.start_ts < end_time_ts)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _update_statistics_rollup(
+    session: Session,
+    table: type[StatisticsDaily | StatisticsMonthly],
+    metadata_ids: list[int],
+    start_time_ts: float,
+    end_time_ts: float,
+) -> None:
+    """Roll up the hourly statistics of a single day or month.
+
+    The rollup is a row per statistic with the mean of the hourly means,
+    the min of the mins and the max of the maxes. Like the hourly
+    statistics, state, sum and last_reset are those of the last hour.
+    """
+    session.execute(
+        _delete_statistics_rollup_stmt(table, metadata_ids, start_time_ts, end_time_ts)
+    )
+    summary: dict[int, StatisticDataTimestamp] = {}
+    mean_counts: dict[int, int] = {}
+    stmt = _statistics_rollup_mean_stmt(metadata_ids, start_time_ts, end_time_ts)
+    for metadata_id, _mean, _min, _max, mean_count in execute_stmt_lambda_element(
+        session, stmt
+    ):
+        summary[metadata_id] = {
+            "start_ts": start_time_ts,
+            "mean": _mean,
+            "min": _min,
+            "max": _max,
+        }
+        mean_counts[metadata_id] = mean_count
+    stmt = _statistics_rollup_last_sum_stmt(metadata_ids, start_time_ts, end_time_ts)
+    for metadata_id, _, last_reset_ts, state, _sum, _ in execute_stmt_lambda_element(
+        session, stmt
+    ):
+        summary[metadata_id].update(
+            {"last_reset_ts": last_reset_ts, "state": state, "sum": _sum}
+        )
+    now_timestamp = time_time()
+    for metadata_id, summary_item in summary.items():
+        rollup = table.from_stats_ts(metadata_id, summary_item, now_timestamp)
+        rollup.mean_count = mean_counts[metadata_id]
+        session.add(rollup)
+
+
+def _update_statistics_rollups_with_hour(
+    session: Session, summary: dict[int, StatisticDataTimestamp], start_time_ts: float
+) -> None:
+    """Roll the statistics of a newly compiled hour into its day and month.
+
+    The rollups are updated from the hour only, the mean is weighted by
+    the number of hourly means rolled up before. Rollups without a count
+    of their hourly means are rolled up again.
+    """
+    now_timestamp = time_time()
+    metadata_ids = list(summary)
+    table: type[StatisticsDaily | StatisticsMonthly]
+    for table, factory in (
+        (StatisticsDaily, reduce_day_ts_factory),
+        (StatisticsMonthly, reduce_month_ts_factory),
+    ):
+        period_start_ts, period_end_ts = factory()[1](start_time_ts)
+        rollups = {
+            rollup.metadata_id: rollup
+            for rollup in cast(
+                Iterable[StatisticsRollupBase],
+                session.execute(
+                    select(table)
+                    .filter(table.metadata_id.in_(metadata_ids))
+                    .filter(table.start_ts == period_start_ts)
+                ).scalars(),
+            )
+        }
+        rebuild: list[int] = []
+        for metadata_id, hour in summary.items():
+            if (rollup := rollups.get(metadata_id)) is None:
+                rollup = table.from_stats_ts(
+                    metadata_id, {**hour, "start_ts": period_start_ts}, now_timestamp
+                )
+                rollup.mean_count = 0 if hour.get("mean") is None else 1
+                session.add(rollup)
+                continue
+            if (mean_count := rollup.mean_count) is None:
+                # The rollup is deleted and added again
+                session.expunge(rollup)
+                rebuild.append(metadata_id)
+                continue
+            if (_mean := hour.get("mean")) is not None:
+                rollup.mean = ((rollup.mean or 0.0) * mean_count + _mean) / (
+                    mean_count + 1
+                )
+                rollup.mean_count = mean_count + 1
+            if (_min := hour.get("min")) is not None:
+                rollup.min = _min if rollup.min is None else min(rollup.min, _min)
+            if (_max := hour.get("max")) is not None:
+                rollup.max = _max if rollup.max is None else max(rollup.max, _max)
+            if "sum" in hour:
+                rollup.last_reset_ts = hour["last_reset_ts"]
+                rollup.state = hour["state"]
+                rollup.sum = hour["sum"]
+        if rebuild:
+            _update_statistics_rollup(
+                session, table, rebuild, period_start_ts, period_end_ts
+            )
+
+
+def _update_statistics_rollups(
+    session: Session,
+    metadata_ids: list[int],
+    start_time_ts: float,
+    end_time_ts: float,
+) -> None:
+    """Update the daily and monthly statistics rollups overlapping a period.
+
+    The days and months are those of the current time zone.
+    """
+    for table, factory in (
+        (StatisticsDaily, reduce_day_ts_factory),
+        (StatisticsMonthly, reduce_month_ts_factory),
+    ):
+        _, period_start_end = factory()
+        period_start_ts, period_end_ts = period_start_end(start_time_ts)
+        while period_start_ts < end_time_ts:
+            _update_statistics_rollup(
+                session, table, metadata_ids, period_start_ts, period_end_ts
+            )
+            period_start_ts, period_end_ts = period_start_end(period_end_ts)
+
+
+def rebuild_statistics_rollups(
+    instance: Recorder, start_time_ts: float | None
+) -> float | None:
+    """Rebuild the daily and monthly statistics rollups of a single month.
+
+    The rebuild continues with the first month with hourly statistics from
+    start_time_ts, or starts with the oldest month if it is None. Rollups
+    between start_time_ts and the month were made for another time zone
+    and are removed. Returns where the rebuild continues or None if all
+    rollups have been rebuilt.
+    """
+    _, month_start_end = reduce_month_ts_factory()
+    with session_scope(session=instance.get_session()) as session:
+        stmt = select(func.min(Statistics.start_ts))
+        if start_time_ts is not None:
+            stmt = stmt.filter(Statistics.start_ts >= start_time_ts)
+        if (first_start_time_ts := session.execute(stmt).scalar()) is None:
+            return None
+        month_start_ts, month_end_ts = month_start_end(first_start_time_ts)
+        for table in (StatisticsDaily, StatisticsMonthly):
+            delete_stmt = delete(table).filter(table.start_ts < month_end_ts)
+            if start_time_ts is not None:
+                delete_stmt = delete_stmt.filter(table.start_ts >= start_time_ts)
+            session.execute(delete_stmt)
+        metadata_ids = [
+            metadata_id
+            for (metadata_id,) in session.execute(
+                select(Statistics.metadata_id)
+                .filter(Statistics.start_ts >= month_start_ts)
+                .filter(Statistics.start_ts < month_end_ts)
+                .distinct()
+            )
+        ]
+        _update_statistics_rollups(session, metadata_ids, month_start_ts, month_end_ts)
+        if session.execute(
+            select(Statistics.id).filter(Statistics.start_ts >= month_end_ts).limit(1)
+        ).first():
+            return month_end_ts
+    return None
+
 
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
@@ -756,6 +1005,8 @@ def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
         instance.statistics_meta_manager.delete(session, statistic_ids)
+    if instance.archive is not None:
+        instance.archive.clear_statistics(statistic_ids)
 
 
 def update_statistics_metadata(
@@ -778,9 +1029,11 @@ def update_statistics_metadata(
                 instance, "statistic"
             ),
         ) as session:
-            statistics_meta_manager.update_statistic_id(
+            renamed = statistics_meta_manager.update_statistic_id(
                 session, DOMAIN, statistic_id, new_statistic_id
             )
+        if renamed and instance.archive is not None:
+            instance.archive.rename_statistics(statistic_id, new_statistic_id)
 
 
 async def async_list_statistic_ids(
@@ -915,8 +1168,13 @@ def _reduce_statistics(
     period_start_end: Callable[[float], tuple[float, float]],
     period: timedelta,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+    mean_weights: dict[str, list[int]] | None = None,
 ) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
+    """Reduce hourly statistics to daily or monthly statistics.
+
+    If mean_weights is given, the means of each statistic are weighted by
+    the matching weights.
+    """
     result: dict[str, list[StatisticsRow]] = defaultdict(list)
     period_seconds = period.total_seconds()
     _want_mean = "mean" in types
@@ -929,11 +1187,13 @@ def _reduce_statistics(
         max_values: list[float] = []
         mean_values: list[float] = []
         min_values: list[float] = []
+        weights = mean_weights[statistic_id] if mean_weights is not None else None
+        weight_values: list[int] = []
         prev_stat: StatisticsRow = stat_list[0]
         fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
 
         # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
+        for idx, statistic in enumerate(chain(stat_list, (fake_entry,))):
             if not same_period(prev_stat["start"], statistic["start"]):
                 start, end = period_start_end(prev_stat["start"])
                 # The previous statistic was the last entry of the period
@@ -942,7 +1202,18 @@ def _reduce_statistics(
                     "end": end,
                 }
                 if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
+                    if not mean_values:
+                        row["mean"] = None
+                    elif weights is None:
+                        row["mean"] = mean(mean_values)
+                    else:
+                        row["mean"] = sum(
+                            value * weight
+                            for value, weight in zip(
+                                mean_values, weight_values, strict=True
+                            )
+                        ) / sum(weight_values)
+                        weight_values.clear()
                     mean_values.clear()
                 if _want_min:
                     row["min"] = min(min_values) if min_values else None
@@ -961,6 +1232,8 @@ def _reduce_statistics(
                 max_values.append(_max)
             if _want_mean and (_mean := statistic.get("mean")) is not None:
                 mean_values.append(_mean)
+                if weights is not None:
+                    weight_values.append(weights[idx])
             if _want_min and (_min := statistic.get("min")) is not None:
                 min_values.append(_min)
             prev_stat = statistic
@@ -1055,11 +1328,17 @@ def reduce_week_ts_factory() -> tuple[
 def _reduce_statistics_per_week(
     stats: dict[str, list[StatisticsRow]],
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+    mean_weights: dict[str, list[int]] | None = None,
 ) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to weekly statistics."""
+    """Reduce hourly or daily statistics to weekly statistics."""
     _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
     return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
+        stats,
+        _same_week_ts,
+        _week_start_end_ts,
+        timedelta(days=7),
+        types,
+        mean_weights,
     )
 
 
@@ -1701,6 +1980,96 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _statistics_rollups_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int] | None,
+    period: str,
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]] | None:
+    """Return daily, weekly or monthly statistics from the statistics rollups.
+
+    Weekly statistics are reduced from the daily rollups. Returns None if
+    the rollups do not match the days or months of the current time zone,
+    the rollups are then rebuilt in the background.
+    """
+    table: type[StatisticsDaily | StatisticsMonthly]
+    if period == "month":
+        table = StatisticsMonthly
+        _, period_start_end = reduce_month_ts_factory()
+    else:
+        table = StatisticsDaily
+        _, period_start_end = reduce_day_ts_factory()
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    if not stats:
+        return {}
+
+    result = _sorted_statistics_to_dict(
+        hass, stats, statistic_ids, metadata, True, table, units, types
+    )
+    # Most statistics have rows for the same periods, only look up each one once
+    period_ends: dict[float, float] = {}
+    for rows in result.values():
+        for row in rows:
+            if (period_end := period_ends.get(row["start"])) is None:
+                period_start, period_end = period_start_end(row["start"])
+                if period_start != row["start"]:
+                    get_instance(hass).queue_statistics_rollups_rebuild()
+                    return None
+                period_ends[period_start] = period_end
+            row["end"] = period_end
+    if period != "week":
+        return result
+
+    mean_weights: dict[str, list[int]] | None = None
+    if "mean" in types:
+        # Weigh the daily means by the number of hours they were rolled up from
+        mean_counts: dict[tuple[int, float], int | None] = {
+            (metadata_id, start_ts): mean_count
+            for metadata_id, start_ts, mean_count in execute_stmt_lambda_element(
+                session,
+                _statistics_rollup_mean_counts_stmt(start_time, end_time, metadata_ids),
+            )
+        }
+        mean_weights = {}
+        for statistic_id, rows in result.items():
+            metadata_id = metadata[statistic_id][0]
+            mean_weights[statistic_id] = [
+                mean_counts.get((metadata_id, row["start"])) or 1 for row in rows
+            ]
+    return _reduce_statistics_per_week(result, types, mean_weights)
+
+
+def _statistics_rollup_mean_counts_stmt(
+    start_time: datetime, end_time: datetime | None, metadata_ids: list[int] | None
+) -> StatementLambdaElement:
+    """Generate the statement for the mean counts of the daily rollups."""
+    start_time_ts = start_time.timestamp()
+    stmt = lambda_stmt(
+        lambda: select(
+            StatisticsDaily.metadata_id,
+            StatisticsDaily.start_ts,
+            StatisticsDaily.mean_count,
+        ).filter(StatisticsDaily.start_ts >= start_time_ts)
+    )
+    if end_time is not None:
+        end_time_ts = end_time.timestamp()
+        stmt += lambda q: q.filter(StatisticsDaily.start_ts < end_time_ts)
+    if metadata_ids:
+        stmt += lambda q: q.filter(StatisticsDaily.metadata_id.in_(metadata_ids))
+    return stmt
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1771,35 +2140,68 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    result: dict[str, list[StatisticsRow]] | None = None
+    if (
+        period in ("day", "week", "month")
+        and get_instance(hass).statistics_rollups_active
+    ):
+        result = _statistics_rollups_during_period(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            metadata,
+            metadata_ids,
+            period,
+            units,
+            types,
+        )
 
-    if not stats:
-        return {}
+    if result is None:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
+        if (
+            table is StatisticsShortTerm
+            and (archive := get_instance(hass).archive) is not None
+            and archive.reaches(ARCHIVE_STATISTICS_SHORT_TERM, start_time.timestamp())
+        ):
+            stats = cast(
+                Sequence[Row],
+                _merge_archived_statistics(
+                    archive, stats, metadata, start_time, end_time
+                ),
+            )
 
-    result = _sorted_statistics_to_dict(
-        hass,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        units,
-        types,
-    )
+        if not stats:
+            return {}
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
+
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
+
+    if not result:
+        return {}
 
     if "change" in _types:
         _augment_result_with_change(
@@ -1810,6 +2212,34 @@ def _statistics_during_period_with_session(
     return result
 
 
+def _merge_archived_statistics(
+    archive: HistoryArchive,
+    stats: Sequence[Row],
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    start_time: datetime,
+    end_time: datetime | None,
+) -> list[ArchivedStatisticsRow]:
+    """Merge archived short term statistics into the rows from the database.
+
+    A period in both the database and the archive is taken from the
+    database. The rows are sorted by metadata_id and start_ts.
+    """
+    rows: dict[tuple[int, float], ArchivedStatisticsRow] = {
+        (row.metadata_id, row.start_ts): ArchivedStatisticsRow(**row._asdict())
+        for row in stats
+    }
+    for statistic_id, archived_rows in archive.read_statistics(
+        metadata, start_time.timestamp(), datetime_to_timestamp_or_none(end_time)
+    ).items():
+        metadata_id = metadata[statistic_id][0]
+        for archived_row in archived_rows:
+            rows.setdefault(
+                (metadata_id, archived_row[1]),
+                ArchivedStatisticsRow(metadata_id, *archived_row[1:]),
+            )
+    return [rows[key] for key in sorted(rows)]
+
+
 def statistics_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -1824,6 +2254,15 @@ def statistics_during_period(
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
     """
+    if (
+        end_time is None
+        and statistic_ids is not None
+        and period in ("5minute", "hour")
+        and (query_cache := get_instance(hass).query_cache).enabled
+    ):
+        return _cached_statistics_during_period(
+            hass, query_cache, start_time, statistic_ids, period, units, types
+        )
     with session_scope(hass=hass, read_only=True) as session:
         return _statistics_during_period_with_session(
             hass,
@@ -1837,6 +2276,79 @@ def statistics_during_period(
         )
 
 
+def _cached_statistics_during_period(
+    hass: HomeAssistant,
+    query_cache: QueryCache,
+    start_time: datetime,
+    statistic_ids: set[str],
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["change", "last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]]:
+    """Return statistic data points since start_time using the query cache.
+
+    Only the statistics compiled since the cached result was fetched are
+    fetched from the database.
+    """
+    key: StatisticsKey = (
+        tuple(sorted(statistic_ids)),
+        period,
+        tuple(sorted((units or {}).items())),
+        tuple(sorted(types)),
+    )
+    start_time_ts = start_time.timestamp()
+    fetch_start_ts = start_time_ts
+    cached = query_cache.get_statistics(key, start_time_ts)
+    if cached is not None:
+        if (refresh_start_ts := cached[1]) is None:
+            return cast(
+                dict[str, list[StatisticsRow]],
+                {
+                    statistic_id: rows
+                    for statistic_id, rows in cached[0].items()
+                    if rows
+                },
+            )
+        fetch_start_ts = refresh_start_ts
+    generation = query_cache.statistics_generation()
+    with session_scope(hass=hass, read_only=True) as session:
+        fetched = _statistics_during_period_with_session(
+            hass,
+            session,
+            dt_util.utc_from_timestamp(fetch_start_ts),
+            None,
+            statistic_ids,
+            period,
+            units,
+            types,
+        )
+    query_cache.store_statistics(
+        key, fetch_start_ts, cast(dict[str, list[dict[str, Any]]], fetched), generation
+    )
+    if cached is None:
+        return fetched
+    cached_result = cached[0]
+    result = {
+        statistic_id: [
+            *(
+                row
+                for row in cached_result.get(statistic_id, ())
+                if row["start"] < fetch_start_ts
+            ),
+            *(
+                row
+                for row in fetched.get(statistic_id, ())
+                if row["start"] >= start_time_ts
+            ),
+        ]
+        for statistic_id in cached_result.keys() | fetched.keys()
+    }
+    return cast(
+        dict[str, list[StatisticsRow]],
+        {statistic_id: rows for statistic_id, rows in result.items() if rows},
+    )
+
+
 def _get_last_statistics_stmt(
     metadata_id: int,
     number_of_stats: int,
@@ -2355,11 +2867,23 @@ def _import_statistics_with_session(
         session, metadata, old_metadata_dict
     )
     now_timestamp = time_time()
+    start_times_ts: list[float] = []
     for stat in statistics:
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat, now_timestamp)
+        start_times_ts.append(stat["start"].timestamp())
+
+    if table == Statistics:
+        if start_times_ts:
+            _update_statistics_rollups(
+                session,
+                [metadata_id],
+                min(start_times_ts),
+                max(start_times_ts) + Statistics.duration.total_seconds(),
+            )
+        return True
 
     if table != StatisticsShortTerm:
         return True
@@ -2491,9 +3015,45 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        _adjust_sum_statistics_rollups(
+            session,
+            metadata[statistic_id][0],
+            start_time.replace(minute=0).timestamp(),
+            sum_adjustment,
+        )
+
+    if instance.archive is not None:
+        instance.archive.adjust_statistics_sum(
+            statistic_id, start_time.timestamp(), sum_adjustment
+        )
     return True
 
 
+def _adjust_sum_statistics_rollups(
+    session: Session, metadata_id: int, start_time_ts: float, adj: float
+) -> None:
+    """Adjust the daily and monthly statistics rollups after adjusting a sum.
+
+    The day and month the adjustment starts in are rolled up again, the
+    sum of later days and months is adjusted.
+    """
+    for table, factory in (
+        (StatisticsDaily, reduce_day_ts_factory),
+        (StatisticsMonthly, reduce_month_ts_factory),
+    ):
+        period_start_ts, period_end_ts = factory()[1](start_time_ts)
+        _update_statistics_rollup(
+            session, table, [metadata_id], period_start_ts, period_end_ts
+        )
+        _adjust_sum_statistics(
+            session,
+            table,
+            metadata_id,
+            dt_util.utc_from_timestamp(period_end_ts),
+            adj,
+        )
+
+
 def _change_statistics_unit_for_table(
     session: Session,
     table: type[StatisticsBase],
@@ -2551,6 +3111,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
@@ -2559,6 +3121,9 @@ def change_statistics_unit(
             session, statistic_id, new_unit
         )
 
+    if instance.archive is not None:
+        instance.archive.convert_statistics(statistic_id, convert)
+
 
 @callback
 def async_change_statistics_unit(
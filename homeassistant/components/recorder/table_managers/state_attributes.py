@@ -13,6 +13,7 @@ from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import StateAttributes
+from ..models import compress_shared_attrs
 from ..queries import get_shared_attributes
 from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
@@ -125,6 +126,9 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         assert db_state_attributes.shared_attrs is not None
         shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
+        if self.recorder.compress_attributes:
+            # The hash and the caches are of the uncompressed shared_attrs
+            db_state_attributes.shared_attrs = compress_shared_attrs(shared_attrs)
 
     def post_commit_pending(self) -> None:
         """Call after commit to load the attributes_ids of the new StateAttributes into the LRU.
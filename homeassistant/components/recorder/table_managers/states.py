@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
@@ -12,14 +12,19 @@ from ..db_schema import States
 from ..queries import find_oldest_state
 from ..util import execute_stmt_lambda_element
 
+if TYPE_CHECKING:
+    from ..bulk_insert import PendingState
+
 
 class StatesManager:
     """Manage the states table."""
 
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
-        self._pending: dict[str, States] = {}
+        self._pending: dict[str, States | PendingState] = {}
         self._last_committed_id: dict[str, int] = {}
+        # The last_updated_ts of the last committed state of each entity
+        self._last_committed_ts: dict[int, float | None] = {}
         self._last_reported: dict[int, float] = {}
         self._oldest_ts: float | None = None
 
@@ -28,7 +33,7 @@ class StatesManager:
         """Return the oldest timestamp."""
         return self._oldest_ts
 
-    def pop_pending(self, entity_id: str) -> States | None:
+    def pop_pending(self, entity_id: str) -> States | PendingState | None:
         """Pop a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -47,9 +52,23 @@ class StatesManager:
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        return self._last_committed_id.pop(entity_id, None)
+        if (state_id := self._last_committed_id.pop(entity_id, None)) is not None:
+            self._last_committed_ts.pop(state_id, None)
+        return state_id
+
+    def pop_committed_with_last_updated_ts(
+        self, entity_id: str
+    ) -> tuple[int, float | None] | None:
+        """Pop a committed state with its last_updated_ts.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (state_id := self._last_committed_id.pop(entity_id, None)) is None:
+            return None
+        return state_id, self._last_committed_ts.pop(state_id)
 
-    def add_pending(self, entity_id: str, state: States) -> None:
+    def add_pending(self, entity_id: str, state: States | PendingState) -> None:
         """Add a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -78,7 +97,10 @@ class StatesManager:
         recorder thread.
         """
         for entity_id, db_states in self._pending.items():
-            self._last_committed_id[entity_id] = db_states.state_id
+            # States that were never written do not have a state_id
+            if (state_id := db_states.state_id) is not None:
+                self._last_committed_id[entity_id] = state_id
+                self._last_committed_ts[state_id] = db_states.last_updated_ts
         self._pending.clear()
         self._last_reported.clear()
 
@@ -89,6 +111,7 @@ class StatesManager:
         recorder thread.
         """
         self._last_committed_id.clear()
+        self._last_committed_ts.clear()
         self._pending.clear()
         self._oldest_ts = None
 
@@ -124,6 +147,7 @@ class StatesManager:
             last_committed_ids_reversed
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
+            self._last_committed_ts.pop(purged_state_id, None)
 
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
@@ -133,4 +157,5 @@ class StatesManager:
         """
         last_committed_ids = self._last_committed_id
         for entity_id in purged_entity_ids:
-            last_committed_ids.pop(entity_id, None)
+            if (state_id := last_committed_ids.pop(entity_id, None)) is not None:
+                self._last_committed_ts.pop(state_id, None)
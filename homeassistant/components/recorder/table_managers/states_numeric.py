@@ -0,0 +1,122 @@
+"""Support managing StatesNumeric."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import insert
+from sqlalchemy.engine.row import Row
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import State
+
+from ..const import NUMERIC_STATES_SCHEMA_VERSION
+from ..db_schema import States, StatesNumeric
+from ..models import numeric_state_value, process_timestamp
+from ..queries import find_schema_version_reached
+from ..util import execute_stmt_lambda_element
+
+if TYPE_CHECKING:
+    from ..bulk_insert import PendingState
+
+
+class StatesNumericManager:
+    """Manage the states_numeric table."""
+
+    def __init__(self) -> None:
+        """Initialize the states numeric manager."""
+        self._pending: list[tuple[States | PendingState, float | None]] = []
+        self._active_since_ts: float | None = None
+
+    @property
+    def active_since_ts(self) -> float | None:
+        """Return the time since when all numeric states are recorded.
+
+        Returns None if the schema does not have the states_numeric
+        table yet.
+        """
+        return self._active_since_ts
+
+    def add_pending(
+        self, state: States | PendingState, old_state: State | None
+    ) -> None:
+        """Add the numeric value of a state that is not inserted yet.
+
+        Only changes of the state are written. A state which is not
+        numeric is written with a value of None if it replaces a numeric
+        state or if the entity has no old state, for instance after a
+        restart, so the end of a numeric period is always recorded.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        value = numeric_state_value(state.state)
+        if old_state is None or (
+            old_state.state != state.state
+            and (value is not None or numeric_state_value(old_state.state) is not None)
+        ):
+            self._pending.append((state, value))
+
+    def write(self, session: Session) -> None:
+        """Insert the numeric values of the pending states.
+
+        The states must be written to the session already, it is flushed
+        to assign the state_id of states added to it.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        session.flush()
+        params: list[dict[str, Any]] = []
+        for state, value in self._pending:
+            # States that were never written do not have a state_id
+            if (state_id := state.state_id) is None:
+                continue
+            metadata_id = state.metadata_id
+            if (states_meta := state.states_meta_rel) is not None:
+                metadata_id = states_meta.metadata_id
+            params.append(
+                {
+                    "state_id": state_id,
+                    "metadata_id": metadata_id,
+                    "last_updated_ts": state.last_updated_ts,
+                    "value": value,
+                }
+            )
+        if params:
+            session.execute(insert(StatesNumeric), params)
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to clear the written values.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+
+    def load_from_db(self, session: Session) -> None:
+        """Update the time since when numeric states are recorded.
+
+        Must run in the recorder thread.
+        """
+        result = cast(
+            Sequence[Row[Any]],
+            execute_stmt_lambda_element(
+                session, find_schema_version_reached(NUMERIC_STATES_SCHEMA_VERSION)
+            ),
+        )
+        if not result or (changed := process_timestamp(result[0].changed)) is None:
+            self._active_since_ts = None
+        else:
+            self._active_since_ts = changed.timestamp()
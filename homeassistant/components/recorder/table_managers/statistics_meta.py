@@ -303,9 +303,11 @@ class StatisticsMetaManager:
         source: str,
         old_statistic_id: str,
         new_statistic_id: str,
-    ) -> None:
+    ) -> bool:
         """Update the statistic_id for a statistic_id.
 
+        Returns False if the new statistic_id is already in use.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
@@ -316,12 +318,13 @@ class StatisticsMetaManager:
                 old_statistic_id,
                 new_statistic_id,
             )
-            return
+            return False
         session.query(StatisticsMeta).filter(
             (StatisticsMeta.statistic_id == old_statistic_id)
             & (StatisticsMeta.source == source)
         ).update({StatisticsMeta.statistic_id: new_statistic_id})
         self._clear_cache([old_statistic_id])
+        return True
 
     def delete(self, session: Session, statistic_ids: list[str]) -> None:
         """Clear statistics for a list of statistic_ids.
@@ -6,15 +6,17 @@ import abc
 import asyncio
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import threading
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.helpers.typing import UndefinedType
+from homeassistant.util import dt as dt_util
 from homeassistant.util.event_type import EventType
 
-from . import entity_registry, purge, statistics
+from . import entity_registry, purge, repack, statistics
 from .const import DOMAIN
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
@@ -54,6 +56,7 @@ class ChangeStatisticsUnitTask(RecorderTask):
             self.new_unit_of_measurement,
             self.old_unit_of_measurement,
         )
+        instance.query_cache.clear_statistics()
 
 
 @dataclass(slots=True)
@@ -66,6 +69,7 @@ class ClearStatisticsTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
         statistics.clear_statistics(instance, self.statistic_ids)
+        instance.query_cache.clear_statistics()
         if self.on_done:
             self.on_done()
 
@@ -87,6 +91,7 @@ class UpdateStatisticsMetadataTask(RecorderTask):
             self.new_statistic_id,
             self.new_unit_of_measurement,
         )
+        instance.query_cache.clear_statistics()
         if self.on_done:
             self.on_done()
 
@@ -105,6 +110,7 @@ class UpdateStatesMetadataTask(RecorderTask):
             self.entity_id,
             self.new_entity_id,
         )
+        instance.query_cache.clear()
 
 
 @dataclass(slots=True)
@@ -117,9 +123,14 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
+        finished = purge.purge_old_data(
             instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        )
+        if self.apply_filter:
+            instance.query_cache.clear()
+        else:
+            instance.query_cache.purged(self.purge_before.timestamp())
+        if finished:
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
@@ -131,6 +142,59 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class ContinuousPurgeTask(RecorderTask):
+    """Purge a small batch of old rows and schedule the next batch.
+
+    Purging continues in small steps paced by the recorder load until
+    there is nothing left to purge and the free space is returned.
+    """
+
+    continued: bool = False
+    # Rows were purged by the previous steps and the cleanups
+    # of the purge cycle have not run yet
+    purged: bool = False
+
+    def run(self, instance: Recorder) -> None:
+        """Purge the next batch."""
+        pacer = instance.purge_pacer
+        if not self.continued:
+            if pacer.running:
+                # The previous purge is still in progress
+                return
+            pacer.running = True
+        scheduled = False
+        try:
+            scheduled = self._purge_batch(instance)
+        finally:
+            if not scheduled:
+                pacer.running = False
+
+    def _purge_batch(self, instance: Recorder) -> bool:
+        """Purge the next batch and return True if the next step is scheduled."""
+        start = monotonic()
+        purge_before = dt_util.utcnow() - timedelta(days=instance.keep_days)
+        finished = purge.purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=purge.CONTINUOUS_PURGE_BATCHES,
+            states_batch_size=purge.CONTINUOUS_PURGE_BATCHES,
+            cleanup=self.purged,
+        )
+        instance.query_cache.purged(purge_before.timestamp())
+        free_pages_remaining = repack.incremental_vacuum(
+            instance, purge.CONTINUOUS_PURGE_VACUUM_PAGES
+        )
+        if finished and not free_pages_remaining:
+            return False
+        instance.queue_task_later(
+            ContinuousPurgeTask(continued=True, purged=not finished),
+            instance.purge_pacer.next_delay(instance, monotonic() - start),
+        )
+        return True
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -140,12 +204,55 @@ class PurgeEntitiesTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
-        if purge.purge_entity_data(instance, self.entity_filter, self.purge_before):
+        finished = purge.purge_entity_data(
+            instance, self.entity_filter, self.purge_before
+        )
+        instance.query_cache.clear()
+        if finished:
             return
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(PurgeEntitiesTask(self.entity_filter, self.purge_before))
 
 
+@dataclass(slots=True)
+class PurgeRingBuffersTask(RecorderTask):
+    """Purge the rows of entities and event types beyond their ring buffers."""
+
+    continued: bool = False
+
+    def run(self, instance: Recorder) -> None:
+        """Purge the rows beyond the ring buffers."""
+        retention = instance.retention
+        assert retention is not None
+        if not self.continued:
+            if retention.purging_ring_buffers:
+                # The previous purge is still in progress
+                return
+            retention.purging_ring_buffers = True
+        scheduled = False
+        try:
+            if not purge.purge_ring_buffers(
+                instance,
+                retention.ring_buffer_entities(),
+                retention.ring_buffer_event_types(),
+            ):
+                # Schedule a new purge task if this one didn't finish
+                instance.queue_task(PurgeRingBuffersTask(continued=True))
+                scheduled = True
+        finally:
+            if not scheduled:
+                retention.purging_ring_buffers = False
+
+
+@dataclass(slots=True)
+class RecordTrailingChangesTask(RecorderTask):
+    """Record the last skipped changes of entities once they are due."""
+
+    def run(self, instance: Recorder) -> None:
+        """Record the trailing changes."""
+        instance._record_trailing_changes()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class PerodicCleanupTask(RecorderTask):
     """An object to insert into the recorder to trigger cleanup tasks.
@@ -167,7 +274,9 @@ class StatisticsTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
-        if statistics.compile_statistics(instance, self.start, self.fire_events):
+        finished = statistics.compile_statistics(instance, self.start, self.fire_events)
+        instance.query_cache.statistics_compiled()
+        if finished:
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(StatisticsTask(self.start, self.fire_events))
@@ -179,12 +288,33 @@ class CompileMissingStatisticsTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task to compile missing statistics."""
-        if statistics.compile_missing_statistics(instance):
+        finished = statistics.compile_missing_statistics(instance)
+        instance.query_cache.statistics_compiled()
+        if finished:
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(CompileMissingStatisticsTask())
 
 
+@dataclass(slots=True)
+class RebuildStatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to rebuild the statistics rollups."""
+
+    start_time_ts: float | None = None
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics task to rebuild a month of statistics rollups."""
+        if (
+            next_start_time_ts := statistics.rebuild_statistics_rollups(
+                instance, self.start_time_ts
+            )
+        ) is None:
+            instance.statistics_rollups_active = True
+            return
+        # Schedule a new task to rebuild the next month
+        instance.queue_task(RebuildStatisticsRollupsTask(next_start_time_ts))
+
+
 @dataclass(slots=True)
 class ImportStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an import statistics task."""
@@ -195,9 +325,11 @@ class ImportStatisticsTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
-        if statistics.import_statistics(
+        finished = statistics.import_statistics(
             instance, self.metadata, self.statistics, self.table
-        ):
+        )
+        instance.query_cache.clear_statistics()
+        if finished:
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(
@@ -216,13 +348,15 @@ class AdjustStatisticsTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
-        if statistics.adjust_statistics(
+        finished = statistics.adjust_statistics(
             instance,
             self.statistic_id,
             self.start_time,
             self.sum_adjustment,
             self.adjustment_unit,
-        ):
+        )
+        instance.query_cache.clear_statistics()
+        if finished:
             return
         # Schedule a new adjust statistics task if this one didn't finish
         instance.queue_task(
@@ -295,6 +429,17 @@ class CommitTask(RecorderTask):
         instance._commit_event_session_or_retry()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class ReplaySpoolTask(RecorderTask):
+    """Record a batch of events from the spool."""
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        instance._replay_spool()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class AddRecorderPlatformTask(RecorderTask):
     """Add a recorder platform."""
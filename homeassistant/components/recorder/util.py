@@ -8,6 +8,7 @@ from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 import functools
 import logging
+from math import ceil
 import os
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, NoReturn
@@ -455,6 +456,37 @@ def async_create_backup_failure_issue(
     )
 
 
+@callback
+def async_create_migration_progress_issue(
+    hass: HomeAssistant,
+    migration_id: str,
+    rows_done: int,
+    rows_total: int,
+    eta: float,
+) -> None:
+    """Create or update an issue with the progress of a data migration."""
+    ir.async_create_issue(
+        hass,
+        DOMAIN,
+        "migration_progress",
+        is_fixable=False,
+        severity=ir.IssueSeverity.WARNING,
+        translation_key="migration_progress",
+        translation_placeholders={
+            "migration_id": migration_id,
+            "rows_done": str(rows_done),
+            "rows_total": str(rows_total),
+            "minutes": str(ceil(eta / 60)),
+        },
+    )
+
+
+@callback
+def async_delete_migration_progress_issue(hass: HomeAssistant) -> None:
+    """Delete the issue with the progress of a data migration."""
+    ir.async_delete_issue(hass, DOMAIN, "migration_progress")
+
+
 def setup_connection_for_dialect(
     instance: Recorder,
     dialect_name: str,
@@ -468,6 +500,12 @@ def setup_connection_for_dialect(
         if first_connection:
             old_isolation = dbapi_connection.isolation_level  # type: ignore[attr-defined]
             dbapi_connection.isolation_level = None  # type: ignore[attr-defined]
+            if instance.continuous_purge:
+                # Only takes effect for new databases, so it has to
+                # be set before WAL mode initializes the database file
+                execute_on_connection(
+                    dbapi_connection, "PRAGMA auto_vacuum = INCREMENTAL"
+                )
             execute_on_connection(dbapi_connection, "PRAGMA journal_mode=WAL")
             dbapi_connection.isolation_level = old_isolation  # type: ignore[attr-defined]
             # WAL mode only needs to be setup once
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import defaultdict
 from collections.abc import Callable, Iterable
 from contextlib import suppress
@@ -9,6 +10,7 @@ import datetime
 import itertools
 import logging
 import math
+import threading
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -26,12 +28,22 @@ from homeassistant.components.recorder.models import (
 )
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     REVOLUTIONS_PER_MINUTE,
     UnitOfIrradiance,
     UnitOfSoundPressure,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant, State, callback, split_entity_id
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.entity import entity_sources
@@ -78,6 +90,166 @@ WARN_UNSUPPORTED_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unsupported_u
 WARN_UNSTABLE_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unstable_unit")
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# Sensor states collected for compiling short term statistics
+SHORT_TERM_STATES: HassKey[ShortTermStates] = HassKey(f"{DOMAIN}_short_term_states")
+# Max number of states collected per sensor, half are dropped when exceeded
+MAX_SHORT_TERM_STATES = 4096
+
+
+class ShortTermStates:
+    """Sensor states collected for compiling short term statistics.
+
+    The states of sensors with a state class are collected from the state
+    machine as they change, so compiling short term statistics does not
+    need to read them back from the database. The states of a period are
+    only known if they have been collected since before the period started,
+    the database is queried for the other periods, e.g. after a restart, and
+    for sensors whose states were trimmed or which gained a state class
+    during the period.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the collected states."""
+        self._hass = hass
+        self._lock = threading.Lock()
+        self._since = 0.0
+        # Sensors whose states are only known since a later time than _since
+        self._entity_since: dict[str, float] = {}
+        self._states: dict[str, list[State]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start collecting states."""
+        with self._lock:
+            self._since = dt_util.utcnow().timestamp()
+            self._states = {
+                state.entity_id: [state]
+                for state in self._hass.states.async_all(DOMAIN)
+                if ATTR_STATE_CLASS in state.attributes
+            }
+        self._unsub = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_state_changed,
+            event_filter=self._async_sensor_state_filter,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop collecting states."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        with self._lock:
+            self._since = math.inf
+            self._states.clear()
+
+    @callback
+    def _async_sensor_state_filter(self, event_data: EventStateChangedData) -> bool:
+        """Filter state changes of sensors with a state class."""
+        return (
+            (new_state := event_data["new_state"]) is not None
+            and ATTR_STATE_CLASS in new_state.attributes
+            and split_entity_id(event_data["entity_id"])[0] == DOMAIN
+        )
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Collect a changed sensor state."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+        assert new_state is not None
+        with self._lock:
+            if (states := self._states.get(entity_id)) is None:
+                self._states[entity_id] = [new_state]
+                # The states before a state class was added are not known
+                if event.data["old_state"] is not None:
+                    self._entity_since[entity_id] = new_state.last_updated_timestamp
+                return
+            states.append(new_state)
+            if len(states) > MAX_SHORT_TERM_STATES:
+                del states[: len(states) - MAX_SHORT_TERM_STATES // 2]
+                self._entity_since[entity_id] = states[0].last_updated_timestamp
+
+    def states_during_period(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        entity_ids: Iterable[str],
+        significant_entity_ids: Iterable[str],
+    ) -> tuple[dict[str, list[State]], list[str], list[str]]:
+        """Return the states during start-end and forget the older states.
+
+        Like the recorder history, the last state before start is included and
+        only state changes are included for significant_entity_ids. The
+        entity_ids and significant_entity_ids whose states during start-end
+        were not collected are returned to be queried from the database.
+        """
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+        history_list: dict[str, list[State]] = {}
+        missing: tuple[list[str], list[str]] = ([], [])
+        with self._lock:
+            if start_ts < self._since or end_ts > dt_util.utcnow().timestamp():
+                return history_list, list(entity_ids), list(significant_entity_ids)
+            wanted: set[str] = set()
+            for entity_id, significant in itertools.chain(
+                zip(entity_ids, itertools.repeat(False)),
+                zip(significant_entity_ids, itertools.repeat(True)),
+            ):
+                wanted.add(entity_id)
+                if start_ts < self._entity_since.get(entity_id, start_ts):
+                    missing[significant].append(entity_id)
+                    continue
+                if not (states := self._states.get(entity_id)):
+                    continue
+                first = bisect_left(
+                    states, start_ts, key=lambda state: state.last_updated_timestamp
+                )
+                last = bisect_left(
+                    states, end_ts, key=lambda state: state.last_updated_timestamp
+                )
+                period_states = states[first:last]
+                if significant:
+                    period_states = [
+                        state
+                        for state in period_states
+                        if state.last_changed_timestamp == state.last_updated_timestamp
+                    ]
+                history_list[entity_id] = states[max(first - 1, 0) : first] + (
+                    period_states
+                )
+            # Keep the last state before end, it is the first state of the next
+            # period, and forget sensors which are gone or lost their state class
+            for entity_id, states in list(self._states.items()):
+                last = bisect_left(
+                    states, end_ts, key=lambda state: state.last_updated_timestamp
+                )
+                if entity_id not in wanted and last == len(states):
+                    del self._states[entity_id]
+                elif last > 1:
+                    del states[: last - 1]
+            self._entity_since = {
+                entity_id: since
+                for entity_id, since in self._entity_since.items()
+                if since > end_ts and entity_id in self._states
+            }
+            self._since = end_ts
+        return history_list, *missing
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Start collecting sensor states for compiling short term statistics."""
+    short_term_states = hass.data[SHORT_TERM_STATES] = ShortTermStates(hass)
+    short_term_states.async_start()
+
+    @callback
+    def _async_stop(event: Event) -> None:
+        """Stop collecting sensor states."""
+        hass.data.pop(SHORT_TERM_STATES).async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
@@ -402,6 +574,37 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
+def _get_history_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    entities_full_history: list[str],
+    entities_significant_history: list[str],
+) -> dict[str, list[State]]:
+    """Get the sensor states during start-end from the database."""
+    history_list: dict[str, list[State]] = {}
+    if entities_full_history:
+        history_list = history.get_full_significant_states_with_session(
+            hass,
+            session,
+            start - datetime.timedelta.resolution,
+            end,
+            entity_ids=entities_full_history,
+            significant_changes_only=False,
+        )
+    if entities_significant_history:
+        _history_list = history.get_full_significant_states_with_session(
+            hass,
+            session,
+            start - datetime.timedelta.resolution,
+            end,
+            entity_ids=entities_significant_history,
+        )
+        history_list = {**history_list, **_history_list}
+    return history_list
+
+
 def compile_statistics(  # noqa: C901
     hass: HomeAssistant,
     session: Session,
@@ -417,30 +620,29 @@ def compile_statistics(  # noqa: C901
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
     ]
-    history_list: dict[str, list[State]] = {}
-    if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_full_history,
-            significant_changes_only=False,
-        )
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
     ]
-    if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
+    history_list: dict[str, list[State]] = {}
+    if short_term_states := hass.data.get(SHORT_TERM_STATES):
+        (
+            history_list,
+            entities_full_history,
+            entities_significant_history,
+        ) = short_term_states.states_during_period(
+            start, end, entities_full_history, entities_significant_history
+        )
+    if entities_full_history or entities_significant_history:
+        history_list |= _get_history_with_session(
             hass,
             session,
-            start - datetime.timedelta.resolution,
+            start,
             end,
-            entity_ids=entities_significant_history,
+            entities_full_history,
+            entities_significant_history,
         )
-        history_list = {**history_list, **_history_list}
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
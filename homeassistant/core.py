@@ -7,7 +7,7 @@ of entities and react to changes.
 from __future__ import annotations
 
 import asyncio
-from collections import UserDict, defaultdict
+from collections import UserDict, defaultdict, deque
 from collections.abc import (
     Callable,
     Collection,
@@ -15,6 +15,7 @@ from collections.abc import (
     Iterable,
     KeysView,
     Mapping,
+    Sized,
     ValuesView,
 )
 import concurrent.futures
@@ -24,6 +25,7 @@ import enum
 import functools
 import inspect
 import logging
+import operator
 import re
 import threading
 import time
@@ -71,6 +73,8 @@ from .const import (
     MAX_EXPECTED_ENTITY_IDS,
     MAX_LENGTH_EVENT_EVENT_TYPE,
     MAX_LENGTH_STATE_STATE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
     __version__,
 )
 from .exceptions import (
@@ -129,6 +133,13 @@ DOMAIN = "homeassistant"
 # How long to wait to log tasks that are blocking
 BLOCK_LOG_TIMEOUT = 60
 
+# Number of handles waiting in the event loop ready queue above which the
+# event loop is considered saturated and background priority jobs are deferred
+LOOP_SATURATED_READY_HANDLES = 100
+# Max seconds spent running deferred background priority jobs before
+# yielding to the event loop
+BACKGROUND_JOBS_TIME_BUDGET = 0.005
+
 type ServiceResponse = JsonObjectType | None
 type EntityServiceResponse = dict[str, ServiceResponse]
 
@@ -324,6 +335,16 @@ class HassJobType(enum.Enum):
     Executor = 3
 
 
+class HassJobPriority(enum.IntEnum):
+    """Represent the priority of a job when the event loop is saturated."""
+
+    NORMAL = 0
+    """Run right away, for user facing work like service calls and automations."""
+
+    BACKGROUND = 1
+    """Deferred while the event loop is saturated, for polling and discovery."""
+
+
 class HassJob[**_P, _R_co]:
     """Represent a job to be run later.
 
@@ -332,7 +353,7 @@ class HassJob[**_P, _R_co]:
     we run the job.
     """
 
-    __slots__ = ("target", "name", "_cancel_on_shutdown", "_cache")
+    __slots__ = ("target", "name", "priority", "_cancel_on_shutdown", "_cache")
 
     def __init__(
         self,
@@ -341,10 +362,12 @@ class HassJob[**_P, _R_co]:
         *,
         cancel_on_shutdown: bool | None = None,
         job_type: HassJobType | None = None,
+        priority: HassJobPriority = HassJobPriority.NORMAL,
     ) -> None:
         """Create a job object."""
         self.target: Final = target
         self.name = name
+        self.priority = priority
         self._cancel_on_shutdown = cancel_on_shutdown
         self._cache: dict[str, Any] = {}
         if job_type:
@@ -391,6 +414,116 @@ def get_hassjob_callable_job_type(target: Callable[..., Any]) -> HassJobType:
     return HassJobType.Executor
 
 
+@dataclass(slots=True)
+class JobPriorityStats:
+    """Represent how long jobs of a priority waited to run.
+
+    For normal priority jobs this is the event loop lag measured while
+    background priority jobs are deferred. For background priority jobs
+    this is the time deferred jobs waited to run.
+    """
+
+    samples: int = 0
+    total_lag: float = 0.0
+    max_lag: float = 0.0
+
+    def add(self, lag: float) -> None:
+        """Add a lag sample."""
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(lag, self.max_lag)
+
+
+@dataclass(slots=True)
+class _DeferredJob:
+    """A background priority job waiting for the event loop to catch up."""
+
+    hassjob: HassJob[..., Any]
+    args: tuple[Any, ...]
+    deferred_at: float
+    cancelled: bool = False
+
+    @callback
+    def cancel(self) -> None:
+        """Cancel the job if it has not run yet."""
+        self.cancelled = True
+
+
+class _BackgroundJobQueue:
+    """Defer background priority jobs while the event loop is saturated.
+
+    Deferred jobs are run from a callback which is queued at the end of the
+    event loop ready queue, so work that was already waiting to run goes
+    first. While the loop stays saturated only one deferred job runs per
+    event loop iteration.
+    """
+
+    __slots__ = ("_hass", "_jobs", "_ready", "_drain_scheduled_at", "stats")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._jobs: deque[_DeferredJob] = deque()
+        # The event loop does not expose the length of the ready queue, the
+        # fallback makes the loop never considered saturated.
+        self._ready: Sized = getattr(hass.loop, "_ready", ())
+        self._drain_scheduled_at: float | None = None
+        self.stats = {priority: JobPriorityStats() for priority in HassJobPriority}
+
+    @callback
+    def async_should_defer(self) -> bool:
+        """Return if background priority jobs should be deferred."""
+        return bool(self._jobs) or len(self._ready) > LOOP_SATURATED_READY_HANDLES
+
+    @callback
+    def async_add(
+        self, hassjob: HassJob[..., Any], args: tuple[Any, ...]
+    ) -> CALLBACK_TYPE:
+        """Defer a background priority job and return a callback to cancel it."""
+        now = self._hass.loop.time()
+        deferred_job = _DeferredJob(hassjob, args, now)
+        self._jobs.append(deferred_job)
+        if self._drain_scheduled_at is None:
+            self._drain_scheduled_at = now
+            self._hass.loop.call_soon(self._async_drain)
+        return deferred_job.cancel
+
+    @callback
+    def _async_drain(self) -> None:
+        """Run deferred jobs until the time budget is used or the loop is saturated."""
+        hass = self._hass
+        loop = hass.loop
+        jobs = self._jobs
+        start = loop.time()
+        if TYPE_CHECKING:
+            assert self._drain_scheduled_at is not None
+        self.stats[HassJobPriority.NORMAL].add(start - self._drain_scheduled_at)
+        self._drain_scheduled_at = None
+        background_stats = self.stats[HassJobPriority.BACKGROUND]
+        while jobs:
+            deferred_job = jobs.popleft()
+            if deferred_job.cancelled:
+                continue
+            hassjob = deferred_job.hassjob
+            args = deferred_job.args
+            background_stats.add(loop.time() - deferred_job.deferred_at)
+            try:
+                if hassjob.job_type is HassJobType.Callback:
+                    hass._async_run_callback_hass_job(hassjob, args)  # noqa: SLF001
+                else:
+                    hass._async_add_hass_job(hassjob, *args, background=True)  # noqa: SLF001
+            except Exception:
+                _LOGGER.exception("Error running job: %s", hassjob)
+            if (
+                loop.time() - start > BACKGROUND_JOBS_TIME_BUDGET
+                or len(self._ready) > LOOP_SATURATED_READY_HANDLES
+            ):
+                break
+        if jobs:
+            self._drain_scheduled_at = loop.time()
+            loop.call_soon(self._async_drain)
+
+
 class CoreState(enum.Enum):
     """Represent the current state of Home Assistant."""
 
@@ -436,6 +569,7 @@ class HomeAssistant:
         self.loop = asyncio.get_running_loop()
         self._tasks: set[asyncio.Future[Any]] = set()
         self._background_tasks: set[asyncio.Future[Any]] = set()
+        self._background_jobs = _BackgroundJobQueue(self)
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
@@ -455,6 +589,11 @@ class HomeAssistant:
             max_workers=1, thread_name_prefix="ImportExecutor"
         )
         self.loop_thread_id = getattr(self.loop, "_thread_id")
+        # The callback HassJob running in the event loop, so loop
+        # diagnostics can attribute a stall to the job causing it.
+        # Only recorded while track_running_job is set.
+        self.track_running_job = False
+        self.running_job: HassJob[..., Any] | None = None
 
     def verify_event_loop_thread(self, what: str) -> None:
         """Report and raise if we are not running in the event loop thread."""
@@ -886,6 +1025,14 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_get_job_priority_stats(self) -> dict[HassJobPriority, JobPriorityStats]:
+        """Return how long jobs waited to run per priority.
+
+        This method must be run in the event loop.
+        """
+        return self._background_jobs.stats
+
     @callback
     def async_add_import_executor_job[*_Ts, _T](
         self, target: Callable[[*_Ts], _T], *args: *_Ts
@@ -927,9 +1074,19 @@ class HomeAssistant:
 
         If background is True, the task will created as a background task.
 
+        Jobs with background priority are deferred while the event loop is
+        saturated, in which case None is returned.
+
         hassjob: HassJob
         args: parameters for method to call.
         """
+        if (
+            hassjob.priority is HassJobPriority.BACKGROUND
+            and self._background_jobs.async_should_defer()
+        ):
+            self._background_jobs.async_add(hassjob, args)
+            return None
+
         # This code path is performance sensitive and uses
         # if TYPE_CHECKING to avoid the overhead of constructing
         # the type used for the cast. For history see:
@@ -937,11 +1094,53 @@ class HomeAssistant:
         if hassjob.job_type is HassJobType.Callback:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., _R], hassjob)
-            hassjob.target(*args)
+            if self.track_running_job:
+                self._async_run_callback_hass_job(hassjob, args)
+            else:
+                hassjob.target(*args)
             return None
 
         return self._async_add_hass_job(hassjob, *args, background=background)
 
+    @callback
+    def _async_run_callback_hass_job(
+        self, hassjob: HassJob[..., Any], args: tuple[Any, ...]
+    ) -> None:
+        """Run a callback HassJob, recording it as the running job if tracked."""
+        if not self.track_running_job:
+            hassjob.target(*args)
+            return
+        running_job = self.running_job
+        self.running_job = hassjob
+        try:
+            hassjob.target(*args)
+        finally:
+            self.running_job = running_job
+
+    @callback
+    def async_run_cancellable_hass_job(
+        self, hassjob: HassJob[..., Coroutine[Any, Any, Any] | Any], *args: Any
+    ) -> CALLBACK_TYPE | None:
+        """Run a HassJob from within the event loop unless it is deferred.
+
+        Background priority jobs are deferred while the event loop is
+        saturated, like with async_run_hass_job. If the job was deferred a
+        callback to cancel it is returned, so the owner of the job can stop
+        it from running, otherwise the job was run and None is returned.
+
+        This method must be run in the event loop.
+        """
+        if (
+            hassjob.priority is HassJobPriority.BACKGROUND
+            and self._background_jobs.async_should_defer()
+        ):
+            return self._background_jobs.async_add(hassjob, args)
+        if hassjob.job_type is HassJobType.Callback:
+            self._async_run_callback_hass_job(hassjob, args)
+        else:
+            self._async_add_hass_job(hassjob, *args)
+        return None
+
     @overload
     @callback
     def async_run_job[_R, *_Ts](
@@ -1147,6 +1346,8 @@ class HomeAssistant:
         self.exit_code = exit_code
 
         self.set_state(CoreState.stopping)
+        # Held back state writes would be lost once integrations stop
+        self.states.async_flush_coalesced_writes()
         self.bus.async_fire_internal(EVENT_HOMEASSISTANT_STOP)
         try:
             async with self.timeout.async_timeout(STOP_STAGE_SHUTDOWN_TIMEOUT):
@@ -1159,6 +1360,7 @@ class HomeAssistant:
 
         # Stage 3 - Final write
         self.set_state(CoreState.final_write)
+        self.states.async_flush_coalesced_writes()
         self.bus.async_fire_internal(EVENT_HOMEASSISTANT_FINAL_WRITE)
         try:
             async with self.timeout.async_timeout(FINAL_WRITE_STAGE_SHUTDOWN_TIMEOUT):
@@ -1445,6 +1647,17 @@ class _OneTimeListener(Generic[_DataT]):
         return f"<_OneTimeListener {self.listener_job.target}>"
 
 
+type _EventKeyType[_DataT: Mapping[str, Any]] = str | Callable[[_DataT], str | None]
+
+
+@dataclass(slots=True)
+class _KeyedListenerIndex(Generic[_DataT]):
+    """Index of listeners for an event type keyed by a value of the event data."""
+
+    key_getter: Callable[[_DataT], str | None]
+    listeners: defaultdict[str, list[_FilterableJobType[_DataT]]]
+
+
 # Empty list, used by EventBus.async_fire_internal
 EMPTY_LIST: list[Any] = []
 
@@ -1459,13 +1672,22 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_hass",
+        "_keyed_listeners",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._keyed_listeners: dict[
+            EventType[Any] | str, dict[_EventKeyType[Any], _KeyedListenerIndex[Any]]
+        ] = {}
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
@@ -1483,7 +1705,18 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, indexes in self._keyed_listeners.items():
+            # A job listening for several keys is counted once
+            listeners[event_type] = listeners.get(event_type, 0) + len(
+                {
+                    filterable_job
+                    for index in indexes.values()
+                    for jobs in index.listeners.values()
+                    for filterable_job in jobs
+                }
+            )
+        return listeners
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1554,6 +1787,28 @@ class EventBus:
         else:
             match_all_listeners = EMPTY_LIST
 
+        if event_data is not None and (
+            keyed_indexes := self._keyed_listeners.get(event_type)
+        ):
+            # Keyed listeners are looked up by the value of the event
+            # data so listeners that do not match are never visited
+            keyed_listeners: list[_FilterableJobType[Any]] = []
+            for index in keyed_indexes.values():
+                try:
+                    key = index.key_getter(event_data)
+                except Exception:
+                    _LOGGER.exception("Error in event key getter")
+                    continue
+                try:
+                    jobs = index.listeners.get(key) if key is not None else None
+                except TypeError:
+                    # The event data holds an unhashable value for the key
+                    continue
+                if jobs:
+                    keyed_listeners += jobs
+            if keyed_listeners:
+                listeners = listeners + keyed_listeners
+
         event: Event[_DataT] | None = None
         for job, event_filter in listeners + match_all_listeners:
             if event_filter is not None:
@@ -1653,6 +1908,96 @@ class EventBus:
             self._async_remove_listener, event_type, filterable_job
         )
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: EventType[_DataT] | str,
+        key: _EventKeyType[_DataT],
+        keys: str | Iterable[str],
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None]
+        | HassJob[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        job_type: HassJobType | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type matching one or more keys.
+
+        The key is either the name of a value in the event data, for example
+        ``entity_id`` or ``device_id``, or a callable decorated with @callback
+        which returns the key for the event data, for example the domain of
+        the entity_id. Listeners are indexed by key so firing an event only
+        visits the listeners registered for the key of that event, instead of
+        calling an event filter for every listener of the event type.
+
+        Callables used as key should be module level functions, since
+        listeners are indexed per key callable.
+
+        The listener may be a HassJob, so a job can be shared when listening
+        for keys added over time, in which case job_type is ignored.
+
+        Keyed listeners run after the listeners registered with async_listen
+        for the event type and before the listeners for all events.
+
+        This method must be run in the event loop.
+        """
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        if not keys:
+            raise HomeAssistantError("At least one key is required")
+        if not isinstance(key, str) and not is_callback_check_partial(key):
+            raise HomeAssistantError(f"Event key {key} is not a callback")
+
+        if (indexes := self._keyed_listeners.get(event_type)) is None:
+            indexes = self._keyed_listeners[event_type] = {}
+        if (index := indexes.get(key)) is None:
+            key_getter = (
+                cast(Callable[[_DataT], str | None], operator.methodcaller("get", key))
+                if isinstance(key, str)
+                else key
+            )
+            index = indexes[key] = _KeyedListenerIndex(key_getter, defaultdict(list))
+
+        filterable_job: _FilterableJobType[_DataT] = (
+            listener
+            if isinstance(listener, HassJob)
+            else HassJob(listener, f"listen {event_type} {key}", job_type=job_type),
+            None,
+        )
+        for key_value in keys:
+            index.listeners[key_value].append(filterable_job)
+        return functools.partial(
+            self._async_remove_keyed_listener, event_type, key, keys, filterable_job
+        )
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        key: _EventKeyType[_DataT],
+        keys: tuple[str, ...],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexes = self._keyed_listeners[event_type]
+            index_listeners = indexes[key].listeners
+            for key_value in keys:
+                index_listeners[key_value].remove(filterable_job)
+                if not index_listeners[key_value]:
+                    del index_listeners[key_value]
+        except (KeyError, ValueError):
+            # KeyError if the event_type, key or key value did not exist
+            # ValueError if listener did not exist for the key value
+            _LOGGER.exception(
+                "Unable to remove unknown keyed job listener %s", filterable_job
+            )
+            return
+
+        if not index_listeners:
+            del indexes[key]
+            if not indexes:
+                del self._keyed_listeners[event_type]
+
     def listen_once(
         self,
         event_type: EventType[_DataT] | str,
@@ -1909,10 +2254,26 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @under_cached_property
+    def attributes_json(self) -> bytes:
+        """Return a JSON string of the attributes of the State.
+
+        It is shared by all serialized formats of the State and carried
+        over to the next State if the attributes do not change.
+        """
+        return json_bytes(self.attributes)
+
+    @under_cached_property
+    def attributes_json_fragment(self) -> json_fragment:
+        """Return a JSON fragment of the attributes of the State."""
+        return json_fragment(self.attributes_json)
+
     @under_cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            {**self._as_dict, "attributes": self.attributes_json_fragment}
+        )
 
     @under_cached_property
     def json_fragment(self) -> json_fragment:
@@ -1955,7 +2316,14 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        return json_bytes(
+            {
+                self.entity_id: {
+                    **self.as_compressed_state,
+                    COMPRESSED_STATE_ATTRIBUTES: self.attributes_json_fragment,
+                }
+            }
+        )[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -2063,10 +2431,36 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+# States which are always written immediately, even if the entity
+# has a coalesce window, since they are significant transitions
+_COALESCE_BYPASS_STATES = frozenset({STATE_UNAVAILABLE, STATE_UNKNOWN})
+
+
+@dataclass(slots=True)
+class _CoalescedStateWrite:
+    """A state write held back until the coalesce window of the entity ends."""
+
+    new_state: str
+    attributes: Mapping[str, Any] | None
+    force_update: bool
+    context: Context | None
+    state_info: StateInfo | None
+    timestamp: float
+    timer: asyncio.TimerHandle | None = None
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_coalesce_windows",
+        "_coalesced_writes",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2077,6 +2471,8 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._coalesce_windows: dict[str, float] = {}
+        self._coalesced_writes: dict[str, _CoalescedStateWrite] = {}
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2184,6 +2580,9 @@ class StateMachine:
         entity_id = entity_id.lower()
         old_state = self._states.pop(entity_id, None)
         self._reservations.discard(entity_id)
+        if self._coalesce_windows:
+            self._async_cancel_coalesced_write(entity_id)
+            self._coalesce_windows.pop(entity_id, None)
 
         if old_state is None:
             return False
@@ -2252,6 +2651,115 @@ class StateMachine:
             entity_id not in self._states_data and entity_id not in self._reservations
         )
 
+    @callback
+    def async_set_coalesce_window(self, entity_id: str, window: float | None) -> None:
+        """Set the window in seconds in which state writes of an entity are coalesced.
+
+        The first write after the window has passed is written immediately.
+        Writes within the window are held back and only the last one is
+        written when the window ends, resulting in a single state_changed
+        event. Adding the entity and writes from or to unavailable or unknown
+        are always written immediately.
+
+        Pass None to stop coalescing, any held back write is written
+        immediately. The window is also reset when the state is removed.
+
+        This method must be run in the event loop.
+        """
+        entity_id = entity_id.lower()
+        if window:
+            self._coalesce_windows[entity_id] = window
+            return
+        self._coalesce_windows.pop(entity_id, None)
+        if pending := self._async_cancel_coalesced_write(entity_id):
+            self._async_write_coalesced(entity_id, pending)
+
+    @callback
+    def _async_cancel_coalesced_write(
+        self, entity_id: str
+    ) -> _CoalescedStateWrite | None:
+        """Cancel and return the held back write of an entity."""
+        if (pending := self._coalesced_writes.pop(entity_id, None)) and pending.timer:
+            pending.timer.cancel()
+        return pending
+
+    @callback
+    def _async_coalesce_write(
+        self,
+        entity_id: str,
+        window: float,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+    ) -> bool:
+        """Hold back a state write if it is within the coalesce window.
+
+        Returns True if the write was held back.
+        """
+        if (pending := self._coalesced_writes.get(entity_id)) is not None:
+            if new_state not in _COALESCE_BYPASS_STATES:
+                # Fold the write into the one already held back
+                pending.new_state = new_state
+                pending.attributes = attributes
+                pending.force_update |= force_update
+                pending.context = context
+                pending.state_info = state_info
+                pending.timestamp = timestamp
+                return True
+            self._async_cancel_coalesced_write(entity_id)
+            return False
+
+        if (
+            (old_state := self._states_data.get(entity_id)) is None
+            or new_state in _COALESCE_BYPASS_STATES
+            or old_state.state in _COALESCE_BYPASS_STATES
+            or (remaining := window - (timestamp - old_state.last_updated_timestamp))
+            <= 0
+        ):
+            return False
+
+        pending = _CoalescedStateWrite(
+            new_state, attributes, force_update, context, state_info, timestamp
+        )
+        pending.timer = self._loop.call_later(
+            remaining, self._async_write_coalesced, entity_id, pending
+        )
+        self._coalesced_writes[entity_id] = pending
+        return True
+
+    @callback
+    def async_flush_coalesced_writes(self) -> None:
+        """Write all held back state writes now.
+
+        This method must be run in the event loop.
+        """
+        coalesced_writes = self._coalesced_writes
+        self._coalesced_writes = {}
+        for entity_id, pending in coalesced_writes.items():
+            if pending.timer:
+                pending.timer.cancel()
+            self._async_write_coalesced(entity_id, pending)
+
+    @callback
+    def _async_write_coalesced(
+        self, entity_id: str, pending: _CoalescedStateWrite
+    ) -> None:
+        """Write a held back state write at the end of the coalesce window."""
+        if self._coalesced_writes.get(entity_id) is pending:
+            del self._coalesced_writes[entity_id]
+        self._async_set_state(
+            entity_id,
+            pending.new_state,
+            pending.attributes,
+            pending.force_update,
+            pending.context,
+            pending.state_info,
+            pending.timestamp,
+        )
+
     @callback
     def async_set(
         self,
@@ -2302,6 +2810,43 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
+        if (
+            self._coalesce_windows
+            and (window := self._coalesce_windows.get(entity_id))
+            and self._async_coalesce_write(
+                entity_id,
+                window,
+                new_state,
+                attributes,
+                force_update,
+                context,
+                state_info,
+                timestamp,
+            )
+        ):
+            return
+        self._async_set_state(
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+            timestamp,
+        )
+
+    @callback
+    def _async_set_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+    ) -> None:
+        """Set the state of an entity without coalescing."""
         # Most cases the key will be in the dict
         # so we optimize for the happy path as
         # python 3.11+ has near zero overhead for
@@ -2373,6 +2918,10 @@ class StateMachine:
             timestamp,
         )
         if old_state is not None:
+            if same_attr and (
+                attributes_json := old_state._cache.get("attributes_json")  # noqa: SLF001
+            ):
+                state._cache["attributes_json"] = attributes_json  # noqa: SLF001
             old_state.expire()
         self._states[entity_id] = state
         state_changed_data: EventStateChangedData = {
@@ -7,7 +7,15 @@ import dataclasses
 from typing import TYPE_CHECKING, Any, NamedTuple, Self
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
-from homeassistant.core import CoreState, Event, HomeAssistant, callback
+from homeassistant.core import (
+    CoreState,
+    Event,
+    HassJob,
+    HassJobPriority,
+    HassJobType,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.loader import bind_hass
 from homeassistant.util.async_ import gather_with_limited_concurrency
 from homeassistant.util.hass_dict import HassKey
@@ -59,15 +67,33 @@ def async_create_flow(
         context = context | {"discovery_key": discovery_key}
 
     if not dispatcher or dispatcher.started:
-        if init_coro := _async_init_flow(hass, domain, context, data):
-            hass.async_create_background_task(
-                init_coro, f"discovery flow {domain} {context}", eager_start=True
-            )
+        hass.async_run_hass_job(_START_FLOW_JOB, hass, domain, context, data)
         return
 
     dispatcher.async_create(domain, context, data)
 
 
+@callback
+def _async_start_flow(
+    hass: HomeAssistant, domain: str, context: ConfigFlowContext, data: Any
+) -> None:
+    """Start a discovery flow in the background."""
+    if init_coro := _async_init_flow(hass, domain, context, data):
+        hass.async_create_background_task(
+            init_coro, f"discovery flow {domain} {context}", eager_start=True
+        )
+
+
+# Discovery is background work, starting flows is deferred while the
+# event loop is saturated so user facing work runs first
+_START_FLOW_JOB = HassJob(
+    _async_start_flow,
+    "start discovery flow",
+    job_type=HassJobType.Callback,
+    priority=HassJobPriority.BACKGROUND,
+)
+
+
 @callback
 def _async_init_flow(
     hass: HomeAssistant, domain: str, context: ConfigFlowContext, data: Any
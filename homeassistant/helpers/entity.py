@@ -511,6 +511,9 @@ class Entity(
     __combined_unrecorded_attributes: frozenset[str] = (
         _entity_component_unrecorded_attributes | _unrecorded_attributes
     )
+    # Window in seconds in which state writes are coalesced into a single
+    # state_changed event, set by integrations with high frequency updates
+    _state_coalesce_window: float | None = None
     # Job type cache
     _job_types: dict[str, HassJobType] | None = None
 
@@ -1478,6 +1481,11 @@ class Entity(
             "unrecorded_attributes": self.__combined_unrecorded_attributes
         }
 
+        if self._state_coalesce_window:
+            self.hass.states.async_set_coalesce_window(
+                self.entity_id, self._state_coalesce_window
+            )
+
         if self.registry_entry is not None:
             # This is an assert as it should never happen, but helps in tests
             assert not self.registry_entry.disabled_by, (
@@ -60,21 +60,12 @@ from .typing import TemplateVarsType
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
     "track_state_change_data"
 )
-_TRACK_STATE_REPORT_DATA: HassKey[_KeyedEventData[EventStateReportedData]] = HassKey(
-    "track_state_report_data"
-)
 _TRACK_STATE_ADDED_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = (
     HassKey("track_state_added_domain_data")
 )
 _TRACK_STATE_REMOVED_DOMAIN_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = (
     HassKey("track_state_removed_domain_data")
 )
-_TRACK_ENTITY_REGISTRY_UPDATED_DATA: HassKey[
-    _KeyedEventData[EventEntityRegistryUpdatedData]
-] = HassKey("track_entity_registry_updated_data")
-_TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
-    _KeyedEventData[EventDeviceRegistryUpdatedData]
-] = HassKey("track_device_registry_updated_data")
 
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
@@ -94,10 +85,16 @@ _TypedDictT = TypeVar("_TypedDictT", bound=Mapping[str, Any])
 
 @dataclass(slots=True, frozen=True)
 class _KeyedEventTracker(Generic[_TypedDictT]):
-    """Class to track events by key."""
+    """Class to track events by key.
+
+    The event key is passed to EventBus.async_listen_keyed, so the bus only
+    dispatches events for the keys that are tracked. Listeners tracking
+    MATCH_ALL are indexed by the match_all_event_key instead, if it is set.
+    """
 
     key: HassKey[_KeyedEventData[_TypedDictT]]
     event_type: EventType[_TypedDictT] | str
+    event_key: str | Callable[[_TypedDictT], str | None]
     dispatcher_callable: Callable[
         [
             HomeAssistant,
@@ -106,21 +103,16 @@ class _KeyedEventTracker(Generic[_TypedDictT]):
         ],
         None,
     ]
-    filter_callable: Callable[
-        [
-            HomeAssistant,
-            dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
-            _TypedDictT,
-        ],
-        bool,
-    ]
+    match_all_event_key: Callable[[_TypedDictT], str | None] | None = None
 
 
 @dataclass(slots=True, frozen=True)
 class _KeyedEventData(Generic[_TypedDictT]):
     """Class to track data for events by key."""
 
-    listener: CALLBACK_TYPE
+    dispatch_job: HassJob[[Event[_TypedDictT]], None]
+    match_all_job: HassJob[[Event[_TypedDictT]], None]
+    listeners: dict[str, CALLBACK_TYPE]
     callbacks: defaultdict[str, list[HassJob[[Event[_TypedDictT]], Any]]]
 
 
@@ -361,21 +353,11 @@ def _async_dispatch_entity_id_event[_StateEventDataT: EventStateEventData](
             )
 
 
-@callback
-def _async_state_filter[_StateEventDataT: EventStateEventData](
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[_StateEventDataT]], Any]]],
-    event_data: _StateEventDataT,
-) -> bool:
-    """Filter state changes by entity_id."""
-    return event_data["entity_id"] in callbacks
-
-
 _KEYED_TRACK_STATE_CHANGE = _KeyedEventTracker(
     key=_TRACK_STATE_CHANGE_DATA,
     event_type=EVENT_STATE_CHANGED,
+    event_key="entity_id",
     dispatcher_callable=_async_dispatch_entity_id_event_soon,
-    filter_callable=_async_state_filter,
 )
 
 
@@ -395,14 +377,6 @@ def _async_track_state_change_event(
     )
 
 
-_KEYED_TRACK_STATE_REPORT = _KeyedEventTracker(
-    key=_TRACK_STATE_REPORT_DATA,
-    event_type=EVENT_STATE_REPORTED,
-    dispatcher_callable=_async_dispatch_entity_id_event,
-    filter_callable=_async_state_filter,
-)
-
-
 def async_track_state_report_event(
     hass: HomeAssistant,
     entity_ids: str | Iterable[str],
@@ -414,8 +388,10 @@ def async_track_state_report_event(
     EVENT_STATE_REPORTED is fired on each occasion the state is updated
     but not changed, opposite of EVENT_STATE_CHANGED.
     """
-    return _async_track_event(
-        _KEYED_TRACK_STATE_REPORT, hass, entity_ids, action, job_type
+    if not entity_ids:
+        return _remove_empty_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_REPORTED, "entity_id", entity_ids, action, job_type
     )
 
 
@@ -430,16 +406,38 @@ def _remove_listener(
     tracker: _KeyedEventTracker[_TypedDictT],
     keys: Iterable[str],
     job: HassJob[[Event[_TypedDictT]], Any],
-    callbacks: dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
+    event_data: _KeyedEventData[_TypedDictT],
 ) -> None:
     """Remove listener."""
+    callbacks = event_data.callbacks
     for key in keys:
         callbacks[key].remove(job)
         if not callbacks[key]:
             del callbacks[key]
+            event_data.listeners.pop(key)()
 
     if not callbacks:
-        hass.data.pop(tracker.key).listener()
+        del hass.data[tracker.key]
+
+
+@callback
+def _async_listen_key(
+    hass: HomeAssistant,
+    tracker: _KeyedEventTracker[_TypedDictT],
+    event_data: _KeyedEventData[_TypedDictT],
+    key: str,
+) -> CALLBACK_TYPE:
+    """Listen for the events of a key on the event bus."""
+    if key == MATCH_ALL and tracker.match_all_event_key is not None:
+        return hass.bus.async_listen_keyed(
+            tracker.event_type,
+            tracker.match_all_event_key,
+            key,
+            event_data.match_all_job,
+        )
+    return hass.bus.async_listen_keyed(
+        tracker.event_type, tracker.event_key, key, event_data.dispatch_job
+    )
 
 
 # tracker, not hass is intentionally the first argument here since its
@@ -465,71 +463,46 @@ def _async_track_event(
         callbacks = event_data.callbacks
     else:
         callbacks = defaultdict(list)
-        listener = hass.bus.async_listen(
-            tracker.event_type,
-            partial(tracker.dispatcher_callable, hass, callbacks),
-            event_filter=partial(tracker.filter_callable, hass, callbacks),
+        # The jobs are shared by all keys, the bus dispatches an event
+        # to them only if its key is tracked
+        event_data = _KeyedEventData(
+            HassJob(
+                partial(tracker.dispatcher_callable, hass, callbacks),
+                f"dispatch {tracker.event_type} event by key",
+                job_type=HassJobType.Callback,
+            ),
+            HassJob(
+                partial(_async_dispatch_match_all_event, hass, callbacks),
+                f"dispatch {tracker.event_type} event to all keys",
+                job_type=HassJobType.Callback,
+            ),
+            {},
+            callbacks,
         )
-        event_data = _KeyedEventData(listener, callbacks)
         hass_data[tracker_key] = event_data
 
     job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
 
     if isinstance(keys, str):
         # Almost all calls to this function use a single key
-        # so we optimize for that case. We don't use setdefault
-        # here because this function gets called ~20000 times
-        # during startup, and we want to avoid the overhead of
-        # creating empty lists and throwing them away.
-        callbacks[keys].append(job)
+        # so we optimize for that case.
         keys = (keys,)
-    else:
-        for key in keys:
-            callbacks[key].append(job)
-
-    return partial(_remove_listener, hass, tracker, keys, job, callbacks)
-
-
-@callback
-def _async_dispatch_old_entity_id_or_entity_id_event(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventEntityRegistryUpdatedData]], Any]]],
-    event: Event[EventEntityRegistryUpdatedData],
-) -> None:
-    """Dispatch to listeners."""
-    if not (
-        callbacks_list := callbacks.get(  # type: ignore[call-overload]  # mypy bug?
-            event.data.get("old_entity_id", event.data["entity_id"])
-        )
-    ):
-        return
-    for job in callbacks_list.copy():
-        try:
-            hass.async_run_hass_job(job, event)
-        except Exception:
-            _LOGGER.exception(
-                "Error while dispatching event for %s to %s",
-                event.data.get("old_entity_id", event.data["entity_id"]),
-                job,
+    for key in keys:
+        if key not in callbacks:
+            event_data.listeners[key] = _async_listen_key(
+                hass, tracker, event_data, key
             )
+        callbacks[key].append(job)
+
+    return partial(_remove_listener, hass, tracker, keys, job, event_data)
 
 
 @callback
-def _async_entity_registry_updated_filter(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventEntityRegistryUpdatedData]], Any]]],
+def _entity_registry_updated_key(
     event_data: EventEntityRegistryUpdatedData,
-) -> bool:
-    """Filter entity registry updates by entity_id."""
-    return event_data.get("old_entity_id", event_data["entity_id"]) in callbacks
-
-
-_KEYED_TRACK_ENTITY_REGISTRY_UPDATED = _KeyedEventTracker(
-    key=_TRACK_ENTITY_REGISTRY_UPDATED_DATA,
-    event_type=EVENT_ENTITY_REGISTRY_UPDATED,
-    dispatcher_callable=_async_dispatch_old_entity_id_or_entity_id_event,
-    filter_callable=_async_entity_registry_updated_filter,
-)
+) -> str:
+    """Return the entity_id an entity registry update is keyed by."""
+    return event_data.get("old_entity_id", event_data["entity_id"])  # type: ignore[return-value]  # mypy bug?
 
 
 @bind_hass
@@ -546,49 +519,17 @@ def async_track_entity_registry_updated_event(
 
     Similar to async_track_state_change_event.
     """
-    return _async_track_event(
-        _KEYED_TRACK_ENTITY_REGISTRY_UPDATED, hass, entity_ids, action, job_type
+    if not entity_ids:
+        return _remove_empty_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_ENTITY_REGISTRY_UPDATED,
+        _entity_registry_updated_key,
+        entity_ids,
+        action,
+        job_type,
     )
 
 
-@callback
-def _async_device_registry_updated_filter(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventDeviceRegistryUpdatedData]], Any]]],
-    event_data: EventDeviceRegistryUpdatedData,
-) -> bool:
-    """Filter device registry updates by device_id."""
-    return event_data["device_id"] in callbacks
-
-
-@callback
-def _async_dispatch_device_id_event(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventDeviceRegistryUpdatedData]], Any]]],
-    event: Event[EventDeviceRegistryUpdatedData],
-) -> None:
-    """Dispatch to listeners."""
-    if not (callbacks_list := callbacks.get(event.data["device_id"])):
-        return
-    for job in callbacks_list.copy():
-        try:
-            hass.async_run_hass_job(job, event)
-        except Exception:
-            _LOGGER.exception(
-                "Error while dispatching event for %s to %s",
-                event.data["device_id"],
-                job,
-            )
-
-
-_KEYED_TRACK_DEVICE_REGISTRY_UPDATED = _KeyedEventTracker(
-    key=_TRACK_DEVICE_REGISTRY_UPDATED_DATA,
-    event_type=EVENT_DEVICE_REGISTRY_UPDATED,
-    dispatcher_callable=_async_dispatch_device_id_event,
-    filter_callable=_async_device_registry_updated_filter,
-)
-
-
 @callback
 def async_track_device_registry_updated_event(
     hass: HomeAssistant,
@@ -600,8 +541,10 @@ def async_track_device_registry_updated_event(
 
     Similar to async_track_entity_registry_updated_event.
     """
-    return _async_track_event(
-        _KEYED_TRACK_DEVICE_REGISTRY_UPDATED, hass, device_ids, action, job_type
+    if not device_ids:
+        return _remove_empty_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_DEVICE_REGISTRY_UPDATED, "device_id", device_ids, action, job_type
     )
 
 
@@ -613,7 +556,7 @@ def _async_dispatch_domain_event(
 ) -> None:
     """Dispatch domain event listeners."""
     domain = split_entity_id(event.data["entity_id"])[0]
-    for job in callbacks.get(domain, []) + callbacks.get(MATCH_ALL, []):
+    for job in callbacks.get(domain, []).copy():
         try:
             hass.async_run_hass_job(job, event)
         except Exception:
@@ -623,19 +566,33 @@ def _async_dispatch_domain_event(
 
 
 @callback
-def _async_domain_added_filter(
+def _async_dispatch_match_all_event(
     hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
-    event_data: EventStateChangedData,
-) -> bool:
-    """Filter state changes by entity_id."""
-    return event_data["old_state"] is None and (
-        MATCH_ALL in callbacks
-        or
-        # If old_state is None, new_state must be set but
-        # mypy doesn't know that
-        event_data["new_state"].domain in callbacks  # type: ignore[union-attr]
-    )
+    callbacks: dict[str, list[HassJob[[Event[Any]], Any]]],
+    event: Event[Any],
+) -> None:
+    """Dispatch listeners tracking all keys."""
+    for job in callbacks.get(MATCH_ALL, []).copy():
+        try:
+            hass.async_run_hass_job(job, event)
+        except Exception:
+            _LOGGER.exception("Error while processing event %s", event)
+
+
+@callback
+def _state_added_domain_key(event_data: EventStateChangedData) -> str | None:
+    """Return the domain of an added entity."""
+    if event_data["old_state"] is not None:
+        return None
+    # If old_state is None, new_state must be set but
+    # mypy doesn't know that
+    return event_data["new_state"].domain  # type: ignore[union-attr]
+
+
+@callback
+def _state_added_match_all_key(event_data: EventStateChangedData) -> str | None:
+    """Return MATCH_ALL if an entity was added."""
+    return MATCH_ALL if event_data["old_state"] is None else None
 
 
 @bind_hass
@@ -654,8 +611,9 @@ def async_track_state_added_domain(
 _KEYED_TRACK_STATE_ADDED_DOMAIN = _KeyedEventTracker(
     key=_TRACK_STATE_ADDED_DOMAIN_DATA,
     event_type=EVENT_STATE_CHANGED,
+    event_key=_state_added_domain_key,
     dispatcher_callable=_async_dispatch_domain_event,
-    filter_callable=_async_domain_added_filter,
+    match_all_event_key=_state_added_match_all_key,
 )
 
 
@@ -673,26 +631,27 @@ def _async_track_state_added_domain(
 
 
 @callback
-def _async_domain_removed_filter(
-    hass: HomeAssistant,
-    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
-    event_data: EventStateChangedData,
-) -> bool:
-    """Filter state changes by entity_id."""
-    return event_data["new_state"] is None and (
-        MATCH_ALL in callbacks
-        or
-        # If new_state is None, old_state must be set but
-        # mypy doesn't know that
-        event_data["old_state"].domain in callbacks  # type: ignore[union-attr]
-    )
+def _state_removed_domain_key(event_data: EventStateChangedData) -> str | None:
+    """Return the domain of a removed entity."""
+    if event_data["new_state"] is not None:
+        return None
+    # If new_state is None, old_state must be set but
+    # mypy doesn't know that
+    return event_data["old_state"].domain  # type: ignore[union-attr]
+
+
+@callback
+def _state_removed_match_all_key(event_data: EventStateChangedData) -> str | None:
+    """Return MATCH_ALL if an entity was removed."""
+    return MATCH_ALL if event_data["new_state"] is None else None
 
 
 _KEYED_TRACK_STATE_REMOVED_DOMAIN = _KeyedEventTracker(
     key=_TRACK_STATE_REMOVED_DOMAIN_DATA,
     event_type=EVENT_STATE_CHANGED,
+    event_key=_state_removed_domain_key,
     dispatcher_callable=_async_dispatch_domain_event,
-    filter_callable=_async_domain_removed_filter,
+    match_all_event_key=_state_removed_match_all_key,
 )
 
 
@@ -0,0 +1,239 @@
+"""Columnar snapshots of the state of many entities."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+import math
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HassJob,
+    HassJobType,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+
+from .state import state_as_number
+
+
+@dataclass(slots=True, frozen=True)
+class StateSnapshotColumns:
+    """Columns of a state snapshot.
+
+    Row n of every column belongs to the entity at entity_ids[n]. States
+    that cannot be converted to a number are NaN in the values column and
+    missing attributes are None.
+    """
+
+    entity_ids: list[str]
+    values: array[float]
+    last_changed: array[float]
+    attributes: dict[str, list[Any]]
+
+
+def _state_value(state: State) -> float:
+    """Return the numeric value of a state or NaN."""
+    try:
+        return state_as_number(state)
+    except ValueError:
+        return math.nan
+
+
+@callback
+def _state_changed_domain_key(event_data: EventStateChangedData) -> str:
+    """Return the domain of the entity of a state change."""
+    return split_entity_id(event_data["entity_id"])[0]
+
+
+class StateSnapshot:
+    """Columnar snapshot of selected entities kept up to date from state changes.
+
+    The columns are built once from the state machine and then updated in
+    place from state_changed events, so reading the state of many entities
+    does not have to convert every state again.
+
+    The snapshot holds the entities of the selected domains and the selected
+    entity_ids, or all entities if neither is selected. Selected entities are
+    tracked with keyed listeners, so only their state changes are dispatched
+    to the snapshot.
+    """
+
+    __slots__ = (
+        "_attributes",
+        "_domains",
+        "_entity_ids",
+        "_hass",
+        "_last_changed",
+        "_rows",
+        "_selected_entity_ids",
+        "_unsubs",
+        "_values",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        domains: Iterable[str] | None = None,
+        attributes: Iterable[str] = (),
+        entity_ids: Iterable[str] | None = None,
+    ) -> None:
+        """Initialize the snapshot."""
+        self._hass = hass
+        self._domains = None if domains is None else frozenset(domains)
+        self._selected_entity_ids = (
+            None if entity_ids is None else frozenset(entity_ids)
+        )
+        self._rows: dict[str, int] = {}
+        self._entity_ids: list[str] = []
+        self._values = array("d")
+        self._last_changed = array("d")
+        self._attributes: dict[str, list[Any]] = {
+            attribute: [] for attribute in attributes
+        }
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Load the current states and start tracking changes."""
+        hass = self._hass
+        states = hass.states
+        domains = self._domains
+        entity_ids = self._selected_entity_ids
+        if domains is None and entity_ids is None:
+            for state in states.async_all():
+                self._async_add_row(state)
+            self._unsubs.append(
+                hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+            )
+            return
+
+        job = HassJob(
+            self._async_state_changed,
+            "state snapshot",
+            job_type=HassJobType.Callback,
+        )
+        if domains:
+            for state in states.async_all(domains):
+                self._async_add_row(state)
+            self._unsubs.append(
+                hass.bus.async_listen_keyed(
+                    EVENT_STATE_CHANGED, _state_changed_domain_key, domains, job
+                )
+            )
+        if entity_ids:
+            for entity_id in entity_ids:
+                if entity_id not in self._rows and (
+                    entity_state := states.get(entity_id)
+                ):
+                    self._async_add_row(entity_state)
+            # Entities of the selected domains are already tracked
+            if domains:
+                entity_ids = frozenset(
+                    entity_id
+                    for entity_id in entity_ids
+                    if split_entity_id(entity_id)[0] not in domains
+                )
+            if entity_ids:
+                self._unsubs.append(
+                    hass.bus.async_listen_keyed(
+                        EVENT_STATE_CHANGED, "entity_id", entity_ids, job
+                    )
+                )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking changes."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_columns(self) -> StateSnapshotColumns:
+        """Return a copy of the current columns."""
+        return StateSnapshotColumns(
+            self._entity_ids.copy(),
+            array("d", self._values),
+            array("d", self._last_changed),
+            {
+                attribute: column.copy()
+                for attribute, column in self._attributes.items()
+            },
+        )
+
+    def __len__(self) -> int:
+        """Return the number of entities in the snapshot."""
+        return len(self._entity_ids)
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Update the snapshot from a state change."""
+        entity_id = event.data["entity_id"]
+        if (new_state := event.data["new_state"]) is None:
+            self._async_remove_row(entity_id)
+        elif (row := self._rows.get(entity_id)) is None:
+            self._async_add_row(new_state)
+        else:
+            self._async_update_row(row, new_state)
+
+    @callback
+    def _async_add_row(self, state: State) -> None:
+        """Append a row for a state."""
+        self._rows[state.entity_id] = len(self._entity_ids)
+        self._entity_ids.append(state.entity_id)
+        self._values.append(_state_value(state))
+        self._last_changed.append(state.last_changed_timestamp)
+        attributes = state.attributes
+        for attribute, column in self._attributes.items():
+            column.append(attributes.get(attribute))
+
+    @callback
+    def _async_update_row(self, row: int, state: State) -> None:
+        """Update the row of a state."""
+        self._values[row] = _state_value(state)
+        self._last_changed[row] = state.last_changed_timestamp
+        attributes = state.attributes
+        for attribute, column in self._attributes.items():
+            column[row] = attributes.get(attribute)
+
+    @callback
+    def _async_remove_row(self, entity_id: str) -> None:
+        """Remove the row of an entity by moving the last row into its place."""
+        if (row := self._rows.pop(entity_id, None)) is None:
+            return
+        last_entity_id = self._entity_ids.pop()
+        last_value = self._values.pop()
+        last_changed = self._last_changed.pop()
+        last_attributes = [column.pop() for column in self._attributes.values()]
+        if last_entity_id == entity_id:
+            return
+        self._rows[last_entity_id] = row
+        self._entity_ids[row] = last_entity_id
+        self._values[row] = last_value
+        self._last_changed[row] = last_changed
+        for column, value in zip(
+            self._attributes.values(), last_attributes, strict=True
+        ):
+            column[row] = value
+
+
+@callback
+def async_track_state_snapshot(
+    hass: HomeAssistant,
+    domains: Iterable[str] | None = None,
+    attributes: Iterable[str] = (),
+    entity_ids: Iterable[str] | None = None,
+) -> StateSnapshot:
+    """Create a columnar snapshot of entity states that stays up to date.
+
+    Call async_stop on the returned snapshot to stop tracking changes.
+    """
+    snapshot = StateSnapshot(hass, domains, attributes, entity_ids)
+    snapshot.async_start()
+    return snapshot
@@ -18,7 +18,15 @@ import requests
 
 from homeassistant import config_entries
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    HassJobPriority,
+    HassJobType,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
@@ -112,6 +120,14 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
         self._unsub_refresh: CALLBACK_TYPE | None = None
         self._unsub_shutdown: CALLBACK_TYPE | None = None
         self._request_refresh_task: asyncio.TimerHandle | None = None
+        # Polling is background work, it is deferred while the event loop is
+        # saturated so user facing work runs first
+        self._refresh_interval_job = HassJob(
+            self.__wrap_handle_refresh_interval,
+            f"{name} - refresh interval",
+            job_type=HassJobType.Callback,
+            priority=HassJobPriority.BACKGROUND,
+        )
         self.last_update_success = True
         self.last_exception: Exception | None = None
 
@@ -240,9 +256,17 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
             int(loop.time()) + self._microsecond + self._update_interval_seconds
         )
         self._unsub_refresh = loop.call_at(
-            next_refresh, self.__wrap_handle_refresh_interval
+            next_refresh, self.__async_run_refresh_interval_job
         ).cancel
 
+    @callback
+    def __async_run_refresh_interval_job(self) -> None:
+        """Run the refresh interval job or keep a way to cancel it if deferred."""
+        if cancel := self.hass.async_run_cancellable_hass_job(
+            self._refresh_interval_job
+        ):
+            self._unsub_refresh = cancel
+
     @callback
     def __wrap_handle_refresh_interval(self) -> None:
         """Handle a refresh interval occurrence."""
@@ -0,0 +1,167 @@
+"""Helper to run integration I/O in event loops on worker threads.
+
+Protocol heavy integrations can run their network I/O and parsing in a
+worker loop so it does not compete with the main event loop. Code running
+in a worker loop must not call into Home Assistant directly; results are
+handed back to the main event loop through a BatchedChannel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import logging
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_WORKER_LOOPS: HassKey[dict[str, WorkerLoop]] = HassKey("worker_loops")
+
+
+class BatchedChannel[_T]:
+    """Thread-safe channel that hands items to the main event loop in batches.
+
+    Items can be put from any thread. They are delivered to the callback on
+    the main event loop as a list, with a single call_soon_threadsafe per
+    batch instead of one per item.
+    """
+
+    __slots__ = ("_callback", "_items", "_lock", "_loop", "_scheduled")
+
+    def __init__(self, hass: HomeAssistant, target: Callable[[list[_T]], None]) -> None:
+        """Initialize the channel.
+
+        The target must be a callback.
+        """
+        self._loop = hass.loop
+        self._callback = target
+        self._items: list[_T] = []
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def put(self, item: _T) -> None:
+        """Put an item in the channel.
+
+        This method is thread-safe.
+        """
+        with self._lock:
+            self._items.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._loop.call_soon_threadsafe(self._async_deliver)
+
+    @callback
+    def _async_deliver(self) -> None:
+        """Deliver the items in the channel to the callback."""
+        with self._lock:
+            items = self._items
+            self._items = []
+            self._scheduled = False
+        try:
+            self._callback(items)
+        except Exception:
+            _LOGGER.exception("Error delivering %s items from channel", len(items))
+
+
+class WorkerLoop:
+    """An event loop running in a worker thread."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the worker loop."""
+        self.hass = hass
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name=f"WorkerLoop-{name}", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Run the event loop until it is stopped.
+
+        This runs in the worker thread.
+        """
+        loop = self.loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    def async_run[_R](self, target: Coroutine[Any, Any, _R]) -> asyncio.Future[_R]:
+        """Run a coroutine in the worker loop.
+
+        Returns a future that can be awaited in the main event loop.
+
+        This method must be run in the event loop.
+        """
+        return asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(target, self.loop), loop=self.hass.loop
+        )
+
+    @callback
+    def async_create_channel[_T](
+        self, target: Callable[[list[_T]], None]
+    ) -> BatchedChannel[_T]:
+        """Create a channel to hand results back to the main event loop.
+
+        This method must be run in the event loop.
+        """
+        return BatchedChannel(self.hass, target)
+
+    async def async_stop(self) -> None:
+        """Cancel the tasks in the worker loop and stop it."""
+        worker_loops = self.hass.data.get(DATA_WORKER_LOOPS, {})
+        if worker_loops.get(self.name) is self:
+            del worker_loops[self.name]
+        if not self._thread.is_alive():
+            return
+        await self.async_run(_async_cancel_tasks())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        await self.hass.async_add_executor_job(self._thread.join)
+
+
+async def _async_cancel_tasks() -> None:
+    """Cancel all other tasks in the running loop and wait for them."""
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@callback
+def async_get_worker_loop(hass: HomeAssistant, name: str) -> WorkerLoop:
+    """Return the worker loop with the given name, starting it if needed.
+
+    Worker loops are stopped when Home Assistant closes.
+
+    This method must be run in the event loop.
+    """
+    if (worker_loops := hass.data.get(DATA_WORKER_LOOPS)) is None:
+        worker_loops = hass.data[DATA_WORKER_LOOPS] = {}
+
+        async def _async_stop_worker_loops(event: Event) -> None:
+            """Stop all worker loops."""
+            loops = list(worker_loops.values())
+            worker_loops.clear()
+            await asyncio.gather(*(worker_loop.async_stop() for worker_loop in loops))
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_stop_worker_loops)
+
+    if (worker_loop := worker_loops.get(name)) is None:
+        worker_loop = worker_loops[name] = WorkerLoop(hass, name)
+        worker_loop.start()
+    return worker_loop
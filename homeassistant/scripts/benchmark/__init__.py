@@ -6,22 +6,63 @@ import argparse
 import asyncio
 from collections.abc import Callable
 from contextlib import suppress
+from dataclasses import dataclass
+import json
 import logging
+import platform
+import random
+import statistics
+import tempfile
+import threading
+import time
 from timeit import default_timer as timer
+from typing import TYPE_CHECKING, Any
 
-from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.orm import Session
+
+from homeassistant import bootstrap, config_entries, core, loader
+from homeassistant.const import EVENT_STATE_CHANGED, __version__
+from homeassistant.helpers import recorder as recorder_helper
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
+    TrackTemplate,
     async_track_state_change,
     async_track_state_change_event,
+    async_track_template_result,
 )
 from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.template import Template
+from homeassistant.setup import async_setup_component
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder import Recorder
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
 
 BENCHMARKS: dict[str, Callable] = {}
+SUITE_BENCHMARKS: dict[str, Callable] = {}
+
+SUITE = "suite"
+RECORDER = "recorder"
+DEFAULT_ENTITIES = [1000, 10000, 100000]
+DEFAULT_LISTENERS = [1, 1000]
+DEFAULT_OPERATIONS = 100000
+
+
+@dataclass(slots=True)
+class SuiteRun:
+    """Result of a single run of a suite benchmark.
+
+    operations: number of operations run.
+    runtime: seconds spent on all operations, excluding setup.
+    latencies: seconds spent on each measured operation or batch of operations.
+    """
+
+    operations: int
+    runtime: float
+    latencies: list[float]
 
 
 def run(args):
@@ -30,11 +71,85 @@ def run(args):
     logging.getLogger("homeassistant.core").setLevel(logging.CRITICAL)
 
     parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
-    parser.add_argument("name", choices=BENCHMARKS)
+    parser.add_argument(
+        "name", choices=[*BENCHMARKS, *SUITE_BENCHMARKS, SUITE, RECORDER]
+    )
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--entities",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ENTITIES,
+        help="Entity counts to run suite and recorder benchmarks with",
+    )
+    parser.add_argument(
+        "--listeners",
+        type=int,
+        nargs="+",
+        default=DEFAULT_LISTENERS,
+        help="Listener counts to run suite benchmarks with",
+    )
+    parser.add_argument(
+        "--operations",
+        type=int,
+        default=DEFAULT_OPERATIONS,
+        help="Operations measured per suite and recorder benchmark run",
+    )
+    parser.add_argument("--output", help="Write the suite results as JSON to this file")
+    parser.add_argument(
+        "--db-url",
+        help="Database the recorder benchmark records to, defaults to a new SQLite "
+        "database",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Writes per second of the recorder benchmark, defaults to unlimited",
+    )
+    parser.add_argument(
+        "--attribute-churn",
+        type=float,
+        default=0.0,
+        help="Fraction of state writes of the recorder benchmark that change "
+        "the attributes",
+    )
+    parser.add_argument(
+        "--event-ratio",
+        type=float,
+        default=0.0,
+        help="Fraction of writes of the recorder benchmark that fire an event "
+        "instead of writing a state",
+    )
 
     args = parser.parse_args()
 
+    if args.name in (SUITE, RECORDER) or args.name in SUITE_BENCHMARKS:
+        logging.getLogger("homeassistant").setLevel(logging.WARNING)
+        if args.name == RECORDER:
+            results = run_recorder_workloads(
+                [
+                    RecorderWorkload(
+                        entities=entity_count,
+                        operations=args.operations,
+                        db_url=args.db_url,
+                        rate=args.rate,
+                        attribute_churn=args.attribute_churn,
+                        event_ratio=args.event_ratio,
+                    )
+                    for entity_count in args.entities
+                ]
+            )
+        else:
+            names = list(SUITE_BENCHMARKS) if args.name == SUITE else [args.name]
+            results = run_suite(names, args.entities, args.listeners, args.operations)
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf8") as fp:
+                fp.write(output)
+        else:
+            print(output)
+        return
+
     bench = BENCHMARKS[args.name]
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
 
@@ -43,6 +158,87 @@ def run(args):
             asyncio.run(run_benchmark(bench))
 
 
+def run_suite(
+    names: list[str], entities: list[int], listeners: list[int], operations: int
+) -> dict:
+    """Run suite benchmarks for all entity and listener counts."""
+    results = []
+    for name in names:
+        for entity_count in entities:
+            for listener_count in listeners:
+                suite_run = asyncio.run(
+                    run_suite_benchmark(
+                        SUITE_BENCHMARKS[name], entity_count, listener_count, operations
+                    )
+                )
+                results.append(
+                    {
+                        "benchmark": name,
+                        "entities": entity_count,
+                        "listeners": listener_count,
+                        **summarize(suite_run),
+                    }
+                )
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def run_recorder_workloads(workloads: list[RecorderWorkload]) -> dict:
+    """Run the recorder benchmark for each workload."""
+    results = [asyncio.run(run_recorder_workload(workload)) for workload in workloads]
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def _p50_p99(latencies: list[float]) -> tuple[float, float]:
+    """Return the median and 99th percentile of latencies."""
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        return quantiles[49], quantiles[98]
+    latency = latencies[0] if latencies else 0.0
+    return latency, latency
+
+
+def summarize(suite_run: SuiteRun) -> dict[str, float | int]:
+    """Summarize a suite benchmark run."""
+    p50, p99 = _p50_p99(suite_run.latencies)
+    return {
+        "operations": suite_run.operations,
+        "runtime": suite_run.runtime,
+        "operations_per_second": (
+            suite_run.operations / suite_run.runtime if suite_run.runtime else 0.0
+        ),
+        "p50_latency_us": p50 * 10**6,
+        "p99_latency_us": p99 * 10**6,
+    }
+
+
+async def run_suite_benchmark(
+    bench: Callable, entities: int, listeners: int, operations: int
+) -> SuiteRun:
+    """Run a suite benchmark."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = core.HomeAssistant(config_dir)
+        suite_run = await bench(hass, entities, listeners, operations)
+        await hass.async_stop()
+    return suite_run
+
+
+async def run_recorder_workload(workload: RecorderWorkload) -> dict:
+    """Run the recorder benchmark for a workload."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = core.HomeAssistant(config_dir)
+        result = await _async_run_recorder_workload(hass, workload)
+        await hass.async_stop()
+    return result
+
+
 async def run_benchmark(bench):
     """Run a benchmark."""
     hass = core.HomeAssistant("")
@@ -57,6 +253,37 @@ def benchmark[_CallableT: Callable](func: _CallableT) -> _CallableT:
     return func
 
 
+def suite_benchmark[_CallableT: Callable](func: _CallableT) -> _CallableT:
+    """Decorate to mark a benchmark that is part of the suite.
+
+    Suite benchmarks are called with hass, the number of entities, the
+    number of listeners and the number of operations to measure and
+    return a SuiteRun.
+    """
+    SUITE_BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _entity_ids(entities: int) -> list[str]:
+    """Return entity ids for a suite benchmark."""
+    return [f"sensor.benchmark_{idx}" for idx in range(entities)]
+
+
+def _listened_entity_ids(entity_ids: list[str], listeners: int) -> list[str]:
+    """Return the entity ids listeners are spread over."""
+    step = max(len(entity_ids) // listeners, 1)
+    return [entity_ids[(idx * step) % len(entity_ids)] for idx in range(listeners)]
+
+
+async def _async_set_initial_states(
+    hass: core.HomeAssistant, entity_ids: list[str]
+) -> None:
+    """Set the initial state of all entities."""
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "0")
+    await hass.async_block_till_done()
+
+
 @benchmark
 async def fire_events(hass):
     """Fire a million events."""
@@ -308,3 +535,412 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@suite_benchmark
+async def bus_fire_internal(hass, entities, listeners, operations):
+    """Fire state_changed events with listeners that filter on entity_id."""
+    entity_ids = _entity_ids(entities)
+    count = 0
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for listened_entity_id in _listened_entity_ids(entity_ids, listeners):
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            listener,
+            event_filter=core.callback(
+                lambda event_data, entity_id=listened_entity_id: (
+                    event_data["entity_id"] == entity_id
+                )
+            ),
+        )
+
+    state = core.State(entity_ids[0], "on")
+    events_data = [
+        {"entity_id": entity_id, "old_state": state, "new_state": state}
+        for entity_id in entity_ids
+    ]
+    fire = hass.bus.async_fire_internal
+    latencies = []
+
+    start = timer()
+    for idx in range(operations):
+        fire_start = timer()
+        fire(EVENT_STATE_CHANGED, events_data[idx % entities])
+        latencies.append(timer() - fire_start)
+    await hass.async_block_till_done()
+    return SuiteRun(operations, timer() - start, latencies)
+
+
+@suite_benchmark
+async def state_set_internal(hass, entities, listeners, operations):
+    """Write states with listeners tracking state changes of some entities."""
+    entity_ids = _entity_ids(entities)
+    await _async_set_initial_states(hass, entity_ids)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+
+    for listened_entity_id in _listened_entity_ids(entity_ids, listeners):
+        async_track_state_change_event(hass, listened_entity_id, listener)
+
+    set_internal = hass.states.async_set_internal
+    latencies = []
+
+    start = timer()
+    for idx in range(operations):
+        timestamp = time.time()
+        set_start = timer()
+        set_internal(
+            entity_ids[idx % entities], str(idx), {}, False, None, None, timestamp
+        )
+        latencies.append(timer() - set_start)
+    await hass.async_block_till_done()
+    return SuiteRun(operations, timer() - start, latencies)
+
+
+@suite_benchmark
+async def track_state_change_event(hass, entities, listeners, operations):
+    """Measure the latency from a state write to async_track_state_change_event."""
+    entity_ids = _entity_ids(entities)
+    await _async_set_initial_states(hass, entity_ids)
+    listened_entity_ids = _listened_entity_ids(entity_ids, listeners)
+    future: asyncio.Future[float] | None = None
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        if future is not None and not future.done():
+            future.set_result(timer())
+
+    for listened_entity_id in listened_entity_ids:
+        async_track_state_change_event(hass, listened_entity_id, listener)
+
+    latencies = []
+    start = timer()
+    for idx in range(operations):
+        future = hass.loop.create_future()
+        set_start = timer()
+        hass.states.async_set(listened_entity_ids[idx % listeners], str(idx + 1))
+        latencies.append(await future - set_start)
+    return SuiteRun(operations, timer() - start, latencies)
+
+
+@suite_benchmark
+async def template_render(hass, entities, listeners, operations):
+    """Measure the latency from a state write to a template re-render.
+
+    Each listener tracks a template referencing a single entity.
+    """
+    entity_ids = _entity_ids(entities)
+    await _async_set_initial_states(hass, entity_ids)
+    listened_entity_ids = _listened_entity_ids(entity_ids, listeners)
+    future: asyncio.Future[float] | None = None
+
+    @core.callback
+    def listener(event, updates):
+        """Handle template result."""
+        if future is not None and not future.done():
+            future.set_result(timer())
+
+    for listened_entity_id in listened_entity_ids:
+        async_track_template_result(
+            hass,
+            [
+                TrackTemplate(
+                    Template(
+                        f"{{{{ states('{listened_entity_id}') | int(0) + 1 }}}}", hass
+                    ),
+                    None,
+                )
+            ],
+            listener,
+        )
+    await hass.async_block_till_done()
+
+    latencies = []
+    start = timer()
+    for idx in range(operations):
+        future = hass.loop.create_future()
+        set_start = timer()
+        hass.states.async_set(listened_entity_ids[idx % listeners], str(idx + 1))
+        latencies.append(await future - set_start)
+    return SuiteRun(operations, timer() - start, latencies)
+
+
+RECORDER_BATCH_SIZE = 1000
+
+
+@suite_benchmark
+async def recorder_ingest(hass, entities, listeners, operations):
+    """Measure recorder ingestion of state changes into SQLite.
+
+    Listeners track state changes of some entities next to the recorder.
+    Latencies are measured per batch of state changes, from the first
+    state write of the batch until the recorder has committed it.
+    """
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    recorder_helper.async_initialize_recorder(hass)
+    assert await async_setup_component(
+        hass,
+        "recorder",
+        {"recorder": {"db_url": f"sqlite:///{hass.config.path('benchmark.db')}"}},
+    )
+    await hass.async_start()
+    instance = hass.data[recorder_helper.DATA_INSTANCE]
+    assert await instance.async_db_ready
+
+    entity_ids = _entity_ids(entities)
+    await _async_set_initial_states(hass, entity_ids)
+    await instance.async_block_till_done()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+
+    for listened_entity_id in _listened_entity_ids(entity_ids, listeners):
+        async_track_state_change_event(hass, listened_entity_id, listener)
+
+    latencies = []
+    start = timer()
+    for batch_start in range(0, operations, RECORDER_BATCH_SIZE):
+        set_start = timer()
+        for idx in range(
+            batch_start, min(batch_start + RECORDER_BATCH_SIZE, operations)
+        ):
+            hass.states.async_set(entity_ids[idx % entities], str(idx))
+        await instance.async_block_till_done()
+        latencies.append(timer() - set_start)
+    return SuiteRun(operations, timer() - start, latencies)
+
+
+# Stages of ingestion the CPU time of the recorder thread is split into
+STAGE_SERIALIZE = "serialize"
+STAGE_LOOKUP = "lookup"
+STAGE_FLUSH = "flush"
+STAGE_COMMIT = "commit"
+RECORDER_STAGES = (STAGE_SERIALIZE, STAGE_LOOKUP, STAGE_FLUSH, STAGE_COMMIT)
+
+# Number of writes of the recorder benchmark between checks of the rate
+RECORDER_WORKLOAD_BATCH_SIZE = 100
+
+
+@dataclass(slots=True, kw_only=True)
+class RecorderWorkload:
+    """Synthetic workload of the recorder benchmark.
+
+    db_url: database to record to, a new SQLite database if None.
+    rate: writes per second, as fast as possible if None.
+    attribute_churn: fraction of state writes that change the attributes.
+    event_ratio: fraction of writes that fire an event instead of a state.
+    """
+
+    entities: int
+    operations: int
+    db_url: str | None = None
+    rate: float | None = None
+    attribute_churn: float = 0.0
+    event_ratio: float = 0.0
+
+
+class RecorderProfiler:
+    """Measure the recorder thread while it ingests a workload.
+
+    The CPU time of the recorder thread is attributed to the innermost
+    stage it is in, a flush while looking up or committing only counts
+    as flush.
+    """
+
+    def __init__(self, instance: Recorder) -> None:
+        """Initialize the profiler."""
+        self.instance = instance
+        self.cpu = dict.fromkeys(RECORDER_STAGES, 0.0)
+        self.commit_latencies: list[float] = []
+        self._stages: list[str] = []
+        self._stage_start = 0.0
+        self._commit_start = 0.0
+        self._listeners = (
+            ("before_flush", self._before_flush),
+            ("after_flush_postexec", self._after_flush),
+            ("before_commit", self._before_commit),
+            ("after_commit", self._after_commit),
+        )
+        self._wrapped: list[tuple[Any, str]] = []
+
+    def attach(self) -> None:
+        """Start measuring the recorder."""
+        instance = self.instance
+        for stage, manager, name in (
+            (
+                STAGE_SERIALIZE,
+                instance.state_attributes_manager,
+                "serialize_from_event",
+            ),
+            (STAGE_SERIALIZE, instance.event_data_manager, "serialize_from_event"),
+            (STAGE_LOOKUP, instance.states_meta_manager, "get"),
+            (STAGE_LOOKUP, instance.state_attributes_manager, "get_from_cache"),
+            (STAGE_LOOKUP, instance.state_attributes_manager, "get"),
+            (STAGE_LOOKUP, instance.event_data_manager, "get_from_cache"),
+            (STAGE_LOOKUP, instance.event_data_manager, "get"),
+            (STAGE_LOOKUP, instance.event_type_manager, "get"),
+        ):
+            setattr(manager, name, self._timed(stage, getattr(manager, name)))
+            self._wrapped.append((manager, name))
+        for identifier, listener in self._listeners:
+            sqlalchemy_event.listen(Session, identifier, listener)
+
+    def detach(self) -> None:
+        """Stop measuring the recorder."""
+        for manager, name in self._wrapped:
+            delattr(manager, name)
+        self._wrapped.clear()
+        for identifier, listener in self._listeners:
+            sqlalchemy_event.remove(Session, identifier, listener)
+
+    def _timed(self, stage: str, func: Callable) -> Callable:
+        """Attribute the time spent in a table manager method to a stage."""
+
+        def _wrapper(*args, **kwargs):
+            self._enter(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return _wrapper
+
+    def _enter(self, stage: str) -> None:
+        """Enter a stage, the time until now belongs to the enclosing stage."""
+        now = time.thread_time()
+        if self._stages:
+            self.cpu[self._stages[-1]] += now - self._stage_start
+        self._stages.append(stage)
+        self._stage_start = now
+
+    def _exit(self) -> None:
+        """Exit the innermost stage."""
+        now = time.thread_time()
+        self.cpu[self._stages.pop()] += now - self._stage_start
+        self._stage_start = now
+
+    def _in_stage(self, stage: str) -> bool:
+        """Return if the recorder thread is in a stage."""
+        return (
+            threading.get_ident() == self.instance.thread_id
+            and bool(self._stages)
+            and self._stages[-1] == stage
+        )
+
+    def _before_flush(self, session: Session, *args: Any) -> None:
+        if threading.get_ident() == self.instance.thread_id:
+            self._enter(STAGE_FLUSH)
+
+    def _after_flush(self, session: Session, *args: Any) -> None:
+        if self._in_stage(STAGE_FLUSH):
+            self._exit()
+
+    def _before_commit(self, session: Session) -> None:
+        if threading.get_ident() == self.instance.thread_id:
+            self._commit_start = timer()
+            self._enter(STAGE_COMMIT)
+
+    def _after_commit(self, session: Session) -> None:
+        if self._in_stage(STAGE_COMMIT):
+            self._exit()
+            self.commit_latencies.append(timer() - self._commit_start)
+
+
+async def _async_run_recorder_workload(
+    hass: core.HomeAssistant, workload: RecorderWorkload
+) -> dict:
+    """Drive a synthetic workload into the recorder and measure it.
+
+    Writes are issued in batches at the rate of the workload while the
+    recorder commits them, the run ends once every write is committed.
+    """
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    recorder_helper.async_initialize_recorder(hass)
+    db_url = workload.db_url or f"sqlite:///{hass.config.path('benchmark.db')}"
+    assert await async_setup_component(
+        hass, "recorder", {"recorder": {"db_url": db_url}}
+    )
+    await hass.async_start()
+    instance = hass.data[recorder_helper.DATA_INSTANCE]
+    assert await instance.async_db_ready
+
+    entities = workload.entities
+    entity_ids = _entity_ids(entities)
+    attributes: list[dict[str, Any]] = [
+        {"friendly_name": f"Benchmark {idx}", "unit_of_measurement": "W"}
+        for idx in range(entities)
+    ]
+    for entity_id, entity_attributes in zip(entity_ids, attributes, strict=True):
+        hass.states.async_set(entity_id, "0", entity_attributes)
+    await hass.async_block_till_done()
+    await instance.async_block_till_done()
+
+    # Seeded so runs of the same workload write the same rows
+    rng = random.Random(0)
+    rate = workload.rate
+    operations = workload.operations
+    events = 0
+    backlogs: list[int] = []
+    profiler = RecorderProfiler(instance)
+    profiler.attach()
+    try:
+        start = timer()
+        for batch_start in range(0, operations, RECORDER_WORKLOAD_BATCH_SIZE):
+            batch_end = min(batch_start + RECORDER_WORKLOAD_BATCH_SIZE, operations)
+            for idx in range(batch_start, batch_end):
+                entity_idx = idx % entities
+                if rng.random() < workload.event_ratio:
+                    hass.bus.async_fire("benchmark_event", {"entity": entity_idx})
+                    events += 1
+                    continue
+                if rng.random() < workload.attribute_churn:
+                    attributes[entity_idx] = {**attributes[entity_idx], "churn": idx}
+                hass.states.async_set(
+                    entity_ids[entity_idx], str(idx), attributes[entity_idx]
+                )
+            # Yield to the recorder listener even when the rate is unlimited
+            await asyncio.sleep(
+                max(start + batch_end / rate - timer(), 0) if rate else 0
+            )
+            backlogs.append(instance.backlog)
+        offered = timer() - start
+        await instance.async_block_till_done()
+        runtime = timer() - start
+    finally:
+        profiler.detach()
+
+    commit_p50, commit_p99 = _p50_p99(profiler.commit_latencies)
+    return {
+        "dialect": instance.dialect_name,
+        "entities": entities,
+        "operations": operations,
+        "events": events,
+        "rate": rate,
+        "attribute_churn": workload.attribute_churn,
+        "event_ratio": workload.event_ratio,
+        "runtime": runtime,
+        "rows_per_second": operations / runtime if runtime else 0.0,
+        "offered_rows_per_second": operations / offered if offered else 0.0,
+        "commits": len(profiler.commit_latencies),
+        "commit_p50_latency_us": commit_p50 * 10**6,
+        "commit_p99_latency_us": commit_p99 * 10**6,
+        "peak_backlog": max(backlogs, default=0),
+        "backlog_growth_per_second": (
+            (backlogs[-1] - backlogs[0]) / offered if offered else 0.0
+        ),
+        "cpu_seconds": profiler.cpu,
+    }
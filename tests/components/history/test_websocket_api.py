@@ -2,6 +2,7 @@
 
 import asyncio
 from datetime import timedelta
+from functools import partial
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
@@ -9,7 +10,7 @@ import pytest
 
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import Recorder, history as recorder_history
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -173,6 +174,42 @@ async def test_history_during_period(
     assert sensor_test_history[2]["a"] == {"any": "attr"}
 
 
+async def test_history_during_period_numeric(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period in numeric mode."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "1.5", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "1.5", attributes={"any": "changed"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "unavailable")
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "2")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "numeric": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    sensor_test_history = response["result"]["sensor.test"]
+    assert [value for _, value in sensor_test_history] == [1.5, None, 2.0]
+    assert all(isinstance(ts, float) for ts, _ in sensor_test_history)
+    assert sensor_test_history == sorted(sensor_test_history, key=lambda row: row[0])
+
+
 async def test_history_during_period_impossible_conditions(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -298,16 +335,16 @@ async def test_history_during_period_significant_domain(
     assert len(sensor_test_history) == 5
 
     assert sensor_test_history[0]["s"] == "on"
-    assert sensor_test_history[0]["a"] == {}
+    assert "a" not in sensor_test_history[0]
     assert isinstance(sensor_test_history[0]["lu"], float)
     assert "lc" not in sensor_test_history[0]  # skipped if the same a last_updated (lu)
 
-    assert "a" in sensor_test_history[1]
+    assert "a" not in sensor_test_history[1]
     assert sensor_test_history[1]["s"] == "off"
     assert "lc" not in sensor_test_history[1]  # skipped if the same a last_updated (lu)
 
     assert sensor_test_history[4]["s"] == "on"
-    assert sensor_test_history[4]["a"] == {}
+    assert "a" not in sensor_test_history[4]
 
     await client.send_json(
         {
@@ -543,6 +580,64 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_only_in_chunks(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends long histories in chunks."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    for value in ("on", "off", "on"):
+        hass.states.async_set("sensor.one", value, attributes={"any": value})
+        await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.two", "off", attributes={"any": "attr"})
+    sensor_two_last_updated_timestamp = hass.states.get(
+        "sensor.two"
+    ).last_updated_timestamp
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    request = {
+        "entity_ids": ["sensor.one", "sensor.two"],
+        "start_time": now.isoformat(),
+        "end_time": end_time.isoformat(),
+        "significant_changes_only": False,
+    }
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "history/history_during_period", **request}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+    assert len(expected["sensor.one"]) == 3
+
+    with patch.object(
+        websocket_api.history,
+        "stream_significant_states",
+        partial(recorder_history.stream_significant_states, chunk_size=2),
+    ):
+        await client.send_json({"id": 2, "type": "history/stream", **request})
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["id"] == 2
+
+        first = await client.receive_json()
+        last = await client.receive_json()
+
+    # Only the last chunk comes with the time window of the response
+    assert first["event"] == {"states": {"sensor.one": expected["sensor.one"][:2]}}
+    assert last["event"] == {
+        "end_time": pytest.approx(sensor_two_last_updated_timestamp),
+        "start_time": pytest.approx(now.timestamp()),
+        "states": {
+            "sensor.one": expected["sensor.one"][2:],
+            "sensor.two": expected["sensor.two"],
+        },
+    }
+
+
 async def test_history_stream_significant_domain_historical_only(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -621,16 +716,16 @@ async def test_history_stream_significant_domain_historical_only(
     assert len(sensor_test_history) == 5
 
     assert sensor_test_history[0]["s"] == "on"
-    assert sensor_test_history[0]["a"] == {}
+    assert "a" not in sensor_test_history[0]
     assert isinstance(sensor_test_history[0]["lu"], float)
     assert "lc" not in sensor_test_history[0]  # skipped if the same a last_updated (lu)
 
-    assert "a" in sensor_test_history[1]
+    assert "a" not in sensor_test_history[1]
     assert sensor_test_history[1]["s"] == "off"
     assert "lc" not in sensor_test_history[1]  # skipped if the same a last_updated (lu)
 
     assert sensor_test_history[4]["s"] == "on"
-    assert sensor_test_history[4]["a"] == {}
+    assert "a" not in sensor_test_history[4]
 
     await client.send_json(
         {
@@ -1189,14 +1284,12 @@ async def test_history_stream_live_no_attributes(
             "states": {
                 "sensor.one": [
                     {
-                        "a": {},
                         "lu": pytest.approx(sensor_one_last_updated_timestamp),
                         "s": "on",
                     }
                 ],
                 "sensor.two": [
                     {
-                        "a": {},
                         "lu": pytest.approx(sensor_two_last_updated_timestamp),
                         "s": "off",
                     }
@@ -1670,7 +1763,6 @@ async def test_history_during_period_for_invalid_entity_ids(
         "result": {
             "sensor.one": [
                 {
-                    "a": {},
                     "lu": pytest.approx(sensor_one_last_updated_timestamp),
                     "s": "on",
                 }
@@ -1698,14 +1790,12 @@ async def test_history_during_period_for_invalid_entity_ids(
         "result": {
             "sensor.one": [
                 {
-                    "a": {},
                     "lu": pytest.approx(sensor_one_last_updated_timestamp),
                     "s": "on",
                 }
             ],
             "sensor.two": [
                 {
-                    "a": {},
                     "lu": pytest.approx(sensor_two_last_updated_timestamp),
                     "s": "off",
                 }
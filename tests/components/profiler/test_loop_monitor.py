@@ -0,0 +1,182 @@
+"""Test the Profiler event loop monitor."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from homeassistant.components.profiler.const import DOMAIN, LOOP_MONITOR
+from homeassistant.components.profiler.loop_monitor import (
+    LoopMonitor,
+    StallSource,
+    sample_stall_source,
+)
+from homeassistant.core import HassJob, HomeAssistant, callback
+from homeassistant.helpers.entity_component import async_update_entity
+
+from tests.common import MockConfigEntry, extract_stack_to_frame
+from tests.typing import WebSocketGenerator
+
+
+async def test_loop_stats(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test recorded loop lag is exposed via websocket and sensors."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    monitor: LoopMonitor = hass.data[DOMAIN][LOOP_MONITOR]
+    monitor.async_record_lag(0.002)
+    monitor.async_record_lag(0.3, StallSource("hue", "hue refresh", "light.py:23"))
+    monitor.async_record_lag(0.2, StallSource("hue", "hue refresh", "light.py:23"))
+    monitor.async_record_lag(0.4)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/loop_stats"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    result = msg["result"]
+    assert result["recent_max_lag"] == 0.4
+    assert result["lag"]["samples"] == 4
+    assert result["lag"]["max"] == 0.4
+    assert result["lag"]["buckets"][-1] == {"le": None, "count": 4}
+    assert {"le": 0.005, "count": 1} in result["lag"]["buckets"]
+    assert result["integrations"] == {
+        "hue": {"count": 2, "total": 0.5, "max": 0.3, "last_job": "hue refresh"},
+        "unknown": {"count": 1, "total": 0.4, "max": 0.4, "last_job": None},
+    }
+    assert [
+        (slow_callback["integration"], slow_callback["duration"])
+        for slow_callback in result["slow_callbacks"]
+    ] == [("hue", 0.3), ("hue", 0.2), ("unknown", 0.4)]
+    assert result["job_priorities"].keys() == {"normal", "background"}
+    assert result["job_priorities"]["background"] == {
+        "samples": 0,
+        "total_lag": 0.0,
+        "max_lag": 0.0,
+    }
+
+    for entity_id in (
+        "sensor.profiler_event_loop_lag",
+        "sensor.profiler_slow_callbacks",
+        "sensor.profiler_slowest_integration",
+    ):
+        await async_update_entity(hass, entity_id)
+
+    assert float(hass.states.get("sensor.profiler_event_loop_lag").state) == 400
+    assert hass.states.get("sensor.profiler_slow_callbacks").state == "3"
+    assert hass.states.get("sensor.profiler_slowest_integration").state == "hue"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await client.send_json_auto_id({"type": "profiler/loop_stats"})
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+
+
+async def test_heartbeat_uses_stall_sample(hass: HomeAssistant) -> None:
+    """Test a late heartbeat is attributed to the sampled stall source."""
+    monitor = LoopMonitor(hass, slow_callback_threshold=0.1)
+    source = StallSource("hue", "hue refresh", None)
+
+    monitor._next_beat = time.monotonic() - 0.3
+    monitor._stall_sample = (monitor._next_beat, source)
+    monitor._async_heartbeat()
+
+    assert monitor.slow_callbacks[0].source is source
+    assert monitor.slow_callbacks[0].duration >= 0.3
+    assert monitor._stall_sample is None
+
+    # A sample taken for a previous beat is not used
+    monitor._stall_sample = (monitor._next_beat - 1, source)
+    monitor._next_beat = time.monotonic() - 0.3
+    monitor._async_heartbeat()
+
+    assert monitor.slow_callbacks[1].source.integration == "unknown"
+    await monitor.async_stop()
+
+
+async def test_running_job_name(hass: HomeAssistant) -> None:
+    """Test the running HassJob or task is used as the stalled job."""
+    monitor = LoopMonitor(hass)
+    job_names: list[str | None] = []
+
+    @callback
+    def _sample() -> None:
+        job_names.append(monitor._running_job_name())
+
+    async def _refresh() -> None:
+        job_names.append(monitor._running_job_name())
+        hass.async_run_hass_job(HassJob(_sample, "hue refresh"))
+        hass.async_run_hass_job(HassJob(_sample))
+        job_names.append(monitor._running_job_name())
+
+    # Callback jobs are only recorded while the monitor runs
+    await hass.async_create_task(_refresh(), "hue coordinator")
+    assert job_names == ["hue coordinator"] * 4
+
+    job_names.clear()
+    monitor.async_start()
+    assert hass.track_running_job
+    await hass.async_create_task(_refresh(), "hue coordinator")
+    await monitor.async_stop()
+    assert not hass.track_running_job
+
+    assert job_names == [
+        "hue coordinator",
+        "hue refresh",
+        "hue coordinator",
+        "hue coordinator",
+    ]
+    assert hass.running_job is None
+
+
+@pytest.mark.parametrize(
+    ("handle_run", "job"), [(True, "HueLight.async_update"), (False, None)]
+)
+def test_sample_stall_source(handle_run: bool, job: str | None) -> None:
+    """Test attributing a stack to an integration and job."""
+    run_frame = Mock(filename="/home/dev/asyncio/events.py", lineno="88", line="")
+    job_frame = Mock(
+        filename="/home/dev/homeassistant/components/hue/light.py",
+        lineno="20",
+        line="await self.async_refresh()",
+    )
+    integration_frame = Mock(
+        filename="/home/dev/homeassistant/components/hue/light.py",
+        lineno="23",
+        line="self.light.is_on",
+    )
+    frame = extract_stack_to_frame(
+        [
+            run_frame,
+            job_frame,
+            integration_frame,
+            Mock(filename="/home/dev/aiohue/lights.py", lineno="2", line="something()"),
+        ]
+    )
+    job_frame.f_code.co_qualname = "HueLight.async_update"
+    if handle_run:
+        run_frame.f_code = asyncio.Handle._run.__code__
+
+    assert sample_stall_source(frame) == StallSource(
+        "hue", job, "homeassistant/components/hue/light.py:23"
+    )
+    assert sample_stall_source(frame, "hue refresh") == StallSource(
+        "hue", "hue refresh", "homeassistant/components/hue/light.py:23"
+    )
+
+
+def test_sample_stall_source_no_integration() -> None:
+    """Test attributing a stack without an integration."""
+    frame = extract_stack_to_frame(
+        [Mock(filename="/home/dev/aiohue/lights.py", lineno="2")]
+    )
+
+    assert sample_stall_source(frame) == StallSource("unknown", None, None)
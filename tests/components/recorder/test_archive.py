@@ -0,0 +1,447 @@
+"""Test the history archive of the recorder."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+import gzip
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import (
+    DOMAIN as RECORDER_DOMAIN,
+    Recorder,
+    history,
+)
+from homeassistant.components.recorder.archive import (
+    ARCHIVE_STATES,
+    ARCHIVE_STATISTICS_SHORT_TERM,
+    HistoryArchive,
+)
+from homeassistant.components.recorder.db_schema import (
+    States,
+    StatisticsMeta,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.services import SERVICE_PURGE_ENTITIES
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .common import async_wait_purge_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+JAN_31 = datetime(2024, 1, 31, 23, 58, tzinfo=UTC).timestamp()
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_states(tmp_path: Path) -> None:
+    """Test states are written to monthly segments and read back."""
+    archive = HistoryArchive(str(tmp_path))
+    assert not archive.reaches(ARCHIVE_STATES, 0)
+    archive.write_states(
+        [
+            ("sensor.a", "1", JAN_31 - 86400 * 40, None, "{}"),
+            ("sensor.a", "2", JAN_31, None, '{"a":1}'),
+            ("sensor.b", "on", JAN_31 + 60, JAN_31, '{"a":1}'),
+            ("sensor.a", "3", JAN_31 + 180, None, "{}"),
+        ]
+    )
+    # A batch written again after a failed commit
+    archive.write_states([("sensor.a", "3", JAN_31 + 180, None, "{}")])
+    assert sorted(path.name for path in (tmp_path / "states").iterdir()) == [
+        "2023-12.jsonl.gz",
+        "2024-01.jsonl.gz",
+        "2024-02.jsonl.gz",
+    ]
+    assert archive.reaches(ARCHIVE_STATES, JAN_31 + 180)
+    assert not archive.reaches(ARCHIVE_STATES, JAN_31 + 181)
+    assert not archive.reaches(ARCHIVE_STATISTICS_SHORT_TERM, 0)
+
+    assert archive.read_states(["sensor.a", "sensor.b"], JAN_31 + 30, None, True) == {
+        "sensor.a": (
+            ("sensor.a", "2", JAN_31, None, '{"a":1}'),
+            [("sensor.a", "3", JAN_31 + 180, None, "{}")],
+        ),
+        "sensor.b": (None, [("sensor.b", "on", JAN_31 + 60, JAN_31, '{"a":1}')]),
+    }
+    # The start state is looked up in the months before the start
+    assert archive.read_states(["sensor.a"], JAN_31 - 60, JAN_31 + 180, True) == {
+        "sensor.a": (
+            ("sensor.a", "1", JAN_31 - 86400 * 40, None, "{}"),
+            [("sensor.a", "2", JAN_31, None, '{"a":1}')],
+        ),
+    }
+    assert archive.read_states(["sensor.a"], JAN_31 - 60, JAN_31 + 180, False) == {
+        "sensor.a": (None, [("sensor.a", "2", JAN_31, None, '{"a":1}')]),
+    }
+
+    # The newest timestamp is loaded from the newest segment
+    assert HistoryArchive(str(tmp_path)).reaches(ARCHIVE_STATES, JAN_31 + 180)
+
+
+def test_iter_states(tmp_path: Path) -> None:
+    """Test the states of an entity are decoded one month at a time."""
+    archive = HistoryArchive(str(tmp_path))
+    month = 86400 * 31
+    archive.write_states(
+        [
+            ("sensor.a", "1", JAN_31 - month, None, "{}"),
+            ("sensor.a", "2", JAN_31 + 60, None, "{}"),
+            ("sensor.b", "on", JAN_31 + 60, None, "{}"),
+            ("sensor.a", "3", JAN_31 + month, None, "{}"),
+        ]
+    )
+
+    with patch.object(
+        archive, "_read_month_states", wraps=archive._read_month_states
+    ) as read_mock:
+        start_state, states = archive.iter_states("sensor.a", JAN_31, None, True)
+        # The month of the start time is read once to find the start state
+        assert [call.args[0] for call in read_mock.call_args_list] == [
+            "2024-01",
+            "2023-12",
+        ]
+        assert start_state == ("sensor.a", "1", JAN_31 - month, None, "{}")
+        assert next(states) == ("sensor.a", "2", JAN_31 + 60, None, "{}")
+        assert read_mock.call_count == 2
+        assert list(states) == [("sensor.a", "3", JAN_31 + month, None, "{}")]
+        assert read_mock.call_args_list[-1].args[0] == "2024-03"
+
+
+def test_damaged_segment(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Test a segment cut short while it was written is read up to the damage."""
+    archive = HistoryArchive(str(tmp_path))
+    archive.write_states([("sensor.a", "1", JAN_31, None, "{}")])
+    archive.write_states([("sensor.a", "2", JAN_31 + 60, None, "{}")])
+    segment = tmp_path / "states" / "2024-01.jsonl.gz"
+    segment.write_bytes(segment.read_bytes()[:-10])
+
+    assert archive.read_states(["sensor.a"], JAN_31 - 60, None, False) == {
+        "sensor.a": (None, [("sensor.a", "1", JAN_31, None, "{}")]),
+    }
+    assert "Archive segment" in caplog.text
+
+    with gzip.open(segment, "wb") as file:
+        file.write(b'{"entity_ids":')
+    assert archive.read_states(["sensor.a"], JAN_31 - 60, None, False) == {
+        "sensor.a": (None, []),
+    }
+
+
+def test_statistics(tmp_path: Path) -> None:
+    """Test short term statistics are written to monthly segments and read back."""
+    archive = HistoryArchive(str(tmp_path))
+    archive.write_statistics(
+        [
+            ("test:a", JAN_31, 1.0, 0.5, 1.5, None, None, None),
+            ("test:b", JAN_31, None, None, None, JAN_31 - 300, 2.0, 5.0),
+            ("test:a", JAN_31 + 300, 2.0, 1.5, 2.5, None, None, None),
+        ]
+    )
+    assert archive.reaches(ARCHIVE_STATISTICS_SHORT_TERM, JAN_31 + 300)
+    assert archive.read_statistics(["test:a", "test:c"], JAN_31, JAN_31 + 300) == {
+        "test:a": [("test:a", JAN_31, 1.0, 0.5, 1.5, None, None, None)],
+        "test:c": [],
+    }
+    assert archive.read_statistics(["test:a"], JAN_31 + 1, None) == {
+        "test:a": [("test:a", JAN_31 + 300, 2.0, 1.5, 2.5, None, None, None)],
+    }
+
+
+def test_rewrite(tmp_path: Path) -> None:
+    """Test archived rows follow the changes of the database rows."""
+    archive = HistoryArchive(str(tmp_path))
+    archive.write_states(
+        [
+            ("sensor.a", "1", JAN_31, None, "{}"),
+            ("sensor.b", "2", JAN_31, None, "{}"),
+            ("sensor.a", "3", JAN_31 + 180, None, "{}"),
+        ]
+    )
+    archive.rename_states("sensor.b", "sensor.c")
+    archive.purge_states(lambda entity_id: entity_id == "sensor.a", JAN_31 + 60)
+    assert archive.read_states(
+        ["sensor.a", "sensor.b", "sensor.c"], JAN_31 - 60, None, False
+    ) == {
+        "sensor.a": (None, [("sensor.a", "3", JAN_31 + 180, None, "{}")]),
+        "sensor.b": (None, []),
+        "sensor.c": (None, [("sensor.c", "2", JAN_31, None, "{}")]),
+    }
+    # Segments without any rows left are removed
+    archive.purge_states(lambda entity_id: True, JAN_31 + 60)
+    assert [path.name for path in (tmp_path / "states").iterdir()] == [
+        "2024-02.jsonl.gz"
+    ]
+    archive.purge_states(lambda entity_id: True, JAN_31 + 181)
+    assert not list((tmp_path / "states").iterdir())
+    assert not archive.reaches(ARCHIVE_STATES, JAN_31)
+
+    archive.write_statistics(
+        [
+            ("test:a", JAN_31, 1.0, 0.5, 1.5, None, None, None),
+            ("test:b", JAN_31, None, None, None, None, 2.0, 5.0),
+            ("test:b", JAN_31 + 300, None, None, None, None, 3.0, 6.0),
+            ("test:c", JAN_31, 1.0, 1.0, 1.0, None, None, None),
+        ]
+    )
+    archive.convert_statistics(
+        "test:a", lambda value: None if value is None else value * 1000
+    )
+    archive.adjust_statistics_sum("test:b", JAN_31 + 300, 10.0)
+    archive.rename_statistics("test:b", "test:d")
+    archive.clear_statistics(["test:c"])
+    assert archive.read_statistics(
+        ["test:a", "test:b", "test:c", "test:d"], JAN_31, None
+    ) == {
+        "test:a": [("test:a", JAN_31, 1000.0, 500.0, 1500.0, None, None, None)],
+        "test:b": [],
+        "test:c": [],
+        "test:d": [
+            ("test:d", JAN_31, None, None, None, None, 2.0, 5.0),
+            ("test:d", JAN_31 + 300, None, None, None, None, 3.0, 16.0),
+        ],
+    }
+
+
+def _state_values(states: dict[str, list[Any]]) -> dict[str, list[Any]]:
+    """Return the values of history states to compare them."""
+    return {
+        entity_id: [
+            state
+            if isinstance(state, dict)
+            else (
+                state.state,
+                state.attributes,
+                state.last_changed,
+                state.last_updated,
+            )
+            for state in entity_states
+        ]
+        for entity_id, entity_states in states.items()
+    }
+
+
+@pytest.mark.parametrize("recorder_config", [{"archive_history": True}])
+async def test_history_query_through(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+) -> None:
+    """Test history reads purged states from the archive."""
+    assert isinstance(recorder_mock.archive, HistoryArchive)
+    recorder_mock.archive = HistoryArchive(str(tmp_path))
+    start = dt_util.utc_from_timestamp(JAN_31)
+    freezer.move_to(start)
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("climate.home", "heat", {"temperature": 20})
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "kW"})
+    freezer.tick(timedelta(minutes=2))
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "kW"})
+    hass.states.async_set("climate.home", "heat", {"temperature": 21})
+    await async_wait_recording_done(hass)
+    freezer.move_to(start + timedelta(days=20))
+    hass.states.async_set("sensor.power", "3", {"unit_of_measurement": "kW"})
+    await async_wait_recording_done(hass)
+    entity_ids = ["sensor.power", "climate.home", "sensor.unknown"]
+    queries: list[tuple[timedelta, dict[str, Any]]] = [
+        (start_offset, kwargs)
+        for start_offset in (timedelta(seconds=-1), timedelta(seconds=90))
+        for kwargs in (
+            {},
+            {"significant_changes_only": False},
+            {"include_start_time_state": False},
+            {"minimal_response": True},
+            {"compressed_state_format": True},
+            {"no_attributes": True, "minimal_response": True},
+        )
+    ]
+
+    def _history() -> list[Any]:
+        results: list[Any] = [
+            _state_values(
+                history.get_significant_states(
+                    hass, start + start_offset, None, entity_ids, **kwargs
+                )
+            )
+            for start_offset, kwargs in queries
+        ]
+        results.append(
+            history.get_numeric_states(
+                hass, start + timedelta(seconds=90), None, ["sensor.power"]
+            )
+        )
+        # The attributes of streamed states are preserialized fragments
+        results.append(
+            json_loads(
+                json_bytes(
+                    list(
+                        history.stream_significant_states(
+                            hass,
+                            start + timedelta(seconds=90),
+                            None,
+                            entity_ids,
+                            chunk_size=2,
+                        )
+                    )
+                )
+            )
+        )
+        return results
+
+    expected = await recorder_mock.async_add_executor_job(_history)
+    assert not (tmp_path / "states").exists()
+
+    purge_before = start + timedelta(days=10)
+    while not purge_old_data(recorder_mock, purge_before, repack=False):
+        pass
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
+    assert sorted(path.name for path in (tmp_path / "states").iterdir()) == [
+        "2024-01.jsonl.gz",
+        "2024-02.jsonl.gz",
+    ]
+
+    assert await recorder_mock.async_add_executor_job(_history) == expected
+
+
+@pytest.mark.parametrize("recorder_config", [{"archive_history": True}])
+async def test_archive_legacy_states(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test states without a metadata_id are archived by their entity_id."""
+    recorder_mock.archive = HistoryArchive(str(tmp_path))
+    with session_scope(hass=hass) as session:
+        session.add(
+            States(
+                entity_id="sensor.legacy",
+                state="1",
+                attributes='{"a":1}',
+                last_updated_ts=JAN_31,
+                last_changed_ts=JAN_31,
+            )
+        )
+    while not purge_old_data(
+        recorder_mock, dt_util.utc_from_timestamp(JAN_31 + 60), repack=False
+    ):
+        pass
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 0
+
+    assert recorder_mock.archive.read_states(
+        ["sensor.legacy"], JAN_31 - 60, None, True
+    ) == {
+        "sensor.legacy": (
+            None,
+            [("sensor.legacy", "1", JAN_31, JAN_31, '{"a":1}')],
+        )
+    }
+
+
+@pytest.mark.parametrize("recorder_config", [{"archive_history": True}])
+async def test_statistics_query_through(
+    hass: HomeAssistant, recorder_mock: Recorder, tmp_path: Path
+) -> None:
+    """Test short term statistics are read from the archive once purged."""
+    recorder_mock.archive = HistoryArchive(str(tmp_path))
+    now = dt_util.utcnow().replace(second=0, microsecond=0)
+    start = now - timedelta(days=3)
+    with session_scope(hass=hass) as session:
+        metadata = StatisticsMeta(
+            statistic_id="sensor.temperature",
+            source="recorder",
+            unit_of_measurement="°C",
+            has_mean=True,
+            has_sum=False,
+            name=None,
+        )
+        session.add(metadata)
+        session.flush()
+        session.add_all(
+            StatisticsShortTerm(
+                metadata_id=metadata.id,
+                start_ts=(start + offset).timestamp(),
+                mean=20 + idx,
+                min=19 + idx,
+                max=21 + idx,
+            )
+            for idx, offset in enumerate(
+                (timedelta(0), timedelta(minutes=5), timedelta(days=2))
+            )
+        )
+
+    def _statistics() -> dict[str, list[dict[str, Any]]]:
+        return statistics_during_period(
+            hass,
+            start,
+            None,
+            {"sensor.temperature"},
+            "5minute",
+            None,
+            {"mean", "min", "max"},
+        )
+
+    expected = await recorder_mock.async_add_executor_job(_statistics)
+    assert [row["mean"] for row in expected["sensor.temperature"]] == [20, 21, 22]
+
+    while not purge_old_data(recorder_mock, now - timedelta(days=1), repack=False):
+        pass
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsShortTerm).count() == 1
+
+    assert await recorder_mock.async_add_executor_job(_statistics) == expected
+
+
+@pytest.mark.parametrize("recorder_config", [{"archive_history": True}])
+async def test_archive_follows_entity_changes(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+) -> None:
+    """Test renamed and purged entities are changed in the archive."""
+    recorder_mock.archive = HistoryArchive(str(tmp_path))
+    start = dt_util.utc_from_timestamp(JAN_31)
+    freezer.move_to(start)
+    hass.states.async_set("sensor.renamed", "1")
+    hass.states.async_set("sensor.purged", "1")
+    await async_wait_recording_done(hass)
+    freezer.move_to(start + timedelta(days=20))
+    while not purge_old_data(recorder_mock, start + timedelta(days=10), repack=False):
+        pass
+
+    recorder_mock.async_update_states_metadata("sensor.renamed", "sensor.new")
+    await hass.services.async_call(
+        RECORDER_DOMAIN,
+        SERVICE_PURGE_ENTITIES,
+        {"entity_id": "sensor.purged"},
+        blocking=True,
+    )
+    await async_wait_purge_done(hass)
+
+    states = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        start - timedelta(seconds=1),
+        None,
+        ["sensor.renamed", "sensor.new", "sensor.purged"],
+    )
+    assert {entity_id: len(states) for entity_id, states in states.items()} == {
+        "sensor.new": 1
+    }
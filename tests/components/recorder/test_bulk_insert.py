@@ -0,0 +1,126 @@
+"""Test inserting states in bulk."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.db_schema import (
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.mark.parametrize("recorder_config", [{"bulk_insert": True}])
+async def test_bulk_insert_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test states are inserted in bulk and linked to their old state."""
+    assert recorder_mock._bulk_states_writer is not None
+
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+
+    # Several states for the same entity in a single commit
+    hass.states.async_set("sensor.one", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.one", "3", {"unit_of_measurement": "kW"})
+    hass.states.async_set("sensor.two", "on", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.one", "4", {"unit_of_measurement": "kW"})
+    hass.states.async_remove("sensor.two")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = (
+            session.query(States, StatesMeta.entity_id, StateAttributes.shared_attrs)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .order_by(States.state_id)
+            .all()
+        )
+        assert [(row[0].state, row[1], row[2]) for row in rows] == [
+            ("1", "sensor.one", '{"unit_of_measurement":"W"}'),
+            ("2", "sensor.one", '{"unit_of_measurement":"W"}'),
+            ("3", "sensor.one", '{"unit_of_measurement":"kW"}'),
+            ("on", "sensor.two", '{"unit_of_measurement":"W"}'),
+            ("4", "sensor.one", '{"unit_of_measurement":"kW"}'),
+            (None, "sensor.two", "{}"),
+        ]
+        state_ids = [row[0].state_id for row in rows]
+        assert [row[0].old_state_id for row in rows] == [
+            None,
+            state_ids[0],
+            state_ids[1],
+            None,
+            state_ids[2],
+            state_ids[3],
+        ]
+        assert all(row[0].entity_id is None for row in rows)
+        assert session.query(StateAttributes).count() == 3
+        assert session.query(StatesMeta).count() == 2
+
+    # The last committed state is linked from the next commit
+    hass.states.async_set("sensor.one", "5", {"unit_of_measurement": "kW"})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        last_state = session.query(States).order_by(States.state_id.desc()).first()
+        assert last_state.state == "5"
+        assert last_state.old_state_id == state_ids[4]
+
+
+@pytest.mark.parametrize("recorder_config", [{"bulk_insert": True}])
+async def test_bulk_insert_state_not_serializable(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a state that could not be written is not linked as old state."""
+    hass.states.async_set("sensor.one", "1", {"bad": object()})
+    hass.states.async_set("sensor.one", "2")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = session.query(States).all()
+        assert [(row.state, row.old_state_id) for row in rows] == [("2", None)]
+
+
+async def test_bulk_insert_disabled_by_default(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test states are inserted through the ORM by default."""
+    assert recorder_mock._bulk_states_writer is None
+
+
+async def test_bulk_insert_not_supported(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test falling back to the ORM when the dialect can not return ids."""
+    with patch(
+        "sqlalchemy.dialects.sqlite.pysqlite.SQLiteDialect_pysqlite.insert_executemany_returning_sort_by_parameter_order",
+        False,
+    ):
+        await async_setup_recorder_instance(hass, {"bulk_insert": True})
+
+    assert get_instance(hass)._bulk_states_writer is None
+    assert "does not support returning ids from bulk inserts" in caplog.text
+
+    hass.states.async_set("sensor.one", "1")
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(States).count() == 1
@@ -5,7 +5,8 @@ from __future__ import annotations
 from copy import copy
 from datetime import datetime, timedelta
 import json
-from unittest.mock import sentinel
+from typing import Any
+from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
 import pytest
@@ -16,13 +17,15 @@ from homeassistant.components.recorder.db_schema import (
     StateAttributes,
     States,
     StatesMeta,
+    StatesNumeric,
 )
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import HomeAssistant, State
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .common import (
     assert_dict_of_states_equal_without_context_and_last_changed,
@@ -962,6 +965,182 @@ async def test_get_full_significant_states_past_year_2038(
     assert sensor_one_states[0].last_updated == past_2038_time
 
 
+async def test_get_numeric_states(hass: HomeAssistant) -> None:
+    """Test numeric states are returned as timestamp and value pairs."""
+    start = dt_util.utcnow()
+    one = start + timedelta(seconds=1)
+    two = one + timedelta(seconds=1)
+    three = two + timedelta(seconds=1)
+    end = three + timedelta(seconds=1)
+
+    with freeze_time(start) as freezer:
+        hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.energy", "1.5")
+        freezer.move_to(one)
+        hass.states.async_set("sensor.power", "12.5", {"unit_of_measurement": "W"})
+        # Attribute changes and repeated values are dropped
+        hass.states.async_set("sensor.power", "12.5", {"unit_of_measurement": "kW"})
+        freezer.move_to(two)
+        hass.states.async_set("sensor.power", "unavailable")
+        hass.states.async_set("sensor.energy", "nan")
+        freezer.move_to(three)
+        hass.states.async_set("sensor.power", "12.50")
+        hass.states.async_set("sensor.power", "13")
+        freezer.move_to(end)
+        hass.states.async_set("sensor.power", "14")
+    await async_wait_recording_done(hass)
+
+    start_ts = start.timestamp()
+    one_ts = one.timestamp()
+    two_ts = two.timestamp()
+    three_ts = three.timestamp()
+    assert history.get_numeric_states(
+        hass,
+        start - timedelta(seconds=1),
+        end,
+        ["sensor.power", "sensor.energy", "sensor.unknown"],
+    ) == {
+        "sensor.power": [
+            (start_ts, 10.0),
+            (one_ts, 12.5),
+            (two_ts, None),
+            (three_ts, 12.5),
+            (three_ts, 13.0),
+        ],
+        "sensor.energy": [(start_ts, 1.5), (two_ts, None)],
+    }
+
+    # The state at the start time is returned with the start time
+    one_and_half = one + timedelta(seconds=0.5)
+    assert history.get_numeric_states(hass, one_and_half, end, ["sensor.power"]) == {
+        "sensor.power": [
+            (one_and_half.timestamp(), 12.5),
+            (two_ts, None),
+            (three_ts, 12.5),
+            (three_ts, 13.0),
+        ],
+    }
+    assert history.get_numeric_states(
+        hass, one_and_half, end, ["sensor.power"], include_start_time_state=False
+    ) == {
+        "sensor.power": [(two_ts, None), (three_ts, 12.5), (three_ts, 13.0)],
+    }
+
+    with pytest.raises(ValueError, match="entity_ids must be provided"):
+        history.get_numeric_states(hass, start, end)
+
+
+async def test_get_numeric_states_from_numeric_table(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test numeric states are recorded in and read from the numeric table."""
+    start = dt_util.utcnow() + timedelta(seconds=1)
+    one = start + timedelta(seconds=1)
+    two = one + timedelta(seconds=1)
+    end = two + timedelta(seconds=1)
+
+    with freeze_time(start) as freezer:
+        hass.states.async_set("sensor.power", "10")
+        hass.states.async_set("switch.light", "on")
+        freezer.move_to(one)
+        # Attribute changes and states of entities which are not numeric
+        # are not recorded, unless they follow a numeric state
+        hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+        hass.states.async_set("switch.light", "off")
+        hass.states.async_set("sensor.power", "unavailable")
+        freezer.move_to(two)
+        hass.states.async_set("sensor.power", "unknown")
+        hass.states.async_set("sensor.power", "11")
+    await async_wait_recording_done(hass)
+
+    start_ts = start.timestamp()
+    one_ts = one.timestamp()
+    two_ts = two.timestamp()
+    with session_scope(hass=hass, read_only=True) as session:
+        assert [
+            (row.last_updated_ts, row.value)
+            for row in session.query(StatesNumeric).order_by(StatesNumeric.state_id)
+        ] == [(start_ts, 10.0), (start_ts, None), (one_ts, None), (two_ts, 11.0)]
+
+    active_since_ts = recorder_mock.states_numeric_manager.active_since_ts
+    assert active_since_ts is not None
+    assert active_since_ts < start_ts
+    before_start = start - timedelta(seconds=0.5)
+    expected = {"sensor.power": [(start_ts, 10.0), (one_ts, None), (two_ts, 11.0)]}
+    assert (
+        history.get_numeric_states(hass, before_start, end, ["sensor.power"])
+        == expected
+    )
+    # The state at the start time is read from the states table
+    one_and_half = one + timedelta(seconds=0.5)
+    assert history.get_numeric_states(hass, one_and_half, end, ["sensor.power"]) == {
+        "sensor.power": [(one_and_half.timestamp(), None), (two_ts, 11.0)]
+    }
+
+    # Periods before the numeric table was added are parsed from the states
+    with patch.object(
+        recorder_mock.states_numeric_manager, "_active_since_ts", end.timestamp()
+    ):
+        assert (
+            history.get_numeric_states(hass, before_start, end, ["sensor.power"])
+            == expected
+        )
+
+
+@pytest.mark.parametrize(
+    ("significant_changes_only", "minimal_response", "no_attributes"),
+    [
+        (True, False, False),
+        (True, True, False),
+        (False, True, True),
+        (True, False, True),
+    ],
+)
+async def test_stream_significant_states(
+    hass: HomeAssistant,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Test streamed states are the same as the compressed significant states."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+
+    # Start after the first states so the start time states are included
+    start = zero + timedelta(seconds=1, microseconds=500)
+    args = (
+        hass,
+        start,
+        four,
+        list(states),
+        True,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    )
+    expected = json_loads(
+        json_bytes(
+            history.get_significant_states(
+                *args[:4], None, *args[4:], compressed_state_format=True
+            )
+        )
+    )
+    chunks = list(history.stream_significant_states(*args, chunk_size=2))
+    assert len(chunks) > 1
+    assert all(
+        sum(len(entity_states) for entity_states in chunk.values()) <= 2
+        for chunk in chunks
+    )
+    streamed: dict[str, list[dict[str, Any]]] = {}
+    for chunk in json_loads(json_bytes(chunks)):
+        for entity_id, entity_states in chunk.items():
+            streamed.setdefault(entity_id, []).extend(entity_states)
+    assert streamed == expected
+
+    with pytest.raises(ValueError, match="entity_ids must be provided"):
+        next(history.stream_significant_states(hass, start, four))
+
+
 async def test_get_significant_states_without_entity_ids_raises(
     hass: HomeAssistant,
 ) -> None:
@@ -13,6 +13,7 @@ from unittest.mock import Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 
@@ -30,6 +31,7 @@ from homeassistant.components.recorder import (
     Recorder,
     db_schema,
     get_instance,
+    history,
     migration,
     statistics,
 )
@@ -77,6 +79,7 @@ from homeassistant.helpers import (
     issue_registry as ir,
     recorder as recorder_helper,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
@@ -136,6 +139,13 @@ def _default_recorder(hass: HomeAssistant) -> Recorder:
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_event_types=set(),
+        bulk_insert=False,
+        migration_rows_per_second=None,
+        compress_attributes=False,
+        continuous_purge=False,
+        query_cache_max_bytes=0,
+        archive_history=False,
+        retention=None,
     )
 
 
@@ -2782,6 +2792,55 @@ async def test_all_tables_use_default_table_args(hass: HomeAssistant) -> None:
         assert table.kwargs.items() >= db_schema._DEFAULT_TABLE_ARGS.items()
 
 
+@pytest.mark.parametrize("recorder_config", [{"compress_attributes": True}])
+async def test_compress_attributes(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test state attributes are stored compressed and read back decompressed."""
+    attributes = {
+        "friendly_name": "Forecast",
+        "icon": "mdi:weather-cloudy",
+        "forecast": [
+            {"datetime": f"2024-01-{day:02}T00:00:00+00:00", "temperature": day}
+            for day in range(1, 21)
+        ],
+    }
+    hass.states.async_set("weather.home", "cloudy", attributes)
+    hass.states.async_set("weather.home", "sunny", attributes)
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        shared_attrs = [
+            shared_attrs
+            for (shared_attrs,) in session.execute(
+                text("SELECT shared_attrs FROM state_attributes")
+            )
+        ]
+        assert len(shared_attrs) == 2
+        shared_attrs.remove('{"unit_of_measurement":"W"}')
+        compressed = shared_attrs[0]
+        assert "forecast" not in compressed
+        assert json_loads(compressed)["icon"] == "mdi:weather-cloudy"
+        db_state_attributes = session.query(StateAttributes).all()
+        assert {attrs.shared_attrs for attrs in db_state_attributes} == {
+            '{"unit_of_measurement":"W"}',
+            json_bytes(attributes).decode(),
+        }
+
+    states = await recorder_mock.async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        dt_util.utcnow() - timedelta(hours=1),
+        None,
+        ["weather.home"],
+    )
+    assert [state.attributes for state in states["weather.home"]] == [
+        attributes,
+        attributes,
+    ]
+
+
 async def test_empty_entity_id(
     hass: HomeAssistant,
     async_setup_recorder_instance: RecorderInstanceGenerator,
@@ -7,7 +7,7 @@ import sys
 from unittest.mock import ANY, Mock, PropertyMock, call, patch
 
 import pytest
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, inspect, select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import ReflectedForeignKeyConstraint
 from sqlalchemy.exc import (
@@ -25,12 +25,14 @@ from homeassistant.components.recorder import db_schema, migration
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
     Events,
+    MigrationChanges,
     RecorderRuns,
     States,
 )
+from homeassistant.components.recorder.statistics import async_add_external_statistics
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import HomeAssistant, State
-from homeassistant.helpers import recorder as recorder_helper
+from homeassistant.helpers import issue_registry as ir, recorder as recorder_helper
 import homeassistant.util.dt as dt_util
 
 from .common import async_wait_recording_done, create_engine_test
@@ -1484,3 +1486,149 @@ def test_update_states_table_with_foreign_key_options_unsupported_engine(
         match="_update_states_table_with_foreign_key_options not supported for sqlite",
     ):
         migration._update_states_table_with_foreign_key_options(session_maker, engine)
+
+
+def test_migration_progress() -> None:
+    """Test the progress, estimated time left and throttling of a migration."""
+    progress = migration.MigrationProgress(
+        "state_context_id_as_binary", 1000, started=100
+    )
+    with patch.object(migration, "monotonic", return_value=110):
+        assert progress.eta() is None
+        assert progress.as_dict() == {
+            "migration_id": "state_context_id_as_binary",
+            "rows_done": 0,
+            "rows_total": 1000,
+            "eta": None,
+        }
+        progress.rows_done = 250
+        assert progress.eta() == 30
+        assert progress.as_dict()["eta"] == 30
+        assert progress.throttle_delay(None) == 0
+        assert progress.throttle_delay(100) == 0
+        assert progress.throttle_delay(10) == 15
+
+    progress = migration.MigrationProgress("event_id_post_migration", None)
+    progress.rows_done = 250
+    assert progress.eta() is None
+
+
+def test_offline_migration_throttled() -> None:
+    """Test off line migrations wait between steps to stay within the rows per second."""
+    migrator = migration.StatesContextIDMigration(
+        initial_schema_version=0, start_schema_version=0, migration_changes={}
+    )
+    with (
+        patch.object(migrator, "needs_migrate", return_value=True),
+        patch.object(migrator, "_ensure_index_exists"),
+        patch.object(migrator, "migrate_data", side_effect=[False, False, True]),
+        patch.object(migrator, "throttle_delay", return_value=2.5),
+        patch.object(migration, "sleep") as sleep_mock,
+    ):
+        migrator.migrate_all(Mock(), Mock())
+    assert sleep_mock.mock_calls == [call(2.5), call(2.5)]
+
+
+@pytest.mark.parametrize("delay", [0, 2.5])
+def test_run_time_migration_throttled(delay: float) -> None:
+    """Test run time migrations continue later to stay within the rows per second."""
+    migrator = Mock(
+        migrate_data=Mock(return_value=False), throttle_delay=Mock(return_value=delay)
+    )
+    instance = Mock()
+    migration.MigrationTask(migrator).run(instance)
+    if delay:
+        instance.queue_task_later.assert_called_once_with(
+            migration.MigrationTask(migrator), delay
+        )
+        instance.queue_task.assert_not_called()
+    else:
+        instance.queue_task.assert_called_once_with(migration.MigrationTask(migrator))
+        instance.queue_task_later.assert_not_called()
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_run_time_migration_checkpoint(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    issue_registry: ir.IssueRegistry,
+) -> None:
+    """Test an interrupted run time migration continues from its checkpoint."""
+    await hass.config.async_set_time_zone("UTC")
+    instance = await async_setup_recorder_instance(hass)
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    month_starts = [
+        dt_util.parse_datetime(f"2022-{month:02}-01 00:00:00+00:00")
+        for month in (8, 9, 10)
+    ]
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [
+            {"start": month_start + datetime.timedelta(days=14), "mean": 1}
+            for month_start in month_starts
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    def _get_migration_changes() -> tuple[int, int | None] | None:
+        with session_scope(hass=hass, read_only=True) as session:
+            return session.execute(
+                select(MigrationChanges.version, MigrationChanges.checkpoint).where(
+                    MigrationChanges.migration_id == "statistics_rollups"
+                )
+            ).one_or_none()
+
+    def _new_migrator() -> migration.StatisticsRollupsMigration:
+        return migration.StatisticsRollupsMigration(
+            initial_schema_version=48, start_schema_version=48, migration_changes={}
+        )
+
+    migrator = _new_migrator()
+    assert not await instance.async_add_executor_job(migrator.migrate_data, instance)
+    assert instance.migration_progress.as_dict() == {
+        "migration_id": "statistics_rollups",
+        "rows_done": 1,
+        "rows_total": 3,
+        "eta": ANY,
+    }
+    assert await instance.async_add_executor_job(_get_migration_changes) == (
+        0,
+        month_starts[1].timestamp(),
+    )
+    await hass.async_block_till_done()
+    issue = issue_registry.async_get_issue(recorder.DOMAIN, "migration_progress")
+    assert issue is not None
+    assert issue.translation_placeholders == {
+        "migration_id": "statistics_rollups",
+        "rows_done": "1",
+        "rows_total": "3",
+        "minutes": ANY,
+    }
+
+    # A new migrator continues from the checkpoint
+    migrator = _new_migrator()
+    assert not await instance.async_add_executor_job(migrator.migrate_data, instance)
+    assert instance.migration_progress.as_dict() == {
+        "migration_id": "statistics_rollups",
+        "rows_done": 1,
+        "rows_total": 2,
+        "eta": ANY,
+    }
+    assert await instance.async_add_executor_job(_get_migration_changes) == (
+        0,
+        month_starts[2].timestamp(),
+    )
+
+    assert await instance.async_add_executor_job(migrator.migrate_data, instance)
+    assert instance.migration_progress is None
+    assert await instance.async_add_executor_job(_get_migration_changes) == (1, None)
+    await hass.async_block_till_done()
+    assert not issue_registry.async_get_issue(recorder.DOMAIN, "migration_progress")
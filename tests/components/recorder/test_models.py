@@ -14,12 +14,15 @@ from homeassistant.components.recorder.db_schema import (
 )
 from homeassistant.components.recorder.models import (
     LazyState,
+    compress_shared_attrs,
+    decompress_shared_attrs,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
@@ -172,6 +175,49 @@ def test_handling_broken_json_state_attributes(
     assert "Error converting row to state attributes" in caplog.text
 
 
+def test_compress_shared_attrs() -> None:
+    """Test compressing and decompressing shared attributes."""
+    attributes = {
+        "forecast": [
+            {
+                "datetime": f"2024-01-{day:02}T00:00:00+00:00",
+                "condition": "sunny",
+                "temperature": 20 + day,
+                "templow": 10,
+            }
+            for day in range(1, 11)
+        ],
+        "icon": "mdi:weather-sunny",
+        "unit_of_measurement": "\u00b0C",
+        "friendly_name": "Home",
+    }
+    shared_attrs = json_bytes(attributes).decode()
+    compressed = compress_shared_attrs(shared_attrs)
+    assert len(compressed) < len(shared_attrs) / 2
+    # Attributes looked at by database queries are not compressed
+    compressed_attributes = json_loads(compressed)
+    assert compressed_attributes["icon"] == "mdi:weather-sunny"
+    assert compressed_attributes["unit_of_measurement"] == "\u00b0C"
+    assert "forecast" not in compressed_attributes
+    assert decompress_shared_attrs(compressed) == shared_attrs
+    assert StateAttributes(shared_attrs=compressed).to_native() == attributes
+
+    # Short shared attributes are not worth compressing
+    assert compress_shared_attrs('{"friendly_name":"Home"}') == (
+        '{"friendly_name":"Home"}'
+    )
+    assert decompress_shared_attrs('{"friendly_name":"Home"}') == (
+        '{"friendly_name":"Home"}'
+    )
+    assert decompress_shared_attrs(None) is None
+
+
+def test_decompress_broken_shared_attrs(caplog: pytest.LogCaptureFixture) -> None:
+    """Test we handle broken compressed shared attributes."""
+    assert decompress_shared_attrs('{"__compressed_v1__":"broken"}') == "{}"
+    assert "Error decompressing state attributes" in caplog.text
+
+
 def test_from_event_to_delete_state() -> None:
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -4,10 +4,11 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from freezegun import freeze_time
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
@@ -21,17 +22,24 @@ from homeassistant.components.recorder.db_schema import (
     StateAttributes,
     States,
     StatesMeta,
+    StatesNumeric,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    CONTINUOUS_PURGE_MAX_DELAY,
+    CONTINUOUS_PURGE_MIN_DELAY,
+    PurgePacer,
+    purge_old_data,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
+from homeassistant.components.recorder.repack import incremental_vacuum, repack_database
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
-from homeassistant.components.recorder.tasks import PurgeTask
+from homeassistant.components.recorder.tasks import ContinuousPurgeTask, PurgeTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
 from homeassistant.core import HomeAssistant
@@ -110,6 +118,200 @@ async def test_purge_big_database(hass: HomeAssistant, recorder_mock: Recorder)
             assert state_attributes.count() == 1
 
 
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test the continuous purge deletes old states in small steps."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 6),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 6),
+        patch(
+            "homeassistant.components.recorder.purge.purge_old_data",
+            wraps=purge_old_data,
+        ) as purge_old_data_mock,
+        patch.object(PurgePacer, "next_delay", return_value=0),
+    ):
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        # A purge in progress is not started again
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        await async_wait_purge_done(hass, 10)
+
+    assert not recorder_mock.purge_pacer.running
+    # 24 states are older than keep_days, 6 of them are purged in each step
+    assert len(purge_old_data_mock.mock_calls) == 5
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 48
+        assert not states.filter(States.state.like("autopurgeme%")).count()
+
+
+def test_purge_pacer() -> None:
+    """Test the continuous purge slows down while the recorder is busy."""
+    instance = Mock(backlog=0, commit_duration=0.0)
+    pacer = PurgePacer()
+    assert pacer.next_delay(instance, 0.1) == CONTINUOUS_PURGE_MIN_DELAY
+    # A slow step is followed by a longer break
+    assert pacer.next_delay(instance, 1) == 4
+
+    instance.backlog = 1000
+    assert pacer.next_delay(instance, 0.1) == CONTINUOUS_PURGE_MIN_DELAY * 2
+    instance.backlog = 0
+    instance.commit_duration = 1.0
+    assert pacer.next_delay(instance, 0.1) == CONTINUOUS_PURGE_MIN_DELAY * 4
+    for _ in range(10):
+        pacer.next_delay(instance, 0.1)
+    assert pacer.delay == CONTINUOUS_PURGE_MAX_DELAY
+
+    instance.commit_duration = 0.0
+    assert pacer.next_delay(instance, 0.1) == CONTINUOUS_PURGE_MAX_DELAY / 2
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge_incremental_vacuum(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the continuous purge returns free space of SQLite databases."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    def _free_pages() -> tuple[int, int]:
+        with recorder_mock.engine.connect() as conn:
+            return (
+                conn.execute(text("PRAGMA auto_vacuum")).scalar(),
+                conn.execute(text("PRAGMA freelist_count")).scalar(),
+            )
+
+    def _purge() -> bool:
+        purge_old_data(recorder_mock, dt_util.utcnow(), repack=False)
+        with session_scope(hass=hass) as session:
+            session.execute(text("DELETE FROM state_attributes"))
+        return incremental_vacuum(recorder_mock, 1)
+
+    auto_vacuum, free_pages = await recorder_mock.async_add_executor_job(_free_pages)
+    assert auto_vacuum == 2
+    assert free_pages == 0
+    assert await recorder_mock.async_add_executor_job(_purge)
+    free_pages = (await recorder_mock.async_add_executor_job(_free_pages))[1]
+    assert free_pages > 0
+    await recorder_mock.async_add_executor_job(
+        incremental_vacuum, recorder_mock, free_pages
+    )
+    assert (await recorder_mock.async_add_executor_job(_free_pages))[1] == 0
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge_skips_vacuum_until_repacked(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test databases without incremental auto vacuum are left to the repack."""
+
+    def _disable_auto_vacuum() -> None:
+        with recorder_mock.engine.connect() as conn:
+            conn.execute(text("PRAGMA auto_vacuum = NONE"))
+            conn.execute(text("VACUUM"))
+            conn.commit()
+
+    def _auto_vacuum() -> int:
+        with recorder_mock.engine.connect() as conn:
+            conn.execute(text("PRAGMA freelist_count"))
+            return conn.execute(text("PRAGMA auto_vacuum")).scalar()
+
+    await recorder_mock.async_add_executor_job(_disable_auto_vacuum)
+    assert await recorder_mock.async_add_executor_job(_auto_vacuum) == 0
+
+    assert not await recorder_mock.async_add_executor_job(
+        incremental_vacuum, recorder_mock, 1
+    )
+    assert await recorder_mock.async_add_executor_job(_auto_vacuum) == 0
+
+    await recorder_mock.async_add_executor_job(repack_database, recorder_mock)
+    assert await recorder_mock.async_add_executor_job(_auto_vacuum) == 2
+
+
+@pytest.mark.parametrize("enable_nightly_purge", [True])
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge_replaces_nightly_purge(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the nightly tasks only clean up when purging continuously."""
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.purge_old_data", return_value=True
+        ) as purge_old_data_mock,
+        patch(
+            "homeassistant.components.recorder.tasks.periodic_db_cleanups"
+        ) as periodic_db_cleanups,
+    ):
+        recorder_mock.async_nightly_tasks(datetime(2026, 10, 12, tzinfo=dt_util.UTC))
+        await async_wait_recording_done(hass)
+        assert len(purge_old_data_mock.mock_calls) == 0
+        assert len(periodic_db_cleanups.mock_calls) == 1
+
+        recorder_mock._async_five_minute_tasks(dt_util.utcnow())
+        await async_wait_recording_done(hass)
+        assert len(purge_old_data_mock.mock_calls) == 1
+
+        # The database is still repacked on the second sunday of the month
+        recorder_mock.async_nightly_tasks(datetime(2026, 10, 11, tzinfo=dt_util.UTC))
+        await async_wait_recording_done(hass)
+        assert len(purge_old_data_mock.mock_calls) == 2
+        assert purge_old_data_mock.mock_calls[1].args[2] is True
+        assert len(periodic_db_cleanups.mock_calls) == 2
+
+
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge_cleanups(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the cleanups only run after a continuous purge deleted rows."""
+    with (
+        patch(
+            "homeassistant.components.recorder.purge._purge_old_event_types"
+        ) as purge_old_event_types,
+        patch.object(PurgePacer, "next_delay", return_value=0),
+    ):
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        await async_wait_purge_done(hass)
+        assert not purge_old_event_types.mock_calls
+
+        await _add_test_states(hass)
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        await async_wait_purge_done(hass)
+        assert len(purge_old_event_types.mock_calls) == 1
+    assert not recorder_mock.purge_pacer.running
+
+
+@pytest.mark.parametrize("recorder_config", [{"continuous_purge": True}])
+async def test_continuous_purge_error(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the continuous purge starts again after a step failed."""
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        side_effect=ValueError,
+    ):
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        await async_wait_recording_done(hass)
+    assert not recorder_mock.purge_pacer.running
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data", return_value=True
+    ) as purge_old_data_mock:
+        recorder_mock.queue_task(ContinuousPurgeTask())
+        await async_wait_recording_done(hass)
+    assert len(purge_old_data_mock.mock_calls) == 1
+
+
 async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
     """Test deleting old states."""
     assert recorder_mock.states_manager.oldest_ts is None
@@ -223,6 +425,30 @@ async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) ->
         assert state_attributes.count() == 3
 
 
+async def test_purge_old_numeric_states(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the numeric values of purged states are deleted with them."""
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+    with freeze_time(eleven_days_ago) as freezer:
+        hass.states.async_set("sensor.power", "10")
+        freezer.tick(1)
+        hass.states.async_set("sensor.power", "11")
+    hass.states.async_set("sensor.power", "12")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatesNumeric).count() == 3
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    finished = purge_old_data(recorder_mock, purge_before, repack=False)
+    assert finished
+
+    with session_scope(hass=hass) as session:
+        assert [row.value for row in session.query(StatesNumeric)] == [12.0]
+        assert session.query(States).count() == 1
+
+
 @pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
 @pytest.mark.usefixtures("recorder_mock", "skip_by_db_engine")
 async def test_purge_old_states_encouters_database_corruption(
@@ -425,6 +651,45 @@ async def test_purge_old_statistics_runs(
         assert statistics_runs.count() == 1
 
 
+async def test_purge_short_term_statistics_in_periods(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test short term statistics are purged in bounded ranges of periods."""
+    now = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    with session_scope(hass=hass) as session:
+        # 4 periods of 3 rows each, the newest period is not purged
+        for period in range(4):
+            start_ts = (now - timedelta(minutes=5 * (3 - period))).timestamp()
+            session.add_all(
+                StatisticsShortTerm(start_ts=start_ts, state=period) for _ in range(3)
+            )
+
+    def _remaining_states() -> list[float]:
+        with session_scope(hass=hass) as session:
+            return sorted(
+                state for (state,) in session.query(StatisticsShortTerm.state)
+            )
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 4),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 4),
+    ):
+        # The batch ends at the period of the fifth oldest row
+        assert not purge_old_data(recorder_mock, now, repack=False)
+        assert _remaining_states() == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 2),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 2),
+    ):
+        # The oldest period has more rows than max_bind_vars
+        assert not purge_old_data(recorder_mock, now, repack=False)
+        assert _remaining_states() == [2, 2, 2, 3, 3, 3]
+        # The range of the last period is capped at purge_before
+        assert purge_old_data(recorder_mock, now, repack=False)
+        assert _remaining_states() == [3, 3, 3]
+
+
 @pytest.mark.parametrize("use_sqlite", [True, False], indirect=True)
 @pytest.mark.usefixtures("recorder_mock")
 async def test_purge_method(
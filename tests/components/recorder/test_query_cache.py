@@ -0,0 +1,467 @@
+"""Test the query cache of the recorder."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder, history, statistics
+from homeassistant.components.recorder.history import modern
+from homeassistant.components.recorder.query_cache import (
+    HistoryEntry,
+    HistoryKey,
+    HistoryRow,
+    QueryCache,
+    StatisticsKey,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+HISTORY_KEY: HistoryKey = (("sensor.a", "sensor.b"), False)
+STATISTICS_KEY: StatisticsKey = (("test:a",), "hour", (), ("sum",))
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _history_entry() -> HistoryEntry:
+    """Return a history entry of two entities since 100."""
+    return HistoryEntry(
+        100,
+        {"sensor.a": 1, "sensor.b": 2},
+        {
+            "sensor.a": [
+                HistoryRow(1, "on", 0, 0, "{}"),
+                HistoryRow(1, "off", 110, None, "{}"),
+            ],
+            "sensor.b": [],
+        },
+    )
+
+
+def test_history() -> None:
+    """Test history results are cached and extended with committed states."""
+    cache = QueryCache(1024**2)
+    assert cache.enabled
+    assert not QueryCache(0).enabled
+    assert cache.get_history(HISTORY_KEY, 100) is None
+
+    cache.store_history(HISTORY_KEY, _history_entry(), cache.history_sequence())
+    assert cache.get_history(HISTORY_KEY, 99) is None
+    metadata_ids, rows = cache.get_history(HISTORY_KEY, 100)
+    assert metadata_ids == {"sensor.a": 1, "sensor.b": 2}
+    assert rows == {
+        "sensor.a": (
+            HistoryRow(1, "on", 0, 0, "{}"),
+            [HistoryRow(1, "off", 110, None, "{}")],
+        ),
+        "sensor.b": (None, []),
+    }
+
+    cache.add_states(
+        [
+            ("sensor.b", "1", 120, None, '{"a":1}'),
+            ("sensor.a", "on", 115, None, "{}"),
+            ("sensor.other", "2", 120, None, "{}"),
+        ]
+    )
+    _, rows = cache.get_history(HISTORY_KEY, 112)
+    assert rows == {
+        "sensor.a": (
+            HistoryRow(1, "off", 110, None, "{}"),
+            [HistoryRow(1, "on", 115, None, "{}")],
+        ),
+        "sensor.b": (None, [HistoryRow(2, "1", 120, None, '{"a":1}')]),
+    }
+    # Rows committed out of order are sorted in
+    cache.add_states([("sensor.a", "unknown", 112, None, "{}")])
+    _, rows = cache.get_history(HISTORY_KEY, 111)
+    assert rows["sensor.a"] == (
+        HistoryRow(1, "off", 110, None, "{}"),
+        [
+            HistoryRow(1, "unknown", 112, None, "{}"),
+            HistoryRow(1, "on", 115, None, "{}"),
+        ],
+    )
+
+    cache.purged(50)
+    assert cache.get_history(HISTORY_KEY, 100) is not None
+    cache.purged(101)
+    assert cache.get_history(HISTORY_KEY, 101) is None
+    assert cache.size == 0
+
+
+def test_history_missed_states() -> None:
+    """Test history results which may miss states are not cached."""
+    cache = QueryCache(1024**2)
+    sequence = cache.history_sequence()
+    cache.add_states([("sensor.b", "1", 120, None, "{}")])
+    cache.store_history(HISTORY_KEY, _history_entry(), sequence)
+    assert cache.get_history(HISTORY_KEY, 100) is None
+
+    sequence = cache.history_sequence()
+    cache.clear()
+    cache.store_history(HISTORY_KEY, _history_entry(), sequence)
+    assert cache.get_history(HISTORY_KEY, 100) is None
+
+    cache.purged(150)
+    cache.store_history(HISTORY_KEY, _history_entry(), cache.history_sequence())
+    assert cache.get_history(HISTORY_KEY, 100) is None
+
+    # States of entities which were not recorded can not be added
+    entry = _history_entry()
+    entry.entity_id_to_metadata_id["sensor.b"] = None
+    cache = QueryCache(1024**2)
+    cache.store_history(HISTORY_KEY, entry, cache.history_sequence())
+    cache.add_states([("sensor.a", "1", 120, None, "{}")])
+    assert cache.get_history(HISTORY_KEY, 100) is not None
+    cache.add_states([("sensor.b", "1", 121, None, "{}")])
+    assert cache.get_history(HISTORY_KEY, 100) is None
+    assert cache.size == 0
+
+
+def test_history_purged_entities() -> None:
+    """Test only the history of entities with purged states is removed."""
+    cache = QueryCache(1024**2)
+    other_key: HistoryKey = (("sensor.c",), False)
+    other_entry = HistoryEntry(100, {"sensor.c": 3}, {"sensor.c": []})
+    cache.store_history(HISTORY_KEY, _history_entry(), cache.history_sequence())
+    cache.store_history(other_key, other_entry, cache.history_sequence())
+    cache.store_statistics(
+        STATISTICS_KEY, 100, {"test:a": []}, cache.statistics_generation()
+    )
+
+    sequence = cache.history_sequence()
+    cache.purged_entities(["sensor.b"])
+    assert cache.get_history(HISTORY_KEY, 100) is None
+    assert cache.get_history(other_key, 100) is not None
+    assert cache.get_statistics(STATISTICS_KEY, 100) == ({"test:a": []}, None)
+
+    # Results fetched before the purge may hold the purged states
+    cache.store_history(HISTORY_KEY, _history_entry(), sequence)
+    assert cache.get_history(HISTORY_KEY, 100) is None
+    cache.store_history(HISTORY_KEY, _history_entry(), cache.history_sequence())
+    assert cache.get_history(HISTORY_KEY, 100) is not None
+
+
+def test_statistics() -> None:
+    """Test statistics results are cached and refreshed after compiling."""
+    cache = QueryCache(1024**2)
+    assert cache.get_statistics(STATISTICS_KEY, 0) is None
+    rows: dict[str, list[dict[str, Any]]] = {
+        "test:a": [{"start": 0, "sum": 1}, {"start": 3600, "sum": 2}]
+    }
+    cache.store_statistics(STATISTICS_KEY, 0, rows, cache.statistics_generation())
+    result, refresh_start_ts = cache.get_statistics(STATISTICS_KEY, 3600)
+    assert result == {"test:a": [{"start": 3600, "sum": 2}]}
+    assert refresh_start_ts is None
+    # Callers may change the returned rows
+    result["test:a"][0]["start"] = 3600000
+    rows["test:a"][0]["start"] = 1000
+    expected = {"test:a": [{"start": 0, "sum": 1}, {"start": 3600, "sum": 2}]}
+    assert cache.get_statistics(STATISTICS_KEY, 0) == (expected, None)
+
+    generation = cache.statistics_generation()
+    cache.statistics_compiled()
+    # Results fetched while statistics were compiled are not cached
+    cache.store_statistics(STATISTICS_KEY, 3600, {}, generation)
+    assert cache.get_statistics(STATISTICS_KEY, 0) == (expected, 3600)
+
+    cache.store_statistics(
+        STATISTICS_KEY,
+        3600,
+        {"test:a": [{"start": 3600, "sum": 3}, {"start": 7200, "sum": 4}]},
+        cache.statistics_generation(),
+    )
+    assert cache.get_statistics(STATISTICS_KEY, 0) == (
+        {
+            "test:a": [
+                {"start": 0, "sum": 1},
+                {"start": 3600, "sum": 3},
+                {"start": 7200, "sum": 4},
+            ]
+        },
+        None,
+    )
+
+    cache.clear_statistics()
+    assert cache.get_statistics(STATISTICS_KEY, 0) is None
+    assert cache.size == 0
+
+    # Statistics without rows are fetched again from the start
+    cache.store_statistics(STATISTICS_KEY, 0, {}, cache.statistics_generation())
+    cache.statistics_compiled()
+    assert cache.get_statistics(STATISTICS_KEY, 0) == ({}, 0)
+
+
+def test_evict() -> None:
+    """Test the least recently used results are evicted."""
+    cache = QueryCache(1024**2)
+    cache.store_history(HISTORY_KEY, _history_entry(), cache.history_sequence())
+    cache.store_statistics(
+        STATISTICS_KEY,
+        0,
+        {"test:a": [{"start": 0, "sum": 1}]},
+        cache.statistics_generation(),
+    )
+    cache.get_history(HISTORY_KEY, 100)
+    cache.max_bytes = cache.size - 1
+    cache.add_states([])
+    assert cache.get_statistics(STATISTICS_KEY, 0) is None
+    assert cache.get_history(HISTORY_KEY, 100) is not None
+
+    cache.max_bytes = 1
+    cache.add_states([])
+    assert cache.get_history(HISTORY_KEY, 100) is None
+    assert cache.size == 0
+
+
+def _state_values(
+    states: dict[str, list[Any]],
+) -> dict[str, list[Any]]:
+    """Return the values of history states to compare them."""
+    return {
+        entity_id: [
+            state
+            if isinstance(state, dict)
+            else (
+                state.state,
+                state.attributes,
+                state.last_changed,
+                state.last_updated,
+            )
+            for state in entity_states
+        ]
+        for entity_id, entity_states in states.items()
+    }
+
+
+@pytest.mark.parametrize("recorder_config", [{"query_cache_size": 1}])
+async def test_history_query_cache(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history is served from the query cache."""
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("climate.home", "heat", {"temperature": 20})
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "kW"})
+    hass.states.async_set("climate.home", "heat", {"temperature": 21})
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "kW"})
+    await async_wait_recording_done(hass)
+    entity_ids = ["sensor.power", "climate.home", "sensor.unknown"]
+    query_cache = recorder_mock.query_cache
+
+    def _significant_states(start_offset: timedelta, **kwargs: Any) -> dict:
+        return _state_values(
+            history.get_significant_states(
+                hass, start + start_offset, None, entity_ids, **kwargs
+            )
+        )
+
+    def _compare_with_database(**kwargs: Any) -> None:
+        for start_offset in (
+            timedelta(seconds=-1),
+            timedelta(seconds=30),
+            timedelta(seconds=90),
+        ):
+            cached = _significant_states(start_offset, **kwargs)
+            query_cache.max_bytes = 0
+            try:
+                assert cached == _significant_states(start_offset, **kwargs)
+            finally:
+                query_cache.max_bytes = 1024**2
+
+    for kwargs in (
+        {},
+        {"significant_changes_only": False},
+        {"include_start_time_state": False},
+        {"minimal_response": True},
+        {"compressed_state_format": True},
+        {"no_attributes": True, "minimal_response": True},
+    ):
+        await recorder_mock.async_add_executor_job(
+            lambda kwargs=kwargs: _compare_with_database(**kwargs)
+        )
+
+    with patch.object(
+        modern, "execute_stmt_lambda_element", side_effect=AssertionError
+    ):
+        states = await recorder_mock.async_add_executor_job(
+            _significant_states, timedelta(seconds=30)
+        )
+    assert [state[0] for state in states["sensor.power"]] == ["1", "2"]
+
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "3", {"unit_of_measurement": "kW"})
+    await async_wait_recording_done(hass)
+    with patch.object(
+        modern, "execute_stmt_lambda_element", side_effect=AssertionError
+    ):
+        states = await recorder_mock.async_add_executor_job(
+            _significant_states, timedelta(seconds=30)
+        )
+    assert [state[0] for state in states["sensor.power"]] == ["1", "2", "3"]
+    await recorder_mock.async_add_executor_job(_compare_with_database)
+
+
+@pytest.mark.parametrize("recorder_config", [{"query_cache_size": 1}])
+async def test_history_stream_query_cache(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test streamed history of a period is served from the query cache."""
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("climate.home", "heat", {"temperature": 20})
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "2")
+    freezer.tick(timedelta(minutes=1))
+    hass.states.async_set("sensor.power", "3")
+    await async_wait_recording_done(hass)
+    end = dt_util.utcnow()
+    entity_ids = ["sensor.power", "climate.home"]
+    query_cache = recorder_mock.query_cache
+
+    def _stream(start_offset: timedelta, end_time: datetime | None) -> list:
+        return json_loads(
+            json_bytes(
+                list(
+                    history.stream_significant_states(
+                        hass, start + start_offset, end_time, entity_ids, chunk_size=2
+                    )
+                )
+            )
+        )
+
+    def _compare_with_database() -> None:
+        for start_offset in (timedelta(seconds=-1), timedelta(seconds=30)):
+            for end_time in (None, end, start + timedelta(seconds=90)):
+                cached = _stream(start_offset, end_time)
+                query_cache.max_bytes = 0
+                try:
+                    assert cached == _stream(start_offset, end_time)
+                finally:
+                    query_cache.max_bytes = 1024**2
+
+    await recorder_mock.async_add_executor_job(_compare_with_database)
+
+    with patch.object(
+        modern, "execute_stmt_lambda_element", side_effect=AssertionError
+    ):
+        chunks = await recorder_mock.async_add_executor_job(
+            _stream, timedelta(seconds=30), start + timedelta(seconds=90)
+        )
+    assert [
+        state["s"] for chunk in chunks for state in chunk.get("sensor.power", ())
+    ] == ["1", "2"]
+
+    # Periods which ended a while ago are not fetched into the cache
+    freezer.tick(timedelta(hours=1))
+    key = (("sensor.other",), False)
+    hass.states.async_set("sensor.other", "1")
+    await async_wait_recording_done(hass)
+    await recorder_mock.async_add_executor_job(
+        lambda: list(
+            history.stream_significant_states(
+                hass, start, end, ["sensor.other"], chunk_size=2
+            )
+        )
+    )
+    assert query_cache.get_history(key, start.timestamp()) is None
+
+
+@pytest.mark.parametrize("recorder_config", [{"query_cache_size": 1}])
+async def test_statistics_query_cache(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test statistics are served from the query cache."""
+    zero = dt_util.utcnow()
+    period1 = zero.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    period2 = period1 + timedelta(hours=1)
+    metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(
+        hass,
+        metadata,
+        (
+            {"start": period1, "state": 0, "sum": 2},
+            {"start": period2, "state": 1, "sum": 3},
+        ),
+    )
+    await async_wait_recording_done(hass)
+
+    def _statistics() -> dict[str, list[dict[str, Any]]]:
+        return statistics_during_period(
+            hass,
+            zero,
+            None,
+            {"test:total_energy_import"},
+            "hour",
+            None,
+            {"state", "sum", "change"},
+        )
+
+    with patch.object(
+        statistics,
+        "_statistics_during_period_with_session",
+        wraps=statistics._statistics_during_period_with_session,
+    ) as statistics_mock:
+        stats = _statistics()
+        assert [row["sum"] for row in stats["test:total_energy_import"]] == [2, 3]
+        assert [row["change"] for row in stats["test:total_energy_import"]] == [
+            2,
+            1,
+        ]
+        assert statistics_mock.call_count == 1
+        assert _statistics() == stats
+        assert statistics_mock.call_count == 1
+
+        # Only the statistics since the last row are fetched after compiling
+        recorder_mock.query_cache.statistics_compiled()
+        assert _statistics() == stats
+        assert statistics_mock.call_count == 2
+        assert statistics_mock.call_args[0][2] == period2
+
+        # Importing statistics clears the cached statistics
+        async_add_external_statistics(
+            hass,
+            metadata,
+            ({"start": period2 + timedelta(hours=1), "state": 2, "sum": 5},),
+        )
+        await async_wait_recording_done(hass)
+        stats = _statistics()
+        assert statistics_mock.call_count == 3
+        assert [row["change"] for row in stats["test:total_energy_import"]] == [
+            2,
+            1,
+            2,
+        ]
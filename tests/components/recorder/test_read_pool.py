@@ -0,0 +1,132 @@
+"""Test the read pool of the recorder."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder, get_instance, history
+from homeassistant.components.recorder.const import DB_READER_PREFIX
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+# A query that keeps SQLite busy until it is interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE cnt(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM cnt)"
+    " SELECT count(*) FROM cnt"
+)
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_read_job(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test read jobs run on read-only connections of their own."""
+    instance = await async_setup_recorder_instance(hass)
+    assert instance._read_pool is not None
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "1")
+    await async_wait_recording_done(hass)
+
+    def _read_states() -> tuple[str, bool, list[str]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = [state.state for state in session.query(States)]
+            on_read_pool = session.get_bind() is instance._read_pool.engine
+        return threading.current_thread().name, on_read_pool, states
+
+    thread_name, on_read_pool, states = await instance.async_add_read_job(_read_states)
+    assert thread_name.startswith(DB_READER_PREFIX)
+    assert on_read_pool
+    assert states == ["1"]
+
+    def _write_state() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            session.execute(text("DELETE FROM states"))
+
+    with pytest.raises(OperationalError, match="readonly"):
+        await instance.async_add_read_job(_write_state)
+
+    assert await instance.async_add_read_job(
+        history.get_significant_states, hass, start, None, ["sensor.power"]
+    )
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_setup_read_pool_closes_previous_pool(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test setting up the read pool again closes the previous pool."""
+    instance = await async_setup_recorder_instance(hass)
+    previous_pool = instance._read_pool
+    assert previous_pool is not None
+
+    with patch.object(previous_pool, "close") as close_mock:
+        await instance.async_add_executor_job(instance._setup_read_pool, {})
+
+    close_mock.assert_called_once_with()
+    assert instance._read_pool is not None
+    assert instance._read_pool is not previous_pool
+    previous_pool.close()
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_read_job_timeout(
+    hass: HomeAssistant, async_setup_recorder_instance: RecorderInstanceGenerator
+) -> None:
+    """Test a read job that takes too long is interrupted."""
+    instance = await async_setup_recorder_instance(hass)
+    finished = threading.Event()
+    errors: list[Exception] = []
+
+    def _slow_query() -> None:
+        try:
+            with session_scope(hass=hass, read_only=True) as session:
+                session.execute(SLOW_QUERY)
+        except OperationalError as err:
+            errors.append(err)
+        finally:
+            finished.set()
+
+    with (
+        patch.object(recorder.core, "READ_JOB_TIMEOUT", 0.1),
+        pytest.raises(TimeoutError),
+    ):
+        await instance.async_add_read_job(_slow_query)
+
+    assert await hass.async_add_executor_job(finished.wait, 10)
+    assert "interrupted" in str(errors[0])
+
+
+async def test_no_read_pool_in_memory_database(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test read jobs use the db executor when the database is in memory."""
+    instance = get_instance(hass)
+    assert instance._read_pool is None
+
+    def _read_states() -> str:
+        with session_scope(hass=hass, read_only=True) as session:
+            session.query(States).all()
+        return threading.current_thread().name
+
+    assert not (await instance.async_add_read_job(_read_states)).startswith(
+        DB_READER_PREFIX
+    )
@@ -0,0 +1,381 @@
+"""Test the retention policies of the recorder."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    Events,
+    EventTypes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.purge import purge_ring_buffers
+from homeassistant.components.recorder.retention import (
+    RecorderRetention,
+    RetentionPolicy,
+)
+from homeassistant.components.recorder.tasks import (
+    PurgeRingBuffersTask,
+    RecordTrailingChangesTask,
+    SynchronizeTask,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _state_changed(entity_id: str, state: str | None, when: datetime) -> Event:
+    """Return a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": None,
+            "new_state": None
+            if state is None
+            else State(entity_id, state, last_updated=when, last_changed=when),
+        },
+    )
+
+
+def test_sample_every() -> None:
+    """Test every nth change is recorded."""
+    retention = RecorderRetention(
+        {"sensor.chatty": RetentionPolicy(sample_every=3)},
+        {"chatty_event": RetentionPolicy(sample_every=2)},
+    )
+    now = dt_util.utcnow()
+    assert [
+        retention.should_record(_state_changed("sensor.chatty", str(idx), now))
+        for idx in range(7)
+    ] == [True, False, False, True, False, False, True]
+    assert all(
+        retention.should_record(_state_changed("sensor.other", str(idx), now))
+        for idx in range(3)
+    )
+    assert [retention.should_record(Event("chatty_event", {})) for _ in range(4)] == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert retention.should_record(Event("other_event", {}))
+
+    # The entity starts over after it was removed
+    assert not retention.should_record(_state_changed("sensor.chatty", "7", now))
+    assert retention.should_record(_state_changed("sensor.chatty", None, now))
+    assert retention.should_record(_state_changed("sensor.chatty", "8", now))
+    assert not retention.should_record(_state_changed("sensor.chatty", "9", now))
+
+
+def test_min_interval() -> None:
+    """Test changes are recorded at most once per interval."""
+    retention = RecorderRetention(
+        {
+            "sensor.chatty": RetentionPolicy(min_interval=60),
+            "sensor.both": RetentionPolicy(sample_every=2, min_interval=60),
+        },
+        {},
+    )
+    start = dt_util.utcnow()
+    assert [
+        retention.should_record(
+            _state_changed("sensor.chatty", "1", start + timedelta(seconds=seconds))
+        )
+        for seconds in (0, 30, 59, 60, 61, 150)
+    ] == [True, False, False, True, False, True]
+    assert [
+        retention.should_record(
+            _state_changed("sensor.both", "1", start + timedelta(seconds=seconds))
+        )
+        for seconds in (0, 70, 80, 90, 100)
+    ] == [True, False, True, False, False]
+
+
+def test_ring_buffers() -> None:
+    """Test the ring buffers of the policies."""
+    retention = RecorderRetention(
+        {
+            "sensor.chatty": RetentionPolicy(keep_last=10),
+            "sensor.sampled": RetentionPolicy(sample_every=2),
+        },
+        {"chatty_event": RetentionPolicy(keep_last=5)},
+    )
+    assert retention.ring_buffers
+    assert retention.ring_buffer_entities() == {"sensor.chatty": 10}
+    assert retention.ring_buffer_event_types() == {"chatty_event": 5}
+    # A ring buffer alone does not skip changes
+    now = dt_util.utcnow()
+    assert all(
+        retention.should_record(_state_changed("sensor.chatty", str(idx), now))
+        for idx in range(3)
+    )
+    assert not RecorderRetention(
+        {"sensor.sampled": RetentionPolicy(sample_every=2)}, {}
+    ).ring_buffers
+
+
+def test_trailing_changes() -> None:
+    """Test the last skipped change is recorded once it is due."""
+    retention = RecorderRetention(
+        {
+            "sensor.chatty": RetentionPolicy(min_interval=60),
+            "sensor.sampled": RetentionPolicy(sample_every=3),
+        },
+        {},
+    )
+    assert retention.samples_entities
+    start = dt_util.utcnow()
+    start_ts = start.timestamp()
+    changes = [
+        _state_changed("sensor.chatty", state, start + timedelta(seconds=seconds))
+        for state, seconds in (("1", 0), ("5", 10), ("6", 20))
+    ]
+    assert [retention.should_record(event) for event in changes] == [
+        True,
+        False,
+        False,
+    ]
+    assert retention.pop_trailing_changes(start_ts + 59) == []
+    assert retention.pop_trailing_changes(start_ts + 60) == [changes[2]]
+    assert retention.pop_trailing_changes(start_ts + 600) == []
+    # The interval starts again at the recorded trailing change
+    later = _state_changed("sensor.chatty", "7", start + timedelta(seconds=70))
+    assert not retention.should_record(later)
+
+    # Sampled changes without an interval are due right away
+    sampled = [_state_changed("sensor.sampled", str(idx), start) for idx in range(3)]
+    assert [retention.should_record(event) for event in sampled] == [
+        True,
+        False,
+        False,
+    ]
+    assert retention.pop_trailing_changes(start_ts) == [sampled[2]]
+
+    # The trailing change of a removed entity is recorded before the removal
+    assert retention.pop_removed_trailing_changes() == []
+    assert retention.should_record(_state_changed("sensor.chatty", None, start))
+    assert retention.pop_removed_trailing_changes() == [later]
+    assert retention.pop_removed_trailing_changes() == []
+    assert not RecorderRetention(
+        {"sensor.ring": RetentionPolicy(keep_last=2)}, {}
+    ).samples_entities
+
+
+def _count_states(hass: HomeAssistant, entity_id: str) -> int:
+    """Return the number of recorded states of an entity."""
+    with session_scope(hass=hass) as session:
+        return (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
+            .count()
+        )
+
+
+def _states(hass: HomeAssistant, entity_id: str) -> list[str]:
+    """Return the recorded states of an entity, oldest first."""
+    with session_scope(hass=hass) as session:
+        return [
+            state
+            for (state,) in session.query(States.state)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
+            .order_by(States.last_updated_ts)
+        ]
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [
+        {
+            "retention": {
+                "entities": {
+                    "sensor.sampled": {"sample_every": 2},
+                    "sensor.throttled": {"min_interval": {"seconds": 60}},
+                    "sensor.ring": {"keep_last": 3},
+                },
+                "event_types": {
+                    "chatty_event": {"sample_every": 3, "keep_last": 2},
+                    "state_changed": {"sample_every": 2},
+                },
+            }
+        }
+    ],
+)
+async def test_retention(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test retention policies are applied before events are recorded."""
+    assert any(
+        "State change events cannot have a retention policy" in record.message
+        for record in caplog.get_records("setup")
+    )
+    retention = recorder_mock.retention
+    assert retention is not None
+    assert retention.entities == {
+        "sensor.sampled": RetentionPolicy(sample_every=2),
+        "sensor.throttled": RetentionPolicy(min_interval=60),
+        "sensor.ring": RetentionPolicy(keep_last=3),
+    }
+    assert retention.event_types == {
+        "chatty_event": RetentionPolicy(sample_every=3, keep_last=2)
+    }
+
+    # Start right after the five minute tasks so they do not run again
+    freezer.move_to(
+        dt_util.utcnow().replace(second=15, microsecond=0)
+        - timedelta(minutes=dt_util.utcnow().minute % 5)
+        + timedelta(minutes=5)
+    )
+    await async_wait_recording_done(hass)
+    for idx in range(6):
+        for entity_id in (
+            "sensor.sampled",
+            "sensor.throttled",
+            "sensor.ring",
+            "sensor.other",
+        ):
+            hass.states.async_set(entity_id, str(idx))
+        hass.bus.async_fire("chatty_event", {"idx": idx})
+        freezer.tick(timedelta(seconds=25))
+    await async_wait_recording_done(hass)
+
+    def _check() -> dict[str, Any]:
+        with session_scope(hass=hass) as session:
+            chatty_events = (
+                session.query(Events)
+                .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == "chatty_event")
+                .count()
+            )
+        return {
+            "sampled": _states(hass, "sensor.sampled"),
+            "throttled": _states(hass, "sensor.throttled"),
+            "ring": _count_states(hass, "sensor.ring"),
+            "other": _count_states(hass, "sensor.other"),
+            "chatty_events": chatty_events,
+        }
+
+    assert await recorder_mock.async_add_executor_job(_check) == {
+        "sampled": ["0", "2", "4"],
+        "throttled": ["0", "3"],
+        "ring": 6,
+        "other": 6,
+        "chatty_events": 2,
+    }
+
+    # The latest states are recorded once they are due
+    recorded = asyncio.Event()
+    recorder_mock.queue_task(RecordTrailingChangesTask())
+    recorder_mock.queue_task(SynchronizeTask(recorded))
+    await recorded.wait()
+    checked = await recorder_mock.async_add_executor_job(_check)
+    assert checked["sampled"] == ["0", "2", "4", "5"]
+    assert checked["throttled"] == ["0", "3", "5"]
+
+    assert purge_ring_buffers(recorder_mock, {"sensor.ring": 3}, {"chatty_event": 1})
+    assert await recorder_mock.async_add_executor_job(_states, hass, "sensor.ring") == [
+        "3",
+        "4",
+        "5",
+    ]
+    counts = await recorder_mock.async_add_executor_job(_check)
+    assert counts["chatty_events"] == 1
+    assert counts["other"] == 6
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [{"retention": {"entities": {"sensor.ring": {"keep_last": 3}}}}],
+)
+async def test_purge_ring_buffers_once(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the ring buffers are not purged again while a purge is in progress."""
+    assert recorder_mock.retention is not None
+    with patch(
+        "homeassistant.components.recorder.purge.purge_ring_buffers",
+        side_effect=[False, True],
+    ) as purge_ring_buffers_mock:
+        recorder_mock.queue_task(PurgeRingBuffersTask())
+        recorder_mock.queue_task(PurgeRingBuffersTask())
+        await async_wait_recording_done(hass)
+        await async_wait_recording_done(hass)
+    assert len(purge_ring_buffers_mock.mock_calls) == 2
+    assert not recorder_mock.retention.purging_ring_buffers
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_ring_buffers",
+        side_effect=ValueError,
+    ):
+        recorder_mock.queue_task(PurgeRingBuffersTask())
+        await async_wait_recording_done(hass)
+    assert not recorder_mock.retention.purging_ring_buffers
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [
+        {"retention": {"entities": {"sensor.sampled": {"sample_every": 2}}}},
+        {
+            "commit_interval": 60,
+            "retention": {"entities": {"sensor.sampled": {"sample_every": 2}}},
+        },
+    ],
+)
+async def test_sampled_changes_do_not_report_recorded_state(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the last reported time of skipped states is not written."""
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.sampled", "0")
+    freezer.tick(timedelta(seconds=10))
+    # Skipped by the sampling
+    hass.states.async_set("sensor.sampled", "1")
+    freezer.tick(timedelta(seconds=10))
+    hass.states.async_set("sensor.sampled", "1")
+    freezer.tick(timedelta(seconds=10))
+    hass.states.async_set("sensor.sampled", "2")
+    await async_wait_recording_done(hass)
+
+    def _rows() -> list[tuple[str, float, float | None]]:
+        with session_scope(hass=hass) as session:
+            return [
+                tuple(row)
+                for row in session.query(
+                    States.state, States.last_updated_ts, States.last_reported_ts
+                )
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "sensor.sampled")
+                .order_by(States.last_updated_ts)
+            ]
+
+    t0 = start.timestamp()
+    assert await recorder_mock.async_add_executor_job(_rows) == [
+        ("0", t0, None),
+        ("2", t0 + 30, None),
+    ]
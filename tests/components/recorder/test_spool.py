@@ -0,0 +1,292 @@
+"""Test spooling recorder events to disk."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+import sys
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.db_schema import (
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.spool import FRAME_HEADER, EventSpool
+from homeassistant.components.recorder.tasks import RecorderTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.common import async_fire_time_changed
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_event_spool(tmp_path: Path) -> None:
+    """Test events are read back from the spool in the order they were written."""
+    spool = EventSpool(str(tmp_path / "spool"))
+    assert not spool.load()
+    assert spool.read(10) == []
+
+    old_state = State(
+        "sensor.power",
+        "10",
+        {"unit_of_measurement": "W"},
+        state_info={"unrecorded_attributes": frozenset({"options"})},
+    )
+    new_state = State("sensor.power", "12", {"unit_of_measurement": "W"})
+    context = Context(user_id="b" * 32, parent_id="c" * 26)
+    events = [
+        Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "sensor.power",
+                "old_state": old_state,
+                "new_state": new_state,
+            },
+            context=context,
+        ),
+        Event("test_event", {"value": 1}, EventOrigin.remote),
+        Event("test_event", {"value": object()}),
+        Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "sensor.power", "old_state": new_state, "new_state": None},
+        ),
+    ]
+    spool.write(events[:2])
+    spool.write(events[2:])
+    assert spool.pending
+
+    first, second = spool.read(2)
+    assert first.event_type == EVENT_STATE_CHANGED
+    assert first.time_fired_timestamp == events[0].time_fired_timestamp
+    assert first.context.id == context.id
+    assert first.context.user_id == context.user_id
+    assert first.context.parent_id == context.parent_id
+    assert first.data["entity_id"] == "sensor.power"
+    for restored, original in (
+        (first.data["old_state"], old_state),
+        (first.data["new_state"], new_state),
+    ):
+        assert restored.as_dict() == {
+            **original.as_dict(),
+            "context": restored.context.as_dict(),
+        }
+        assert restored.last_updated_timestamp == original.last_updated_timestamp
+        assert restored.last_reported_timestamp == original.last_reported_timestamp
+        assert restored.state_info == original.state_info
+    assert second.event_type == "test_event"
+    assert second.data == {"value": 1}
+    assert second.origin is EventOrigin.remote
+
+    # The event that could not be serialized was skipped
+    (third,) = spool.read(10)
+    assert third.data["old_state"].state == "12"
+    assert third.data["new_state"] is None
+
+    # The file is removed once it has been read
+    assert not spool.pending
+    assert not Path(spool.path).exists()
+
+
+def test_event_spool_left_from_previous_run(tmp_path: Path) -> None:
+    """Test events left from a previous run are picked up and bad frames skipped."""
+    path = tmp_path / "spool"
+    EventSpool(str(path)).write([Event("test_event", {"value": 1})])
+    with path.open("ab") as file:
+        file.write(FRAME_HEADER.pack(3) + b"bad")
+        file.write(FRAME_HEADER.pack(100)[:2])
+
+    spool = EventSpool(str(path))
+    assert spool.load()
+    (event,) = spool.read(10)
+    assert event.data == {"value": 1}
+    assert not spool.pending
+    assert not path.exists()
+
+
+def _count_test_events(session: Session) -> int:
+    """Count the recorded test events."""
+    return (
+        session.query(Events)
+        .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+        .filter(EventTypes.event_type == "test_event")
+        .count()
+    )
+
+
+@dataclass(slots=True)
+class BlockTask(RecorderTask):
+    """Block the recorder thread until released."""
+
+    release: threading.Event
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        self.release.wait()
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_spool_backlog(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test events are spooled while the backlog is too large and replayed."""
+    instance = await async_setup_recorder_instance(hass, {"commit_interval": 0})
+    spool_path = Path(instance._spool.path)
+
+    release = threading.Event()
+    instance.queue_task(BlockTask(release))
+    with (
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 1),
+        patch.object(
+            recorder.core, "MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG", sys.maxsize
+        ),
+        patch.object(recorder.core, "SPOOL_FLUSH_SIZE", 2),
+    ):
+        hass.states.async_set("sensor.power", "1")
+        hass.states.async_set("sensor.power", "2")
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+        await hass.async_block_till_done()
+        assert "new events will be spooled" in caplog.text
+        assert instance.recording
+
+        for value in range(3, 8):
+            hass.states.async_set("sensor.power", str(value))
+        hass.bus.async_fire("test_event", {"value": 1})
+        await hass.async_block_till_done()
+        assert spool_path.exists()
+
+    release.set()
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    hass.states.async_set("sensor.power", "8")
+    await async_wait_recording_done(hass)
+
+    def _get_rows() -> tuple[list[tuple[str, int | None, int]], int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = session.query(States).order_by(States.state_id).all()
+            return (
+                [(row.state, row.old_state_id, row.state_id) for row in states],
+                _count_test_events(session),
+            )
+
+    states, event_count = await instance.async_add_executor_job(_get_rows)
+    assert [state for state, _, _ in states] == [str(value) for value in range(1, 9)]
+    # Every state is linked to the one recorded before it
+    assert [old_state_id for _, old_state_id, _ in states] == [
+        None,
+        *(state_id for _, _, state_id in states[:-1]),
+    ]
+    assert event_count == 1
+    assert not spool_path.exists()
+    assert instance._spool_buffer is None
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_spool_unrecorded_attributes(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test unrecorded attributes of spooled states are not recorded."""
+    instance = await async_setup_recorder_instance(hass, {"commit_interval": 0})
+
+    release = threading.Event()
+    instance.queue_task(BlockTask(release))
+    with (
+        patch.object(recorder.core, "MAX_QUEUE_BACKLOG_MIN_VALUE", 1),
+        patch.object(
+            recorder.core, "MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG", sys.maxsize
+        ),
+        patch.object(recorder.core, "SPOOL_FLUSH_SIZE", 1),
+    ):
+        hass.states.async_set("sensor.power", "1")
+        hass.states.async_set("sensor.power", "2")
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+        await hass.async_block_till_done()
+        assert instance._spool_buffer is not None
+
+        hass.states.async_set(
+            "camera.front_door",
+            "idle",
+            {
+                "access_token": "secret",
+                "entity_picture": "/api/camera_proxy/camera.front_door",
+                "friendly_name": "Front door",
+            },
+            state_info={
+                "unrecorded_attributes": frozenset({"access_token", "entity_picture"})
+            },
+        )
+        await hass.async_block_till_done()
+        assert Path(instance._spool.path).exists()
+
+    release.set()
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+
+    def _get_attributes() -> dict[str, Any]:
+        with session_scope(hass=hass, read_only=True) as session:
+            (state_attributes,) = (
+                session.query(StateAttributes)
+                .join(States, States.attributes_id == StateAttributes.attributes_id)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == "camera.front_door")
+                .all()
+            )
+            return state_attributes.to_native()
+
+    assert await instance.async_add_executor_job(_get_attributes) == {
+        "friendly_name": "Front door"
+    }
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_spool_left_from_previous_run(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    recorder_db_url: str,
+) -> None:
+    """Test events spooled before a restart are recorded at startup."""
+    spool_path = recorder_db_url.removeprefix("sqlite:///") + ".spool"
+    EventSpool(spool_path).write([Event("test_event", {"value": 1})])
+
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+
+    def _count_events() -> int:
+        with session_scope(hass=hass, read_only=True) as session:
+            return _count_test_events(session)
+
+    assert await instance.async_add_executor_job(_count_events) == 1
+    assert not Path(spool_path).exists()
+
+
+async def test_no_spool_in_memory_database(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test events are not spooled when the database is in memory."""
+    assert get_instance(hass)._spool is None
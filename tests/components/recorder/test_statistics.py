@@ -9,7 +9,11 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -1844,6 +1848,196 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna"])
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    timezone: str,
+) -> None:
+    """Test daily and monthly statistics are read from the rollups."""
+    await hass.config.async_set_time_zone(timezone)
+    await async_wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.statistics_rollups_active
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2022-09-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": zero + timedelta(hours=hour),
+            "mean": hour,
+            "min": hour - 1,
+            "max": hour + 1,
+            "last_reset": None,
+            "state": hour,
+            "sum": hour,
+        }
+        for hour in range(72)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def _count_rollups() -> tuple[int, int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                session.query(StatisticsDaily).count(),
+                session.query(StatisticsMonthly).count(),
+            )
+
+    def _assert_rollups_match_hourly_statistics() -> None:
+        for period in ("day", "week", "month"):
+            for types in (
+                {"last_reset", "max", "mean", "min", "state", "sum"},
+                {"change"},
+            ):
+                rollups = statistics_during_period(
+                    hass, zero, period=period, types=types
+                )
+                with patch.object(instance, "statistics_rollups_active", False):
+                    reduced = statistics_during_period(
+                        hass, zero, period=period, types=types
+                    )
+                assert rollups == reduced
+
+    assert _count_rollups() == (3, 2)
+    _assert_rollups_match_hourly_statistics()
+    stats = statistics_during_period(hass, zero, period="day", types={"mean", "sum"})
+    assert stats["test:total_energy_import"][0] == {
+        "start": zero.timestamp(),
+        "end": (zero + timedelta(days=1)).timestamp(),
+        "mean": 11.5,
+        "sum": 23.0,
+    }
+
+    # Adjusting the sum updates the rollups of the day and all later days
+    instance.async_adjust_statistics(
+        "test:total_energy_import", zero + timedelta(hours=30), 100, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics()
+    stats = statistics_during_period(hass, zero, period="day", types={"sum"})
+    assert [row["sum"] for row in stats["test:total_energy_import"]] == [
+        23.0,
+        147.0,
+        171.0,
+    ]
+
+    # Rollups for another time zone are not used and rebuilt
+    await hass.config.async_set_time_zone("UTC")
+    with patch.object(instance, "statistics_rollups_active", False):
+        reduced = statistics_during_period(hass, zero, period="day")
+    assert statistics_during_period(hass, zero, period="day") == reduced
+    assert not instance.statistics_rollups_active
+    # The rollups are rebuilt one month at a time
+    await async_wait_recording_done(hass)
+    await async_wait_recording_done(hass)
+    assert instance.statistics_rollups_active
+    assert _count_rollups() == (4, 2)
+    _assert_rollups_match_hourly_statistics()
+
+
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups_compiled_hours(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test compiled hours are rolled into the daily and monthly rollups."""
+    await hass.config.async_set_time_zone("Europe/Vienna")
+    await async_wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.statistics_rollups_active
+
+    zero = dt_util.as_utc(dt_util.parse_datetime("2022-09-29 00:00:00"))
+    # There are no statistics for the hours 5 and 6
+    short_term_statistics = [
+        {
+            "start": zero + timedelta(minutes=5 * idx),
+            "mean": idx % 7,
+            "min": idx % 7 - 1,
+            "max": idx % 7 + idx,
+            "last_reset": None,
+            "state": idx,
+            "sum": idx,
+        }
+        for idx in range(12 * 31)
+        if not 60 <= idx < 84
+    ]
+    metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": None,
+        "source": "recorder",
+        "statistic_id": "sensor.test",
+        "unit_of_measurement": "kWh",
+    }
+    instance.async_import_statistics(
+        metadata, short_term_statistics, StatisticsShortTerm
+    )
+    await async_wait_recording_done(hass)
+
+    def _compile_hours(hours: range) -> None:
+        for hour in hours:
+            with session_scope(hass=hass) as session:
+                statistics._compile_hourly_statistics(
+                    session, zero + timedelta(hours=hour)
+                )
+
+    def _assert_rollups_match_hourly_statistics() -> None:
+        for period in ("day", "week", "month"):
+            rollups = statistics_during_period(hass, zero, period=period)
+            with patch.object(instance, "statistics_rollups_active", False):
+                reduced = statistics_during_period(hass, zero, period=period)
+            assert rollups["sensor.test"] == [
+                pytest.approx(row, rel=1e-9) for row in reduced["sensor.test"]
+            ]
+
+    def _mean_counts() -> list[int | None]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                rollup.mean_count
+                for rollup in session.query(StatisticsDaily).order_by(
+                    StatisticsDaily.start_ts
+                )
+            ]
+
+    # The rollups are updated from the compiled hour only
+    with patch.object(
+        statistics,
+        "_update_statistics_rollup",
+        wraps=statistics._update_statistics_rollup,
+    ) as update_rollup_mock:
+        await instance.async_add_executor_job(_compile_hours, range(30))
+    update_rollup_mock.assert_not_called()
+    _assert_rollups_match_hourly_statistics()
+    assert await instance.async_add_executor_job(_mean_counts) == [22, 6]
+
+    # Rollups without a mean count are rolled up from the hourly statistics
+    def _clear_mean_count() -> None:
+        with session_scope(hass=hass) as session:
+            session.query(StatisticsDaily).filter(
+                StatisticsDaily.start_ts > zero.timestamp()
+            ).update({"mean_count": None})
+
+    await instance.async_add_executor_job(_clear_mean_count)
+    with patch.object(
+        statistics,
+        "_update_statistics_rollup",
+        wraps=statistics._update_statistics_rollup,
+    ) as update_rollup_mock:
+        await instance.async_add_executor_job(_compile_hours, range(30, 31))
+    update_rollup_mock.assert_called_once()
+    _assert_rollups_match_hourly_statistics()
+    assert await instance.async_add_executor_job(_mean_counts) == [22, 7]
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
@@ -239,7 +239,7 @@ def test_setup_connection_for_dialect_mysql(mysql_version) -> None:
 )
 def test_setup_connection_for_dialect_sqlite(sqlite_version: str) -> None:
     """Test setting up the connection for a sqlite dialect."""
-    instance_mock = MagicMock()
+    instance_mock = MagicMock(continuous_purge=False)
     execute_args = []
     close_mock = MagicMock()
 
@@ -286,6 +286,31 @@ def test_setup_connection_for_dialect_sqlite(sqlite_version: str) -> None:
     assert execute_args[2] == "PRAGMA foreign_keys=ON"
 
 
+def test_setup_connection_for_dialect_sqlite_continuous_purge() -> None:
+    """Test new sqlite databases use incremental auto vacuum for continuous purge."""
+    instance_mock = MagicMock(continuous_purge=True)
+    execute_args = []
+
+    def execute_mock(statement):
+        execute_args.append(statement)
+
+    def fetchall_mock():
+        if execute_args[-1] == "SELECT sqlite_version()":
+            return [[str(MIN_VERSION_SQLITE)]]
+        return None
+
+    def _make_cursor_mock(*_):
+        return MagicMock(execute=execute_mock, fetchall=fetchall_mock)
+
+    dbapi_connection = MagicMock(cursor=_make_cursor_mock)
+    util.setup_connection_for_dialect(instance_mock, "sqlite", dbapi_connection, True)
+    # Must be set before WAL mode initializes the database file
+    assert execute_args[:2] == [
+        "PRAGMA auto_vacuum = INCREMENTAL",
+        "PRAGMA journal_mode=WAL",
+    ]
+
+
 @pytest.mark.parametrize(
     "sqlite_version",
     [str(MIN_VERSION_SQLITE)],
@@ -294,7 +319,7 @@ def test_setup_connection_for_dialect_sqlite_zero_commit_interval(
     sqlite_version: str,
 ) -> None:
     """Test setting up the connection for a sqlite dialect with a zero commit interval."""
-    instance_mock = MagicMock(commit_interval=0)
+    instance_mock = MagicMock(commit_interval=0, continuous_purge=False)
     execute_args = []
     close_mock = MagicMock()
 
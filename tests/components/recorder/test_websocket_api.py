@@ -11,7 +11,7 @@ from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import Recorder, migration
 from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
@@ -2560,11 +2560,31 @@ async def test_recorder_info(
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "migration_progress": None,
         "recording": True,
         "thread_running": True,
     }
 
 
+async def test_recorder_info_migration_progress(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test getting the progress of a running data migration."""
+    client = await hass_ws_client()
+    progress = migration.MigrationProgress("statistics_rollups", 400, rows_done=100)
+
+    with patch.object(recorder_mock, "migration_progress", progress):
+        await client.send_json_auto_id({"type": "recorder/info"})
+        response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["migration_progress"] == {
+        "migration_id": "statistics_rollups",
+        "rows_done": 100,
+        "rows_total": 400,
+        "eta": ANY,
+    }
+
+
 async def test_recorder_info_no_recorder(
     hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -36,7 +36,12 @@ from homeassistant.components.recorder.statistics import (
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
 from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN, SensorDeviceClass
-from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
+from homeassistant.components.sensor.recorder import SHORT_TERM_STATES, ShortTermStates
+from homeassistant.const import (
+    ATTR_FRIENDLY_NAME,
+    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
+)
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.setup import async_setup_component
@@ -306,6 +311,139 @@ async def test_compile_hourly_statistics(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+async def test_compile_short_term_statistics_collected_states(
+    hass: HomeAssistant,
+) -> None:
+    """Test compiling short term statistics from states collected in memory."""
+    past = get_start_time(dt_util.utcnow())
+    zero = past + timedelta(minutes=15)
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    # The states are collected from when the sensor recorder platform is set
+    # up, an earlier period is compiled from the database
+    assert SHORT_TERM_STATES in hass.data
+    do_adhoc_statistics(hass, start=past)
+    await async_wait_recording_done(hass)
+
+    with freeze_time(zero) as freezer:
+        await async_record_states(
+            hass, freezer, zero, "sensor.test1", POWER_SENSOR_ATTRIBUTES
+        )
+        await async_wait_recording_done(hass)
+
+        freezer.move_to(zero + timedelta(minutes=5, seconds=10))
+        with patch.object(
+            history,
+            "get_full_significant_states_with_session",
+            wraps=history.get_full_significant_states_with_session,
+        ) as get_states_mock:
+            do_adhoc_statistics(hass, start=zero)
+            await async_wait_recording_done(hass)
+    get_states_mock.assert_not_called()
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": process_timestamp(zero).timestamp(),
+                "end": process_timestamp(zero + timedelta(minutes=5)).timestamp(),
+                "mean": pytest.approx(13.050847),
+                "min": pytest.approx(-10.0),
+                "max": pytest.approx(30.0),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+
+    # The states before the last compiled period are read from the database
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_states_mock:
+        do_adhoc_statistics(hass, start=past + timedelta(minutes=5))
+        await async_wait_recording_done(hass)
+    get_states_mock.assert_called()
+
+
+async def test_short_term_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test collecting sensor states for compiling short term statistics."""
+    zero = get_start_time(dt_util.utcnow())
+    freezer.move_to(zero)
+    hass.states.async_set("sensor.test1", "1", POWER_SENSOR_ATTRIBUTES)
+    hass.states.async_set("sensor.test2", "1")
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    short_term_states = ShortTermStates(hass)
+    short_term_states.async_start()
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
+    states = [hass.states.get("sensor.test1")]
+
+    freezer.tick(60)
+    hass.states.async_set("sensor.test1", "2", POWER_SENSOR_ATTRIBUTES)
+    states.append(hass.states.get("sensor.test1"))
+    # The states of sensors without a state class are not collected
+    hass.states.async_set("sensor.test3", "1")
+    # The states of a sensor removed and added back during a period are kept
+    hass.states.async_remove("sensor.test1")
+    freezer.tick(60)
+    hass.states.async_set("sensor.test1", "3", POWER_SENSOR_ATTRIBUTES)
+    states.append(hass.states.get("sensor.test1"))
+    # The states of a sensor before it got a state class are not known
+    hass.states.async_set("sensor.test2", "2", POWER_SENSOR_ATTRIBUTES)
+    test2_state = hass.states.get("sensor.test2")
+
+    freezer.move_to(zero + timedelta(minutes=5, seconds=10))
+    assert short_term_states.states_during_period(
+        zero,
+        zero + timedelta(minutes=5),
+        ["sensor.test1", "sensor.test3"],
+        ["sensor.test2"],
+    ) == ({"sensor.test1": states}, [], ["sensor.test2"])
+
+    # The states of a period in which states were trimmed are not known
+    with patch("homeassistant.components.sensor.recorder.MAX_SHORT_TERM_STATES", 4):
+        for value in range(5):
+            hass.states.async_set("sensor.test1", str(value), POWER_SENSOR_ATTRIBUTES)
+            freezer.tick(1)
+    test1_state = hass.states.get("sensor.test1")
+    freezer.move_to(zero + timedelta(minutes=10, seconds=10))
+    assert short_term_states.states_during_period(
+        zero + timedelta(minutes=5),
+        zero + timedelta(minutes=10),
+        ["sensor.test1"],
+        ["sensor.test2"],
+    ) == ({"sensor.test2": [test2_state]}, ["sensor.test1"], [])
+
+    # The states of sensors which are no longer wanted are forgotten
+    freezer.move_to(zero + timedelta(minutes=15, seconds=10))
+    assert short_term_states.states_during_period(
+        zero + timedelta(minutes=10),
+        zero + timedelta(minutes=15),
+        ["sensor.test1"],
+        [],
+    ) == ({"sensor.test1": [test1_state]}, [], [])
+    assert short_term_states.states_during_period(
+        zero + timedelta(minutes=15),
+        zero + timedelta(minutes=20),
+        ["sensor.test1"],
+        ["sensor.test2"],
+    ) == ({}, ["sensor.test1"], ["sensor.test2"])
+
+    short_term_states.async_stop()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+    freezer.move_to(zero + timedelta(minutes=20, seconds=10))
+    assert short_term_states.states_during_period(
+        zero + timedelta(minutes=15),
+        zero + timedelta(minutes=20),
+        ["sensor.test1"],
+        [],
+    ) == ({}, ["sensor.test1"], [])
+
+
 @pytest.mark.parametrize(
     (
         "device_class",
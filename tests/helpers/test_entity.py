@@ -37,6 +37,7 @@ from homeassistant.helpers import device_registry as dr, entity, entity_registry
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
+from homeassistant.util import dt as dt_util
 
 from tests.common import (
     MockConfigEntry,
@@ -44,6 +45,7 @@ from tests.common import (
     MockEntityPlatform,
     MockModule,
     MockPlatform,
+    async_fire_time_changed,
     mock_integration,
     mock_registry,
 )
@@ -859,6 +861,33 @@ async def test_removing_entity_unavailable(hass: HomeAssistant) -> None:
     assert state.state == STATE_UNAVAILABLE
 
 
+async def test_state_coalesce_window(hass: HomeAssistant) -> None:
+    """Test entities can opt in to coalescing their state writes."""
+
+    class CoalescedEntity(entity.Entity):
+        _state_coalesce_window = 60
+
+    platform = MockEntityPlatform(hass, domain="hello")
+    ent = CoalescedEntity()
+    ent.entity_id = "hello.world"
+    await platform.async_add_entities([ent])
+    assert hass.states.get("hello.world").state == STATE_UNKNOWN
+
+    ent._attr_state = "1"
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").state == "1"
+
+    ent._attr_state = "2"
+    ent.async_write_ha_state()
+    ent._attr_state = "3"
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").state == "1"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world").state == "3"
+
+
 async def test_get_supported_features_entity_registry(
     hass: HomeAssistant, entity_registry: er.EntityRegistry
 ) -> None:
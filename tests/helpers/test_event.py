@@ -13,12 +13,13 @@ from freezegun.api import FrozenDateTimeFactory
 import jinja2
 import pytest
 
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import (
     Event,
     EventStateChangedData,
     EventStateReportedData,
+    HassJobType,
     HomeAssistant,
     callback,
 )
@@ -444,6 +445,47 @@ async def test_async_track_state_change_filtered(hass: HomeAssistant) -> None:
     track_throws.async_remove()
 
 
+async def test_async_track_state_change_event_keyed(hass: HomeAssistant) -> None:
+    """Test state writes are only dispatched to trackers of their entity."""
+    calls = []
+    added_calls = []
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    with patch(
+        "homeassistant.helpers.event._async_dispatch_entity_id_event"
+    ) as dispatch:
+        unsub = async_track_state_change_event(
+            hass, ["light.bowl", "light.kitchen"], calls.append, HassJobType.Callback
+        )
+        unsub_added = async_track_state_added_domain(
+            hass, "switch", added_calls.append, HassJobType.Callback
+        )
+        assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 2
+        # The bus indexes the tracked entities instead of filtering every event
+        keyed_listeners = hass.bus._keyed_listeners[EVENT_STATE_CHANGED]
+        assert keyed_listeners["entity_id"].listeners.keys() == {
+            "light.bowl",
+            "light.kitchen",
+        }
+
+        hass.states.async_set("light.other", "on")
+        hass.states.async_set("switch.other", "on")
+        hass.states.async_set("switch.other", "off")
+        await hass.async_block_till_done()
+        dispatch.assert_not_called()
+        assert [event.data["entity_id"] for event in added_calls] == ["switch.other"]
+
+        hass.states.async_set("light.bowl", "on")
+        await hass.async_block_till_done()
+        dispatch.assert_called_once()
+        assert dispatch.call_args[0][2].data["entity_id"] == "light.bowl"
+
+    unsub()
+    unsub_added()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+    assert EVENT_STATE_CHANGED not in hass.bus._keyed_listeners
+
+
 async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     """Test async_track_state_change_event."""
     single_entity_id_tracker = []
@@ -107,6 +107,41 @@ async def test_extract_frame_integration_with_excluded_integration(
     )
 
 
+async def test_extract_frame_integration_from_start_frame() -> None:
+    """Test extracting the integration frame from a given start frame."""
+    correct_frame = Mock(
+        filename="/home/dev/homeassistant/components/hue/light.py",
+        lineno="23",
+        line="self.light.is_on",
+    )
+    start_frame = extract_stack_to_frame(
+        [
+            Mock(
+                filename="/home/dev/homeassistant/core.py",
+                lineno="23",
+                line="do_something()",
+            ),
+            correct_frame,
+            Mock(
+                filename="/home/dev/aiohue/lights.py",
+                lineno="2",
+                line="something()",
+            ),
+        ]
+    )
+    with patch("homeassistant.helpers.frame.get_current_frame") as mock_current:
+        integration_frame = frame.get_integration_frame(start_frame=start_frame)
+
+    mock_current.assert_not_called()
+    assert integration_frame == frame.IntegrationFrame(
+        custom_integration=False,
+        frame=correct_frame,
+        integration="hue",
+        module=None,
+        relative_filename="homeassistant/components/hue/light.py",
+    )
+
+
 async def test_extract_frame_no_integration(caplog: pytest.LogCaptureFixture) -> None:
     """Test extracting the current frame without integration context."""
     with (
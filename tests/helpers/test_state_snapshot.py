@@ -0,0 +1,138 @@
+"""Test state snapshot helpers."""
+
+import math
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.state_snapshot import (
+    StateSnapshot,
+    async_track_state_snapshot,
+)
+
+
+async def test_state_snapshot(hass: HomeAssistant) -> None:
+    """Test the snapshot is built from the state machine and kept up to date."""
+    hass.states.async_set("sensor.power", "10.5", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.mode", "eco")
+    hass.states.async_set("switch.fan", "on")
+
+    snapshot = async_track_state_snapshot(
+        hass, attributes=("unit_of_measurement", "friendly_name")
+    )
+    columns = snapshot.async_columns()
+    assert columns.entity_ids == ["sensor.power", "sensor.mode", "switch.fan"]
+    assert columns.values[0] == 10.5
+    assert math.isnan(columns.values[1])
+    assert columns.values[2] == 1
+    assert columns.last_changed[0] == (
+        hass.states.get("sensor.power").last_changed_timestamp
+    )
+    assert columns.attributes == {
+        "unit_of_measurement": ["W", None, None],
+        "friendly_name": [None, None, None],
+    }
+
+    hass.states.async_set("sensor.power", "12", {"unit_of_measurement": "kW"})
+    hass.states.async_set("light.bowl", "off", {"friendly_name": "Bowl"})
+    await hass.async_block_till_done()
+
+    # Columns that were returned before are not changed
+    assert columns.values[0] == 10.5
+
+    columns = snapshot.async_columns()
+    assert columns.entity_ids == [
+        "sensor.power",
+        "sensor.mode",
+        "switch.fan",
+        "light.bowl",
+    ]
+    assert columns.values[0] == 12
+    assert columns.values[3] == 0
+    assert columns.attributes["unit_of_measurement"][0] == "kW"
+    assert columns.attributes["friendly_name"][3] == "Bowl"
+
+    # The last row takes the place of removed rows
+    hass.states.async_remove("sensor.mode")
+    await hass.async_block_till_done()
+    columns = snapshot.async_columns()
+    assert columns.entity_ids == ["sensor.power", "light.bowl", "switch.fan"]
+    assert list(columns.values) == [12, 0, 1]
+    assert columns.attributes["friendly_name"] == [None, "Bowl", None]
+
+    hass.states.async_remove("switch.fan")
+    await hass.async_block_till_done()
+    assert snapshot.async_columns().entity_ids == ["sensor.power", "light.bowl"]
+    assert len(snapshot) == 2
+
+    snapshot.async_stop()
+    snapshot.async_stop()
+    hass.states.async_set("sensor.power", "15")
+    await hass.async_block_till_done()
+    assert snapshot.async_columns().values[0] == 12
+
+
+async def test_state_snapshot_domains(hass: HomeAssistant) -> None:
+    """Test the snapshot only tracks the selected domains."""
+    hass.states.async_set("sensor.power", "10")
+    hass.states.async_set("switch.fan", "on")
+
+    snapshot = async_track_state_snapshot(hass, domains=["sensor"])
+    assert snapshot.async_columns().entity_ids == ["sensor.power"]
+
+    hass.states.async_set("switch.pump", "on")
+    hass.states.async_set("sensor.energy", "3")
+    hass.states.async_remove("switch.fan")
+    await hass.async_block_till_done()
+
+    columns = snapshot.async_columns()
+    assert columns.entity_ids == ["sensor.power", "sensor.energy"]
+    assert list(columns.values) == [10, 3]
+    assert columns.attributes == {}
+    snapshot.async_stop()
+
+
+async def test_state_snapshot_entity_ids(hass: HomeAssistant) -> None:
+    """Test the snapshot only tracks the selected entities and domains."""
+    hass.states.async_set("sensor.power", "10")
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_set("light.bowl", "on")
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    snapshot = async_track_state_snapshot(
+        hass,
+        domains=["sensor"],
+        entity_ids=["switch.fan", "switch.pump", "sensor.power"],
+    )
+    assert snapshot.async_columns().entity_ids == ["sensor.power", "switch.fan"]
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    with patch.object(
+        StateSnapshot,
+        "_async_update_row",
+        autospec=True,
+        side_effect=StateSnapshot._async_update_row,
+    ) as update_row:
+        hass.states.async_set("light.bowl", "off")
+        hass.states.async_set("switch.other", "off")
+        await hass.async_block_till_done()
+        update_row.assert_not_called()
+
+        hass.states.async_set("switch.pump", "on")
+        hass.states.async_set("sensor.energy", "3")
+        hass.states.async_set("sensor.power", "12")
+        hass.states.async_set("switch.fan", "off")
+        await hass.async_block_till_done()
+        assert update_row.call_count == 2
+
+    columns = snapshot.async_columns()
+    assert columns.entity_ids == [
+        "sensor.power",
+        "switch.fan",
+        "switch.pump",
+        "sensor.energy",
+    ]
+    assert list(columns.values) == [12, 0, 1, 3]
+
+    snapshot.async_stop()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
@@ -10,7 +10,7 @@ from freezegun.api import FrozenDateTimeFactory
 import pytest
 import requests
 
-from homeassistant import config_entries
+from homeassistant import config_entries, core as ha
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CoreState, HomeAssistant, callback
 from homeassistant.exceptions import (
@@ -370,6 +370,38 @@ async def test_update_interval(
     assert crd.data == 2
 
 
+async def test_update_interval_deferred(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    crd: update_coordinator.DataUpdateCoordinator[int],
+) -> None:
+    """Test refreshes deferred while the event loop is saturated can be cancelled."""
+    unsub = crd.async_add_listener(Mock())
+
+    with patch.object(ha, "LOOP_SATURATED_READY_HANDLES", -1):
+        freezer.tick(crd.update_interval)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert crd.data == 1
+
+        # The deferred refresh does not run after the last listener is removed
+        freezer.tick(crd.update_interval)
+        async_fire_time_changed(hass)
+        unsub()
+        await hass.async_block_till_done()
+        assert crd.data == 1
+
+        # The deferred refresh does not run after a shutdown
+        unsub = crd.async_add_listener(Mock())
+        freezer.tick(crd.update_interval)
+        async_fire_time_changed(hass)
+        await crd.async_shutdown()
+        await hass.async_block_till_done()
+        assert crd.data == 1
+
+    unsub()
+
+
 async def test_update_interval_not_present(
     hass: HomeAssistant,
     crd_without_update_interval: update_coordinator.DataUpdateCoordinator[int],
@@ -0,0 +1,94 @@
+"""Test the worker loop helper."""
+
+import asyncio
+import threading
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.worker_loop import async_get_worker_loop
+
+
+async def test_worker_loop(hass: HomeAssistant) -> None:
+    """Test running coroutines in a worker loop and batching results."""
+    worker_loop = async_get_worker_loop(hass, "test")
+    assert async_get_worker_loop(hass, "test") is worker_loop
+    batches: list[list[int]] = []
+
+    @callback
+    def _async_receive(items: list[int]) -> None:
+        assert threading.get_ident() == hass.loop_thread_id
+        batches.append(items)
+
+    channel = worker_loop.async_create_channel(_async_receive)
+
+    async def _produce() -> str:
+        for item in range(5):
+            channel.put(item)
+        return threading.current_thread().name
+
+    assert await worker_loop.async_run(_produce()) == "WorkerLoop-test"
+    await hass.async_block_till_done()
+    assert batches == [[0, 1, 2, 3, 4]]
+
+    channel.put(5)
+    await hass.async_block_till_done()
+    assert batches == [[0, 1, 2, 3, 4], [5]]
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert not worker_loop.loop.is_running()
+
+
+async def test_worker_loop_stop_cancels_tasks(hass: HomeAssistant) -> None:
+    """Test stopping a worker loop cancels its tasks."""
+    worker_loop = async_get_worker_loop(hass, "test")
+    started = asyncio.Event()
+    cancelled = False
+
+    async def _run_forever() -> None:
+        nonlocal cancelled
+        hass.loop.call_soon_threadsafe(started.set)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    future = worker_loop.async_run(_run_forever())
+    await started.wait()
+    await worker_loop.async_stop()
+    await worker_loop.async_stop()
+
+    assert cancelled
+    assert future.cancelled()
+    assert worker_loop.loop.is_closed()
+
+
+async def test_channel_callback_error(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test errors raised by the channel callback are logged."""
+    worker_loop = async_get_worker_loop(hass, "test")
+
+    @callback
+    def _async_receive(items: list[int]) -> None:
+        raise ValueError("bad items")
+
+    channel = worker_loop.async_create_channel(_async_receive)
+    channel.put(1)
+    await hass.async_block_till_done()
+
+    assert "Error delivering 1 items from channel" in caplog.text
+    await worker_loop.async_stop()
+
+
+async def test_get_worker_loop_after_stop(hass: HomeAssistant) -> None:
+    """Test a new worker loop is started after the previous one was stopped."""
+    worker_loop = async_get_worker_loop(hass, "test")
+    await worker_loop.async_stop()
+
+    new_worker_loop = async_get_worker_loop(hass, "test")
+    assert new_worker_loop is not worker_loop
+    assert not new_worker_loop.loop.is_closed()
@@ -16,6 +16,7 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from pytest_unordered import unordered
 import voluptuous as vol
@@ -34,6 +35,7 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     EVENT_STATE_REPORTED,
     MATCH_ALL,
+    STATE_UNAVAILABLE,
 )
 import homeassistant.core as ha
 from homeassistant.core import (
@@ -65,6 +67,7 @@ from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from .common import (
     async_capture_events,
+    async_fire_time_changed,
     async_mock_service,
     help_test_all,
     import_and_test_deprecated_alias,
@@ -354,7 +357,7 @@ async def test_async_create_task_schedule_coroutine_with_name() -> None:
 
 async def test_async_run_eager_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(track_running_job=False)
     calls = []
 
     def job():
@@ -378,7 +381,7 @@ async def test_async_run_eager_hass_job_calls_coro_function() -> None:
 
 async def test_async_run_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(track_running_job=False)
     calls = []
 
     def job():
@@ -402,6 +405,87 @@ async def test_async_run_hass_job_delegates_non_async() -> None:
     assert len(hass._async_add_hass_job.mock_calls) == 1
 
 
+async def test_async_run_hass_job_background_priority(hass: HomeAssistant) -> None:
+    """Test background priority jobs are deferred while the loop is saturated."""
+    calls = []
+
+    @ha.callback
+    def job(value):
+        calls.append(value)
+
+    async def coro_job(value):
+        calls.append(value)
+
+    background_job = ha.HassJob(job, priority=ha.HassJobPriority.BACKGROUND)
+    background_coro_job = ha.HassJob(coro_job, priority=ha.HassJobPriority.BACKGROUND)
+    normal_job = ha.HassJob(job)
+
+    # Not saturated, background priority jobs run right away
+    hass.async_run_hass_job(background_job, "background")
+    assert calls == ["background"]
+    calls.clear()
+
+    with patch.object(ha, "LOOP_SATURATED_READY_HANDLES", -1):
+        assert hass.async_run_hass_job(background_job, 1) is None
+        assert hass.async_run_hass_job(background_coro_job, 2) is None
+        hass.async_run_hass_job(normal_job, "normal")
+        assert calls == ["normal"]
+
+        # One deferred job runs per event loop iteration while saturated
+        await asyncio.sleep(0)
+        assert calls == ["normal", 1]
+        await asyncio.sleep(0)
+        assert calls == ["normal", 1, 2]
+
+    stats = hass.async_get_job_priority_stats()
+    assert stats[ha.HassJobPriority.BACKGROUND].samples == 2
+    assert stats[ha.HassJobPriority.NORMAL].samples == 2
+    assert stats[ha.HassJobPriority.BACKGROUND].max_lag > 0
+
+
+async def test_async_run_cancellable_hass_job(hass: HomeAssistant) -> None:
+    """Test deferred background priority jobs can be cancelled."""
+    calls = []
+
+    @ha.callback
+    def job(value):
+        calls.append(value)
+
+    background_job = ha.HassJob(job, priority=ha.HassJobPriority.BACKGROUND)
+
+    # Not saturated, the job runs right away
+    assert hass.async_run_cancellable_hass_job(background_job, 1) is None
+    assert calls == [1]
+
+    with patch.object(ha, "LOOP_SATURATED_READY_HANDLES", -1):
+        cancel = hass.async_run_cancellable_hass_job(background_job, 2)
+        assert hass.async_run_cancellable_hass_job(background_job, 3) is not None
+        assert cancel is not None
+        cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    assert calls == [1, 3]
+
+
+async def test_async_run_hass_job_background_priority_error(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test errors in deferred background priority jobs are logged."""
+
+    @ha.callback
+    def job():
+        raise ValueError
+
+    with patch.object(ha, "LOOP_SATURATED_READY_HANDLES", -1):
+        hass.async_run_hass_job(
+            ha.HassJob(job, "bad job", priority=ha.HassJobPriority.BACKGROUND)
+        )
+        await asyncio.sleep(0)
+
+    assert "Error running job: <Job bad job" in caplog.text
+
+
 async def test_async_get_hass_can_be_called(hass: HomeAssistant) -> None:
     """Test calling async_get_hass via different paths.
 
@@ -1117,6 +1201,25 @@ def test_state_as_compressed_state_json() -> None:
     assert state.as_compressed_state_json is as_compressed_state
 
 
+async def test_state_attributes_json_shared(hass: HomeAssistant) -> None:
+    """Test the attributes JSON is shared between formats and states."""
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    state = hass.states.get("sensor.power")
+    attributes_json = state.attributes_json
+    assert attributes_json == b'{"unit_of_measurement":"W"}'
+    assert attributes_json in state.as_dict_json
+    assert attributes_json in state.as_compressed_state_json
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    assert hass.states.get("sensor.power").attributes_json is attributes_json
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "kW"})
+    assert (
+        hass.states.get("sensor.power").attributes_json
+        == b'{"unit_of_measurement":"kW"}'
+    )
+
+
 async def test_eventbus_add_remove_listener(hass: HomeAssistant) -> None:
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -1165,6 +1268,165 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass: HomeAssistant) -> None:
+    """Test we can listen for events by a key of the event data."""
+    calls = []
+    domain_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def domain_listener(event):
+        """Mock domain listener."""
+        domain_calls.append(event)
+
+    @ha.callback
+    def domain_key(event_data):
+        """Return the domain of the entity_id."""
+        return event_data["entity_id"].partition(".")[0]
+
+    listeners_before = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.kitchen", "light.bed"], listener
+    )
+    unsub_domain = hass.bus.async_listen_keyed(
+        "test", domain_key, "switch", domain_listener
+    )
+    # A listener for several keys is counted once
+    assert hass.bus.async_listeners()["test"] == listeners_before + 2
+
+    hass.bus.async_fire("test", {"entity_id": "light.other"})
+    hass.bus.async_fire("test", {"other": "light.kitchen"})
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+    assert len(domain_calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bed"})
+    hass.bus.async_fire("test", {"entity_id": "switch.fan"})
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls] == [
+        "light.kitchen",
+        "light.bed",
+    ]
+    assert [event.data["entity_id"] for event in domain_calls] == ["switch.fan"]
+
+    unsub()
+    unsub_domain()
+    assert hass.bus.async_listeners().get("test", 0) == listeners_before
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "switch.fan"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert len(domain_calls) == 1
+
+
+async def test_eventbus_keyed_listener_hassjob(hass: HomeAssistant) -> None:
+    """Test a HassJob can listen for keys added over time."""
+    calls = []
+    job = ha.HassJob(calls.append, job_type=ha.HassJobType.Callback)
+
+    listeners_before = hass.bus.async_listeners().get("test", 0)
+    unsub_kitchen = hass.bus.async_listen_keyed(
+        "test", "entity_id", "light.kitchen", job
+    )
+    unsub_bed = hass.bus.async_listen_keyed("test", "entity_id", "light.bed", job)
+    assert hass.bus.async_listeners()["test"] == listeners_before + 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bed"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    unsub_kitchen()
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bed"})
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls[2:]] == ["light.bed"]
+
+    unsub_bed()
+    assert hass.bus.async_listeners().get("test", 0) == listeners_before
+
+
+async def test_eventbus_keyed_listener_errors(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test keyed listener validation and key getter errors."""
+
+    def not_a_callback(event_data):
+        """Not decorated with callback."""
+
+    with pytest.raises(HomeAssistantError, match="At least one key is required"):
+        hass.bus.async_listen_keyed("test", "entity_id", [], lambda event: None)
+
+    with pytest.raises(HomeAssistantError, match="is not a callback"):
+        hass.bus.async_listen_keyed(
+            "test", not_a_callback, "light.kitchen", lambda event: None
+        )
+
+    @ha.callback
+    def bad_key(event_data):
+        """Raise an error."""
+        raise ValueError
+
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", bad_key, "light.kitchen", listener)
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+    assert "Error in event key getter" in caplog.text
+
+    unsub()
+    unsub()
+    assert "Unable to remove unknown keyed job listener" in caplog.text
+
+
+async def test_eventbus_keyed_listener_unhashable_key(hass: HomeAssistant) -> None:
+    """Test an unhashable key value does not stop the other listeners."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append("regular")
+
+    @ha.callback
+    def keyed_listener(event):
+        """Mock keyed listener."""
+        calls.append("keyed")
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock match all listener."""
+        if event.event_type == "test":
+            calls.append("match_all")
+
+    hass.bus.async_listen("test", listener)
+    hass.bus.async_listen_keyed("test", "entity_id", "light.kitchen", keyed_listener)
+    hass.bus.async_listen(MATCH_ALL, match_all_listener)
+
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    await hass.async_block_till_done()
+    assert calls == ["regular", "match_all"]
+
+    # Keyed listeners run after the listeners of the event type
+    calls.clear()
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert calls == ["regular", "keyed", "match_all"]
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1560,6 +1822,121 @@ async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> N
     assert isinstance(new_state.attributes, ReadOnlyDict)
 
 
+async def test_statemachine_equal_attributes_not_changed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test equal attributes in a different order do not change the state."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("sensor.one", "1", {"unit": "W", "precision": 1})
+    state = hass.states.get("sensor.one")
+    freezer.tick(1)
+    hass.states.async_set("sensor.one", "1", {"precision": 1, "unit": "W"})
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    reported = hass.states.get("sensor.one")
+    assert reported is state
+    assert reported.last_updated == state.last_updated
+    assert reported.last_reported > state.last_updated
+
+
+async def test_statemachine_coalesce_window(hass: HomeAssistant) -> None:
+    """Test state writes within the coalesce window are coalesced."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set_coalesce_window("sensor.Power", 5)
+    now = time.time()
+
+    # Adding the entity is written immediately
+    hass.states.async_set("sensor.power", "1", timestamp=now)
+    assert len(events) == 1
+
+    # Writes within the window are held back
+    hass.states.async_set("sensor.power", "2", {"a": 1}, timestamp=now + 1)
+    hass.states.async_set("sensor.power", "3", {"a": 2}, timestamp=now + 2)
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert hass.states.get("sensor.power").state == "1"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    state = hass.states.get("sensor.power")
+    assert state.state == "3"
+    assert state.attributes == {"a": 2}
+    assert state.last_updated_timestamp == now + 2
+    assert events[1].data["old_state"].state == "1"
+
+    # The first write after the window is written immediately
+    hass.states.async_set("sensor.power", "4", timestamp=now + 8)
+    assert len(events) == 3
+
+    # Unavailable is written immediately and drops held back writes
+    hass.states.async_set("sensor.power", "5", timestamp=now + 9)
+    hass.states.async_set("sensor.power", STATE_UNAVAILABLE, timestamp=now + 10)
+    assert len(events) == 4
+    assert hass.states.get("sensor.power").state == STATE_UNAVAILABLE
+    hass.states.async_set("sensor.power", "6", timestamp=now + 11)
+    assert len(events) == 5
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert len(events) == 5
+
+    # Disabling coalescing writes the held back write
+    hass.states.async_set("sensor.power", "7", timestamp=now + 12)
+    assert len(events) == 5
+    hass.states.async_set_coalesce_window("sensor.power", None)
+    assert len(events) == 6
+    assert hass.states.get("sensor.power").state == "7"
+    hass.states.async_set("sensor.power", "8", timestamp=now + 13)
+    assert len(events) == 7
+
+
+async def test_statemachine_coalesce_window_remove(hass: HomeAssistant) -> None:
+    """Test removing a state drops the held back write and the window."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set_coalesce_window("sensor.power", 5)
+    now = time.time()
+    hass.states.async_set("sensor.power", "1", timestamp=now)
+    hass.states.async_set("sensor.power", "2", timestamp=now + 1)
+    assert hass.states.async_remove("sensor.power")
+    assert len(events) == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    assert hass.states.get("sensor.power") is None
+
+    hass.states.async_set("sensor.power", "3", timestamp=now + 2)
+    hass.states.async_set("sensor.power", "4", timestamp=now + 3)
+    assert len(events) == 4
+
+
+async def test_statemachine_coalesce_window_flushed_at_stop(
+    hass: HomeAssistant,
+) -> None:
+    """Test held back state writes are written when Home Assistant stops."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set_coalesce_window("sensor.power", 5)
+    now = time.time()
+    hass.states.async_set("sensor.power", "1", timestamp=now)
+    hass.states.async_set("sensor.power", "2", timestamp=now + 1)
+    assert len(events) == 1
+
+    states_at_stop: list[str] = []
+
+    @ha.callback
+    def _async_stop(event: ha.Event) -> None:
+        states_at_stop.append(hass.states.get("sensor.power").state)
+        hass.states.async_set("sensor.power", "3", timestamp=now + 2)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    await hass.async_stop()
+
+    assert states_at_stop == ["2"]
+    assert [event.data["new_state"].state for event in events] == ["1", "2", "3"]
+    assert events[1].data["new_state"].last_updated_timestamp == now + 1
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall(None, "homeassistant", "start")